@@ -0,0 +1,224 @@
+"""异步传输引擎模块。
+
+在一个事件循环上用aiohttp流式下载大量文件，不再为每个任务占用一个线程：
+1. 网络读取全部在事件循环中进行，数百个传输只需要一个线程
+2. 写盘和摘要计算交给少量线程的I/O执行器，不阻塞事件循环
+3. 同一个文件的写入按顺序提交，缓冲区攒满后才提交一次，缓冲区从全局池借用
+
+依赖yt-dlp等同步库的插件仍走线程池路径。引擎只做单连接下载，
+需要分段或续传的文件通过TransferDeferred交回同步路径。
+"""
+
+import os
+import time
+import asyncio
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Union
+
+import aiohttp
+
+from .chunk_sizing import AdaptiveChunkSizer
+from .exceptions import DownloadCanceled
+from .file_writer import PositionalWriter, StagingBuffer
+from .hashing import StreamingHasher
+from .resume import part_path_for
+
+logger = logging.getLogger(__name__)
+
+
+class TransferDeferred(Exception):
+    """文件需要分段下载或续传，交给同步下载路径处理。"""
+    pass
+
+
+class AsyncTransferEngine:
+    """异步传输引擎。
+
+    Attributes:
+        chunk_size: int, 每次从网络读取的初始字节数，传输中按带宽调整
+        buffer_size: int, 写盘缓冲区初始大小
+        io_executor: ThreadPoolExecutor, 写盘执行器
+    """
+
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+    DEFAULT_BUFFER_SIZE = 1024 * 1024
+    DEFAULT_IO_WORKERS = 4
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        io_workers: int = DEFAULT_IO_WORKERS
+    ):
+        """初始化传输引擎。
+
+        Args:
+            chunk_size: 每次从网络读取的字节数
+            buffer_size: 写盘缓冲区大小
+            io_workers: 写盘线程数
+        """
+        self.chunk_size = chunk_size
+        self.buffer_size = buffer_size
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=io_workers,
+            thread_name_prefix="transfer-io"
+        )
+
+    @staticmethod
+    def _finish(staging: StagingBuffer, size: int) -> None:
+        """写入剩余数据并把文件截断到实际大小。"""
+        staging.flush()
+        staging.close()
+        if staging.position != size:
+            staging.writer.truncate(staging.position)
+        staging.writer.close()
+
+    async def download(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        save_path: Union[str, Path],
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        proxy: Optional[str] = None,
+        ssl: Optional[bool] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        is_canceled: Optional[Callable[[], bool]] = None,
+        throttle: Optional[Callable[[int], float]] = None,
+        sizer: Optional[AdaptiveChunkSizer] = None,
+        defer: Optional[Callable[[aiohttp.ClientResponse], bool]] = None
+    ) -> Dict[str, Any]:
+        """流式下载文件。
+
+        数据先写入 ``.part`` 临时文件，完成后替换为正式文件，失败时删除本次写入的临时文件。
+        收到响应头之前不会打开临时文件，已有的临时文件不受影响。
+
+        Args:
+            session: aiohttp会话
+            url: 下载地址
+            save_path: 保存路径
+            headers: 请求头
+            cookies: Cookie
+            proxy: 代理地址
+            ssl: 为False时不验证证书
+            on_progress: 进度回调，参数为已下载字节数和总字节数
+            is_canceled: 返回True时中止下载
+            throttle: 限速回调，参数为本次读取的字节数，返回需要等待的秒数
+            sizer: 块大小控制器，默认按引擎配置创建
+            defer: 收到响应头后调用，返回True时放弃本次传输，例如文件大到需要分段下载
+
+        Returns:
+            Dict[str, Any]: 文件摘要
+
+        Raises:
+            TransferDeferred: defer返回True
+            DownloadCanceled: 下载被取消
+            aiohttp.ClientError: 网络错误
+            OSError: 文件写入失败
+        """
+        loop = asyncio.get_running_loop()
+        if sizer is None:
+            sizer = AdaptiveChunkSizer(self.chunk_size, self.buffer_size)
+        save_path = Path(save_path)
+        part_path = part_path_for(save_path)
+        hasher = StreamingHasher()
+        request_headers = dict(headers or {})
+        # 媒体文件不需要压缩传输，避免服务器返回无法解码的编码
+        request_headers['Accept-Encoding'] = 'identity'
+
+        await loop.run_in_executor(
+            self.io_executor,
+            lambda: save_path.parent.mkdir(parents=True, exist_ok=True)
+        )
+        writer = None
+        staging = None
+        try:
+            async with session.get(
+                url,
+                headers=request_headers,
+                cookies=cookies,
+                proxy=proxy,
+                ssl=ssl
+            ) as response:
+                response.raise_for_status()
+                if defer is not None and defer(response):
+                    raise TransferDeferred(url)
+                total_size = response.content_length or 0
+                writer = await loop.run_in_executor(
+                    self.io_executor, lambda: PositionalWriter(part_path, truncate=True)
+                )
+                downloaded = 0
+                await loop.run_in_executor(self.io_executor, writer.preallocate, total_size)
+                # 摘要在I/O线程写盘前计算，不占用事件循环
+                staging = StagingBuffer(writer, 0, sizer.buffer_size, on_flush=hasher.update)
+
+                while True:
+                    started = time.monotonic()
+                    chunk = await response.content.read(sizer.chunk_size)
+                    if not chunk:
+                        break
+                    sizer.observe(len(chunk), time.monotonic() - started)
+                    if is_canceled and is_canceled():
+                        raise DownloadCanceled("下载已取消")
+                    if len(chunk) > staging.room:
+                        # 放不下时append会先写盘
+                        await loop.run_in_executor(self.io_executor, staging.append, chunk)
+                    else:
+                        staging.append(chunk)
+                    downloaded += len(chunk)
+                    if staging.filled >= sizer.buffer_size:
+                        await loop.run_in_executor(
+                            self.io_executor, staging.flush, sizer.buffer_size
+                        )
+                    if throttle:
+                        delay = throttle(len(chunk))
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    if on_progress:
+                        on_progress(downloaded, total_size)
+
+                await loop.run_in_executor(
+                    self.io_executor, self._finish, staging, total_size
+                )
+            await loop.run_in_executor(self.io_executor, os.replace, part_path, save_path)
+        except BaseException:
+            if writer is not None:
+                await loop.run_in_executor(
+                    self.io_executor, self._discard, writer, staging, part_path
+                )
+            raise
+        return hasher.result()
+
+    @staticmethod
+    def _discard(
+        writer: PositionalWriter,
+        staging: Optional[StagingBuffer],
+        part_path: Path
+    ) -> None:
+        """归还缓冲区，关闭并删除不完整的临时文件。"""
+        if staging is not None:
+            staging.close()
+        try:
+            writer.close()
+        except OSError:
+            pass
+        try:
+            os.remove(part_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"删除临时文件失败: {part_path} - {e}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭I/O执行器。
+
+        Args:
+            wait: 是否等待未完成的写入
+        """
+        self.io_executor.shutdown(wait=wait)
+
+
+# 全局传输引擎
+transfer_engine = AsyncTransferEngine()
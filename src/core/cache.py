@@ -6,8 +6,8 @@
 import logging
 import os
 import time
-import json
 import pickle
+import sqlite3
 import zlib
 from typing import Any, Optional, Dict, List, Tuple
 from collections import OrderedDict
@@ -154,8 +154,8 @@ class LRUCache:
             # 创建缓存项
             item = CacheItem(value, expire_at)
             
-            # 检查容量
-            if len(self.cache) >= self.capacity:
+            # 检查容量(覆盖已有键时不淘汰)
+            if key not in self.cache and len(self.cache) >= self.capacity:
                 self.cache.popitem(last=False)
                 
             # 更新缓存
@@ -185,33 +185,134 @@ class LRUCache:
 class DiskCache:
     """磁盘缓存。
     
+    所有条目保存在同一个SQLite数据库(WAL模式)中，键使用SHA-256哈希，
+    跨进程重启后依然有效。超过容量上限时先清理过期条目，再按最近访问时间淘汰。
+    每个线程使用独立的连接，读操作可以并发进行，写操作串行执行。
+    
     Attributes:
         cache_dir: 缓存目录
-        lock: 线程锁
+        db_path: 数据库文件路径
+        max_bytes: 缓存容量上限(字节)
+        lock: 写操作锁
     """
     
-    def __init__(self, cache_dir: str):
+    # 默认容量上限
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    
+    # 淘汰后保留的容量比例，避免每次写入都触发淘汰
+    EVICT_RATIO = 0.9
+    
+    # 访问时间的更新间隔(秒)，减少读操作引起的写入
+    ACCESS_RESOLUTION = 60
+    
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
         """初始化缓存。
         
         Args:
             cache_dir: 缓存目录
+            max_bytes: 缓存容量上限(字节)，默认256MB
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / 'cache.db'
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
         self.lock = Lock()
+        self._local = threading.local()
+        
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS entries (
+                        key_hash TEXT PRIMARY KEY,
+                        key TEXT NOT NULL,
+                        value BLOB NOT NULL,
+                        compressed INTEGER NOT NULL DEFAULT 0,
+                        size INTEGER NOT NULL,
+                        expire_at REAL,
+                        accessed_at REAL NOT NULL
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)"
+                )
+            self._total_bytes = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接。
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
         
-    def _get_path(self, key: str) -> Path:
-        """获取缓存文件路径。
+    @staticmethod
+    def _hash_key(key: str) -> str:
+        """计算稳定的键哈希。
         
         Args:
             key: 键
             
         Returns:
-            Path: 文件路径
+            str: SHA-256十六进制哈希
         """
-        # 使用键的哈希值作为文件名
-        filename = f"{hash(key)}.cache"
-        return self.cache_dir / filename
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+        
+    def get_item(self, key: str) -> Optional[CacheItem]:
+        """获取缓存项。
+        
+        Args:
+            key: 键
+            
+        Returns:
+            Optional[CacheItem]: 缓存项，不存在或已过期时返回None
+        """
+        key_hash = self._hash_key(key)
+        try:
+            row = self._connect().execute(
+                "SELECT key, value, compressed, expire_at, accessed_at "
+                "FROM entries WHERE key_hash = ?",
+                (key_hash,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read cache: {e}")
+            return None
+            
+        if row is None or row[0] != key:
+            return None
+            
+        stored_key, data, compressed, expire_at, accessed_at = row
+        now = time.time()
+        if expire_at is not None and now > expire_at:
+            self.remove(key)
+            return None
+            
+        try:
+            value = CacheItem.deserialize(data, bool(compressed))
+        except Exception as e:
+            logger.error(f"Failed to read cache: {e}")
+            self.remove(key)
+            return None
+            
+        # 更新访问时间，用于LRU淘汰
+        if now - accessed_at >= self.ACCESS_RESOLUTION:
+            with self.lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE key_hash = ?",
+                        (now, key_hash)
+                    )
+                    
+        return CacheItem(value, expire_at, bool(compressed))
         
     def get(self, key: str) -> Optional[Any]:
         """获取缓存。
@@ -222,43 +323,8 @@ class DiskCache:
         Returns:
             Optional[Any]: 值
         """
-        with self.lock:
-            path = self._get_path(key)
-            if not path.exists():
-                return None
-                
-            try:
-                # 读取元数据
-                meta_path = path.with_suffix('.meta')
-                if not meta_path.exists():
-                    return None
-                    
-                with meta_path.open('r') as f:
-                    meta = json.load(f)
-                    
-                # 检查是否过期
-                expire_at = meta.get('expire_at')
-                if (
-                    expire_at is not None
-                    and time.time() > expire_at
-                ):
-                    self.remove(key)
-                    return None
-                    
-                # 读取数据
-                with path.open('rb') as f:
-                    data = f.read()
-                    
-                # 反序列化
-                return CacheItem.deserialize(
-                    data,
-                    meta.get('compressed', False)
-                )
-                
-            except Exception as e:
-                logger.error(f"Failed to read cache: {e}")
-                self.remove(key)
-                return None
+        item = self.get_item(key)
+        return item.value if item is not None else None
                 
     def put(
         self,
@@ -275,42 +341,73 @@ class DiskCache:
             ttl: 过期时间(秒)，可选
             compress: 是否压缩，默认False
         """
+        try:
+            # 创建缓存项并序列化
+            now = time.time()
+            item = CacheItem(
+                value,
+                now + ttl if ttl is not None else None,
+                compress
+            )
+            data = item.serialize()
+        except Exception as e:
+            logger.error(f"Failed to write cache: {e}")
+            return
+            
+        if len(data) > self.max_bytes:
+            logger.warning(f"Cache entry too large, skipped: {key}")
+            return
+            
+        key_hash = self._hash_key(key)
         with self.lock:
             try:
-                # 创建缓存项
-                item = CacheItem(
-                    value,
-                    (
-                        time.time() + ttl
-                        if ttl is not None else None
-                    ),
-                    compress
-                )
-                
-                # 序列化数据
-                data = item.serialize()
-                
-                # 写入数据
-                path = self._get_path(key)
-                with path.open('wb') as f:
-                    f.write(data)
-                    
-                # 写入元数据
-                meta = {
-                    'key': key,
-                    'expire_at': item.expire_at,
-                    'compressed': item.compressed,
-                    'size': len(data),
-                    'created_at': time.time()
-                }
+                conn = self._connect()
+                with conn:
+                    old = conn.execute(
+                        "SELECT size FROM entries WHERE key_hash = ?", (key_hash,)
+                    ).fetchone()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(key_hash, key, value, compressed, size, expire_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key_hash, key, data, int(compress), len(data), item.expire_at, now)
+                    )
+                self._total_bytes += len(data) - (old[0] if old else 0)
                 
-                meta_path = path.with_suffix('.meta')
-                with meta_path.open('w') as f:
-                    json.dump(meta, f)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn, now)
                     
-            except Exception as e:
+            except sqlite3.Error as e:
                 logger.error(f"Failed to write cache: {e}")
-                self.remove(key)
+                
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """淘汰条目直到低于容量上限(调用方负责加锁)。
+        
+        Args:
+            conn: 数据库连接
+            now: 当前时间
+        """
+        target = int(self.max_bytes * self.EVICT_RATIO)
+        with conn:
+            # 先清理过期条目
+            conn.execute(
+                "DELETE FROM entries WHERE expire_at IS NOT NULL AND expire_at < ?",
+                (now,)
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            
+            # 再按最近访问时间淘汰
+            if total > target:
+                victims = []
+                for key_hash, size in conn.execute(
+                    "SELECT key_hash, size FROM entries ORDER BY accessed_at"
+                ):
+                    if total <= target:
+                        break
+                    victims.append((key_hash,))
+                    total -= size
+                conn.executemany("DELETE FROM entries WHERE key_hash = ?", victims)
+        self._total_bytes = total
                 
     def remove(self, key: str):
         """删除缓存。
@@ -318,25 +415,37 @@ class DiskCache:
         Args:
             key: 键
         """
+        key_hash = self._hash_key(key)
         with self.lock:
-            path = self._get_path(key)
-            meta_path = path.with_suffix('.meta')
-            
-            if path.exists():
-                path.unlink()
-            if meta_path.exists():
-                meta_path.unlink()
+            conn = self._connect()
+            with conn:
+                row = conn.execute(
+                    "SELECT size FROM entries WHERE key_hash = ?", (key_hash,)
+                ).fetchone()
+                if row:
+                    conn.execute("DELETE FROM entries WHERE key_hash = ?", (key_hash,))
+                    self._total_bytes -= row[0]
                 
     def clear(self):
         """清空缓存。"""
         with self.lock:
-            for path in self.cache_dir.glob('*'):
-                path.unlink()
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+            
+    @property
+    def size(self) -> int:
+        """缓存占用的字节数。"""
+        return self._total_bytes
                 
     def __contains__(self, key: str) -> bool:
         """检查键是否存在。"""
-        with self.lock:
-            return self._get_path(key).exists()
+        row = self._connect().execute(
+            "SELECT expire_at FROM entries WHERE key_hash = ? AND key = ?",
+            (self._hash_key(key), key)
+        ).fetchone()
+        return row is not None and (row[0] is None or time.time() <= row[0])
 
 class SmartCache:
     """智能缓存。
@@ -351,21 +460,29 @@ class SmartCache:
     Attributes:
         memory_cache: 内存缓存
         disk_cache: 磁盘缓存
+        stats: 命中统计
     """
     
     def __init__(
         self,
         memory_capacity: int = 1000,
-        cache_dir: str = './cache'
+        cache_dir: str = './cache',
+        max_disk_bytes: Optional[int] = None
     ):
         """初始化缓存。
         
         Args:
             memory_capacity: 内存缓存容量，默认1000
             cache_dir: 磁盘缓存目录，默认'./cache'
+            max_disk_bytes: 磁盘缓存容量上限(字节)，可选
         """
         self.memory_cache = LRUCache(memory_capacity)
-        self.disk_cache = DiskCache(cache_dir)
+        self.disk_cache = DiskCache(cache_dir, max_disk_bytes)
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0
+        }
         
     def get(self, key: str) -> Optional[Any]:
         """获取缓存。
@@ -379,15 +496,22 @@ class SmartCache:
         # 优先从内存缓存获取
         value = self.memory_cache.get(key)
         if value is not None:
+            self.stats['memory_hits'] += 1
             return value
             
         # 从磁盘缓存获取
-        value = self.disk_cache.get(key)
-        if value is not None:
-            # 写入内存缓存
-            self.memory_cache.put(key, value)
-            return value
+        item = self.disk_cache.get_item(key)
+        if item is not None and item.value is not None:
+            # 写入内存缓存，保留剩余的过期时间
+            ttl = (
+                max(item.expire_at - time.time(), 0)
+                if item.expire_at is not None else None
+            )
+            self.memory_cache.put(key, item.value, ttl)
+            self.stats['disk_hits'] += 1
+            return item.value
             
+        self.stats['misses'] += 1
         return None
         
     def put(
@@ -425,6 +549,20 @@ class SmartCache:
         self.memory_cache.clear()
         self.disk_cache.clear()
         
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中统计。
+        
+        Returns:
+            Dict[str, Any]: 命中次数、命中率和磁盘占用
+        """
+        stats = dict(self.stats)
+        total = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (
+            (stats['memory_hits'] + stats['disk_hits']) / total if total else 0.0
+        )
+        stats['disk_bytes'] = self.disk_cache.size
+        return stats
+        
     def __contains__(self, key: str) -> bool:
         """检查键是否存在。"""
         return (
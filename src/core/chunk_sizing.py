@@ -0,0 +1,173 @@
+"""自适应块大小模块。
+
+固定的小块在高速下载时会产生大量读调用和Python层循环，CPU成为瓶颈；
+固定的大块在慢速连接上又会让每次读取等待很久，进度和取消都不及时。
+AdaptiveChunkSizer按实测带宽调整每次读取的字节数和写盘批量：
+1. 带宽升高时增大块和缓冲区，每次调整最多翻倍
+2. 单次读取耗时超过阈值时立即减半块大小
+3. 系统内存紧张时缩小缓冲区和块大小
+4. 每个传输使用独立实例，调整记录可从get_metrics获取
+"""
+
+import time
+import logging
+from typing import Dict, List, Any, Callable
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+def _memory_pressure(threshold: float = 90.0) -> bool:
+    """系统内存使用率是否超过阈值。"""
+    try:
+        return psutil.virtual_memory().percent >= threshold
+    except Exception:
+        return False
+
+
+def _round_pow2(value: float) -> int:
+    """向下取整到2的幂。"""
+    value = max(1, int(value))
+    return 1 << (value.bit_length() - 1)
+
+
+class AdaptiveChunkSizer:
+    """按带宽调整块大小和写盘批量的控制器。
+
+    Attributes:
+        chunk_size: int, 当前每次读取的字节数
+        buffer_size: int, 当前写盘批量(字节)
+        bandwidth: float, 带宽估计(字节/秒)
+        decisions: List[Dict[str, Any]], 调整记录
+    """
+
+    MIN_CHUNK_SIZE = 8 * 1024
+    MAX_CHUNK_SIZE = 1024 * 1024
+    MIN_BUFFER_SIZE = 64 * 1024
+    MAX_BUFFER_SIZE = 16 * 1024 * 1024
+    TARGET_READ_TIME = 0.01  # 每次读取约10ms的数据
+    TARGET_FLUSH_TIME = 0.25  # 约每250ms写盘一次
+    SLOW_READ_TIME = 0.5  # 单次读取超过该时间视为延迟升高
+    ADJUST_INTERVAL = 0.25
+    MAX_DECISIONS = 50
+
+    def __init__(
+        self,
+        chunk_size: int = MIN_CHUNK_SIZE,
+        buffer_size: int = 1024 * 1024,
+        smoothing: float = 0.3,
+        memory_pressure: Callable[[], bool] = _memory_pressure,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """初始化控制器。
+
+        Args:
+            chunk_size: 初始块大小
+            buffer_size: 初始写盘批量
+            smoothing: 带宽平滑系数(0-1)
+            memory_pressure: 返回True表示内存紧张
+            clock: 时钟函数
+        """
+        self.chunk_size = self._clamp(chunk_size, self.MIN_CHUNK_SIZE, self.MAX_CHUNK_SIZE)
+        self.buffer_size = self._clamp(
+            buffer_size, max(self.MIN_BUFFER_SIZE, self.chunk_size), self.MAX_BUFFER_SIZE
+        )
+        self.smoothing = smoothing
+        self.bandwidth = 0.0
+        self.decisions: List[Dict[str, Any]] = []
+        self._memory_pressure = memory_pressure
+        self._clock = clock
+        self._start = clock()
+        self._window_start = self._start
+        self._window_bytes = 0
+        self._total_bytes = 0
+        self._reads = 0
+        self._adjustments = 0
+
+    @staticmethod
+    def _clamp(value: int, low: int, high: int) -> int:
+        return max(low, min(int(value), high))
+
+    def observe(self, size: int, elapsed: float) -> None:
+        """记录一次读取。
+
+        Args:
+            size: 读取的字节数
+            elapsed: 本次读取等待的时间(秒)
+        """
+        self._reads += 1
+        self._total_bytes += size
+        self._window_bytes += size
+
+        if elapsed >= self.SLOW_READ_TIME and self.chunk_size > self.MIN_CHUNK_SIZE:
+            self._set(self.chunk_size // 2, self.buffer_size, "latency")
+            return
+
+        now = self._clock()
+        window = now - self._window_start
+        if window < self.ADJUST_INTERVAL:
+            return
+        current = self._window_bytes / window
+        if self.bandwidth:
+            self.bandwidth += self.smoothing * (current - self.bandwidth)
+        else:
+            self.bandwidth = current
+        self._window_start = now
+        self._window_bytes = 0
+        self._adjust()
+
+    def _adjust(self) -> None:
+        """按带宽估计重新计算块大小和写盘批量。"""
+        if self._memory_pressure():
+            self._set(self.chunk_size // 2, self.buffer_size // 2, "memory")
+            return
+
+        chunk = _round_pow2(self.bandwidth * self.TARGET_READ_TIME)
+        # 增大时每次最多翻倍，避免单次测量偏高导致跳变
+        chunk = min(chunk, self.chunk_size * 2)
+        buffer = _round_pow2(self.bandwidth * self.TARGET_FLUSH_TIME)
+        buffer = min(buffer, self.buffer_size * 2)
+        self._set(chunk, buffer, "bandwidth")
+
+    def _set(self, chunk_size: int, buffer_size: int, reason: str) -> None:
+        """应用新的大小并记录变化。"""
+        chunk_size = self._clamp(chunk_size, self.MIN_CHUNK_SIZE, self.MAX_CHUNK_SIZE)
+        buffer_size = self._clamp(
+            buffer_size, max(self.MIN_BUFFER_SIZE, chunk_size), self.MAX_BUFFER_SIZE
+        )
+        if chunk_size == self.chunk_size and buffer_size == self.buffer_size:
+            return
+        self._adjustments += 1
+        self.decisions.append({
+            'time': round(self._clock() - self._start, 3),
+            'reason': reason,
+            'chunk_size': chunk_size,
+            'buffer_size': buffer_size,
+            'bandwidth': round(self.bandwidth),
+        })
+        if len(self.decisions) > self.MAX_DECISIONS:
+            del self.decisions[0]
+        logger.debug(
+            f"调整块大小({reason}): chunk {self.chunk_size} -> {chunk_size}, "
+            f"buffer {self.buffer_size} -> {buffer_size}"
+        )
+        self.chunk_size = chunk_size
+        self.buffer_size = buffer_size
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """获取调整统计。
+
+        Returns:
+            Dict[str, Any]: 当前大小、带宽估计、读取次数和调整记录
+        """
+        return {
+            'chunk_size': self.chunk_size,
+            'buffer_size': self.buffer_size,
+            'bandwidth': self.bandwidth,
+            'bytes': self._total_bytes,
+            'reads': self._reads,
+            'avg_read_size': self._total_bytes / self._reads if self._reads else 0,
+            'adjustments': self._adjustments,
+            'decisions': list(self.decisions),
+        }
@@ -0,0 +1,301 @@
+"""自适应并发控制模块。
+
+固定的并发数很难适配不同站点和代理：太小浪费带宽，太大会被限流。
+AIMDController按主机测量有效吞吐、429/5xx比例和响应延迟，用加性增、乘性减调整并发上限：
+1. 每个统计窗口结束时，若并发已用满且吞吐比历史最好值明显提高，上限加1
+2. 收到429/503或请求超时时立即按系数缩小上限，每个窗口最多缩小一次
+3. 窗口内5xx比例过高或延迟远高于基线时，同样缩小上限
+
+调用方用acquire等待主机有空闲并发(或用begin直接计入在途)，收到响应头时调用observe
+报告状态码和延迟，传输完成后调用release。包括响应体传输在内的整个请求都计入在途数，
+同一主机的所有调用方共享一个在途计数。传输数据时调用add_bytes累计吞吐，用limit读取当前上限。
+"""
+
+import time
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# 表示服务器正在限流的状态码
+THROTTLE_STATUS = (429, 503)
+
+
+class _HostState:
+    """单个主机的控制状态。"""
+
+    def __init__(self, limit: float, now: float):
+        self.limit = limit
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.window_start = now
+        self.window_bytes = 0
+        self.window_requests = 0
+        self.window_errors = 0
+        self.window_latency = 0.0
+        self.best_goodput = 0.0
+        self.goodput = 0.0
+        self.base_latency: Optional[float] = None
+        self.last_decrease = float('-inf')
+        self.increases = 0
+        self.decreases = 0
+
+
+class AIMDController:
+    """按主机的加性增、乘性减并发控制器。
+
+    线程安全。
+
+    Attributes:
+        min_limit: int, 并发上限的下限
+        max_limit: int, 并发上限的上限
+        initial_limit: int, 新主机的初始上限
+        increase_step: float, 每次增加的并发数
+        decrease_factor: float, 缩小时乘以的系数
+        interval: float, 统计窗口长度(秒)
+    """
+
+    MIN_GAIN = 0.05  # 吞吐至少提高5%才继续增加并发
+    GOODPUT_DECAY = 0.9  # 每个窗口历史最好吞吐的衰减，使网络变化后能重新探测
+    MAX_ERROR_RATE = 0.2
+    MIN_ERROR_SAMPLES = 3
+    LATENCY_FACTOR = 3.0  # 平均延迟超过基线的倍数视为拥塞
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        initial_limit: int = 4,
+        increase_step: float = 1.0,
+        decrease_factor: float = 0.5,
+        interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """初始化控制器。
+
+        Args:
+            min_limit: 并发上限的下限
+            max_limit: 并发上限的上限
+            initial_limit: 新主机的初始上限
+            increase_step: 每次增加的并发数
+            decrease_factor: 缩小时乘以的系数
+            interval: 统计窗口长度(秒)
+            clock: 时钟函数，测试时可替换
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.initial_limit = initial_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.interval = interval
+        self._clock = clock
+        self._hosts: Dict[str, _HostState] = {}
+        # 条件变量同时作为可重入锁，释放并发或上限提高时唤醒acquire
+        self._lock = threading.Condition()
+
+    def _state(self, key: str, initial: Optional[int] = None) -> _HostState:
+        """获取主机状态，不存在时创建(调用方持有锁)。"""
+        state = self._hosts.get(key)
+        if state is None:
+            limit = initial if initial is not None else self.initial_limit
+            limit = min(self.max_limit, max(self.min_limit, limit))
+            state = self._hosts[key] = _HostState(float(limit), self._clock())
+        return state
+
+    def limit(self, key: str, initial: Optional[int] = None) -> int:
+        """获取主机当前的并发上限。
+
+        Args:
+            key: 主机分组键
+            initial: 主机首次出现时使用的初始上限，默认为initial_limit
+
+        Returns:
+            int: 并发上限
+        """
+        with self._lock:
+            state = self._state(key, initial)
+            self._maybe_evaluate(key, state)
+            return int(state.limit)
+
+    def acquire(
+        self,
+        key: str,
+        initial: Optional[int] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> bool:
+        """等待主机的在途请求数低于上限，然后计入一个在途请求。
+
+        Args:
+            key: 主机分组键
+            initial: 主机首次出现时使用的初始上限
+            cancel: 设置后停止等待
+
+        Returns:
+            bool: 是否获得并发，被cancel中止时为False
+        """
+        with self._lock:
+            state = self._state(key, initial)
+            while True:
+                self._maybe_evaluate(key, state)
+                if state.inflight < int(state.limit):
+                    break
+                if cancel is not None and cancel.is_set():
+                    return False
+                # 定期醒来重新评估窗口，上限可能随时间变化
+                self._lock.wait(min(self.interval, 0.1))
+            state.inflight += 1
+            state.peak_inflight = max(state.peak_inflight, state.inflight)
+            return True
+
+    def begin(self, key: str) -> None:
+        """不等待地计入一个在途请求，由调用方自行限制并发。
+
+        Args:
+            key: 主机分组键
+        """
+        with self._lock:
+            state = self._state(key)
+            state.inflight += 1
+            state.peak_inflight = max(state.peak_inflight, state.inflight)
+
+    def release(self, key: str) -> None:
+        """记录一个在途请求结束(包括响应体传输)。
+
+        Args:
+            key: 主机分组键
+        """
+        with self._lock:
+            state = self._state(key)
+            state.inflight = max(0, state.inflight - 1)
+            self._lock.notify_all()
+
+    def end(self, key: str, status: Optional[int], latency: float) -> None:
+        """记录请求的响应并结束该请求，等同于observe后release。
+
+        Args:
+            key: 主机分组键
+            status: HTTP状态码，超时或连接失败时为None
+            latency: 从发出请求到收到响应头的时间(秒)
+        """
+        with self._lock:
+            self.observe(key, status, latency)
+            self.release(key)
+
+    def observe(self, key: str, status: Optional[int], latency: float) -> None:
+        """记录请求的状态码和响应延迟，不改变在途数。
+
+        Args:
+            key: 主机分组键
+            status: HTTP状态码，超时或连接失败时为None
+            latency: 从发出请求到收到响应头的时间(秒)
+        """
+        with self._lock:
+            state = self._state(key)
+            state.window_requests += 1
+            if status is None or status in THROTTLE_STATUS:
+                self._decrease(key, state, "timeout" if status is None else f"status {status}")
+            elif status >= 500:
+                state.window_errors += 1
+            else:
+                state.window_latency += latency
+            self._maybe_evaluate(key, state)
+
+    def add_bytes(self, key: str, size: int) -> None:
+        """累计有效传输的字节数。
+
+        Args:
+            key: 主机分组键
+            size: 字节数
+        """
+        with self._lock:
+            state = self._state(key)
+            state.window_bytes += size
+            self._maybe_evaluate(key, state)
+
+    def _decrease(self, key: str, state: _HostState, reason: str) -> None:
+        """乘性缩小上限，每个窗口最多一次。"""
+        now = self._clock()
+        if now - state.last_decrease < self.interval:
+            return
+        state.last_decrease = now
+        new_limit = max(float(self.min_limit), state.limit * self.decrease_factor)
+        if int(new_limit) != int(state.limit):
+            logger.info(f"降低并发({key}, {reason}): {int(state.limit)} -> {int(new_limit)}")
+        state.limit = new_limit
+        state.decreases += 1
+        # 限流后以降低后的吞吐为新的比较基准
+        state.best_goodput = 0.0
+
+    def _maybe_evaluate(self, key: str, state: _HostState) -> None:
+        """窗口结束时根据吞吐、错误率和延迟调整上限。"""
+        now = self._clock()
+        elapsed = now - state.window_start
+        if elapsed < self.interval:
+            return
+
+        goodput = state.window_bytes / elapsed
+        successes = state.window_requests - state.window_errors
+        latency = state.window_latency / successes if successes > 0 else None
+        error_rate = (
+            state.window_errors / state.window_requests
+            if state.window_requests >= self.MIN_ERROR_SAMPLES else 0.0
+        )
+        saturated = state.peak_inflight >= int(state.limit)
+
+        if error_rate > self.MAX_ERROR_RATE:
+            self._decrease(key, state, f"error rate {error_rate:.0%}")
+        elif (
+            latency is not None
+            and state.base_latency is not None
+            and latency > state.base_latency * self.LATENCY_FACTOR
+        ):
+            self._decrease(key, state, f"latency {latency:.2f}s")
+        elif (
+            saturated
+            and goodput > 0
+            and goodput >= state.best_goodput * (1 + self.MIN_GAIN)
+            and state.limit < self.max_limit
+        ):
+            state.limit = min(float(self.max_limit), state.limit + self.increase_step)
+            state.increases += 1
+            self._lock.notify_all()
+            logger.debug(f"提高并发({key}): {int(state.limit)}")
+
+        if latency is not None:
+            # 基线取最低延迟并缓慢上浮，链路本身变慢后不会一直判定为拥塞
+            state.base_latency = (
+                latency if state.base_latency is None
+                else min(state.base_latency * 1.1, latency)
+            )
+        state.best_goodput = max(state.best_goodput * self.GOODPUT_DECAY, goodput)
+        state.goodput = goodput
+        state.window_start = now
+        state.window_bytes = 0
+        state.window_requests = 0
+        state.window_errors = 0
+        state.window_latency = 0.0
+        state.peak_inflight = state.inflight
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取每个主机的控制状态。
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 主机分组键到上限、在途数、吞吐和调整次数的映射
+        """
+        with self._lock:
+            return {
+                key: {
+                    'limit': int(state.limit),
+                    'inflight': state.inflight,
+                    'goodput': state.goodput,
+                    'base_latency': state.base_latency,
+                    'increases': state.increases,
+                    'decreases': state.decreases,
+                }
+                for key, state in self._hosts.items()
+            }
+
+
+# 全局并发控制器，所有调度器和分片下载器共享各主机的测量结果
+concurrency_controller = AIMDController()
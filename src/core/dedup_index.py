@@ -0,0 +1,341 @@
+"""去重索引模块。
+
+持久化记录媒体文件的大小、采样哈希和完整哈希，按内容识别重复文件。
+
+查找重复文件时逐级过滤：
+1. 只有大小相同的文件才计算采样哈希(文件首尾各64KB)
+2. 只有大小和采样哈希都相同的文件才在线程池中计算完整哈希
+
+索引根据 mtime/inode 增量更新，未变化的文件不会重新读取。
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Iterable, Tuple, Union
+
+from .hashing import hash_file
+
+logger = logging.getLogger(__name__)
+
+# 索引文件名，保存在被索引的目录下
+INDEX_FILENAME = ".dedup_index.db"
+
+# 采样哈希读取文件首尾的字节数
+SAMPLE_SIZE = 64 * 1024
+
+# 默认参与去重的媒体文件扩展名
+MEDIA_EXTENSIONS = ('.mp4', '.ts', '.m4a', '.mp3', '.jpg', '.jpeg', '.png', '.gif')
+
+
+def sample_hash(path: Union[str, Path], size: int) -> str:
+    """计算文件的采样哈希。
+
+    Args:
+        path: 文件路径
+        size: 文件大小
+
+    Returns:
+        str: 文件大小与首尾数据的哈希值
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(size).encode())
+    with open(path, 'rb') as f:
+        if size <= SAMPLE_SIZE * 2:
+            h.update(f.read())
+        else:
+            h.update(f.read(SAMPLE_SIZE))
+            f.seek(size - SAMPLE_SIZE)
+            h.update(f.read(SAMPLE_SIZE))
+    return h.hexdigest()
+
+
+class DedupIndex:
+    """持久化去重索引。
+
+    线程安全，完整哈希使用MD5，与下载时流式计算的摘要一致。
+
+    Attributes:
+        db_path: Path, 索引数据库路径
+        max_workers: int, 计算哈希的线程数
+    """
+
+    def __init__(self, db_path: Union[str, Path], max_workers: Optional[int] = None):
+        """初始化索引。
+
+        Args:
+            db_path: 索引数据库路径
+            max_workers: 计算哈希的线程数，默认为CPU核数(最多4)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """初始化数据库表。"""
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    sample_hash TEXT,
+                    full_hash TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_size ON files (size)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_full_hash ON files (full_hash)")
+
+    @staticmethod
+    def _normalize(path: Union[str, Path]) -> str:
+        """统一路径格式。"""
+        return os.path.abspath(str(path))
+
+    def _refresh(self, path: str, st: os.stat_result) -> None:
+        """根据文件状态更新索引项(调用方负责加锁和提交)。
+
+        文件大小、mtime或inode变化时清空已缓存的哈希。
+        """
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, inode FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row == (st.st_size, st.st_mtime_ns, st.st_ino):
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, inode) VALUES (?, ?, ?, ?)",
+            (path, st.st_size, st.st_mtime_ns, st.st_ino)
+        )
+
+    def add(self, path: Union[str, Path], full_hash: Optional[str] = None) -> None:
+        """登记文件，可同时写入已知的完整哈希。
+
+        Args:
+            path: 文件路径
+            full_hash: 下载时计算的MD5，可选
+        """
+        path = self._normalize(path)
+        st = os.stat(path)
+        with self._lock, self._conn:
+            self._refresh(path, st)
+            if full_hash:
+                self._conn.execute(
+                    "UPDATE files SET full_hash = ? WHERE path = ?", (full_hash, path)
+                )
+
+    def remove(self, path: Union[str, Path]) -> None:
+        """从索引中移除文件。
+
+        Args:
+            path: 文件路径
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (self._normalize(path),))
+
+    def _walk(
+        self,
+        directory: str,
+        extensions: Tuple[str, ...],
+        recursive: bool
+    ) -> Iterable[Tuple[str, os.stat_result]]:
+        """遍历目录中的媒体文件。"""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive:
+                                    stack.append(entry.path)
+                            elif entry.is_file() and entry.name.lower().endswith(extensions):
+                                yield entry.path, entry.stat()
+                        except OSError as e:
+                            logger.warning(f"读取文件信息失败: {entry.path} - {e}")
+            except OSError as e:
+                logger.warning(f"读取目录失败: {current} - {e}")
+
+    def scan(
+        self,
+        directory: Union[str, Path],
+        extensions: Tuple[str, ...] = MEDIA_EXTENSIONS,
+        recursive: bool = True
+    ) -> List[str]:
+        """增量扫描目录并更新索引。
+
+        只读取文件元数据，不读取文件内容；已删除的文件会从索引中移除。
+
+        Args:
+            directory: 目录路径
+            extensions: 参与去重的扩展名
+            recursive: 是否递归子目录
+
+        Returns:
+            List[str]: 扫描到的文件路径
+        """
+        directory = self._normalize(directory)
+        paths = []
+        with self._lock, self._conn:
+            for path, st in self._walk(directory, tuple(extensions), recursive):
+                self._refresh(path, st)
+                paths.append(path)
+
+            # 清理目录下已不存在的索引项
+            seen = set(paths)
+            prefix = directory.rstrip(os.sep) + os.sep
+            stale = [
+                (path,) for (path,) in self._conn.execute(
+                    "SELECT path FROM files WHERE substr(path, 1, ?) = ?",
+                    (len(prefix), prefix)
+                )
+                if path not in seen and (recursive or os.path.dirname(path) == directory)
+            ]
+            self._conn.executemany("DELETE FROM files WHERE path = ?", stale)
+        return paths
+
+    def _fill_hashes(self, rows: List[Tuple[str, int]], column: str) -> Dict[str, Optional[str]]:
+        """在线程池中计算缺失的哈希并写回索引。
+
+        Args:
+            rows: (路径, 大小)列表
+            column: sample_hash 或 full_hash
+
+        Returns:
+            Dict[str, Optional[str]]: 路径到哈希值的映射，读取失败时为None
+        """
+        def compute(item: Tuple[str, int]) -> Optional[str]:
+            path, size = item
+            try:
+                if column == 'sample_hash':
+                    return sample_hash(path, size)
+                return hash_file(path, fast=False)['md5']
+            except OSError as e:
+                logger.warning(f"计算文件哈希失败: {path} - {e}")
+                return None
+
+        if not rows:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            values = dict(zip((path for path, _ in rows), executor.map(compute, rows)))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"UPDATE files SET {column} = ? WHERE path = ?",
+                [(value, path) for path, value in values.items() if value]
+            )
+        return values
+
+    def find_duplicates(self, paths: Optional[Iterable[Union[str, Path]]] = None) -> List[List[str]]:
+        """查找内容相同的文件。
+
+        Args:
+            paths: 限定查找范围的文件路径，默认为索引中的全部文件
+
+        Returns:
+            List[List[str]]: 重复文件分组，每组按修改时间排序，第一个为最早的文件
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, sample_hash, full_hash FROM files"
+            ).fetchall()
+        if paths is not None:
+            wanted = {self._normalize(p) for p in paths}
+            rows = [row for row in rows if row[0] in wanted]
+
+        # 第一级：按大小分组
+        by_size: Dict[int, List[tuple]] = defaultdict(list)
+        for row in rows:
+            by_size[row[1]].append(row)
+        candidates = [row for group in by_size.values() if len(group) > 1 for row in group]
+
+        # 第二级：大小相同时比较采样哈希
+        samples = self._fill_hashes(
+            [(row[0], row[1]) for row in candidates if not row[3]], 'sample_hash'
+        )
+        by_sample: Dict[Tuple[int, str], List[tuple]] = defaultdict(list)
+        for row in candidates:
+            sample = row[3] or samples.get(row[0])
+            if sample:
+                by_sample[(row[1], sample)].append(row)
+        candidates = [row for group in by_sample.values() if len(group) > 1 for row in group]
+
+        # 第三级：采样哈希也相同时才计算完整哈希
+        fulls = self._fill_hashes(
+            [(row[0], row[1]) for row in candidates if not row[4]], 'full_hash'
+        )
+        by_full: Dict[str, List[tuple]] = defaultdict(list)
+        for row in candidates:
+            full = row[4] or fulls.get(row[0])
+            if full:
+                by_full[full].append(row)
+
+        return [
+            [row[0] for row in sorted(group, key=lambda r: (r[2], r[0]))]
+            for group in by_full.values() if len(group) > 1
+        ]
+
+    def lookup(self, full_hash: str, exclude: Optional[Union[str, Path]] = None) -> Optional[str]:
+        """按完整哈希查找已存在的文件。
+
+        Args:
+            full_hash: MD5哈希值
+            exclude: 排除的文件路径(通常是文件自身)
+
+        Returns:
+            Optional[str]: 内容相同的文件路径，不存在时返回None
+        """
+        exclude = self._normalize(exclude) if exclude else None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE full_hash = ?", (full_hash,)
+            ).fetchall()
+            for path, size, mtime_ns in rows:
+                if path == exclude:
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    st = None
+                if st and (st.st_size, st.st_mtime_ns) == (size, mtime_ns):
+                    return path
+                # 文件已删除或被修改，索引项失效
+                with self._conn:
+                    self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        return None
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[str, DedupIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_dedup_index(directory: Union[str, Path]) -> DedupIndex:
+    """获取目录对应的去重索引，同一目录共享一个实例。
+
+    Args:
+        directory: 媒体库目录
+
+    Returns:
+        DedupIndex: 去重索引
+    """
+    key = os.path.abspath(str(directory))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = DedupIndex(Path(key) / INDEX_FILENAME)
+            _indexes[key] = index
+        return index
@@ -11,8 +11,8 @@ from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlparse
 import threading
-from queue import Queue, PriorityQueue
 import hashlib
 import hmac
 from concurrent.futures import ThreadPoolExecutor
@@ -23,6 +23,13 @@ from .exceptions import DownloadError, NetworkError, AuthError
 from .cache import Cache
 from .cookie_manager import CookieManager
 from .task import DownloadTask
+from .resume import ResumeManifest, part_path_for, manifest_path_for
+from .hashing import StreamingHasher
+from .speed_limiter import bandwidth_shaper
+from .task_queue import DurableTaskQueue, PAUSED
+from .host_queue import FairHostQueue, host_key
+from .concurrency import AIMDController
+from .session_registry import session_registry
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +61,7 @@ class DownloadTask:
         remaining_time: 剩余时间
         status: 状态
         error: 错误信息
+        digest: 下载完成后的文件摘要
     """
     
     id: str
@@ -82,6 +90,7 @@ class DownloadTask:
     
     status: str = "pending"  # pending, downloading, paused, completed, failed
     error: Optional[str] = None
+    digest: Optional[Dict[str, Any]] = None
 
 class DownloadScheduler(QObject):
     """下载调度器。
@@ -92,6 +101,9 @@ class DownloadScheduler(QObject):
     3. 内存使用优化
     4. 缓存管理
     5. 安全性控制
+    6. 指定queue_path时排队任务持久化，重启后带着进度恢复
+    7. 按主机限制并发，同一优先级内在主机之间轮流分派
+    8. 指定并发控制器时，每个主机的并发上限随吞吐和限流情况自动调整
     
     Signals:
         task_added: 任务添加信号
@@ -100,6 +112,9 @@ class DownloadScheduler(QObject):
         stats_updated: 统计信息更新信号
     """
     
+    # 元数据响应的缓存时间(秒)
+    CACHE_TTL = 3600
+    
     # 定义信号
     task_added = Signal(object)
     task_removed = Signal(object)
@@ -113,7 +128,11 @@ class DownloadScheduler(QObject):
         default_timeout: int = 30,
         cache_dir: Optional[Path] = None,
         cookie_manager: Optional[CookieManager] = None,
-        secret_key: Optional[str] = None
+        secret_key: Optional[str] = None,
+        queue_path: Optional[Path] = None,
+        host_limits: Optional[Dict[str, int]] = None,
+        default_host_limit: Optional[int] = None,
+        concurrency_controller: Optional[AIMDController] = None
     ):
         """初始化下载调度器。
         
@@ -124,6 +143,10 @@ class DownloadScheduler(QObject):
             cache_dir: 缓存目录
             cookie_manager: Cookie管理器
             secret_key: 签名密钥
+            queue_path: 持久化任务队列的数据库路径，None表示不持久化
+            host_limits: 每个主机或域名后缀的最大并发数，例如 {"twimg.com": 2}
+            default_host_limit: 未单独配置的主机的最大并发数，None表示不限制
+            concurrency_controller: 自适应并发控制器，与配置的主机上限取较小值
         """
         super().__init__()
         
@@ -134,9 +157,16 @@ class DownloadScheduler(QObject):
         # 任务列表
         self.tasks = []
         
-        # 任务队列
-        self._task_queue = PriorityQueue()
+        # 任务队列，同优先级内按主机轮流出队，同一主机先进先出
+        self.host_limits = dict(host_limits or {})
+        self.default_host_limit = default_host_limit
+        self._task_queue = FairHostQueue()
+        self._dispatch_lock = threading.Lock()
         self._active_tasks: Dict[str, DownloadTask] = {}
+        self._active_hosts: Dict[str, int] = {}
+        self._task_hosts: Dict[str, str] = {}
+        self._paused_tasks: Dict[str, DownloadTask] = {}
+        self.controller = concurrency_controller
         self._completed_tasks: Dict[str, DownloadTask] = {}
         self._failed_tasks: Dict[str, DownloadTask] = {}
         
@@ -144,11 +174,17 @@ class DownloadScheduler(QObject):
         self._thread_pool = ThreadPoolExecutor(max_workers=max_concurrent)
         
         # 缓存管理器
-        self.cache = Cache(cache_dir) if cache_dir else None
+        self.cache = Cache(cache_dir=str(cache_dir)) if cache_dir else None
+        
+        # 持久化任务队列
+        self._queue = DurableTaskQueue(queue_path) if queue_path else None
         
         # Cookie管理器
         self.cookie_manager = cookie_manager
         
+        # 全局带宽整形器
+        self.shaper = bandwidth_shaper
+        
         # 签名密钥
         self._secret_key = secret_key.encode() if secret_key else None
         
@@ -169,149 +205,441 @@ class DownloadScheduler(QObject):
         
         # 启动调度器
         self._start()
+        self._restore_tasks()
         
     def _start(self):
-        """启动调度器。"""
+        """启动调度器。
+        
+        调度由事件驱动：任务添加、完成、恢复或并发数调整时立即填满空闲槽位，
+        不再使用轮询线程。
+        """
         self._running = True
-        threading.Thread(target=self._schedule_loop, daemon=True).start()
-        threading.Thread(target=self._stats_loop, daemon=True).start()
+        self.stats['start_time'] = time.time()
+        
+    def _restore_tasks(self):
+        """从持久化队列恢复上次未完成的任务，中断的任务从记录的进度续传。"""
+        if not self._queue:
+            return
+        restored = self._queue.recover(include_paused=True)
+        for item in restored:
+            payload = dict(item.payload)
+            payload['save_path'] = Path(payload['save_path'])
+            task = DownloadTask(**payload)
+            task.total_size = item.progress.get('total_size', 0)
+            task.downloaded_size = item.progress.get('downloaded_size', 0)
+            if item.state == PAUSED:
+                # 用户暂停的任务保持暂停，恢复后才重新排队
+                task.status = "paused"
+                self.tasks.append(task)
+                with self._dispatch_lock:
+                    self._paused_tasks[task.id] = task
+                self.stats['total_tasks'] += 1
+                self.task_added.emit(task)
+            else:
+                self._enqueue(task)
+        if restored:
+            logger.info(f"恢复 {len(restored)} 个未完成的任务")
+            self._dispatch()
+            
+    @staticmethod
+    def _task_payload(task: DownloadTask) -> Dict[str, Any]:
+        """提取任务中可持久化的参数，回调函数不保存。"""
+        return {
+            'id': task.id,
+            'url': task.url,
+            'save_path': str(task.save_path),
+            'priority': task.priority,
+            'speed_limit': task.speed_limit,
+            'chunk_size': task.chunk_size,
+            'buffer_size': task.buffer_size,
+            'retries': task.retries,
+            'timeout': task.timeout,
+            'headers': task.headers,
+            'cookies': task.cookies,
+        }
         
-    def _schedule_loop(self):
-        """调度循环。"""
-        while self._running:
-            if not self._paused and len(self._active_tasks) < self.max_concurrent:
-                try:
-                    # 获取优先级最高的任务
-                    priority, task = self._task_queue.get_nowait()
-                    
-                    # 提交任务
-                    self._thread_pool.submit(self._download_task, task)
-                    
-                    # 更新状态
-                    self._active_tasks[task.id] = task
-                    self.stats['active_tasks'] = len(self._active_tasks)
+    @staticmethod
+    def _task_progress(task: DownloadTask) -> Dict[str, Any]:
+        """任务的进度记录。"""
+        return {
+            'total_size': task.total_size,
+            'downloaded_size': task.downloaded_size,
+        }
+        
+    def _enqueue(self, task: DownloadTask):
+        """把任务放入内存队列并登记。"""
+        self.tasks.append(task)
+        with self._dispatch_lock:
+            self._task_queue.put(task, task.priority, self._host_key(task.url))
+        self.stats['total_tasks'] += 1
+        self.task_added.emit(task)
+        
+    def _dispatch(self):
+        """将排队任务分派到所有空闲槽位，并推送最新统计信息。"""
+        dispatched = []
+        with self._dispatch_lock:
+            while (
+                self._running
+                and not self._paused
+                and len(self._active_tasks) < self.max_concurrent
+            ):
+                # 获取优先级最高、主机还有空闲并发的任务
+                entry = self._task_queue.pop(self._host_has_slot)
+                if entry is None:
+                    break
+                task, key = entry
+                if task.status == "cancelled":
+                    if self._queue:
+                        self._queue.remove(task.id)
+                    continue
+                if task.status == "paused":
+                    # 排队时被暂停，等待恢复
+                    self._paused_tasks[task.id] = task
+                    if self._queue:
+                        self._queue.release(task.id, self._task_progress(task), paused=True)
+                    continue
                     
-                except Exception:
-                    pass
+                # 更新状态
+                self._active_tasks[task.id] = task
+                self._active_hosts[key] = self._active_hosts.get(key, 0) + 1
+                self._task_hosts[task.id] = key
+                if self.controller is not None:
+                    # 整个传输期间都计入控制器的在途数，而不只是等待响应头的时间
+                    self.controller.begin(key)
+                dispatched.append(task)
+                if self._queue:
+                    self._queue.lease(task.id)
+                
+            # 提交任务
+            for task in dispatched:
+                self._thread_pool.submit(self._download_task, task)
+                
+        self._refresh_stats()
+        
+    def _host_key(self, url: str) -> str:
+        """URL的主机分组键，配置了上限或权重的域名后缀合并计数。"""
+        return host_key(url, set(self.host_limits) | set(self._task_queue.weights))
+        
+    def _host_limit(self, key: str) -> Optional[int]:
+        """主机的并发上限，None表示不限制。"""
+        limit = self.host_limits.get(key, self.default_host_limit)
+        if self.controller is not None:
+            adaptive = self.controller.limit(key)
+            limit = adaptive if limit is None else min(limit, adaptive)
+        return limit
+        
+    def _host_has_slot(self, key: str) -> bool:
+        """主机是否还有空闲并发(调用方持有分派锁)。"""
+        limit = self._host_limit(key)
+        return limit is None or self._active_hosts.get(key, 0) < limit
+        
+    def _release_host(self, task: DownloadTask):
+        """任务结束后释放其占用的主机并发和全局槽位。"""
+        with self._dispatch_lock:
+            self._active_tasks.pop(task.id, None)
+            key = self._task_hosts.pop(task.id, None)
+            if key is not None:
+                self._active_hosts[key] -= 1
+                if not self._active_hosts[key]:
+                    del self._active_hosts[key]
+                if self.controller is not None:
+                    self.controller.release(key)
                     
-            time.sleep(0.1)
-            
-    def _stats_loop(self):
-        """统计循环。"""
-        while self._running:
-            # 更新统计信息
-            total_speed = 0
-            for task in self._active_tasks.values():
-                total_speed += task.current_speed
+    def _suspend(self, task: DownloadTask):
+        """中断的任务按状态进入暂停表，暂停后已被恢复的任务重新排队。"""
+        with self._dispatch_lock:
+            paused = task.status == "paused"
+            if paused:
+                self._paused_tasks[task.id] = task
+            elif self._running:
+                self._task_queue.put(task, task.priority, self._host_key(task.url))
+            if self._queue:
+                # 停止调度器时任务回到队列，下次启动继续
+                self._queue.release(task.id, self._task_progress(task), paused=paused)
                 
-            self.stats['current_speed'] = total_speed
-            self.stats['average_speed'] = (
-                self.stats['total_downloaded'] /
-                (time.time() - self.stats['start_time'])
-                if self.stats.get('start_time') else 0
-            )
+    def _find_task(self, task_id: str) -> Optional[DownloadTask]:
+        """按ID查找进行中、暂停或排队的任务(调用方持有分派锁)。"""
+        task = self._active_tasks.get(task_id) or self._paused_tasks.get(task_id)
+        if task is None:
+            task = next((t for t in self.tasks if t.id == task_id), None)
+        return task
+        
+    def _resume(self, task: DownloadTask):
+        """恢复暂停的任务(调用方持有分派锁)。
+        
+        已停止的任务重新排队；还没来得及停下或仍在排队的任务只恢复状态。
+        """
+        if self._paused_tasks.pop(task.id, None) is not None:
+            task.status = "pending"
+            self._task_queue.put(task, task.priority, self._host_key(task.url))
+            if self._queue:
+                self._queue.release(task.id, self._task_progress(task))
+        elif task.status == "paused":
+            task.status = "downloading" if task.id in self._active_tasks else "pending"
             
-            time.sleep(1)
+    def get_host_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取每个主机的排队数、进行中任务数和并发上限。
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: 主机分组键到统计信息的映射
+        """
+        with self._dispatch_lock:
+            depth = self._task_queue.depth_by_key()
+            active = dict(self._active_hosts)
+        return {
+            key: {
+                'queued': depth.get(key, 0),
+                'active': active.get(key, 0),
+                'limit': self._host_limit(key),
+            }
+            for key in sorted(set(depth) | set(active))
+        }
+            
+    def _refresh_stats(self):
+        """重新计算统计信息并推送。"""
+        self.stats['active_tasks'] = len(self._active_tasks)
+        self.stats['queued_tasks'] = self._task_queue.qsize()
+        self.stats['hosts'] = self.get_host_stats()
+        self.stats['current_speed'] = sum(
+            task.current_speed for task in list(self._active_tasks.values())
+        )
+        elapsed = time.time() - self.stats['start_time'] if self.stats.get('start_time') else 0
+        self.stats['average_speed'] = (
+            self.stats['total_downloaded'] / elapsed if elapsed > 0 else 0
+        )
+        self.update_stats()
             
     def _download_task(self, task: DownloadTask):
         """下载任务。
         
+        数据写入 ``.part`` 临时文件并维护续传清单，暂停、失败或重启后
+        再次调度时通过 Range/If-Range 只请求缺失的字节。
+        
         Args:
             task: 下载任务
         """
+        manifest = None
+        suspended = False
         try:
-            # 更新任务状态
-            task.status = "downloading"
+            # 更新任务状态，分派后立即被暂停的任务在第一个数据块前停下
+            if task.status != "paused":
+                task.status = "downloading"
             task.started_at = datetime.now()
             
             # 创建保存目录
             task.save_path.parent.mkdir(parents=True, exist_ok=True)
+            part_path = part_path_for(task.save_path)
             
-            # 获取文件大小
-            response = self._make_request(task.url, method="HEAD")
-            task.total_size = int(response.headers.get('content-length', 0))
+            # 注册任务级限速
+            groups = (urlparse(task.url).hostname or "",)
+            self.shaper.set_task_limit(task.id, task.speed_limit)
             
-            # 下载文件
-            with open(task.save_path, 'wb') as f:
+            # 检查是否可以续传
+            headers = dict(task.headers or {})
+            offset = 0
+            manifest = ResumeManifest.load(manifest_path_for(task.save_path))
+            if (
+                manifest
+                and manifest.url == task.url
+                and manifest.validator
+                and part_path.exists()
+            ):
+                missing = manifest.missing_ranges()
+                offset = missing[0][0] if missing else manifest.total_size
+                headers.update({
+                    'Range': f"bytes={offset}-",
+                    'If-Range': manifest.validator,
+                    'Accept-Encoding': 'identity'
+                })
+            else:
+                manifest = None
+                
+            if manifest and offset >= manifest.total_size:
+                response = None
+            else:
                 response = self._make_request(
                     task.url,
+                    headers=headers,
+                    cookies=task.cookies,
                     stream=True,
-                    chunk_size=task.chunk_size
+                    timeout=task.timeout
                 )
                 
+            if manifest and (response is None or response.status_code == 206):
+                # 服务器确认文件未变化，从断点继续
+                task.total_size = manifest.total_size
+                task.downloaded_size = offset
+                mode = 'r+b'
+            else:
+                offset = 0
+                mode = 'wb'
+                task.total_size = int(response.headers.get('content-length', 0))
+                task.downloaded_size = 0
+                manifest = None
+                if (
+                    task.total_size > 0
+                    and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                ):
+                    manifest = ResumeManifest.from_headers(
+                        manifest_path_for(task.save_path),
+                        task.url,
+                        task.total_size,
+                        response.headers
+                    )
+                    if manifest.validator is None:
+                        manifest = None
+                        
+            # 边下载边计算摘要，续传时先补算已有部分
+            hasher = StreamingHasher()
+            if offset:
+                hasher.update_from_file(part_path, offset)
+                
+            interrupted = False
+            with open(part_path, mode) as f:
+                f.seek(offset)
+                position = offset
+                checkpoint = offset
+                
                 start_time = time.time()
                 chunk_start_time = start_time
                 chunk_downloaded = 0
                 
-                for chunk in response.iter_content(chunk_size=task.chunk_size):
-                    if not self._running or task.status == "paused":
-                        break
-                        
-                    if chunk:
-                        # 写入数据
-                        f.write(chunk)
-                        f.flush()
-                        
-                        # 更新下载进度
-                        chunk_size = len(chunk)
-                        task.downloaded_size += chunk_size
-                        chunk_downloaded += chunk_size
-                        
-                        # 计算速度和剩余时间
-                        now = time.time()
-                        elapsed = now - chunk_start_time
-                        if elapsed >= 1:
-                            task.current_speed = int(chunk_downloaded / elapsed)
-                            if task.total_size > 0:
-                                remaining_bytes = task.total_size - task.downloaded_size
-                                task.remaining_time = timedelta(
-                                    seconds=int(remaining_bytes / task.current_speed)
-                                )
-                            chunk_start_time = now
-                            chunk_downloaded = 0
+                try:
+                    for chunk in (response.iter_content(chunk_size=task.chunk_size) if response else ()):
+                        if not self._running or task.status in ("paused", "cancelled"):
+                            interrupted = True
+                            break
                             
-                        # 速度限制
-                        if task.speed_limit:
-                            required_time = chunk_size / task.speed_limit
-                            actual_time = time.time() - start_time
-                            if actual_time < required_time:
-                                time.sleep(required_time - actual_time)
-                                
-                        # 回调进度
-                        if task.progress_callback:
-                            task.progress_callback({
-                                'task_id': task.id,
-                                'total_size': task.total_size,
-                                'downloaded_size': task.downloaded_size,
-                                'progress': (
-                                    task.downloaded_size / task.total_size
-                                    if task.total_size > 0 else 0
-                                ),
-                                'current_speed': task.current_speed,
-                                'average_speed': task.average_speed,
-                                'remaining_time': task.remaining_time
-                            })
+                        if chunk:
+                            # 写入数据
+                            f.write(chunk)
+                            hasher.update(chunk)
                             
+                            # 更新下载进度
+                            chunk_size = len(chunk)
+                            position += chunk_size
+                            task.downloaded_size += chunk_size
+                            chunk_downloaded += chunk_size
+                            self.stats['total_downloaded'] += chunk_size
+                            if self.controller is not None:
+                                self.controller.add_bytes(self._task_hosts[task.id], chunk_size)
+                            
+                            # 定期登记已落盘的范围
+                            if manifest and position - checkpoint >= task.buffer_size:
+                                f.flush()
+                                manifest.mark_completed(offset, position - 1)
+                                manifest.save()
+                                checkpoint = position
+                            
+                            # 计算速度和剩余时间
+                            now = time.time()
+                            elapsed = now - chunk_start_time
+                            if elapsed >= 1:
+                                task.current_speed = int(chunk_downloaded / elapsed)
+                                if self.controller is not None:
+                                    # 控制器可能提高了上限，顺便补充槽位
+                                    self._dispatch()
+                                else:
+                                    self._refresh_stats()
+                                if self._queue:
+                                    self._queue.heartbeat(task.id, self._task_progress(task))
+                                if task.total_size > 0:
+                                    remaining_bytes = task.total_size - task.downloaded_size
+                                    task.remaining_time = timedelta(
+                                        seconds=int(remaining_bytes / task.current_speed)
+                                    )
+                                chunk_start_time = now
+                                chunk_downloaded = 0
+                                
+                            # 速度限制（全局/主机/任务三级共享整形）
+                            self.shaper.consume(chunk_size, task_id=task.id, groups=groups)
+                                    
+                            # 回调进度
+                            if task.progress_callback:
+                                task.progress_callback({
+                                    'task_id': task.id,
+                                    'total_size': task.total_size,
+                                    'downloaded_size': task.downloaded_size,
+                                    'progress': (
+                                        task.downloaded_size / task.total_size
+                                        if task.total_size > 0 else 0
+                                    ),
+                                    'current_speed': task.current_speed,
+                                    'average_speed': task.average_speed,
+                                    'remaining_time': task.remaining_time
+                                })
+                finally:
+                    if manifest and position > checkpoint:
+                        f.flush()
+                        manifest.mark_completed(offset, position - 1)
+                        
+            if interrupted:
+                if task.status == "cancelled":
+                    # 取消时清理临时文件
+                    part_path.unlink(missing_ok=True)
+                    if manifest:
+                        manifest.delete()
+                        manifest = None
+                    if self._queue:
+                        self._queue.remove(task.id)
+                else:
+                    if manifest:
+                        # 保留临时文件和清单，恢复时续传
+                        manifest.save()
+                    suspended = True
+                return
+                
             # 完成下载
+            os.replace(part_path, task.save_path)
+            if manifest:
+                manifest.delete()
+                manifest = None
+            task.digest = hasher.result()
             task.status = "completed"
             task.finished_at = datetime.now()
             self._completed_tasks[task.id] = task
             self.stats['completed_tasks'] += 1
+            if self._queue:
+                self._queue.complete(task.id)
             
         except Exception as e:
             # 处理错误
+            if manifest:
+                try:
+                    manifest.save()
+                except Exception:
+                    pass
             task.status = "failed"
             task.error = str(e)
             self._failed_tasks[task.id] = task
             self.stats['failed_tasks'] += 1
+            if self._queue:
+                self._queue.fail(task.id, task.error)
             logger.error(f"下载失败: {e}")
             
         finally:
-            # 清理任务
-            if task.id in self._active_tasks:
-                del self._active_tasks[task.id]
-            self.stats['active_tasks'] = len(self._active_tasks)
+            # 清理任务，并立即用排队任务填补空出的槽位
+            self.shaper.remove_task(task.id)
+            self._release_host(task)
+            if suspended:
+                self._suspend(task)
+            task.current_speed = 0
+            self._dispatch()
             
+    @staticmethod
+    def _create_session():
+        """创建调度器的共享会话。
+        
+        适配器层不重试，429和5xx直接交给任务重试和并发控制器处理。
+        """
+        import requests
+        
+        session = requests.Session()
+        adapter = session_registry.make_adapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+        
     def _make_request(
         self,
         url: str,
@@ -343,20 +671,33 @@ class DownloadScheduler(QObject):
                 'X-Signature': signature
             })
             
-        # 检查缓存
-        if self.cache and method == "GET":
+        # 检查缓存（流式响应不缓存）
+        use_cache = self.cache and method == "GET" and not kwargs.get('stream')
+        if use_cache:
             cached = self.cache.get(url)
             if cached:
-                return cached
+                return self._response_from_cache(url, cached)
                 
+        # 向并发控制器报告状态码和响应延迟，在途数由分派和任务结束维护
+        key = self._host_key(url) if self.controller is not None else None
+        status = None
+        started = time.monotonic()
+            
         try:
-            # 发送请求
-            response = requests.request(method, url, **kwargs)
+            # 发送请求，复用注册表中的长连接
+            session = session_registry.get("scheduler", factory=self._create_session)
+            response = session.request(method, url, **kwargs)
+            status = response.status_code
             response.raise_for_status()
             
-            # 缓存响应
-            if self.cache and method == "GET":
-                self.cache.set(url, response)
+            # 缓存响应内容，不缓存持有连接的响应对象
+            if use_cache:
+                self.cache.put(url, {
+                    'status_code': response.status_code,
+                    'headers': dict(response.headers),
+                    'encoding': response.encoding,
+                    'content': response.content
+                }, ttl=self.CACHE_TTL)
                 
             return response
             
@@ -367,7 +708,32 @@ class DownloadScheduler(QObject):
                 elif e.response.status_code == 403:
                     raise AuthError("无权访问")
             raise NetworkError(f"网络请求失败: {e}")
+        finally:
+            if key is not None:
+                self.controller.observe(key, status, time.monotonic() - started)
             
+    @staticmethod
+    def _response_from_cache(url: str, cached: Dict[str, Any]) -> Any:
+        """用缓存的状态码、响应头和内容重建响应对象。
+        
+        Args:
+            url: 请求URL
+            cached: 缓存的响应内容
+            
+        Returns:
+            Any: 响应对象
+        """
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        
+        response = requests.Response()
+        response.url = url
+        response.status_code = cached['status_code']
+        response.headers = CaseInsensitiveDict(cached['headers'])
+        response.encoding = cached['encoding']
+        response._content = cached['content']
+        return response
+        
     def _sign_request(self, url: str, timestamp: str) -> str:
         """签名请求。
         
@@ -396,8 +762,10 @@ class DownloadScheduler(QObject):
         Args:
             task: 下载任务
         """
-        self.tasks.append(task)
-        self.task_added.emit(task)
+        if self._queue:
+            self._queue.put(task.id, self._task_payload(task), task.priority)
+        self._enqueue(task)
+        self._dispatch()
         
     def remove_task(self, task: DownloadTask):
         """移除下载任务。
@@ -427,11 +795,14 @@ class DownloadScheduler(QObject):
         Args:
             task_id: 任务ID
         """
-        if task_id in self._active_tasks:
-            self._active_tasks[task_id].status = "paused"
+        with self._dispatch_lock:
+            task = self._find_task(task_id)
+            if task is None or task.status in ("completed", "failed", "cancelled"):
+                return
+            task.status = "paused"
             
         # 发送信号
-        self.task_updated.emit(self._active_tasks[task_id])
+        self.task_updated.emit(task)
             
     def resume_task(self, task_id: str):
         """恢复任务。
@@ -439,11 +810,15 @@ class DownloadScheduler(QObject):
         Args:
             task_id: 任务ID
         """
-        if task_id in self._active_tasks:
-            self._active_tasks[task_id].status = "downloading"
+        with self._dispatch_lock:
+            task = self._find_task(task_id)
+            if task is None:
+                return
+            self._resume(task)
             
         # 发送信号
-        self.task_updated.emit(self._active_tasks[task_id])
+        self.task_updated.emit(task)
+        self._dispatch()
             
     def cancel_task(self, task_id: str):
         """取消任务。
@@ -468,6 +843,7 @@ class DownloadScheduler(QObject):
         """
         return (
             self._active_tasks.get(task_id) or
+            self._paused_tasks.get(task_id) or
             self._completed_tasks.get(task_id) or
             self._failed_tasks.get(task_id)
         )
@@ -493,18 +869,23 @@ class DownloadScheduler(QObject):
     def resume_all(self):
         """恢复所有任务。"""
         self._paused = False
-        for task in self._active_tasks.values():
-            if task.status == "paused":
-                task.status = "downloading"
+        with self._dispatch_lock:
+            resumed = [task for task in self.tasks if task.status == "paused"]
+            for task in resumed:
+                self._resume(task)
                 
         # 发送信号
-        for task in self._active_tasks.values():
+        for task in resumed:
             self.task_updated.emit(task)
+            
+        self._dispatch()
                 
     def stop(self):
         """停止调度器。"""
         self._running = False
         self._thread_pool.shutdown(wait=True)
+        if self._queue:
+            self._queue.close()
         
     def set_config(self, config: Dict[str, Any]):
         """设置调度器配置。
@@ -512,17 +893,40 @@ class DownloadScheduler(QObject):
         Args:
             config: 配置字典，支持以下选项：
                 - max_concurrent: 最大并发数
-                - speed_limit: 速度限制(字节/秒)
+                - speed_limit: 单任务速度限制(字节/秒)
+                - global_speed_limit: 所有任务共享的总速度限制(字节/秒)
+                - host_limits: 每个主机或域名后缀的最大并发数
+                - default_host_limit: 未单独配置的主机的最大并发数
+                - host_weights: 主机在轮询中的权重，权重为n的主机每轮最多分派n个任务
+            
+            域名后缀的分组只对之后加入的任务生效。
         """
         if 'max_concurrent' in config:
-            self.max_concurrent = config['max_concurrent']
-            # 更新线程池
-            self._thread_pool.shutdown(wait=True)
-            self._thread_pool = ThreadPoolExecutor(max_workers=self.max_concurrent)
+            with self._dispatch_lock:
+                self.max_concurrent = config['max_concurrent']
+                # 更新线程池，正在运行的任务在旧线程池中继续执行
+                old_pool = self._thread_pool
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.max_concurrent)
+            old_pool.shutdown(wait=False)
+            self._dispatch()
             
         if 'speed_limit' in config:
             for task in self._active_tasks.values():
-                task.speed_limit = config['speed_limit'] 
+                task.speed_limit = config['speed_limit']
+                self.shaper.set_task_limit(task.id, task.speed_limit)
+                
+        if 'global_speed_limit' in config:
+            self.shaper.set_global_limit(config['global_speed_limit'])
+            
+        if any(k in config for k in ('host_limits', 'default_host_limit', 'host_weights')):
+            with self._dispatch_lock:
+                if 'host_limits' in config:
+                    self.host_limits = dict(config['host_limits'] or {})
+                if 'default_host_limit' in config:
+                    self.default_host_limit = config['default_host_limit']
+                if 'host_weights' in config:
+                    self._task_queue.weights = dict(config['host_weights'] or {})
+            self._dispatch()
 
         # 发送信号
         self.stats_updated.emit(self.get_stats()) 
\ No newline at end of file
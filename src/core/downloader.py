@@ -8,6 +8,7 @@
 支持线程安全的日志记录和文件操作。
 """
 
+import io
 import os
 import time
 import json
@@ -15,21 +16,33 @@ import logging
 import threading
 import hashlib
 import asyncio
+import weakref
 from typing import Optional, Dict, Any, Callable, Union, List, Set
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
 import requests
 import aiohttp
-from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
+from requests.packages.urllib3.exceptions import (
+    DecodeError, ProtocolError, ReadTimeoutError, SSLError
+)
 import yt_dlp
 from urllib.parse import urlparse
 
 from .exceptions import DownloadCanceled, DownloadError
+from .hashing import StreamingHasher, hash_file
+from .dedup_index import DedupIndex, get_dedup_index, MEDIA_EXTENSIONS
+from .resume import ResumeManifest, part_path_for, manifest_path_for
+from .speed_limiter import bandwidth_shaper
+from .session_registry import session_registry
+from .async_transfer import transfer_engine, TransferDeferred
+from .progress import ProgressReporter
+from .chunk_sizing import AdaptiveChunkSizer
+from .file_writer import PositionalWriter, StagingBuffer
 from src.utils.cookie_manager import CookieManager
 
 # 配置日志
@@ -63,6 +76,8 @@ class DownloadTask:
         total_size: int, 总大小
         speed: float, 下载速度
         retry_count: int, 重试次数
+        digest: Optional[Dict[str, Any]], 下载完成后的文件摘要
+        chunk_metrics: List[Dict[str, Any]], 异步传输的块大小调整统计
     """
     url: str
     save_path: Optional[Path]
@@ -75,6 +90,8 @@ class DownloadTask:
     total_size: int = 0
     speed: float = 0.0
     retry_count: int = 0
+    digest: Optional[Dict[str, Any]] = None
+    chunk_metrics: List[Dict[str, Any]] = field(default_factory=list)
 
 class DownloadScheduler:
     """下载调度器。
@@ -90,7 +107,7 @@ class DownloadScheduler:
         semaphore: asyncio.Semaphore, 并发控制信号量
         session: aiohttp.ClientSession, 异步HTTP会话
         event_loop: asyncio.AbstractEventLoop, 事件循环
-        thread_pool: ThreadPoolExecutor, 线程池
+        thread_pool: ThreadPoolExecutor, 不支持异步传输的下载器使用的线程池
     """
     
     def __init__(
@@ -115,6 +132,10 @@ class DownloadScheduler:
         self.session: Optional[aiohttp.ClientSession] = None
         self.event_loop: Optional[asyncio.AbstractEventLoop] = None
         self.thread_pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        # 同步下载流程使用下载器自身的进度和统计状态，同一下载器的同步任务逐个执行
+        self._sync_locks: "weakref.WeakKeyDictionary[BaseDownloader, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
         self._shutdown = False
         
         # 创建事件循环
@@ -229,6 +250,11 @@ class DownloadScheduler:
     async def _do_download(self, task: DownloadTask, downloader: 'BaseDownloader'):
         """执行实际的下载操作。
         
+        使用基类下载流程的下载器直接在事件循环上异步传输，进度回调按任务传入，
+        同一下载器上的大量任务不共享进度状态。
+        重写了download的插件(如基于yt-dlp的插件)仍在线程池中执行，
+        它们的进度保存在下载器上，同一下载器的同步任务逐个执行。
+        
         Args:
             task: 下载任务
             downloader: 下载器实例
@@ -236,8 +262,10 @@ class DownloadScheduler:
         Raises:
             Exception: 下载失败
         """
-        # 创建进度回调
-        async def progress_callback(progress: float, status: str):
+        original_callback = downloader.progress_callback
+        
+        # 创建进度回调，下载器同步调用
+        def progress_callback(progress: float, status: str):
             task.progress = progress
             if 'speed' in status:
                 try:
@@ -245,17 +273,39 @@ class DownloadScheduler:
                     task.speed = self._parse_speed(speed_str)
                 except:
                     pass
-                    
-        # 设置下载器回调
-        downloader.progress_callback = progress_callback
-        
-        # 在线程池中执行同步下载
-        await self.event_loop.run_in_executor(
-            self.thread_pool,
-            downloader.download,
-            task.url,
-            task.save_path
-        )
+            if original_callback:
+                original_callback(progress, status)
+                
+        deferred = False
+        if downloader.supports_async_transfer:
+            try:
+                await downloader.download_async(
+                    task.url,
+                    task.save_path,
+                    on_progress=progress_callback,
+                    chunk_metrics=task.chunk_metrics
+                )
+            except TransferDeferred:
+                # 需要分段下载或续传，改走同步路径
+                deferred = True
+        if deferred or not downloader.supports_async_transfer:
+            lock = self._sync_locks.get(downloader)
+            if lock is None:
+                lock = self._sync_locks[downloader] = asyncio.Lock()
+            async with lock:
+                downloader.progress_callback = progress_callback
+                try:
+                    # 在线程池中执行同步下载
+                    await asyncio.get_running_loop().run_in_executor(
+                        self.thread_pool,
+                        downloader.download,
+                        task.url,
+                        task.save_path
+                    )
+                finally:
+                    downloader.progress_callback = original_callback
+        if task.save_path:
+            task.digest = downloader.file_digests.get(str(task.save_path))
         
     def _parse_speed(self, speed_str: str) -> float:
         """解析速度字符串。
@@ -339,8 +389,10 @@ class BaseDownloader:
         yt_dlp_opts: Dict[str, Any], yt-dlp配置选项
         config: Any, 下载器配置
         speed_limit: Optional[float], 下载速度限制(字节/秒)
+        shaper: BandwidthShaper, 全局带宽整形器
         chunk_size: int, 下载块大小(字节)
         buffer_size: int, 写入缓冲区大小(字节)
+        max_segments: int, 分段下载的最大连接数
         scheduler: Optional[DownloadScheduler], 下载调度器
     """
     
@@ -396,7 +448,11 @@ class BaseDownloader:
     # 默认配置
     DEFAULT_CHUNK_SIZE = 8192  # 8KB
     DEFAULT_BUFFER_SIZE = 1024 * 1024  # 1MB
-    LARGE_FILE_THRESHOLD = 100 * 1024 * 1024  # 100MB
+    DEFAULT_MAX_SEGMENTS = 4
+    DROP_CACHE_THRESHOLD = 1024 * 1024 * 1024  # 超过1GB的文件写完的区域不占页缓存，None表示从不释放
+    PROGRESS_INTERVAL = 0.1  # 进度最多每秒通知10次
+    PROGRESS_STEP = None  # 按进度步长采样，例如0.01表示每1%通知一次
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024  # 每个分段至少4MB
 
     def __init__(
         self,
@@ -411,7 +467,8 @@ class BaseDownloader:
         speed_limit: Optional[float] = None,
         chunk_size: Optional[int] = None,
         buffer_size: Optional[int] = None,
-        max_concurrency: int = 3
+        max_concurrency: int = 3,
+        max_segments: Optional[int] = None
     ):
         """初始化下载器。
         
@@ -428,6 +485,7 @@ class BaseDownloader:
             chunk_size: 下载块大小(字节)，None使用默认值
             buffer_size: 写入缓冲区大小(字节)，None使用默认值
             max_concurrency: 最大并发数，默认3
+            max_segments: 分段下载的最大连接数，None使用默认值，1表示禁用分段
         """
         self.platform = platform
         self.save_dir = Path(save_dir)
@@ -440,13 +498,25 @@ class BaseDownloader:
         self.speed_limit = speed_limit
         self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
         self.buffer_size = buffer_size or self.DEFAULT_BUFFER_SIZE
+        self.max_segments = max_segments or self.DEFAULT_MAX_SEGMENTS
         self._download_start_time = 0
         self._downloaded_size = 0
-        self._download_speeds = []
-        self._speed_window_size = 10
-        self._last_progress_time = 0
         self._current_file = ""
-        self._buffer = bytearray()
+        # 逐块报告的进度先采样，再格式化和回调
+        self._progress = ProgressReporter(
+            self._emit_progress,
+            interval=self.PROGRESS_INTERVAL,
+            step=self.PROGRESS_STEP
+        )
+        self.file_digests: Dict[str, Dict[str, Any]] = {}
+        # 最近一次下载每个连接的块大小调整统计
+        self.chunk_metrics: List[Dict[str, Any]] = []
+        
+        # 共享的带宽整形器，本下载器的限速作为任务级上限
+        self.shaper = bandwidth_shaper
+        self._shaper_key = f"{platform}:{id(self)}"
+        self._shaper_groups = (platform,)
+        self.shaper.set_task_limit(self._shaper_key, speed_limit)
         
         # 初始化Cookie管理器
         self.cookie_manager = cookie_manager or CookieManager()
@@ -455,8 +525,13 @@ class BaseDownloader:
         with file_lock:
             self.save_dir.mkdir(parents=True, exist_ok=True)
         
-        # 创建会话
-        self.session = self._create_session()
+        # 获取共享会话，同一平台和代理的下载器复用连接池和Cookie
+        self.session = session_registry.get(
+            platform,
+            proxy,
+            factory=self._create_session,
+            cookies=self.cookie_manager.get_cookies(platform)
+        )
         
         # 记录初始化信息
         with log_lock:
@@ -464,7 +539,8 @@ class BaseDownloader:
                 f"初始化下载器: platform={platform}, save_dir={save_dir}, "
                 f"proxy={proxy}, cookies={bool(self.cookie_manager.get_cookies(platform))}, "
                 f"speed_limit={speed_limit if speed_limit else '无限制'}, "
-                f"chunk_size={self.chunk_size}, buffer_size={self.buffer_size}"
+                f"chunk_size={self.chunk_size}, buffer_size={self.buffer_size}, "
+                f"max_segments={self.max_segments}"
             )
             
         # 设置yt-dlp配置
@@ -494,13 +570,8 @@ class BaseDownloader:
             remove_headers_on_redirect=["authorization"]  # 重定向时移除认证头
         )
         
-        # 创建适配器
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=20,  # 增加连接池大小
-            pool_maxsize=20,
-            pool_block=False
-        )
+        # 创建适配器，每个主机的连接数受注册表限制
+        adapter = session_registry.make_adapter(retry_strategy)
         
         # 配置适配器
         session.mount("http://", adapter)
@@ -626,8 +697,9 @@ class BaseDownloader:
         if self.progress_callback:
             self.progress_callback(progress, status)
             
-        with log_lock:
-            logger.debug(f"下载进度: {progress*100:.1f}% - {status}")
+        if logger.isEnabledFor(logging.DEBUG):
+            with log_lock:
+                logger.debug(f"下载进度: {progress*100:.1f}% - {status}")
             
     def _setup_yt_dlp(self):
         """设置yt-dlp下载器配置。"""
@@ -729,27 +801,25 @@ class BaseDownloader:
             seconds = seconds % 60
             return f"{hours}时{minutes}分{seconds}秒"
             
-    def _calculate_speed(self, chunk_size: int) -> float:
-        """计算当前下载速度。
+    def _emit_progress(self, downloaded: int, total_size: int, speed: float) -> None:
+        """进度采样后通知回调，没有回调也不输出调试日志时不格式化状态。
         
         Args:
-            chunk_size: 当前块大小(字节)
-            
-        Returns:
-            float: 当前下载速度(字节/秒)
+            downloaded: 已下载大小(字节)
+            total_size: 总大小(字节)
+            speed: 下载速度(字节/秒)
         """
-        current_time = time.time()
-        if self._last_progress_time > 0:
-            time_diff = current_time - self._last_progress_time
-            if time_diff > 0:
-                speed = chunk_size / time_diff
-                self._download_speeds.append(speed)
-                # 保持窗口大小
-                if len(self._download_speeds) > self._speed_window_size:
-                    self._download_speeds.pop(0)
-                    
-        self._last_progress_time = current_time
-        return sum(self._download_speeds) / len(self._download_speeds) if self._download_speeds else 0
+        if not total_size:
+            return
+        if not self.progress_callback and not logger.isEnabledFor(logging.DEBUG):
+            return
+        status = self._format_progress_status(
+            downloaded,
+            total_size,
+            speed,
+            str(self._current_file)
+        )
+        self.update_progress(downloaded / total_size, status)
         
     def _format_progress_status(
         self,
@@ -987,63 +1057,590 @@ class BaseDownloader:
     def _download_stream(
         self,
         response: requests.Response,
-        file_obj: Any,
-        total_size: int
-    ) -> None:
+        writer: PositionalWriter,
+        total_size: int,
+        checkpoint: Optional[Callable[[int], None]] = None,
+        hasher: Optional[StreamingHasher] = None
+    ) -> int:
         """流式下载数据。
         
+        数据先累积在从缓冲区池借用的缓冲区中，攒满后按偏移写入文件。
+        
         Args:
             response: 响应对象
-            file_obj: 文件对象
+            writer: 目标文件
             total_size: 总大小
+            checkpoint: 缓冲区落盘后的回调，参数为已写入磁盘的字节数
+            hasher: 流式哈希计算器，接收数据时同步更新摘要
+            
+        Returns:
+            int: 写入的字节数
             
         Raises:
             DownloadError: 下载失败
             DownloadCanceled: 下载被取消
         """
         downloaded = 0
-        self._buffer = bytearray()
+        sizer = self._new_chunk_sizer()
+        staging = StagingBuffer(writer, 0, sizer.buffer_size)
         
+        def flush_buffer() -> None:
+            staging.flush(resize=sizer.buffer_size)
+            if checkpoint:
+                checkpoint(staging.position)
+                
         try:
-            for chunk in response.iter_content(chunk_size=self.chunk_size):
+            for chunk in self._iter_chunks(response, sizer):
                 # 检查是否取消
                 self.check_canceled()
                 
                 if chunk:
                     # 添加到缓冲区
-                    self._buffer.extend(chunk)
+                    staging.append(chunk)
                     downloaded += len(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
                     
                     # 如果缓冲区达到阈值，写入文件
-                    if len(self._buffer) >= self.buffer_size:
-                        file_obj.write(self._buffer)
-                        self._buffer.clear()
+                    if staging.filled >= sizer.buffer_size:
+                        flush_buffer()
                     
                     # 应用速度限制
                     self._apply_speed_limit(len(chunk))
                     
-                    # 计算下载速度和更新进度
-                    speed = self._calculate_speed(len(chunk))
-                    if total_size:
-                        progress = downloaded / total_size
-                        status = self._format_progress_status(
-                            downloaded,
-                            total_size,
-                            speed,
-                            str(self._current_file)
-                        )
-                        self.update_progress(progress, status)
+                    # 更新进度(采样后才通知回调)
+                    self._progress.update(downloaded, total_size)
             
             # 写入剩余的缓冲区数据
-            if self._buffer:
-                file_obj.write(self._buffer)
-                self._buffer.clear()
+            if staging.filled:
+                flush_buffer()
+            return staging.position
                 
         except Exception as e:
-            # 清空缓冲区
-            self._buffer.clear()
+            # 尽量保留已接收的数据，便于续传
+            if checkpoint and staging.filled:
+                try:
+                    flush_buffer()
+                except Exception:
+                    pass
             raise e
+        finally:
+            staging.close()
+            self.chunk_metrics.append(sizer.get_metrics())
+            
+    def _open_writer(
+        self,
+        path: Path,
+        total_size: int,
+        truncate: bool = False
+    ) -> PositionalWriter:
+        """打开按偏移写入的目标文件，已知大小时预分配空间。
+        
+        Args:
+            path: 文件路径
+            total_size: 文件总大小(字节)，0表示未知
+            truncate: 是否清空已有内容
+            
+        Returns:
+            PositionalWriter: 目标文件
+        """
+        drop_cache = (
+            self.DROP_CACHE_THRESHOLD is not None
+            and total_size >= self.DROP_CACHE_THRESHOLD
+        )
+        writer = PositionalWriter(path, truncate=truncate, drop_cache=drop_cache)
+        try:
+            writer.preallocate(total_size)
+        except BaseException:
+            writer.close()
+            raise
+        return writer
+        
+    def _new_chunk_sizer(self) -> AdaptiveChunkSizer:
+        """为一次传输创建块大小控制器，初始值为下载器配置的大小。"""
+        return AdaptiveChunkSizer(self.chunk_size, self.buffer_size)
+        
+    def _iter_chunks(
+        self,
+        response: requests.Response,
+        sizer: AdaptiveChunkSizer
+    ):
+        """按控制器给出的块大小读取响应体。
+        
+        iter_content的块大小在开始迭代后无法改变，因此直接从底层连接读取，
+        并把urllib3的异常转换为与iter_content相同的requests异常。
+        
+        Args:
+            response: 流式响应
+            sizer: 块大小控制器
+            
+        Yields:
+            bytes: 数据块
+        """
+        raw = getattr(response, 'raw', None)
+        if isinstance(raw, io.IOBase):
+            def read() -> bytes:
+                try:
+                    return raw.read(sizer.chunk_size, decode_content=True)
+                except ProtocolError as e:
+                    raise requests.exceptions.ChunkedEncodingError(e)
+                except DecodeError as e:
+                    raise requests.exceptions.ContentDecodingError(e)
+                except ReadTimeoutError as e:
+                    raise requests.exceptions.ConnectionError(e)
+                except SSLError as e:
+                    raise requests.exceptions.SSLError(e)
+        else:
+            # 没有底层连接的响应只能按固定块大小读取
+            chunks = response.iter_content(chunk_size=sizer.chunk_size)
+            
+            def read() -> bytes:
+                return next(chunks, b"")
+                
+        while True:
+            started = time.monotonic()
+            chunk = read()
+            if not chunk:
+                break
+            sizer.observe(len(chunk), time.monotonic() - started)
+            yield chunk
 
+    def _get_segment_count(self, response: requests.Response, total_size: int) -> int:
+        """根据响应头判断是否可以分段下载，并计算分段数。
+        
+        服务器必须声明 ``Accept-Ranges: bytes``，且响应未经过内容编码
+        （压缩后的 content-length 与实际字节偏移不一致）。
+        
+        Args:
+            response: 首次请求的响应对象，requests和aiohttp的响应均可
+            total_size: 文件总大小(字节)
+            
+        Returns:
+            int: 分段数，小于2表示使用单连接下载
+        """
+        if self.max_segments <= 1 or not self._supports_ranges(response, total_size):
+            return 1
+        return min(self.max_segments, total_size // self.MIN_SEGMENT_SIZE)
+        
+    @staticmethod
+    def _supports_ranges(response: requests.Response, total_size: int) -> bool:
+        """判断响应是否支持按字节范围请求。
+        
+        Args:
+            response: 响应对象
+            total_size: 文件总大小(字节)
+            
+        Returns:
+            bool: 是否支持Range请求
+        """
+        if total_size <= 0:
+            return False
+        if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+            return False
+        return response.headers.get('Content-Encoding', 'identity').lower() in ('', 'identity')
+        
+    @staticmethod
+    def _split_range(start: int, end: int, count: int) -> List[tuple]:
+        """将一个字节范围平均切分。
+        
+        Args:
+            start: 起始偏移
+            end: 结束偏移(包含)
+            count: 分段数
+            
+        Returns:
+            List[tuple]: (起始偏移, 结束偏移) 列表，结束偏移包含在内
+        """
+        size = end - start + 1
+        segment_size = size // count
+        ranges = []
+        for i in range(count):
+            seg_start = start + i * segment_size
+            seg_end = end if i == count - 1 else seg_start + segment_size - 1
+            ranges.append((seg_start, seg_end))
+        return ranges
+        
+    @classmethod
+    def _split_ranges(cls, total_size: int, count: int) -> List[tuple]:
+        """将文件按字节范围平均切分。
+        
+        Args:
+            total_size: 文件总大小(字节)
+            count: 分段数
+            
+        Returns:
+            List[tuple]: (起始偏移, 结束偏移) 列表，结束偏移包含在内
+        """
+        return cls._split_range(0, total_size - 1, count)
+        
+    def _split_missing_ranges(self, missing: List[tuple]) -> List[tuple]:
+        """将续传时缺失的字节范围切分为下载分段。
+        
+        Args:
+            missing: 缺失范围列表
+            
+        Returns:
+            List[tuple]: 下载分段列表
+        """
+        ranges = []
+        for start, end in missing:
+            count = max(1, min(self.max_segments, (end - start + 1) // self.MIN_SEGMENT_SIZE))
+            ranges.extend(self._split_range(start, end, count))
+        return ranges
+        
+    def _download_segment(
+        self,
+        url: str,
+        writer: PositionalWriter,
+        start: int,
+        end: int,
+        on_chunk: Callable[[int], None],
+        abort_event: threading.Event,
+        headers: Dict[str, str],
+        manifest: Optional[ResumeManifest] = None,
+        **kwargs
+    ) -> int:
+        """下载单个字节范围并写入文件对应偏移。
+        
+        Args:
+            url: 下载地址
+            writer: 已预分配的目标文件，各分段共用
+            start: 起始偏移
+            end: 结束偏移(包含)
+            on_chunk: 每写入一块数据后的回调，参数为块大小
+            abort_event: 其他分段失败时置位，用于提前终止
+            headers: 附加请求头
+            manifest: 续传清单，用于登记已落盘的字节范围
+            **kwargs: 传递给 session.get 的其他参数
+            
+        Returns:
+            int: 写入的字节数
+            
+        Raises:
+            DownloadError: 服务器未返回206或数据不完整
+            DownloadCanceled: 下载被取消
+        """
+        expected = end - start + 1
+        segment_headers = dict(headers)
+        segment_headers['Range'] = f"bytes={start}-{end}"
+        segment_headers['Accept-Encoding'] = 'identity'
+        if manifest and manifest.validator:
+            segment_headers['If-Range'] = manifest.validator
+        
+        response = self.session.get(
+            url,
+            stream=True,
+            timeout=self.timeout,
+            headers=segment_headers,
+            **kwargs
+        )
+        try:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise DownloadError(f"服务器未返回分段内容: status={response.status_code}")
+                
+            written = 0
+            checkpoint = 0
+            sizer = self._new_chunk_sizer()
+            staging = StagingBuffer(writer, start, sizer.buffer_size)
+            try:
+                for chunk in self._iter_chunks(response, sizer):
+                    self.check_canceled()
+                    if abort_event.is_set():
+                        raise DownloadCanceled("分段下载已中止")
+                    if not chunk:
+                        continue
+                    # 防止服务器返回超出请求范围的数据覆盖相邻分段
+                    if written + len(chunk) > expected:
+                        chunk = chunk[:expected - written]
+                    staging.append(chunk)
+                    written += len(chunk)
+                    on_chunk(len(chunk))
+                    
+                    if staging.filled >= sizer.buffer_size:
+                        staging.flush(resize=sizer.buffer_size)
+                        # 定期登记已落盘的范围
+                        if manifest and written - checkpoint >= self.buffer_size:
+                            manifest.mark_completed(start, start + written - 1)
+                            manifest.save()
+                            checkpoint = written
+                            
+                    if written >= expected:
+                        break
+                        
+                staging.flush()
+            finally:
+                self.chunk_metrics.append(sizer.get_metrics())
+                # 出错时也写入已接收的数据，便于续传
+                if manifest and staging.filled:
+                    try:
+                        staging.flush()
+                    except OSError:
+                        pass
+                flushed = staging.position - start
+                staging.close()
+                if manifest and flushed > checkpoint:
+                    manifest.mark_completed(start, start + flushed - 1)
+                    
+            if written != expected:
+                raise DownloadError(
+                    f"分段数据不完整: bytes={start}-{end}, 已接收 {written}/{expected}"
+                )
+            return written
+        finally:
+            response.close()
+            
+    def _download_segmented(
+        self,
+        url: str,
+        save_path: Path,
+        total_size: int,
+        ranges: List[tuple],
+        manifest: Optional[ResumeManifest] = None,
+        **kwargs
+    ) -> None:
+        """多连接分段下载。
+        
+        预分配目标文件后，通过共享的会话连接池并发请求各字节范围，
+        各分段共用一个文件描述符，按偏移直接写入文件中的对应位置。
+        
+        Args:
+            url: 下载地址
+            save_path: 保存路径
+            total_size: 文件总大小(字节)
+            ranges: 需要下载的字节范围列表
+            manifest: 续传清单
+            **kwargs: 传递给 session.get 的其他参数
+            
+        Raises:
+            DownloadError: 任一分段下载失败
+            DownloadCanceled: 下载被取消
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        
+        with log_lock:
+            logger.info(f"分段下载: {url}, 大小={self._format_size(total_size)}, 分段数={len(ranges)}")
+            
+        # 预分配文件（续传时文件已存在，保留已下载内容）
+        writer = self._open_writer(save_path, total_size)
+            
+        progress_lock = threading.Lock()
+        abort_event = threading.Event()
+        downloaded = manifest.completed_size if manifest else 0
+        
+        def on_chunk(size: int) -> None:
+            nonlocal downloaded
+            delay = self._speed_limit_delay(size)
+            with progress_lock:
+                downloaded += size
+                self._progress.update(downloaded, total_size)
+            if delay > 0:
+                time.sleep(delay)
+                
+        with writer, ThreadPoolExecutor(
+            max_workers=max(1, min(len(ranges), self.max_segments)),
+            thread_name_prefix="segment"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._download_segment,
+                    url, writer, start, end,
+                    on_chunk, abort_event, headers, manifest,
+                    **kwargs
+                )
+                for start, end in ranges
+            ]
+            
+            first_error = None
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    if first_error is None:
+                        first_error = e
+                        abort_event.set()
+                        
+        if first_error is not None:
+            raise first_error
+            
+    def _load_resume_manifest(self, url: str, save_path: Path) -> Optional[ResumeManifest]:
+        """加载可用于续传的清单。
+        
+        URL不一致、缺少校验值或临时文件丢失时丢弃旧清单。
+        
+        Args:
+            url: 下载地址
+            save_path: 保存路径
+            
+        Returns:
+            Optional[ResumeManifest]: 可用的清单
+        """
+        manifest = ResumeManifest.load(manifest_path_for(save_path))
+        if manifest is None:
+            return None
+            
+        part_path = part_path_for(save_path)
+        valid = (
+            manifest.url == url
+            and manifest.validator is not None
+            and part_path.exists()
+            and (not manifest.completed or part_path.stat().st_size > manifest.completed[-1][1])
+        )
+        if not valid:
+            manifest.delete()
+            return None
+        return manifest
+        
+    def _resolve_save_path(self, url: str, save_path: Optional[Path] = None) -> Path:
+        """获取保存路径，未指定时根据URL生成。
+        
+        Args:
+            url: 下载地址
+            save_path: 保存路径
+            
+        Returns:
+            Path: 保存路径
+        """
+        if not save_path:
+            parsed_url = urlparse(url)
+            filename = os.path.basename(parsed_url.path)
+            if not filename:
+                filename = f"download_{int(time.time())}"
+            save_path = self.save_dir / self._generate_filename(filename)
+        return Path(save_path)
+        
+    @property
+    def supports_async_transfer(self) -> bool:
+        """是否可以使用异步传输引擎。
+        
+        只有沿用基类download流程的下载器才能改用异步传输，
+        重写了download的插件需要在线程池中执行。
+        """
+        return type(self).download is BaseDownloader.download
+        
+    async def download_async(
+        self,
+        url: str,
+        save_path: Optional[Path] = None,
+        headers: Optional[Dict[str, str]] = None,
+        on_progress: Optional[Callable[[float, str], None]] = None,
+        chunk_metrics: Optional[List[Dict[str, Any]]] = None
+    ) -> bool:
+        """在当前事件循环上异步下载文件。
+        
+        与download的约定相同，但网络读取不占用线程，写盘在I/O执行器中进行。
+        只做单连接下载：存在可续传的临时文件，或服务器支持Range且文件大到需要分段时，
+        抛出TransferDeferred，由调用方改用download，已有的临时文件和清单保持不变。
+        同一下载器上可以并发多个下载，进度、限速分组和块大小统计都按调用分开保存。
+        
+        Args:
+            url: 下载地址
+            save_path: 保存路径，如果不提供则自动生成
+            headers: 附加请求头
+            on_progress: 本次下载的进度回调，默认使用下载器的progress_callback
+            chunk_metrics: 追加本次块大小统计的列表，默认替换下载器的chunk_metrics
+            
+        Returns:
+            bool: 是否下载成功
+            
+        Raises:
+            TransferDeferred: 需要续传或分段下载
+            DownloadError: 下载失败
+            DownloadCanceled: 下载被取消
+        """
+        if not self._validate_url(url):
+            raise DownloadError(
+                "无效的URL",
+                "format",
+                "请检查URL格式是否正确",
+                {"URL": url}
+            )
+            
+        save_path = self._resolve_save_path(url, save_path)
+        if self._load_resume_manifest(url, save_path) is not None:
+            raise TransferDeferred(url)
+        groups = (self.platform, urlparse(url).hostname or "")
+        
+        def emit(downloaded: int, total_size: int, speed: float) -> None:
+            if not total_size:
+                return
+            callback = on_progress or self.progress_callback
+            if not callback and not logger.isEnabledFor(logging.DEBUG):
+                return
+            status = self._format_progress_status(downloaded, total_size, speed, str(save_path))
+            if on_progress:
+                on_progress(downloaded / total_size, status)
+            else:
+                self.update_progress(downloaded / total_size, status)
+                
+        progress = ProgressReporter(emit, interval=self.PROGRESS_INTERVAL, step=self.PROGRESS_STEP)
+        
+        # 沿用同步会话的请求头、Cookie和证书设置
+        request_headers = dict(self.session.headers)
+        request_headers.update(headers or {})
+        session = await session_registry.get_async(
+            self.platform,
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=self.timeout,
+                sock_read=self.timeout
+            )
+        )
+        
+        with log_lock:
+            logger.info(f"开始异步下载: {url} -> {save_path}")
+            
+        sizer = self._new_chunk_sizer()
+        try:
+            digest = await transfer_engine.download(
+                session,
+                url,
+                save_path,
+                headers=request_headers,
+                cookies=self.session.cookies.get_dict(),
+                proxy=self.proxy,
+                ssl=False if self.session.verify is False else None,
+                on_progress=progress.update,
+                sizer=sizer,
+                is_canceled=lambda: self.is_canceled,
+                throttle=lambda size: self.shaper.reserve(
+                    size, task_id=self._shaper_key, groups=groups
+                ),
+                defer=lambda response: self._get_segment_count(
+                    response, response.content_length or 0
+                ) > 1
+            )
+        except (TransferDeferred, DownloadError, DownloadCanceled):
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            with log_lock:
+                logger.error(f"下载失败: {url} -> {str(e)}")
+            raise DownloadError(
+                f"下载失败: {str(e)}",
+                "network",
+                "请检查网络连接或尝试使用代理",
+                {
+                    "URL": url,
+                    "代理设置": self.proxy or "未使用代理",
+                    "原始错误": str(e)
+                }
+            )
+        except OSError as e:
+            raise self._handle_file_error(e, save_path)
+            
+        if chunk_metrics is not None:
+            chunk_metrics.append(sizer.get_metrics())
+        else:
+            self.chunk_metrics = [sizer.get_metrics()]
+        # 更新去重索引涉及数据库写入，放到I/O执行器中
+        await asyncio.get_running_loop().run_in_executor(
+            transfer_engine.io_executor,
+            self._record_digest,
+            save_path,
+            digest
+        )
+        return True
+        
     def download(
         self,
         url: str,
@@ -1052,6 +1649,9 @@ class BaseDownloader:
     ) -> bool:
         """下载文件。
         
+        数据先写入 ``.part`` 临时文件，服务器支持Range时同时维护续传清单，
+        中断后再次调用会只请求缺失的字节。
+        
         Args:
             url: 下载地址
             save_path: 保存路径，如果不提供则自动生成
@@ -1068,8 +1668,8 @@ class BaseDownloader:
             # 重置下载统计
             self._download_start_time = time.time()
             self._downloaded_size = 0
-            self._download_speeds = []
-            self._last_progress_time = 0
+            self._progress.reset()
+            self.chunk_metrics = []
             
             # 验证URL
             if not self._validate_url(url):
@@ -1081,12 +1681,7 @@ class BaseDownloader:
                 )
                 
             # 获取保存路径
-            if not save_path:
-                parsed_url = urlparse(url)
-                filename = os.path.basename(parsed_url.path)
-                if not filename:
-                    filename = f"download_{int(time.time())}"
-                save_path = self.save_dir / self._generate_filename(filename)
+            save_path = self._resolve_save_path(url, save_path)
                 
             try:
                 # 确保目录存在
@@ -1094,6 +1689,27 @@ class BaseDownloader:
             except Exception as e:
                 raise self._handle_file_error(e, save_path)
             
+            self._shaper_groups = (self.platform, urlparse(url).hostname or "")
+            
+            part_path = part_path_for(save_path)
+            headers = dict(kwargs.pop('headers', None) or {})
+            request_headers = dict(headers)
+            
+            # 检查是否存在可续传的临时文件
+            manifest = self._load_resume_manifest(url, save_path)
+            if manifest is not None:
+                missing = manifest.missing_ranges()
+                if not missing:
+                    os.replace(part_path, save_path)
+                    manifest.delete()
+                    self._record_digest(save_path, None)
+                    return True
+                request_headers.update({
+                    'Range': f"bytes={missing[0][0]}-",
+                    'If-Range': manifest.validator,
+                    'Accept-Encoding': 'identity'
+                })
+            
             # 开始下载
             with log_lock:
                 logger.info(f"开始下载: {url} -> {save_path}")
@@ -1103,31 +1719,103 @@ class BaseDownloader:
                     url,
                     stream=True,
                     timeout=self.timeout,
+                    headers=request_headers,
                     **kwargs
                 )
                 response.raise_for_status()
             except Exception as e:
                 raise self._handle_network_error(e)
             
-            # 获取文件大小
-            total_size = int(response.headers.get('content-length', 0))
             self._current_file = str(save_path)
+            hasher: Optional[StreamingHasher] = None
             
-            # 根据文件大小调整缓冲区
-            if total_size > self.LARGE_FILE_THRESHOLD:
-                self.chunk_size = min(self.chunk_size * 2, 1024 * 1024)  # 最大1MB
-                self.buffer_size = min(self.buffer_size * 2, 10 * 1024 * 1024)  # 最大10MB
-                
-            # 下载文件
             try:
-                with open(save_path, 'wb', buffering=self.buffer_size) as f:
-                    self._download_stream(response, f, total_size)
+                if manifest is not None and response.status_code == 206:
+                    # 服务器确认文件未变化，只下载缺失的字节
+                    response.close()
+                    total_size = manifest.total_size
+                    with log_lock:
+                        logger.info(
+                            f"断点续传: {save_path}, 已完成 "
+                            f"{self._format_size(manifest.completed_size)}/{self._format_size(total_size)}"
+                        )
+                    ranges = self._split_missing_ranges(manifest.missing_ranges())
+                    self._download_segmented(
+                        url, part_path, total_size, ranges, manifest,
+                        headers=headers, **kwargs
+                    )
+                else:
+                    if manifest is not None:
+                        with log_lock:
+                            logger.info(f"远程文件已变化，重新下载: {url}")
+                        manifest.delete()
+                        
+                    # 获取文件大小
+                    total_size = int(response.headers.get('content-length', 0))
+                        
+                    # 服务器支持Range时记录续传清单
+                    manifest = None
+                    if self._supports_ranges(response, total_size):
+                        manifest = ResumeManifest.from_headers(
+                            manifest_path_for(save_path), url, total_size, response.headers
+                        )
+                        if manifest.validator is None:
+                            manifest = None
+                            
+                    # 服务器支持Range时改用多连接分段下载
+                    segment_count = self._get_segment_count(response, total_size)
+                    if segment_count > 1:
+                        response.close()
+                        if part_path.exists():
+                            part_path.unlink()
+                        self._download_segmented(
+                            url, part_path, total_size,
+                            self._split_ranges(total_size, segment_count), manifest,
+                            headers=headers, **kwargs
+                        )
+                    else:
+                        checkpoint = None
+                        if manifest is not None:
+                            def checkpoint(written: int) -> None:
+                                manifest.mark_completed(0, written - 1)
+                                manifest.save()
+                        hasher = StreamingHasher()
+                        with self._open_writer(part_path, total_size, truncate=True) as writer:
+                            written = self._download_stream(
+                                response, writer, total_size, checkpoint, hasher
+                            )
+                            # 实际数据比Content-Length短时去掉预分配的多余部分
+                            if written != total_size:
+                                writer.truncate(written)
+                            
+                # 分段和续传的数据乱序到达，没有流式摘要，不再为此重新读取整个文件
+                digest = hasher.result() if hasher is not None else None
+                
+                # 下载完成，替换为正式文件
+                os.replace(part_path, save_path)
+                if manifest is not None:
+                    manifest.delete()
+                    manifest = None
+                self._record_digest(save_path, digest)
+                    
+            except (DownloadError, DownloadCanceled):
+                raise
+            except requests.RequestException as e:
+                raise self._handle_network_error(e)
             except Exception as e:
                 raise self._handle_file_error(e, save_path)
-                
+            finally:
+                # 保存进度，下次调用时续传
+                if manifest is not None:
+                    try:
+                        manifest.save()
+                    except Exception as e:
+                        with log_lock:
+                            logger.warning(f"保存续传清单失败: {e}")
+                            
             return True
             
-        except DownloadError:
+        except (DownloadError, DownloadCanceled):
             raise
         except Exception as e:
             with log_lock:
@@ -1176,11 +1864,14 @@ class BaseDownloader:
             raise DownloadError(f"获取视频信息失败: {str(e)}")
 
     def close(self):
-        """关闭下载器。"""
-        if self.session:
-            self.session.close()
-            with log_lock:
-                logger.info("下载器已关闭")
+        """关闭下载器。
+        
+        会话由注册表持有并被同一平台的其他下载器共用，这里不关闭，
+        需要释放连接时调用 ``session_registry.close(platform)``。
+        """
+        self.shaper.remove_task(self._shaper_key)
+        with log_lock:
+            logger.info("下载器已关闭")
 
     def _validate_url(self, url: str) -> bool:
         """验证URL格式是否有效。
@@ -1194,13 +1885,39 @@ class BaseDownloader:
         # TODO: 实现URL验证逻辑
         return True 
 
+    def _record_digest(self, save_path: Path, digest: Optional[Dict[str, Any]]) -> None:
+        """记录下载完成文件的摘要。
+        
+        分段和续传下载没有流式摘要，这时只在去重索引中登记文件：
+        索引只在大小和抽样哈希都相同时才计算完整哈希，其他需要MD5的调用方自行计算。
+        
+        Args:
+            save_path: 保存路径
+            digest: 文件摘要，没有流式摘要时为None
+        """
+        if digest is not None:
+            self.file_digests[str(save_path)] = digest
+        else:
+            self.file_digests.pop(str(save_path), None)
+        try:
+            self.dedup_index.add(save_path, digest.get('md5') if digest else None)
+        except Exception as e:
+            with log_lock:
+                logger.warning(f"更新去重索引失败: {save_path} - {str(e)}")
+        
+    @property
+    def dedup_index(self) -> DedupIndex:
+        """保存目录对应的持久化去重索引。"""
+        return get_dedup_index(self.save_dir)
+        
     def _remove_duplicates(self, media_list: List[Dict[str, Any]], delete_duplicates: bool = True) -> List[Dict[str, Any]]:
         """基于MD5的文件去重。
         
         通过计算文件的MD5哈希值来识别并移除重复的媒体文件。
+        项目中已有'md5'键或下载时记录过摘要的文件不会再次读取。
         
         Args:
-            media_list: 媒体文件列表，每个项目包含'path'键
+            media_list: 媒体文件列表，每个项目包含'path'键，可选'md5'键
             delete_duplicates: 是否删除重复文件，默认为True
             
         Returns:
@@ -1218,8 +1935,10 @@ class BaseDownloader:
                         logger.warning(f"文件不存在或路径无效: {file_path}")
                     continue
                     
-                with open(file_path, 'rb') as f:
-                    md5 = hashlib.md5(f.read()).hexdigest()
+                md5 = item.get('md5')
+                if not md5:
+                    digest = self.file_digests.get(str(file_path)) or hash_file(file_path)
+                    md5 = digest['md5']
                     
                 if md5 not in unique:
                     unique[md5] = item
@@ -1251,6 +1970,9 @@ class BaseDownloader:
     def remove_duplicates_in_dir(self, directory: Union[str, Path] = None, recursive: bool = True) -> Dict[str, Any]:
         """对指定目录中的所有媒体文件进行去重。
         
+        使用目录下的持久化去重索引，只有大小和采样哈希都相同的文件才会完整读取，
+        保留每组中最早的文件。
+        
         Args:
             directory: 要处理的目录，默认为下载器的保存目录
             recursive: 是否递归处理子目录，默认为True
@@ -1263,21 +1985,24 @@ class BaseDownloader:
         with log_lock:
             logger.info(f"开始处理目录: {directory}")
             
-        # 收集所有媒体文件
-        media_files = []
-        for ext in ['.mp4', '.ts', '.m4a', '.mp3', '.jpg', '.jpeg', '.png', '.gif']:
-            if recursive:
-                pattern = f"**/*{ext}"
-            else:
-                pattern = f"*{ext}"
-            media_files.extend([
-                {'path': str(p)} for p in directory.glob(pattern)
-            ])
-            
-        # 执行去重
+        # 增量更新索引并查找重复文件
+        index = get_dedup_index(directory)
+        media_files = index.scan(directory, MEDIA_EXTENSIONS, recursive)
+        removed_count = 0
+        for group in index.find_duplicates(media_files):
+            for file_path in group[1:]:
+                try:
+                    os.remove(file_path)
+                    index.remove(file_path)
+                    removed_count += 1
+                    with log_lock:
+                        logger.info(f"删除重复文件: {file_path}")
+                except Exception as e:
+                    with log_lock:
+                        logger.warning(f"删除重复文件失败: {file_path} - {str(e)}")
+                        
         original_count = len(media_files)
-        unique_files = self._remove_duplicates(media_files)
-        final_count = len(unique_files)
+        final_count = original_count - removed_count
         
         result = {
             'directory': str(directory),
@@ -1303,18 +2028,36 @@ class BaseDownloader:
         Args:
             chunk_size: 当前块大小(字节)
         """
-        if not self.speed_limit:
-            return
+        delay = self._speed_limit_delay(chunk_size)
+        if delay > 0:
+            time.sleep(delay)
+            
+    def _speed_limit_delay(self, chunk_size: int) -> float:
+        """向全局带宽整形器预约带宽，计算需要等待的时间。
+        
+        同时受全局、平台/主机和本下载器三级限速约束。
+        
+        Args:
+            chunk_size: 当前块大小(字节)
             
+        Returns:
+            float: 需要等待的秒数，不限速时为0
+        """
         self._downloaded_size += chunk_size
-        elapsed_time = time.time() - self._download_start_time
+        return self.shaper.reserve(
+            chunk_size,
+            task_id=self._shaper_key,
+            groups=self._shaper_groups
+        )
         
-        # 计算期望时间
-        expected_time = self._downloaded_size / self.speed_limit
+    def set_speed_limit(self, speed_limit: Optional[float]) -> None:
+        """在运行时修改本下载器的速度限制。
         
-        # 如果实际时间小于期望时间，则等待
-        if elapsed_time < expected_time:
-            time.sleep(expected_time - elapsed_time)
+        Args:
+            speed_limit: 速度限制(字节/秒)，None表示不限速
+        """
+        self.speed_limit = speed_limit
+        self.shaper.set_task_limit(self._shaper_key, speed_limit)
 
     def _yt_dlp_progress_hook(self, d: Dict[str, Any]):
         """yt-dlp进度回调。
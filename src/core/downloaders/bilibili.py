@@ -1,11 +1,11 @@
 import logging
 from pathlib import Path
 from typing import Optional
-import requests
 import re
 import json
 
 from .base import BaseDownloader
+from ..session_registry import session_registry
 from ..task import DownloadTask
 
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ class BilibiliDownloader(BaseDownloader):
             task: 下载任务
         """
         super().__init__(task)
-        self._session = requests.Session()
+        self._session = session_registry.get("bilibili", name="task")
         self._session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Referer': 'https://www.bilibili.com'
@@ -1,10 +1,10 @@
 import logging
 from pathlib import Path
 from typing import Optional
-import requests
 import re
 
 from .base import BaseDownloader
+from ..session_registry import session_registry
 from ..task import DownloadTask
 
 logger = logging.getLogger(__name__)
@@ -19,7 +19,7 @@ class TwitterDownloader(BaseDownloader):
             task: 下载任务
         """
         super().__init__(task)
-        self._session = requests.Session()
+        self._session = session_registry.get("twitter", name="task")
         
     def start(self):
         """开始下载。"""
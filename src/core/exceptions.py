@@ -432,13 +432,25 @@ class ParseError(DownloaderError):
 class DownloadError(DownloaderError):
     """下载错误。"""
     
-    def __init__(self, message: str):
+    def __init__(
+        self,
+        message: str,
+        error_type: str = "unknown",
+        suggestion: str = "",
+        details: Optional[Dict[str, Any]] = None
+    ):
         """初始化异常。
         
         Args:
             message: 错误信息
+            error_type: 错误类型，默认为"unknown"
+            suggestion: 建议操作，默认为空字符串
+            details: 详细信息，默认为None
         """
         super().__init__(message, "E004")
+        self.error_type = error_type
+        self.suggestion = suggestion
+        self.details = details or {}
 
 class ConfigError(DownloaderError):
     """配置错误。"""
@@ -5,8 +5,12 @@
 
 import json
 from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
 import requests
 
+from .session_registry import session_registry
+
 class GraphQLClient:
     """GraphQL客户端。
     
@@ -74,20 +78,12 @@ class GraphQLClient:
         if operation_name:
             payload['operationName'] = operation_name
             
-        # 设置代理
-        proxies = None
-        if self.proxy:
-            proxies = {
-                'http': self.proxy,
-                'https': self.proxy
-            }
-            
-        # 发送请求
-        response = requests.post(
+        # 发送请求，同一端点的客户端共享连接池
+        session = session_registry.get(urlparse(self.endpoint).netloc, self.proxy)
+        response = session.post(
             self.endpoint,
             json=payload,
             headers=self.headers,
-            proxies=proxies,
             timeout=self.timeout
         )
         response.raise_for_status()
@@ -0,0 +1,113 @@
+"""流式哈希模块。
+
+下载时在写盘的同时更新摘要，避免下载完成后再次读取整个文件。
+默认计算MD5(与去重记录兼容)，安装了 ``xxhash`` 时额外计算更快的xxh3摘要。
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - 可选依赖
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+# 事后计算摘要时每次读取的块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class StreamingHasher:
+    """流式哈希计算器。
+
+    Attributes:
+        size: int, 已处理的字节数
+    """
+
+    def __init__(self, fast: bool = True):
+        """初始化哈希计算器。
+
+        Args:
+            fast: 是否同时计算xxh3摘要(需要安装xxhash)
+        """
+        self._md5 = hashlib.md5()
+        self._fast = xxhash.xxh3_64() if fast and xxhash is not None else None
+        self.size = 0
+
+    def update(self, data: bytes) -> None:
+        """追加数据。
+
+        Args:
+            data: 数据块
+        """
+        self._md5.update(data)
+        if self._fast is not None:
+            self._fast.update(data)
+        self.size += len(data)
+
+    def update_from_file(
+        self,
+        file_path: Union[str, Path],
+        length: Optional[int] = None,
+        chunk_size: int = HASH_CHUNK_SIZE
+    ) -> None:
+        """从文件开头读取数据追加到摘要。
+
+        用于续传时补算已存在部分的摘要。
+
+        Args:
+            file_path: 文件路径
+            length: 读取的字节数，None表示读取整个文件
+            chunk_size: 每次读取的块大小
+        """
+        remaining = length
+        with open(file_path, 'rb') as f:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = f.read(size)
+                if not chunk:
+                    break
+                self.update(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+
+    @property
+    def md5(self) -> str:
+        """MD5十六进制摘要。"""
+        return self._md5.hexdigest()
+
+    def result(self) -> Dict[str, Union[str, int]]:
+        """获取摘要结果。
+
+        Returns:
+            Dict[str, Union[str, int]]: 包含md5、size以及可选的xxh3
+        """
+        digest: Dict[str, Union[str, int]] = {'md5': self.md5, 'size': self.size}
+        if self._fast is not None:
+            digest['xxh3'] = self._fast.hexdigest()
+        return digest
+
+
+def hash_file(
+    file_path: Union[str, Path],
+    chunk_size: int = HASH_CHUNK_SIZE,
+    fast: bool = True
+) -> Dict[str, Union[str, int]]:
+    """分块计算文件摘要。
+
+    仅用于没有流式摘要可用的情况(例如外部文件，或分段下载的文件确实需要完整MD5时)。
+
+    Args:
+        file_path: 文件路径
+        chunk_size: 每次读取的块大小
+        fast: 是否同时计算xxh3摘要
+
+    Returns:
+        Dict[str, Union[str, int]]: 包含md5、size以及可选的xxh3
+    """
+    hasher = StreamingHasher(fast=fast)
+    hasher.update_from_file(file_path, chunk_size=chunk_size)
+    return hasher.result()
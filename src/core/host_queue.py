@@ -0,0 +1,140 @@
+"""按主机公平调度的任务队列模块。
+
+单一优先级队列按入队顺序分派，大量同一站点的任务会让其他站点的任务一直排队。
+FairHostQueue在每个优先级内按主机分组，用差额轮询(DRR)在主机之间轮流取任务：
+1. 每个主机每轮获得与权重相等的额度，取出一个任务消耗1
+2. 达到并发上限的主机本轮跳过，额度保留到下一轮
+3. 当前优先级的主机都已达上限时继续从下一个优先级取任务，空闲槽位不会浪费
+
+主机键可以按配置的域名后缀归并，例如 ``twimg.com`` 同时覆盖
+``video.twimg.com`` 和 ``pbs.twimg.com``。
+"""
+
+from collections import deque, OrderedDict
+from urllib.parse import urlparse
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+
+def host_key(url: str, groups: Iterable[str] = ()) -> str:
+    """获取URL的调度分组键。
+
+    主机名等于或以 ``.<后缀>`` 结尾时返回最长的匹配后缀，否则返回主机名。
+
+    Args:
+        url: 下载地址
+        groups: 需要合并计数的域名后缀
+
+    Returns:
+        str: 分组键
+    """
+    host = (urlparse(url).hostname or "").lower()
+    best = None
+    for group in groups:
+        group = group.lower()
+        if (host == group or host.endswith("." + group)) and (
+            best is None or len(group) > len(best)
+        ):
+            best = group
+    return best or host
+
+
+class _Level:
+    """一个优先级内按主机分组的队列。"""
+
+    def __init__(self):
+        self.queues: Dict[str, Deque[Any]] = OrderedDict()
+        self.order: Deque[str] = deque()
+        self.deficit: Dict[str, float] = {}
+
+
+class FairHostQueue:
+    """按优先级和主机公平出队的任务队列。
+
+    非线程安全，由调用方加锁。
+
+    Attributes:
+        weights: Dict[str, int], 主机权重，未配置的主机为1
+    """
+
+    def __init__(self, weights: Optional[Dict[str, int]] = None):
+        """初始化队列。
+
+        Args:
+            weights: 主机权重，权重为n的主机每轮最多取n个任务
+        """
+        self.weights = dict(weights or {})
+        self._levels: Dict[int, _Level] = {}
+        self._size = 0
+
+    def put(self, item: Any, priority: int, key: str) -> None:
+        """添加任务。
+
+        Args:
+            item: 任务
+            priority: 优先级，数值越小越先执行
+            key: 主机分组键
+        """
+        level = self._levels.get(priority)
+        if level is None:
+            level = self._levels[priority] = _Level()
+        queue = level.queues.get(key)
+        if queue is None:
+            queue = level.queues[key] = deque()
+            level.order.append(key)
+            level.deficit[key] = 0
+        queue.append(item)
+        self._size += 1
+
+    def pop(self, can_start: Callable[[str], bool]) -> Optional[tuple]:
+        """按优先级和主机轮询取出下一个任务。
+
+        Args:
+            can_start: 判断主机是否还有空闲并发的回调
+
+        Returns:
+            Optional[tuple]: (任务, 主机分组键)，所有主机都已达上限时返回None
+        """
+        for priority in sorted(self._levels):
+            level = self._levels[priority]
+            for _ in range(len(level.order)):
+                key = level.order[0]
+                if not can_start(key):
+                    level.order.rotate(-1)
+                    continue
+                if level.deficit[key] < 1:
+                    level.deficit[key] += max(1, self.weights.get(key, 1))
+                level.deficit[key] -= 1
+                queue = level.queues[key]
+                item = queue.popleft()
+                self._size -= 1
+                if not queue:
+                    # 队列清空的主机不保留额度
+                    level.order.popleft()
+                    del level.queues[key]
+                    del level.deficit[key]
+                    if not level.order:
+                        del self._levels[priority]
+                elif level.deficit[key] < 1:
+                    level.order.rotate(-1)
+                return item, key
+        return None
+
+    def depth_by_key(self) -> Dict[str, int]:
+        """各主机排队的任务数。
+
+        Returns:
+            Dict[str, int]: 主机分组键到任务数的映射
+        """
+        depth: Dict[str, int] = {}
+        for level in self._levels.values():
+            for key, queue in level.queues.items():
+                depth[key] = depth.get(key, 0) + len(queue)
+        return depth
+
+    def qsize(self) -> int:
+        """排队的任务总数。"""
+        return self._size
+
+    def empty(self) -> bool:
+        """队列是否为空。"""
+        return self._size == 0
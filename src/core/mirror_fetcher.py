@@ -0,0 +1,282 @@
+"""多镜像分块下载模块。
+
+同一个文件有多个CDN镜像时：
+1. 首个Range块同时向所有镜像请求，最先完成的镜像被选为首选
+2. 其余Range块由多个线程并发下载，优先使用首选镜像
+3. 某个镜像请求失败或传输中途停滞(读超时)时自动切换到下一个镜像，并将其降级
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
+
+import requests
+
+from .exceptions import DownloadError
+
+logger = logging.getLogger(__name__)
+
+
+class MirrorRangeFetcher:
+    """多镜像Range分块下载器。
+
+    Attributes:
+        session: requests.Session, 共享的HTTP会话
+        mirrors: List[str], 镜像URL，按速度排序(首个为首选)
+        chunk_size: int, Range块大小(字节)
+        concurrency: int, 并发下载数
+        connect_timeout: float, 连接超时(秒)
+        stall_timeout: float, 读取停滞超时(秒)，超过即切换镜像
+        max_retries: int, 每个块在所有镜像上的最大尝试轮数
+        total_size: int, 文件总大小，首块下载后可用
+    """
+
+    DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        session: requests.Session,
+        mirrors: List[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        concurrency: int = 4,
+        connect_timeout: float = 10,
+        stall_timeout: float = 15,
+        max_retries: int = 3,
+        headers: Optional[Dict[str, str]] = None,
+        proxies: Optional[Dict[str, str]] = None
+    ):
+        """初始化下载器。
+
+        Args:
+            session: 共享的HTTP会话
+            mirrors: 镜像URL列表
+            chunk_size: Range块大小(字节)
+            concurrency: 并发下载数
+            connect_timeout: 连接超时(秒)
+            stall_timeout: 读取停滞超时(秒)
+            max_retries: 每个块在所有镜像上的最大尝试轮数
+            headers: 附加请求头
+            proxies: 代理设置
+
+        Raises:
+            ValueError: 没有可用的镜像
+        """
+        mirrors = [m for m in dict.fromkeys(mirrors) if m]
+        if not mirrors:
+            raise ValueError("没有可用的镜像")
+        self.session = session
+        self.mirrors = mirrors
+        self.chunk_size = chunk_size
+        self.concurrency = max(1, concurrency)
+        self.connect_timeout = connect_timeout
+        self.stall_timeout = stall_timeout
+        self.max_retries = max(1, max_retries)
+        self.headers = headers or {}
+        self.proxies = proxies
+        self.total_size = 0
+        self._lock = threading.Lock()
+
+    def _fetch_range(
+        self,
+        mirror: str,
+        start: int,
+        end: int,
+        stop: threading.Event
+    ) -> Tuple[bytes, int]:
+        """从指定镜像下载一个Range块。
+
+        Args:
+            mirror: 镜像URL
+            start: 起始偏移
+            end: 结束偏移(包含)
+            stop: 停止事件，置位后立即放弃
+
+        Returns:
+            Tuple[bytes, int]: 块数据和文件总大小
+
+        Raises:
+            DownloadError: 镜像不支持Range或数据不完整
+            requests.RequestException: 网络错误或传输停滞
+        """
+        headers = dict(self.headers)
+        headers.update({'Range': f"bytes={start}-{end}", 'Accept-Encoding': 'identity'})
+        with self.session.get(
+            mirror,
+            headers=headers,
+            proxies=self.proxies,
+            stream=True,
+            timeout=(self.connect_timeout, self.stall_timeout)
+        ) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise DownloadError(f"镜像不支持Range请求: {mirror}")
+            content_range = response.headers.get('Content-Range', '')
+            total = int(content_range.rsplit('/', 1)[-1]) if '/' in content_range else 0
+
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if stop.is_set():
+                    raise DownloadError("下载已中止")
+                data.extend(chunk)
+
+        expected = (min(end, total - 1) if total else end) - start + 1
+        if len(data) != expected:
+            raise DownloadError(f"块数据不完整: {mirror} {start}-{end}")
+        return bytes(data), total
+
+    def _demote(self, mirror: str) -> None:
+        """将出错的镜像移到末尾。"""
+        with self._lock:
+            if len(self.mirrors) > 1 and mirror in self.mirrors:
+                self.mirrors.remove(mirror)
+                self.mirrors.append(mirror)
+
+    def _race_first_chunk(self, stop: threading.Event) -> bytes:
+        """向所有镜像同时请求首块，选出最快的镜像。
+
+        Args:
+            stop: 外部停止事件
+
+        Returns:
+            bytes: 首块数据
+
+        Raises:
+            DownloadError: 所有镜像都失败
+        """
+        end = self.chunk_size - 1
+        if len(self.mirrors) == 1:
+            data, self.total_size = self._fetch_range(self.mirrors[0], 0, end, stop)
+            return data
+
+        race_over = threading.Event()
+        race_stop = _AnyEvent(stop, race_over)
+        errors = []
+        executor = ThreadPoolExecutor(max_workers=len(self.mirrors))
+        futures = {
+            executor.submit(self._fetch_range, mirror, 0, end, race_stop): mirror
+            for mirror in self.mirrors
+        }
+        try:
+            for future in as_completed(futures):
+                mirror = futures[future]
+                try:
+                    data, total = future.result()
+                except Exception as e:
+                    errors.append(f"{mirror}: {e}")
+                    self._demote(mirror)
+                    continue
+                # 最快的镜像排在首位
+                with self._lock:
+                    self.mirrors.remove(mirror)
+                    self.mirrors.insert(0, mirror)
+                self.total_size = total
+                logger.debug(f"选择最快的镜像: {mirror}")
+                return data
+        finally:
+            # 其余请求立即放弃，不等待停滞的连接
+            race_over.set()
+            executor.shutdown(wait=False)
+
+        raise DownloadError(f"所有镜像均不可用: {'; '.join(errors)}")
+
+    def _fetch_chunk(self, start: int, end: int, stop: threading.Event) -> bytes:
+        """下载一个块，失败时依次切换镜像。
+
+        Args:
+            start: 起始偏移
+            end: 结束偏移(包含)
+            stop: 停止事件
+
+        Returns:
+            bytes: 块数据
+
+        Raises:
+            DownloadError: 所有尝试都失败
+        """
+        last_error: Optional[Exception] = None
+        for _ in range(self.max_retries):
+            with self._lock:
+                mirrors = list(self.mirrors)
+            for mirror in mirrors:
+                if stop.is_set():
+                    raise DownloadError("下载已中止")
+                try:
+                    data, _ = self._fetch_range(mirror, start, end, stop)
+                    return data
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"镜像下载失败，切换镜像: {mirror} {start}-{end} - {e}")
+                    self._demote(mirror)
+        raise DownloadError(f"下载块失败: {start}-{end} - {last_error}")
+
+    def download(
+        self,
+        save_path: Union[str, Path],
+        on_chunk: Optional[Callable[[int], Any]] = None,
+        abort_event: Optional[threading.Event] = None
+    ) -> int:
+        """下载文件。
+
+        Args:
+            save_path: 保存路径
+            on_chunk: 每个块写入后的回调，参数为块字节数
+            abort_event: 外部取消事件
+
+        Returns:
+            int: 文件总大小
+
+        Raises:
+            DownloadError: 下载失败
+        """
+        stop = threading.Event()
+        external = abort_event or threading.Event()
+        any_stop = _AnyEvent(stop, external)
+
+        first = self._race_first_chunk(any_stop)
+        total = self.total_size or len(first)
+        with open(save_path, 'wb') as f:
+            f.write(first)
+            f.truncate(total)
+        if on_chunk:
+            on_chunk(len(first))
+
+        ranges = [
+            (start, min(start + self.chunk_size, total) - 1)
+            for start in range(len(first), total, self.chunk_size)
+        ]
+        if not ranges:
+            return total
+
+        write_lock = threading.Lock()
+        with open(save_path, 'r+b') as f:
+            def worker(start: int, end: int) -> None:
+                data = self._fetch_chunk(start, end, any_stop)
+                with write_lock:
+                    f.seek(start)
+                    f.write(data)
+                if on_chunk:
+                    on_chunk(len(data))
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = [executor.submit(worker, start, end) for start, end in ranges]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    stop.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+        return total
+
+
+class _AnyEvent:
+    """任意一个事件置位即视为置位。"""
+
+    def __init__(self, *events: threading.Event):
+        self._events = events
+
+    def is_set(self) -> bool:
+        return any(event.is_set() for event in self._events)
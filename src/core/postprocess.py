@@ -0,0 +1,388 @@
+"""后处理模块。
+
+封装、去水印、压缩、缩略图和元数据清理都是CPU密集的工作，放在下载线程里做会
+占住网络并发名额。本模块提供独立的后处理阶段：
+
+1. 下载线程提交完成的文件后立即返回，继续下载下一个URL
+2. 任务进入优先级队列，数字越小越先执行，同优先级按提交顺序执行
+3. 任务在进程池中执行，进程数默认等于CPU核数
+4. 每个任务记录排队时间和处理时间
+"""
+
+import os
+import time
+import queue
+import logging
+import itertools
+import threading
+import subprocess
+from dataclasses import dataclass, field
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Optional, Dict, List, Any, Callable, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PostJobResult:
+    """后处理任务结果。
+
+    Attributes:
+        name: 任务名称
+        output: 任务返回值，通常是输出文件路径
+        wait_time: 排队时间(秒)
+        run_time: 处理时间(秒)
+        error: 错误信息，成功时为None
+    """
+    name: str
+    output: Any = None
+    wait_time: float = 0.0
+    run_time: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass(order=True)
+class _Job:
+    """队列中的任务，按(优先级, 提交序号)排序。"""
+    priority: float
+    seq: int
+    name: str = field(compare=False, default="")
+    func: Optional[Callable] = field(compare=False, default=None)
+    args: Tuple = field(compare=False, default=())
+    kwargs: Dict[str, Any] = field(compare=False, default_factory=dict)
+    future: Optional[Future] = field(compare=False, default=None)
+    submitted: float = field(compare=False, default=0.0)
+
+
+def _run_timed(func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+    """在工作进程中执行任务并计时。"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _run_chain(
+    input_path: str,
+    steps: Sequence[Tuple[Callable, Tuple]],
+    keep_input: bool = True
+) -> str:
+    """依次执行多个处理步骤，上一步的输出作为下一步的输入。
+
+    中间文件在下一步完成后删除，keep_input为True时保留原始输入文件。
+    """
+    current = input_path
+    for func, args in steps:
+        result = func(current, *args)
+        if result != current and (current != input_path or not keep_input):
+            try:
+                os.remove(current)
+            except OSError:
+                pass
+        current = result
+    return current
+
+
+class PostProcessor:
+    """后处理阶段。
+
+    用法::
+
+        processor = get_post_processor()
+        future = processor.submit(remove_watermark, path, output_dir, priority=1)
+        result = future.result()  # PostJobResult
+
+    Attributes:
+        max_workers: int, 最大并行任务数
+        results: List[PostJobResult], 已完成任务的结果
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor_factory: Callable[[int], Executor] = ProcessPoolExecutor
+    ):
+        """初始化后处理阶段。
+
+        Args:
+            max_workers: 最大并行任务数，默认等于CPU核数
+            executor_factory: 执行器工厂，参数为工作者数量
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.results: List[PostJobResult] = []
+        self._executor_factory = executor_factory
+        self._executor: Optional[Executor] = None
+        self._queue: "queue.PriorityQueue[_Job]" = queue.PriorityQueue()
+        # 只有空闲的工作者才从队列取任务，队列中的优先级才有意义
+        self._slots = threading.Semaphore(self.max_workers)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(
+        self,
+        func: Callable,
+        *args,
+        priority: float = 0,
+        name: Optional[str] = None,
+        **kwargs
+    ) -> Future:
+        """提交任务。
+
+        Args:
+            func: 任务函数，必须可被pickle(模块级函数)
+            *args: 位置参数
+            priority: 优先级，数字越小越先执行
+            name: 任务名称，用于日志和统计
+            **kwargs: 关键字参数
+
+        Returns:
+            Future: 完成后返回PostJobResult，失败时抛出任务的异常
+
+        Raises:
+            RuntimeError: 后处理阶段已关闭
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("后处理阶段已关闭")
+            self._ensure_started()
+            job = _Job(
+                priority=priority,
+                seq=next(self._seq),
+                name=name or getattr(func, '__name__', 'job'),
+                func=func,
+                args=args,
+                kwargs=kwargs,
+                future=future,
+                submitted=time.monotonic()
+            )
+            self._queue.put(job)
+        return future
+
+    def submit_chain(
+        self,
+        input_path: str,
+        steps: Sequence[Tuple[Callable, Tuple]],
+        priority: float = 0,
+        name: Optional[str] = None,
+        keep_input: bool = True
+    ) -> Future:
+        """提交多步处理任务，所有步骤在同一个工作进程中依次执行。
+
+        Args:
+            input_path: 输入文件路径
+            steps: (函数, 额外参数)列表，函数的第一个参数为上一步的输出路径
+            priority: 优先级
+            name: 任务名称
+            keep_input: 是否保留原始输入文件
+
+        Returns:
+            Future: 完成后返回PostJobResult，output为最终文件路径
+        """
+        return self.submit(
+            _run_chain,
+            input_path,
+            list(steps),
+            keep_input,
+            priority=priority,
+            name=name or os.path.basename(input_path)
+        )
+
+    def _ensure_started(self) -> None:
+        """启动进程池和分发线程。"""
+        if self._dispatcher is not None:
+            return
+        self._executor = self._executor_factory(self.max_workers)
+        self._dispatcher = threading.Thread(
+            target=self._dispatch,
+            name="PostProcessor",
+            daemon=True
+        )
+        self._dispatcher.start()
+
+    def _dispatch(self) -> None:
+        """有空闲工作者时从队列取出优先级最高的任务执行。"""
+        while True:
+            self._slots.acquire()
+            job = self._queue.get()
+            if job.func is None:
+                self._slots.release()
+                break
+            if not job.future.set_running_or_notify_cancel():
+                self._slots.release()
+                continue
+
+            started = time.monotonic()
+            try:
+                inner = self._executor.submit(_run_timed, job.func, job.args, job.kwargs)
+            except Exception as e:
+                self._slots.release()
+                job.future.set_exception(e)
+                continue
+            inner.add_done_callback(
+                lambda f, job=job, started=started: self._finish(job, started, f)
+            )
+
+    def _finish(self, job: _Job, started: float, inner: Future) -> None:
+        """记录任务结果。"""
+        result = PostJobResult(name=job.name, wait_time=started - job.submitted)
+        error: Optional[BaseException] = None
+        try:
+            result.output, result.run_time = inner.result()
+        except BaseException as e:
+            error = e
+            result.run_time = time.monotonic() - started
+            result.error = str(e)
+
+        with self._lock:
+            self.results.append(result)
+        if error is not None:
+            logger.error(f"后处理失败: {job.name} - {error}")
+            job.future.set_exception(error)
+        else:
+            logger.info(
+                f"后处理完成: {job.name} "
+                f"排队 {result.wait_time:.2f} 秒, 处理 {result.run_time:.2f} 秒"
+            )
+            job.future.set_result(result)
+        # 结果交付后再释放工作者，下一个任务才开始
+        self._slots.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息。
+
+        Returns:
+            Dict[str, Any]: 任务数、失败数、排队和处理时间
+        """
+        with self._lock:
+            results = list(self.results)
+        count = len(results)
+        return {
+            'completed': count,
+            'failed': sum(1 for r in results if r.error),
+            'pending': self._queue.qsize(),
+            'total_run_time': sum(r.run_time for r in results),
+            'avg_wait_time': sum(r.wait_time for r in results) / count if count else 0.0,
+            'avg_run_time': sum(r.run_time for r in results) / count if count else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭后处理阶段。
+
+        Args:
+            wait: 是否等待队列中的任务全部完成
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            dispatcher = self._dispatcher
+        if dispatcher is None:
+            return
+
+        if not wait:
+            # 取消尚未开始的任务
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job.future is not None:
+                    job.future.cancel()
+        # 结束标记排在所有任务之后
+        self._queue.put(_Job(priority=float('inf'), seq=next(self._seq)))
+        if wait:
+            dispatcher.join()
+        self._executor.shutdown(wait=wait)
+
+
+_post_processor: Optional[PostProcessor] = None
+_post_processor_lock = threading.Lock()
+
+
+def get_post_processor() -> PostProcessor:
+    """获取全局后处理阶段，首次调用时创建。
+
+    Returns:
+        PostProcessor: 后处理阶段
+    """
+    global _post_processor
+    with _post_processor_lock:
+        if _post_processor is None:
+            _post_processor = PostProcessor()
+        return _post_processor
+
+
+# 以下为可在工作进程中执行的处理函数。
+# 工作进程内缓存处理器实例，同一进程处理的视频可复用水印检测缓存。
+
+_worker_tools: Dict[Tuple, Any] = {}
+
+
+def _tool(kind: str, *args) -> Any:
+    """获取当前进程缓存的处理器实例。"""
+    key = (kind,) + args
+    tool = _worker_tools.get(key)
+    if tool is None:
+        if kind == 'watermark':
+            from ..processors.tiktok_downloader import TikTokWatermarkRemover
+            tool = TikTokWatermarkRemover(*args)
+        elif kind == 'video':
+            from ..utils.video import VideoProcessor
+            tool = VideoProcessor(*args)
+        else:
+            from ..utils.metadata import MetadataCleaner
+            tool = MetadataCleaner(*args)
+        _worker_tools[key] = tool
+    return tool
+
+
+def remux(input_path: str, output_path: str, ffmpeg_path: str = "ffmpeg") -> str:
+    """不重新编码，将文件封装为新的容器格式。
+
+    Args:
+        input_path: 输入文件路径
+        output_path: 输出文件路径
+        ffmpeg_path: FFmpeg可执行文件路径
+
+    Returns:
+        str: 输出文件路径
+
+    Raises:
+        RuntimeError: FFmpeg执行失败
+    """
+    result = subprocess.run(
+        [ffmpeg_path, "-hide_banner", "-loglevel", "error",
+         "-i", input_path, "-c", "copy", "-y", output_path],
+        capture_output=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"FFmpeg封装失败: {result.stderr.decode('utf-8', errors='replace').strip()}"
+        )
+    return output_path
+
+
+def remove_watermark(video_path: str, output_dir: str, account: Optional[str] = None) -> str:
+    """移除视频水印，见TikTokWatermarkRemover.remove_watermark。"""
+    return _tool('watermark', output_dir).remove_watermark(video_path, account=account)
+
+
+def compress_to_1080p(input_path: str, output_dir: Optional[str] = None) -> str:
+    """压缩视频到1080p，见VideoProcessor.compress_to_1080p。"""
+    return _tool('video', output_dir).compress_to_1080p(input_path)
+
+
+def extract_thumbnail(input_path: str, output_dir: Optional[str] = None, timestamp: float = 0) -> str:
+    """提取视频缩略图，见VideoProcessor.extract_thumbnail。"""
+    return _tool('video', output_dir).extract_thumbnail(input_path, timestamp)
+
+
+def clean_metadata(
+    input_path: str,
+    output_dir: Optional[str] = None,
+    keep_fields: Optional[Tuple[str, ...]] = None
+) -> str:
+    """清理文件元数据，见MetadataCleaner.clean。"""
+    return _tool('metadata', output_dir, keep_fields).clean(input_path)
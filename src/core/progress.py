@@ -0,0 +1,97 @@
+"""进度上报模块。
+
+下载循环每读一个块都会报告进度，逐块格式化状态和回调开销很大。
+ProgressReporter对进度采样后再通知监听者：
+1. 按时间间隔采样(默认10Hz)，也可以按进度步长采样
+2. 速度用指数加权移动平均估计，每次采样O(1)
+3. 只在采样时调用监听者，状态字符串由监听者按需格式化
+"""
+
+import time
+import threading
+from typing import Optional, Callable
+
+# 监听者参数为已下载字节数、总字节数和速度(字节/秒)
+ProgressListener = Callable[[int, int, float], None]
+
+
+class ProgressReporter:
+    """进度采样器。
+
+    Attributes:
+        interval: float, 两次采样的最小间隔(秒)
+        step: Optional[float], 进度每增加该比例时也采样，None表示只按时间采样
+        smoothing: float, 速度平滑系数(0-1)，越大越偏向最近的速度
+        speed: float, 当前速度估计(字节/秒)
+    """
+
+    def __init__(
+        self,
+        listener: ProgressListener,
+        interval: float = 0.1,
+        step: Optional[float] = None,
+        smoothing: float = 0.3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """初始化采样器。
+
+        Args:
+            listener: 采样时调用的监听者
+            interval: 两次采样的最小间隔(秒)
+            step: 按进度采样的步长，例如0.01表示每1%采样一次
+            smoothing: 速度平滑系数
+            clock: 时钟函数
+        """
+        self.listener = listener
+        self.interval = interval
+        self.step = step
+        self.smoothing = smoothing
+        self.speed = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_time: Optional[float] = None
+        self._last_bytes = 0
+
+    def reset(self) -> None:
+        """开始新的下载前重置状态。"""
+        with self._lock:
+            self.speed = 0.0
+            self._last_time = None
+            self._last_bytes = 0
+
+    def update(self, downloaded: int, total_size: int) -> bool:
+        """报告当前进度，达到采样条件时通知监听者。
+
+        Args:
+            downloaded: 已下载字节数
+            total_size: 总字节数，未知时为0
+
+        Returns:
+            bool: 本次是否采样
+        """
+        now = self._clock()
+        with self._lock:
+            if self._last_time is None:
+                # 第一次报告只记录起点，续传时已有的字节不计入速度
+                self._last_time = now
+                self._last_bytes = downloaded
+            else:
+                elapsed = now - self._last_time
+                finished = total_size > 0 and downloaded >= total_size
+                stepped = (
+                    self.step is not None and total_size > 0
+                    and downloaded - self._last_bytes >= self.step * total_size
+                )
+                if not (finished or stepped or elapsed >= self.interval):
+                    return False
+                if elapsed > 0:
+                    current = (downloaded - self._last_bytes) / elapsed
+                    if self.speed:
+                        self.speed += self.smoothing * (current - self.speed)
+                    else:
+                        self.speed = current
+                    self._last_time = now
+                    self._last_bytes = downloaded
+            speed = self.speed
+        self.listener(downloaded, total_size, speed)
+        return True
@@ -0,0 +1,162 @@
+"""流式封装模块。
+
+下载的数据直接通过标准输入送入FFmpeg子进程，边下载边封装为最终文件，
+不再先写临时文件再读取一遍。
+"""
+
+import os
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from typing import Optional, List, Union
+
+from .exceptions import DownloadError
+
+logger = logging.getLogger(__name__)
+
+
+class StreamRemuxer:
+    """FFmpeg流式封装器。
+
+    用法::
+
+        with StreamRemuxer(output_path, input_format="mpegts") as remuxer:
+            for data in chunks:
+                remuxer.write(data)
+
+    正常退出时等待FFmpeg完成封装，发生异常时终止进程并删除不完整的输出文件。
+
+    Attributes:
+        output_path: Path, 输出文件路径
+        ffmpeg_path: str, FFmpeg可执行文件路径
+        input_format: Optional[str], 输入格式，None时由FFmpeg自动探测
+    """
+
+    def __init__(
+        self,
+        output_path: Union[str, Path],
+        ffmpeg_path: str = "ffmpeg",
+        input_format: Optional[str] = None,
+        output_args: Optional[List[str]] = None
+    ):
+        """初始化封装器。
+
+        Args:
+            output_path: 输出文件路径
+            ffmpeg_path: FFmpeg可执行文件路径
+            input_format: 输入格式，例如 mpegts
+            output_args: 输出参数，默认直接复制音视频流
+        """
+        self.output_path = Path(output_path)
+        self.ffmpeg_path = ffmpeg_path
+        self.input_format = input_format
+        self.output_args = output_args or ["-c", "copy"]
+        self._process: Optional[subprocess.Popen] = None
+        self._stderr: List[bytes] = []
+        self._stderr_thread: Optional[threading.Thread] = None
+
+    def _build_command(self) -> List[str]:
+        """构建FFmpeg命令。"""
+        cmd = [self.ffmpeg_path, "-hide_banner", "-loglevel", "error"]
+        if self.input_format:
+            cmd += ["-f", self.input_format]
+        cmd += ["-i", "pipe:0"]
+        cmd += self.output_args
+        cmd += ["-y", str(self.output_path)]
+        return cmd
+
+    def start(self) -> 'StreamRemuxer':
+        """启动FFmpeg进程。
+
+        Returns:
+            StreamRemuxer: 自身
+
+        Raises:
+            FileNotFoundError: 找不到FFmpeg
+        """
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._process = subprocess.Popen(
+            self._build_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        # 持续读取错误输出，避免管道写满后FFmpeg阻塞
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+        return self
+
+    def _drain_stderr(self) -> None:
+        """读取FFmpeg错误输出。"""
+        for line in self._process.stderr:
+            self._stderr.append(line)
+
+    def write(self, data: bytes) -> None:
+        """写入数据。
+
+        Args:
+            data: 媒体数据
+
+        Raises:
+            DownloadError: FFmpeg进程已退出
+        """
+        try:
+            self._process.stdin.write(data)
+        except (BrokenPipeError, OSError) as e:
+            raise DownloadError(f"FFmpeg封装失败: {self._error_output() or e}")
+
+    def _error_output(self) -> str:
+        """获取FFmpeg错误输出。"""
+        return b"".join(self._stderr).decode("utf-8", errors="replace").strip()
+
+    def finish(self) -> Path:
+        """结束输入并等待封装完成。
+
+        Returns:
+            Path: 输出文件路径
+
+        Raises:
+            DownloadError: 封装失败
+        """
+        try:
+            self._process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        returncode = self._process.wait()
+        self._stderr_thread.join()
+        if returncode != 0:
+            self._remove_output()
+            raise DownloadError(f"FFmpeg封装失败: {self._error_output()}")
+        return self.output_path
+
+    def abort(self) -> None:
+        """终止FFmpeg进程并删除不完整的输出文件。"""
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        try:
+            self._process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.wait()
+        self._remove_output()
+
+    def _remove_output(self) -> None:
+        """删除输出文件。"""
+        try:
+            os.remove(self.output_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"删除不完整的输出文件失败: {self.output_path} - {e}")
+
+    def __enter__(self) -> 'StreamRemuxer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.finish()
+        else:
+            self.abort()
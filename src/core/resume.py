@@ -0,0 +1,218 @@
+"""断点续传模块。
+
+下载过程中数据先写入 ``.part`` 文件，并在旁边维护一个 JSON 清单，
+记录URL、ETag/Last-Modified、总大小和已完成的字节范围。
+中断后重新下载时只请求缺失的字节。
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+PART_SUFFIX = ".part"
+MANIFEST_SUFFIX = ".part.json"
+
+
+def part_path_for(save_path: Path) -> Path:
+    """获取目标文件对应的临时文件路径。
+
+    Args:
+        save_path: 最终保存路径
+
+    Returns:
+        Path: ``.part`` 临时文件路径
+    """
+    save_path = Path(save_path)
+    return save_path.with_name(save_path.name + PART_SUFFIX)
+
+
+def manifest_path_for(save_path: Path) -> Path:
+    """获取目标文件对应的清单路径。
+
+    Args:
+        save_path: 最终保存路径
+
+    Returns:
+        Path: 清单文件路径
+    """
+    save_path = Path(save_path)
+    return save_path.with_name(save_path.name + MANIFEST_SUFFIX)
+
+
+class ResumeManifest:
+    """断点续传清单。
+
+    线程安全，多个分段可以同时登记已完成的范围。
+
+    Attributes:
+        path: Path, 清单文件路径
+        url: str, 下载地址
+        total_size: int, 文件总大小(字节)
+        etag: Optional[str], 服务器返回的ETag
+        last_modified: Optional[str], 服务器返回的Last-Modified
+        completed: List[List[int]], 已完成的字节范围(闭区间，已合并排序)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        url: str,
+        total_size: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        completed: Optional[List[List[int]]] = None
+    ):
+        """初始化清单。
+
+        Args:
+            path: 清单文件路径
+            url: 下载地址
+            total_size: 文件总大小(字节)
+            etag: ETag响应头
+            last_modified: Last-Modified响应头
+            completed: 已完成的字节范围
+        """
+        self.path = Path(path)
+        self.url = url
+        self.total_size = total_size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.completed: List[List[int]] = []
+        self._lock = threading.Lock()
+        for start, end in completed or []:
+            self._merge(start, end)
+
+    @classmethod
+    def from_headers(
+        cls,
+        path: Path,
+        url: str,
+        total_size: int,
+        headers: Dict[str, str]
+    ) -> 'ResumeManifest':
+        """根据响应头创建清单。
+
+        Args:
+            path: 清单文件路径
+            url: 下载地址
+            total_size: 文件总大小(字节)
+            headers: 响应头
+
+        Returns:
+            ResumeManifest: 新清单
+        """
+        return cls(
+            path,
+            url,
+            total_size,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified')
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['ResumeManifest']:
+        """从文件加载清单。
+
+        Args:
+            path: 清单文件路径
+
+        Returns:
+            Optional[ResumeManifest]: 清单，不存在或损坏时返回None
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+            return cls(
+                path,
+                data['url'],
+                int(data['total_size']),
+                etag=data.get('etag'),
+                last_modified=data.get('last_modified'),
+                completed=data.get('completed', [])
+            )
+        except Exception as e:
+            logger.warning(f"续传清单无效，将重新下载: {path} - {e}")
+            return None
+
+    def _merge(self, start: int, end: int) -> None:
+        """合并一个已完成范围(调用方负责加锁)。"""
+        ranges = self.completed + [[start, end]]
+        ranges.sort()
+        merged: List[List[int]] = []
+        for s, e in ranges:
+            if merged and s <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        self.completed = merged
+
+    def mark_completed(self, start: int, end: int) -> None:
+        """登记已写入磁盘的字节范围。
+
+        Args:
+            start: 起始偏移
+            end: 结束偏移(包含)
+        """
+        if end < start:
+            return
+        with self._lock:
+            self._merge(start, end)
+
+    def missing_ranges(self) -> List[Tuple[int, int]]:
+        """计算仍需下载的字节范围。
+
+        Returns:
+            List[Tuple[int, int]]: 缺失范围列表(闭区间)
+        """
+        with self._lock:
+            missing = []
+            position = 0
+            for start, end in self.completed:
+                if start > position:
+                    missing.append((position, start - 1))
+                position = max(position, end + 1)
+            if position < self.total_size:
+                missing.append((position, self.total_size - 1))
+            return missing
+
+    @property
+    def completed_size(self) -> int:
+        """已完成的字节数。"""
+        with self._lock:
+            return sum(end - start + 1 for start, end in self.completed)
+
+    @property
+    def validator(self) -> Optional[str]:
+        """用于 If-Range 的校验值，优先使用强ETag。"""
+        if self.etag and not self.etag.startswith('W/'):
+            return self.etag
+        return self.last_modified
+
+    def save(self) -> None:
+        """原子地写入清单文件。"""
+        with self._lock:
+            data: Dict[str, Any] = {
+                'url': self.url,
+                'total_size': self.total_size,
+                'etag': self.etag,
+                'last_modified': self.last_modified,
+                'completed': self.completed
+            }
+            # 持锁写入，避免多个分段同时替换同一个临时文件
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            tmp_path.write_text(json.dumps(data), encoding='utf-8')
+            os.replace(tmp_path, self.path)
+
+    def delete(self) -> None:
+        """删除清单文件。"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -1,13 +1,19 @@
-from typing import Dict, Any
-from queue import Queue
-from threading import Lock
+from typing import Dict, Any, List, Optional
+from queue import Queue, Empty
+from threading import Lock, Condition, Thread
 from pathlib import Path
 import logging
 
+from .speed_limiter import bandwidth_shaper
+
 logger = logging.getLogger(__name__)
 
 class DownloadScheduler:
-    """下载调度器。"""
+    """下载调度器。
+    
+    使用固定大小的工作线程池并发执行下载任务，线程数由
+    ``download.max_concurrent`` 决定，并可通过 ``set_config`` 在运行时调整。
+    """
     
     def __init__(self, settings: Dict[str, Any]):
         """初始化调度器。
@@ -17,28 +23,47 @@ class DownloadScheduler:
         """
         self.settings = settings
         self.max_concurrent = settings.get('download.max_concurrent', 3)
-        self.speed_limit = settings.get('download.speed_limit', 0) * 1024  # 转换为字节/秒
+        speed_limit = settings.get('download.speed_limit')
+        self.speed_limit = self._bytes_per_second(speed_limit)
+        # 全局限速由所有下载共享，只在明确配置时设置，避免新建调度器时覆盖
+        if speed_limit is not None:
+            bandwidth_shaper.set_global_limit(self.speed_limit)
         self._active_tasks = {}
         self._completed_tasks = {}
         self._failed_tasks = {}
         self._queue = Queue()
         self._lock = Lock()
+        self._idle = Condition(self._lock)
         self._stop = False
-        self._worker = None
+        self._workers: List[Thread] = []
+        self._worker_seq = 0
+        self._busy = 0
+        self._retire = 0
         self._start_worker()
         
     def set_config(self, config: Dict[str, Any]):
         """更新配置。
         
         Args:
-            config: 配置信息
+            config: 配置信息，speed_limit与设置中的download.speed_limit相同，单位为KB/s
         """
         with self._lock:
             if 'max_concurrent' in config:
                 self.max_concurrent = config['max_concurrent']
+                if not self._stop:
+                    self._resize_workers(self.max_concurrent)
             if 'speed_limit' in config:
-                self.speed_limit = config['speed_limit']
-                
+                speed_limit = self._bytes_per_second(config['speed_limit'])
+                if speed_limit != self.speed_limit:
+                    self.speed_limit = speed_limit
+                    bandwidth_shaper.set_global_limit(speed_limit)
+                    
+    @staticmethod
+    def _bytes_per_second(speed_limit: Optional[float]) -> int:
+        """把设置中的速度限制(KB/s)转换为字节/秒，0或None表示不限速。"""
+        return int((speed_limit or 0) * 1024)
+        
+
     def add_task(self, url: str, save_path: str) -> str:
         """添加下载任务。
         
@@ -48,6 +73,9 @@ class DownloadScheduler:
             
         Returns:
             str: 任务ID
+            
+        Raises:
+            RuntimeError: 调度器已停止
         """
         from .task import DownloadTask
         
@@ -58,6 +86,8 @@ class DownloadScheduler:
         )
         
         with self._lock:
+            if self._stop:
+                raise RuntimeError("调度器已停止")
             self._active_tasks[task.id] = task
             self._queue.put(task)
             
@@ -103,1946 +133,168 @@ class DownloadScheduler:
         return 'unknown'
         
     def _start_worker(self):
-        """启动工作线程。"""
-        from threading import Thread
+        """按最大并发数启动工作线程池。"""
+        with self._lock:
+            self._resize_workers(self.max_concurrent)
+            
+    def _resize_workers(self, size: int):
+        """调整工作线程数量（调用方需持有锁）。
         
-        def worker():
-            while not self._stop:
-                try:
-                    # 获取任务
-                    task = self._queue.get()
-                    if task is None:
-                        break
-                        
-                    # 开始下载
-                    task.start()
-                    
-                    # 更新状态
+        扩容时立即启动新线程；缩容时空闲线程通过哨兵立即退出，
+        忙碌线程在完成当前任务后退出，不会中断正在进行的下载。
+        
+        Args:
+            size: 目标线程数
+        """
+        size = max(1, int(size))
+        self._workers = [w for w in self._workers if w.is_alive()]
+        current = len(self._workers) - self._retire
+        
+        if size > current:
+            # 优先撤销尚未执行的退出请求
+            revoke = min(self._retire, size - current)
+            self._retire -= revoke
+            for _ in range(size - current - revoke):
+                self._worker_seq += 1
+                worker = Thread(
+                    target=self._worker_loop,
+                    name=f"download-worker-{self._worker_seq}",
+                    daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
+        elif size < current:
+            count = current - size
+            self._retire += count
+            for _ in range(count):
+                self._queue.put(None)
+                
+    def _should_retire(self) -> bool:
+        """检查当前线程是否需要退出（调用方需持有锁）。"""
+        if self._retire > 0:
+            self._retire -= 1
+            return True
+        return False
+        
+    def _worker_loop(self):
+        """工作线程主循环。"""
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    # 哨兵：缩容或停止时退出，过期的哨兵直接忽略
                     with self._lock:
-                        if task.is_completed:
-                            self._completed_tasks[task.id] = task
-                            del self._active_tasks[task.id]
-                        elif task.is_failed:
-                            self._failed_tasks[task.id] = task
-                            del self._active_tasks[task.id]
-                            
-                except Exception as e:
-                    logger.error(f"下载任务失败: {e}")
+                        if self._should_retire():
+                            return
+                    continue
                     
+                with self._lock:
+                    self._busy += 1
+                try:
+                    self._process_task(task)
                 finally:
-                    self._queue.task_done()
+                    with self._lock:
+                        self._busy -= 1
+                        retire = self._should_retire()
+                        
+                if retire:
+                    return
                     
-        self._worker = Thread(target=worker, daemon=True)
-        self._worker.start()
-
-    def _stop_worker(self):
-        # Implementation of _stop_worker method
-        pass
-
-    def _enqueue_task(self, task):
-        # Implementation of _enqueue_task method
-        pass
-
-    def _dequeue_task(self):
-        # Implementation of _dequeue_task method
-        pass
-
+            finally:
+                self._queue.task_done()
+                with self._idle:
+                    if self._busy == 0 and self._queue.unfinished_tasks == 0:
+                        self._idle.notify_all()
+                        
     def _process_task(self, task):
-        # Implementation of _process_task method
-        pass
-
-    def _handle_completed_task(self, task):
-        # Implementation of _handle_completed_task method
-        pass
-
-    def _handle_failed_task(self, task):
-        # Implementation of _handle_failed_task method
-        pass
-
-    def _update_task_status(self, task):
-        # Implementation of _update_task_status method
-        pass
-
-    def _get_task_status(self, task):
-        # Implementation of _get_task_status method
-        pass
-
-    def _get_all_tasks(self):
-        # Implementation of _get_all_tasks method
-        pass
-
-    def _get_active_tasks(self):
-        # Implementation of _get_active_tasks method
-        pass
-
-    def _get_completed_tasks(self):
-        # Implementation of _get_completed_tasks method
-        pass
-
-    def _get_failed_tasks(self):
-        # Implementation of _get_failed_tasks method
-        pass
-
-    def _get_queue_size(self):
-        # Implementation of _get_queue_size method
-        pass
-
-    def _get_speed_limit(self):
-        # Implementation of _get_speed_limit method
-        pass
-
-    def _get_max_concurrent(self):
-        # Implementation of _get_max_concurrent method
-        pass
-
-    def _get_worker_status(self):
-        # Implementation of _get_worker_status method
-        pass
-
-    def _get_worker_progress(self):
-        # Implementation of _get_worker_progress method
-        pass
-
-    def _get_worker_speed(self):
-        # Implementation of _get_worker_speed method
-        pass
-
-    def _get_worker_queue_size(self):
-        # Implementation of _get_worker_queue_size method
-        pass
-
-    def _get_worker_active_tasks(self):
-        # Implementation of _get_worker_active_tasks method
-        pass
-
-    def _get_worker_completed_tasks(self):
-        # Implementation of _get_worker_completed_tasks method
-        pass
-
-    def _get_worker_failed_tasks(self):
-        # Implementation of _get_worker_failed_tasks method
-        pass
-
-    def _get_worker_queue_tasks(self):
-        # Implementation of _get_worker_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_status(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_status method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_progress(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_progress method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_speed(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_task_speed method
-        pass
-
-    def _get_worker_queue_task_queue_task_queue_task_queue_size(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_queue_size method
-        pass
-
-    def _get_worker_queue_task_queue_task_active_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_active_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_completed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_completed_tasks method
-        pass
-
-    def _get_worker_queue_task_queue_task_failed_tasks(self, task):
-        # Implementation of _get_worker_queue_task_queue_task_queue_task_queue_task_failed_tasks method
-        pass
+        """执行单个下载任务并归档结果。
+        
+        Args:
+            task: 下载任务
+        """
+        try:
+            task.start()
+        except Exception as e:
+            logger.error(f"下载任务失败: {e}")
+            
+        with self._lock:
+            if task.is_completed:
+                self._completed_tasks[task.id] = task
+                self._active_tasks.pop(task.id, None)
+            elif task.is_failed or task.is_canceled:
+                self._failed_tasks[task.id] = task
+                self._active_tasks.pop(task.id, None)
+                
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """等待队列中的任务全部执行完毕。
+        
+        Args:
+            timeout: 最长等待时间(秒)，None表示一直等待
+            
+        Returns:
+            bool: 是否在超时前完成
+        """
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: self._busy == 0 and self._queue.unfinished_tasks == 0,
+                timeout=timeout
+            )
+            
+    def stop(self, drain: bool = False, timeout: Optional[float] = None):
+        """停止调度器。
+        
+        Args:
+            drain: 是否先执行完已排队的任务，False时取消尚未开始的任务
+            timeout: 等待工作线程退出的最长时间(秒)
+        """
+        with self._lock:
+            self._stop = True
+            
+        if drain:
+            self.drain(timeout)
+        else:
+            self._cancel_pending()
+            
+        with self._lock:
+            workers = [w for w in self._workers if w.is_alive()]
+            self._retire = len(workers)
+            for _ in workers:
+                self._queue.put(None)
+                
+        for worker in workers:
+            worker.join(timeout)
+            
+    def _cancel_pending(self):
+        """取消所有尚未开始的任务。"""
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except Empty:
+                break
+            try:
+                if task is not None:
+                    task.cancel()
+                    with self._lock:
+                        self._failed_tasks[task.id] = task
+                        self._active_tasks.pop(task.id, None)
+            finally:
+                self._queue.task_done()
+                
+    def get_stats(self) -> Dict[str, Any]:
+        """获取队列深度和线程利用率快照。
+        
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        with self._lock:
+            workers = sum(1 for w in self._workers if w.is_alive())
+            return {
+                'queue_depth': self._queue.qsize() - self._queue.queue.count(None),
+                'workers': workers,
+                'busy_workers': self._busy,
+                'utilization': self._busy / workers if workers else 0.0,
+                'max_concurrent': self.max_concurrent,
+                'active_tasks': len(self._active_tasks),
+                'completed_tasks': len(self._completed_tasks),
+                'failed_tasks': len(self._failed_tasks)
+            }
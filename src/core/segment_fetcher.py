@@ -0,0 +1,200 @@
+"""分片并发下载模块。
+
+用于HLS/DASH等由大量小分片组成的流媒体。多个分片通过共享会话的连接池并发下载，
+完成后按原始顺序交给写入函数，乱序完成的分片暂存在重排缓冲区中。
+
+同时在途和缓冲的分片数量不超过窗口大小，内存占用约为 ``窗口大小 × 分片大小``。
+传入并发控制器时，同时进行的请求数由控制器按主机的吞吐和限流情况动态调整，
+同一主机上的多个下载器和调度器共享控制器的在途计数。
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, Callable, Iterable, Deque, Tuple
+
+import requests
+
+from .concurrency import AIMDController
+from .exceptions import DownloadError
+from .host_queue import host_key
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentFetcher:
+    """有序分片并发下载器。
+
+    Attributes:
+        session: requests.Session, 共享的HTTP会话
+        concurrency: int, 并发下载数，使用并发控制器时为初始并发数
+        controller: Optional[AIMDController], 并发控制器
+        window: int, 在途及待写入分片的最大数量
+        max_retries: int, 每个分片的最大尝试次数
+        timeout: int, 请求超时时间(秒)
+        headers: Dict[str, str], 附加请求头
+        proxies: Optional[Dict[str, str]], 代理设置
+    """
+
+    DEFAULT_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        session: requests.Session,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = 3,
+        timeout: int = 30,
+        headers: Optional[Dict[str, str]] = None,
+        proxies: Optional[Dict[str, str]] = None,
+        window: Optional[int] = None,
+        controller: Optional[AIMDController] = None
+    ):
+        """初始化下载器。
+
+        Args:
+            session: 共享的HTTP会话，连接池大小应不小于并发数
+            concurrency: 并发下载数
+            max_retries: 每个分片的最大尝试次数
+            timeout: 请求超时时间(秒)
+            headers: 附加请求头
+            proxies: 代理设置
+            window: 在途及待写入分片的最大数量，默认为并发数的2倍
+            controller: 并发控制器，None时固定使用concurrency
+        """
+        self.session = session
+        self.concurrency = max(1, concurrency)
+        self.controller = controller
+        # 使用控制器时线程数按控制器允许的最大并发分配，实际并发由控制器限制
+        self._max_workers = max(self.concurrency, controller.max_limit if controller else 0)
+        self.window = max(self._max_workers, window or self.concurrency * 2)
+        self.max_retries = max(1, max_retries)
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.proxies = proxies
+        self._abort = threading.Event()
+
+    def _get(self, url: str) -> bytes:
+        """请求分片，使用控制器时报告状态码、延迟和字节数。"""
+        if self.controller is None:
+            response = self.session.get(
+                url,
+                headers=self.headers,
+                proxies=self.proxies,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.content
+
+        key = host_key(url)
+        if not self.controller.acquire(key, self.concurrency, cancel=self._abort):
+            raise DownloadError("分片下载已中止")
+        status = None
+        latency = 0.0
+        try:
+            started = time.monotonic()
+            response = self.session.get(
+                url,
+                headers=self.headers,
+                proxies=self.proxies,
+                timeout=self.timeout,
+                stream=True
+            )
+            latency = time.monotonic() - started
+            status = response.status_code
+            response.raise_for_status()
+            data = response.content
+            self.controller.add_bytes(key, len(data))
+            return data
+        except requests.exceptions.HTTPError:
+            raise
+        except requests.exceptions.RequestException:
+            # 连接失败，或读取数据时超时、断开
+            status = None
+            raise
+        finally:
+            self.controller.end(key, status, latency)
+
+    def _fetch(self, index: int, url: str) -> bytes:
+        """下载单个分片，失败时按递增间隔重试。
+
+        Args:
+            index: 分片序号
+            url: 分片URL
+
+        Returns:
+            bytes: 分片数据
+
+        Raises:
+            DownloadError: 重试次数用尽
+        """
+        for attempt in range(self.max_retries):
+            if self._abort.is_set():
+                raise DownloadError("分片下载已中止")
+            try:
+                return self._get(url)
+            except requests.exceptions.RequestException as e:
+                if attempt == self.max_retries - 1:
+                    raise DownloadError(f"下载片段失败: {index} - {str(e)}")
+                logger.warning(f"下载片段失败，重试 {attempt + 1}/{self.max_retries}: {index} - {str(e)}")
+                self._abort.wait(1 * (attempt + 1))
+
+    def fetch_ordered(
+        self,
+        urls: Iterable[str],
+        write: Callable[[bytes], Any],
+        on_segment: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """并发下载分片并按顺序写出。
+
+        Args:
+            urls: 分片URL，按播放顺序排列
+            write: 写入函数，按顺序接收每个分片的数据
+            on_segment: 每写出一个分片后的回调，参数为(已写出分片数, 分片字节数)
+
+        Returns:
+            int: 写出的分片数
+
+        Raises:
+            DownloadError: 任一分片下载失败
+        """
+        self._abort.clear()
+        pending: Deque[Tuple[int, Future]] = deque()
+        url_iter = enumerate(urls)
+        written = 0
+
+        def submit_next(executor: ThreadPoolExecutor) -> bool:
+            item = next(url_iter, None)
+            if item is None:
+                return False
+            index, url = item
+            pending.append((index, executor.submit(self._fetch, index, url)))
+            return True
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            try:
+                while len(pending) < self.window and submit_next(executor):
+                    pass
+
+                # 队首分片完成后写出并补充一个新分片，队列即为重排缓冲区
+                while pending:
+                    index, future = pending.popleft()
+                    data = future.result()
+                    write(data)
+                    written += 1
+                    if on_segment:
+                        on_segment(written, len(data))
+                    del data
+                    submit_next(executor)
+            except BaseException:
+                self._abort.set()
+                for _, future in pending:
+                    future.cancel()
+                raise
+
+        return written
+
+    def abort(self) -> None:
+        """中止正在进行的下载。"""
+        self._abort.set()
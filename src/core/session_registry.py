@@ -0,0 +1,233 @@
+"""HTTP会话注册表模块。
+
+进程内所有下载器和插件共用的HTTP会话：
+1. 按(平台, 会话配置名, 代理)缓存requests会话，同一平台的下载器复用已建立的长连接
+2. 连接池按主机限制连接数，超过上限的请求等待空闲连接
+3. 同一平台的会话共享一个Cookie容器
+4. 异步插件按(平台, 事件循环)获取共享的aiohttp会话
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from requests.packages.urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRegistry:
+    """HTTP会话注册表。
+
+    Attributes:
+        max_per_host: int, 每个主机的最大连接数
+        pool_connections: int, 每个会话缓存的主机连接池数量
+        pool_block: bool, 连接数达到上限时是否等待空闲连接
+    """
+
+    DEFAULT_MAX_PER_HOST = 16
+    DEFAULT_POOL_CONNECTIONS = 32
+
+    def __init__(
+        self,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_block: bool = True
+    ):
+        """初始化注册表。
+
+        Args:
+            max_per_host: 每个主机的最大连接数
+            pool_connections: 每个会话缓存的主机连接池数量
+            pool_block: 连接数达到上限时是否等待空闲连接
+        """
+        self.max_per_host = max_per_host
+        self.pool_connections = pool_connections
+        self.pool_block = pool_block
+        self._sessions: Dict[Tuple[str, str, Optional[str]], requests.Session] = {}
+        self._jars: Dict[str, RequestsCookieJar] = {}
+        # 值中保留事件循环的引用，避免循环被回收后id被复用
+        self._async_sessions: Dict[
+            Tuple[str, int], Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]
+        ] = {}
+        self._lock = threading.RLock()
+
+    def make_adapter(
+        self,
+        max_retries: Optional[Retry] = None,
+        pool_maxsize: Optional[int] = None
+    ) -> HTTPAdapter:
+        """创建带连接数上限的适配器。
+
+        Args:
+            max_retries: 重试策略
+            pool_maxsize: 每个主机的最大连接数，默认使用max_per_host
+
+        Returns:
+            HTTPAdapter: 适配器
+        """
+        return HTTPAdapter(
+            max_retries=max_retries if max_retries is not None else 0,
+            pool_connections=self.pool_connections,
+            pool_maxsize=pool_maxsize or self.max_per_host,
+            pool_block=self.pool_block
+        )
+
+    def cookie_jar(self, platform: str) -> RequestsCookieJar:
+        """获取平台共享的Cookie容器。
+
+        Args:
+            platform: 平台标识
+
+        Returns:
+            RequestsCookieJar: Cookie容器
+        """
+        with self._lock:
+            jar = self._jars.get(platform)
+            if jar is None:
+                jar = RequestsCookieJar()
+                self._jars[platform] = jar
+            return jar
+
+    def _default_session(self) -> requests.Session:
+        """创建默认配置的会话。"""
+        session = requests.Session()
+        adapter = self.make_adapter(Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST", "HEAD"]
+        ))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get(
+        self,
+        platform: str,
+        proxy: Optional[str] = None,
+        factory: Optional[Callable[[], requests.Session]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        name: str = "default"
+    ) -> requests.Session:
+        """获取共享会话，不存在时创建。
+
+        Args:
+            platform: 平台标识
+            proxy: 代理地址
+            factory: 会话工厂，只在首次创建时调用，默认使用通用配置
+            cookies: 合并到平台Cookie容器的Cookie
+            name: 会话配置名，同一平台请求头等配置不同的会话用不同的名称，
+                共享同一个Cookie容器
+
+        Returns:
+            requests.Session: 共享会话
+        """
+        key = (platform, name, proxy)
+        with self._lock:
+            jar = self.cookie_jar(platform)
+            if cookies:
+                jar.update(cookies)
+
+            session = self._sessions.get(key)
+            if session is not None:
+                return session
+
+            session = factory() if factory else self._default_session()
+            if proxy:
+                session.proxies = {"http": proxy, "https": proxy}
+            jar.update(session.cookies)
+            session.cookies = jar
+            self._sessions[key] = session
+            logger.debug(f"创建共享会话: platform={platform}, name={name}, proxy={proxy}")
+            return session
+
+    async def get_async(
+        self,
+        platform: str,
+        limit: int = 100,
+        limit_per_host: Optional[int] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None
+    ) -> aiohttp.ClientSession:
+        """获取当前事件循环上的共享aiohttp会话。
+
+        aiohttp会话绑定在创建它的事件循环上，因此按(平台, 事件循环)缓存。
+        代理在请求时通过proxy参数指定。
+
+        Args:
+            platform: 平台标识
+            limit: 总连接数
+            limit_per_host: 每个主机的最大连接数，默认使用max_per_host
+            timeout: 超时设置，只在首次创建时生效
+
+        Returns:
+            aiohttp.ClientSession: 共享会话
+        """
+        loop = asyncio.get_running_loop()
+        key = (platform, id(loop))
+        with self._lock:
+            entry = self._async_sessions.get(key)
+            if entry is not None and not entry[0].closed:
+                return entry[0]
+            # 清理已关闭事件循环上的会话
+            for stale in [k for k, (_, l) in self._async_sessions.items() if l.is_closed()]:
+                del self._async_sessions[stale]
+            connector = aiohttp.TCPConnector(
+                limit=limit,
+                limit_per_host=limit_per_host or self.max_per_host,
+                ttl_dns_cache=300
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._async_sessions[key] = (session, loop)
+            return session
+
+    def close(self, platform: Optional[str] = None) -> None:
+        """关闭requests会话。
+
+        Args:
+            platform: 平台标识，None表示关闭所有会话
+        """
+        with self._lock:
+            keys = [k for k in self._sessions if platform is None or k[0] == platform]
+            sessions = [self._sessions.pop(k) for k in keys]
+        for session in sessions:
+            session.close()
+
+    async def aclose(self, platform: Optional[str] = None) -> None:
+        """关闭当前事件循环上的aiohttp会话。
+
+        Args:
+            platform: 平台标识，None表示关闭所有会话
+        """
+        loop_id = id(asyncio.get_running_loop())
+        with self._lock:
+            keys = [
+                k for k in self._async_sessions
+                if k[1] == loop_id and (platform is None or k[0] == platform)
+            ]
+            sessions = [self._async_sessions.pop(k)[0] for k in keys]
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息。
+
+        Returns:
+            Dict[str, Any]: 会话数量
+        """
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'async_sessions': len(self._async_sessions),
+                'cookie_jars': len(self._jars),
+            }
+
+
+# 全局会话注册表
+session_registry = SessionRegistry()
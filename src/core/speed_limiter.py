@@ -1,11 +1,13 @@
 """下载速度限制器模块。
 
-提供基于令牌桶算法的下载速度限制功能。
+提供基于令牌桶算法的下载速度限制功能，
+以及所有任务共享的全局分层带宽整形器。
 """
 
 import time
 import asyncio
-from typing import List, Tuple
+import threading
+from typing import List, Tuple, Dict, Any, Optional, Iterable
 from collections import deque
 
 class SpeedLimiter:
@@ -120,4 +122,215 @@ class SpeedLimiter:
         """重置速度限制器。"""
         self.token_bucket = self.speed_limit
         self.last_update = time.monotonic()
-        self.bytes_transferred.clear() 
\ No newline at end of file
+        self.bytes_transferred.clear() 
+
+class _RateBucket:
+    """单个层级的限速桶。
+    
+    使用GCRA(通用信元速率算法)记录理论到达时间，预约在O(1)内完成，
+    并允许在运行时修改速率。
+    
+    Attributes:
+        rate: float, 速率(bytes/s)
+        burst: float, 允许的突发时长(秒)
+        tat: float, 理论到达时间
+    """
+    
+    def __init__(self, rate: float, burst: float):
+        """初始化限速桶。
+        
+        Args:
+            rate: 速率(bytes/s)
+            burst: 允许的突发时长(秒)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tat = time.monotonic()
+        
+    def earliest(self, now: float) -> float:
+        """获取下一次预约最早可以开始的时间。"""
+        return max(now, self.tat - self.burst)
+        
+    def commit(self, start: float, size: int) -> None:
+        """在指定时间登记一次传输。"""
+        self.tat = max(self.tat, start) + size / self.rate
+
+
+class BandwidthShaper:
+    """全局分层带宽整形器。
+    
+    所有下载任务共享一个实例，限速分为三层：
+    
+    - 全局：所有任务总带宽
+    - 分组：按平台或主机名限速
+    - 任务：单个任务的上限
+    
+    每次传输需要同时满足所有相关层级，等待时间在锁内原子地计算，
+    在锁外等待。未被占用的带宽可以被任何任务使用(work-conserving)。
+    同时支持同步和asyncio两种等待方式。
+    
+    Attributes:
+        burst: float, 各层级允许的突发时长(秒)
+    """
+    
+    def __init__(self, global_limit: Optional[float] = None, burst: float = 0.5):
+        """初始化带宽整形器。
+        
+        Args:
+            global_limit: 全局速度限制(bytes/s)，None或0表示不限速
+            burst: 允许的突发时长(秒)
+        """
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._global: Optional[_RateBucket] = None
+        self._groups: Dict[str, _RateBucket] = {}
+        self._tasks: Dict[str, _RateBucket] = {}
+        self.set_global_limit(global_limit)
+        
+    def _set_bucket(self, buckets: Dict[str, _RateBucket], key: str, rate: Optional[float]) -> None:
+        """设置或移除指定层级的限速桶(调用方需持有锁)。"""
+        if rate and rate > 0:
+            bucket = buckets.get(key)
+            if bucket:
+                bucket.rate = float(rate)
+            else:
+                buckets[key] = _RateBucket(float(rate), self.burst)
+        else:
+            buckets.pop(key, None)
+            
+    def set_global_limit(self, rate: Optional[float]) -> None:
+        """设置全局速度限制。
+        
+        Args:
+            rate: 速度限制(bytes/s)，None或0表示不限速
+        """
+        with self._lock:
+            if rate and rate > 0:
+                if self._global:
+                    self._global.rate = float(rate)
+                else:
+                    self._global = _RateBucket(float(rate), self.burst)
+            else:
+                self._global = None
+                
+    def set_group_limit(self, group: str, rate: Optional[float]) -> None:
+        """设置平台或主机的速度限制。
+        
+        Args:
+            group: 平台标识或主机名
+            rate: 速度限制(bytes/s)，None或0表示不限速
+        """
+        with self._lock:
+            self._set_bucket(self._groups, group, rate)
+            
+    def set_task_limit(self, task_id: str, rate: Optional[float]) -> None:
+        """设置单个任务的速度限制。
+        
+        Args:
+            task_id: 任务标识
+            rate: 速度限制(bytes/s)，None或0表示不限速
+        """
+        with self._lock:
+            self._set_bucket(self._tasks, task_id, rate)
+            
+    def remove_task(self, task_id: str) -> None:
+        """移除任务的速度限制。
+        
+        Args:
+            task_id: 任务标识
+        """
+        with self._lock:
+            self._tasks.pop(task_id, None)
+            
+    def reserve(
+        self,
+        size: int,
+        task_id: Optional[str] = None,
+        groups: Iterable[str] = ()
+    ) -> float:
+        """预约传输带宽。
+        
+        Args:
+            size: 传输字节数
+            task_id: 任务标识
+            groups: 所属分组(平台、主机名等)
+            
+        Returns:
+            float: 调用方需要等待的秒数
+        """
+        # 未配置任何限速时无需加锁
+        if not (self._global or self._groups or self._tasks):
+            return 0.0
+            
+        with self._lock:
+            buckets = []
+            if self._global:
+                buckets.append(self._global)
+            for group in groups:
+                bucket = self._groups.get(group)
+                if bucket:
+                    buckets.append(bucket)
+            if task_id is not None:
+                bucket = self._tasks.get(task_id)
+                if bucket:
+                    buckets.append(bucket)
+                    
+            if not buckets:
+                return 0.0
+                
+            now = time.monotonic()
+            start = max(bucket.earliest(now) for bucket in buckets)
+            for bucket in buckets:
+                bucket.commit(start, size)
+            return start - now
+            
+    def consume(
+        self,
+        size: int,
+        task_id: Optional[str] = None,
+        groups: Iterable[str] = ()
+    ) -> None:
+        """同步等待传输带宽。
+        
+        Args:
+            size: 传输字节数
+            task_id: 任务标识
+            groups: 所属分组
+        """
+        delay = self.reserve(size, task_id, groups)
+        if delay > 0:
+            time.sleep(delay)
+            
+    async def consume_async(
+        self,
+        size: int,
+        task_id: Optional[str] = None,
+        groups: Iterable[str] = ()
+    ) -> None:
+        """异步等待传输带宽。
+        
+        Args:
+            size: 传输字节数
+            task_id: 任务标识
+            groups: 所属分组
+        """
+        delay = self.reserve(size, task_id, groups)
+        if delay > 0:
+            await asyncio.sleep(delay)
+            
+    def get_limits(self) -> Dict[str, Any]:
+        """获取当前限速配置。
+        
+        Returns:
+            Dict[str, Any]: 各层级的速度限制(bytes/s)
+        """
+        with self._lock:
+            return {
+                'global': self._global.rate if self._global else None,
+                'groups': {key: bucket.rate for key, bucket in self._groups.items()},
+                'tasks': {key: bucket.rate for key, bucket in self._tasks.items()}
+            }
+
+
+# 创建全局带宽整形器实例
+bandwidth_shaper = BandwidthShaper()
@@ -0,0 +1,402 @@
+"""持久化任务队列模块。
+
+调度器的排队任务保存在SQLite(WAL模式)中，崩溃或重启后可以恢复：
+1. 入队、心跳和状态变更先进入内存批次，每隔commit_interval或攒满batch_size
+   后在一个事务中提交，大量入队不会逐条fsync
+2. 正在下载的任务持有租约，下载过程中通过心跳续租并记录已下载字节数
+3. 启动时一次UPDATE把过期或持有者进程已退出的租约放回队列，
+   再按优先级一次读出所有待执行任务，中断的任务带着进度重新排队
+
+已完成的任务直接删除，数据库只保留未完成和失败的任务。
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Any, Union
+
+logger = logging.getLogger(__name__)
+
+# 任务状态
+QUEUED = "queued"
+LEASED = "leased"
+PAUSED = "paused"
+FAILED = "failed"
+
+
+# 进程启动时生成的随机数，区分进程号相同的前后两次运行
+_PROCESS_NONCE = uuid.uuid4().hex[:12]
+
+
+def _default_owner() -> str:
+    """当前进程的租约持有者标识，格式为 ``主机名:进程号:随机数``。"""
+    return f"{socket.gethostname()}:{os.getpid()}:{_PROCESS_NONCE}"
+
+
+def _owner_alive(owner: str) -> bool:
+    """判断租约持有者是否仍在运行。
+
+    容器重启后进程号往往与上次相同(例如都是1)，因此进程号等于本进程
+    但随机数不同的持有者视为已退出。同一主机上的其他持有者只在进程号
+    已不存在时视为已退出，否则等租约过期。
+    其他主机上的持有者无法判断，视为存活，只能等租约过期。
+    """
+    host, _, rest = owner.partition(":")
+    if host != socket.gethostname():
+        return True
+    pid = rest.split(":", 1)[0]
+    if not pid.isdigit():
+        return True
+    pid = int(pid)
+    if pid == os.getpid():
+        return owner == _default_owner()
+    if os.name == 'nt':
+        # Windows上无法用信号0探测进程
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # 没有权限发送信号说明进程存在
+        return True
+    return True
+
+
+@dataclass
+class QueuedTask:
+    """从队列中恢复的任务。
+
+    Attributes:
+        id: 任务ID
+        priority: 优先级，数值越小越先执行
+        payload: 任务参数
+        progress: 中断前记录的进度，例如已下载字节数
+        attempts: 已被租用的次数
+        state: 任务状态，QUEUED或PAUSED
+    """
+
+    id: str
+    priority: int
+    payload: Dict[str, Any]
+    progress: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    state: str = QUEUED
+
+
+class DurableTaskQueue:
+    """基于SQLite的持久化任务队列。
+
+    线程安全。写操作按批提交，调用flush可以立即提交。
+
+    Attributes:
+        db_path: Path, 数据库路径
+        owner: str, 本进程的租约持有者标识
+        lease_time: float, 租约有效期(秒)，超过该时间没有心跳的任务会被收回
+        batch_size: int, 攒满多少个写操作后立即提交
+        commit_interval: float, 批次最长等待时间(秒)
+    """
+
+    DEFAULT_LEASE_TIME = 60.0
+    DEFAULT_BATCH_SIZE = 500
+    DEFAULT_COMMIT_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        owner: Optional[str] = None,
+        lease_time: float = DEFAULT_LEASE_TIME,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        commit_interval: float = DEFAULT_COMMIT_INTERVAL
+    ):
+        """初始化队列。
+
+        Args:
+            db_path: 数据库路径
+            owner: 租约持有者标识，默认为主机名、进程号和本进程的随机数
+            lease_time: 租约有效期(秒)
+            batch_size: 攒满多少个写操作后立即提交
+            commit_interval: 批次最长等待时间(秒)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.owner = owner or _default_owner()
+        self.lease_time = lease_time
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # 待提交的写操作，心跳按任务ID合并
+        self._pending: List[tuple] = []
+        self._heartbeats: Dict[str, str] = {}
+        self._seq = 0
+        self._init_db()
+
+        self._closed = threading.Event()
+        self._wakeup = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="task-queue-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def _init_db(self) -> None:
+        """初始化数据库表。"""
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL模式下NORMAL只在检查点时fsync，断电最多丢失最后几个批次
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    priority INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    progress TEXT NOT NULL DEFAULT '{}',
+                    owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_state ON tasks (state, priority, seq)"
+            )
+            row = self._conn.execute("SELECT MAX(seq) FROM tasks").fetchone()
+            self._seq = row[0] or 0
+
+    def _add(self, sql: str, params: tuple) -> None:
+        """加入待提交批次，攒满时立即提交。"""
+        if self._closed.is_set():
+            logger.warning(f"任务队列已关闭，忽略写操作: {sql}")
+            return
+        with self._lock:
+            self._pending.append((sql, params))
+            full = len(self._pending) + len(self._heartbeats) >= self.batch_size
+        if full:
+            self.flush()
+
+    def _flush_loop(self) -> None:
+        """后台按间隔提交批次。"""
+        while not self._closed.is_set():
+            self._wakeup.wait(self.commit_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"提交任务队列失败: {e}")
+
+    def flush(self) -> None:
+        """在一个事务中提交所有待写入的操作。"""
+        with self._lock:
+            if not self._pending and not self._heartbeats:
+                return
+            pending, self._pending = self._pending, []
+            heartbeats, self._heartbeats = self._heartbeats, {}
+            now = time.time()
+            with self._conn:
+                for sql, params in pending:
+                    self._conn.execute(sql, params)
+                if heartbeats:
+                    self._conn.executemany(
+                        "UPDATE tasks SET progress = ?, lease_expires = ?, updated_at = ? "
+                        "WHERE id = ? AND state = ? AND owner = ?",
+                        [
+                            (progress, now + self.lease_time, now, task_id, LEASED, self.owner)
+                            for task_id, progress in heartbeats.items()
+                        ]
+                    )
+
+    def put(
+        self,
+        task_id: str,
+        payload: Dict[str, Any],
+        priority: int = 5,
+        progress: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """添加或替换任务。
+
+        Args:
+            task_id: 任务ID
+            payload: 任务参数，必须能序列化为JSON
+            priority: 优先级，数值越小越先执行
+            progress: 初始进度
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        self._add(
+            "INSERT OR REPLACE INTO tasks "
+            "(id, priority, seq, state, payload, progress, attempts, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+            (
+                task_id, priority, seq, QUEUED,
+                json.dumps(payload, ensure_ascii=False),
+                json.dumps(progress or {}),
+                time.time()
+            )
+        )
+
+    def lease(self, task_id: str) -> None:
+        """标记任务开始执行，由本进程持有租约。
+
+        Args:
+            task_id: 任务ID
+        """
+        self._add(
+            "UPDATE tasks SET state = ?, owner = ?, lease_expires = ?, "
+            "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+            (LEASED, self.owner, time.time() + self.lease_time, time.time(), task_id)
+        )
+
+    def heartbeat(self, task_id: str, progress: Optional[Dict[str, Any]] = None) -> None:
+        """续租并记录进度，同一批次内多次心跳只写最后一次。
+
+        Args:
+            task_id: 任务ID
+            progress: 当前进度
+        """
+        with self._lock:
+            self._heartbeats[task_id] = json.dumps(progress or {})
+
+    def release(
+        self,
+        task_id: str,
+        progress: Optional[Dict[str, Any]] = None,
+        paused: bool = False
+    ) -> None:
+        """交还租约，任务带着进度回到队列。
+
+        Args:
+            task_id: 任务ID
+            progress: 中断时的进度
+            paused: 是否为用户暂停，暂停的任务恢复时不会自动执行
+        """
+        with self._lock:
+            self._heartbeats.pop(task_id, None)
+        self._add(
+            "UPDATE tasks SET state = ?, owner = NULL, lease_expires = NULL, "
+            "progress = ?, updated_at = ? WHERE id = ?",
+            (PAUSED if paused else QUEUED, json.dumps(progress or {}), time.time(), task_id)
+        )
+
+    def complete(self, task_id: str) -> None:
+        """任务完成，从队列中删除。
+
+        Args:
+            task_id: 任务ID
+        """
+        self.remove(task_id)
+
+    def fail(self, task_id: str, error: str) -> None:
+        """任务失败，保留记录和错误信息。
+
+        Args:
+            task_id: 任务ID
+            error: 错误信息
+        """
+        with self._lock:
+            self._heartbeats.pop(task_id, None)
+        self._add(
+            "UPDATE tasks SET state = ?, owner = NULL, lease_expires = NULL, "
+            "error = ?, updated_at = ? WHERE id = ?",
+            (FAILED, error, time.time(), task_id)
+        )
+
+    def remove(self, task_id: str) -> None:
+        """删除任务。
+
+        Args:
+            task_id: 任务ID
+        """
+        with self._lock:
+            self._heartbeats.pop(task_id, None)
+        self._add("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def reclaim_expired(self) -> int:
+        """把过期或持有者已退出的租约放回队列。
+
+        Returns:
+            int: 收回的任务数
+        """
+        self.flush()
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, owner, lease_expires FROM tasks WHERE state = ?", (LEASED,)
+            ).fetchall()
+            stale = [
+                (task_id,) for task_id, owner, expires in rows
+                if (expires or 0) < now or not owner
+                or (owner != self.owner and not _owner_alive(owner))
+            ]
+            self._conn.executemany(
+                "UPDATE tasks SET state = ?, owner = NULL, lease_expires = NULL "
+                "WHERE id = ?",
+                [(QUEUED, task_id) for task_id, in stale]
+            )
+        if stale:
+            logger.info(f"收回 {len(stale)} 个中断的任务")
+        return len(stale)
+
+    def recover(self, include_paused: bool = False) -> List[QueuedTask]:
+        """收回中断的任务并读出所有待执行任务。
+
+        Args:
+            include_paused: 是否包含用户暂停的任务
+
+        Returns:
+            List[QueuedTask]: 按优先级和入队顺序排列的任务
+        """
+        self.reclaim_expired()
+        states = (QUEUED, PAUSED) if include_paused else (QUEUED,)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, priority, payload, progress, attempts, state FROM tasks "
+                f"WHERE state IN ({','.join('?' * len(states))}) ORDER BY priority, seq",
+                states
+            ).fetchall()
+        return [
+            QueuedTask(
+                id=task_id,
+                priority=priority,
+                payload=json.loads(payload),
+                progress=json.loads(progress),
+                attempts=attempts,
+                state=state
+            )
+            for task_id, priority, payload, progress, attempts, state in rows
+        ]
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取各状态的任务数。
+
+        Returns:
+            Dict[str, int]: 状态到任务数的映射
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM tasks GROUP BY state"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """提交剩余批次并关闭数据库，重复调用无副作用。"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wakeup.set()
+        self._flusher.join()
+        with self._lock:
+            self.flush()
+            self._conn.close()
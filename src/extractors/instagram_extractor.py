@@ -15,6 +15,7 @@ from pathlib import Path
 from ..utils.network import NetworkSession
 from ..utils.video import VideoProcessor
 from ..utils.metadata import MetadataCleaner
+from ..core import postprocess
 from ..exceptions import (
     ExtractError,
     LoginRequiredError,
@@ -69,6 +70,7 @@ class InstagramExtractor:
         session: 网络会话
         video_processor: 视频处理器
         metadata_cleaner: 元数据清理器
+        post_processor: 后处理阶段，设置后预处理在进程池中异步执行
     """
     
     # API端点
@@ -86,7 +88,8 @@ class InstagramExtractor:
         self,
         session: Optional[NetworkSession] = None,
         video_processor: Optional[VideoProcessor] = None,
-        metadata_cleaner: Optional[MetadataCleaner] = None
+        metadata_cleaner: Optional[MetadataCleaner] = None,
+        post_processor: Optional[postprocess.PostProcessor] = None
     ):
         """初始化提取器。
         
@@ -94,10 +97,12 @@ class InstagramExtractor:
             session: 网络会话，可选
             video_processor: 视频处理器，可选
             metadata_cleaner: 元数据清理器，可选
+            post_processor: 后处理阶段，可选
         """
         self.session = session or NetworkSession()
         self.video_processor = video_processor or VideoProcessor()
         self.metadata_cleaner = metadata_cleaner or MetadataCleaner()
+        self.post_processor = post_processor
         
     def download_story(
         self,
@@ -115,9 +120,12 @@ class InstagramExtractor:
         Returns:
             Dict[str, Any]: 下载结果，包含以下字段：
                 - url: 媒体URL
-                - file_path: 保存路径
+                - file_path: 保存路径，交给后处理阶段时原始文件会在处理后删除，
+                  任务成功后更新为处理后的文件路径
                 - expires_at: 过期时间
                 - metadata: 元数据
+                - postprocess: 设置了后处理阶段时为预处理任务的Future，
+                  完成后output为处理后的文件路径
                 
         Raises:
             LoginRequiredError: 需要登录
@@ -145,20 +153,38 @@ class InstagramExtractor:
                 f"{story_id}.{self._get_extension(metadata)}"
             )
             
-            # 应用预处理器
-            if preprocessors:
-                file_path = self._apply_preprocessors(
-                    file_path,
-                    preprocessors
-                )
-            
-            return {
+            result = {
                 'url': metadata.url,
                 'file_path': file_path,
                 'expires_at': metadata.expires_at,
                 'metadata': metadata.__dict__
             }
             
+            # 应用预处理器
+            if preprocessors and self.post_processor:
+                # 交给后处理进程池，下载线程立即返回
+                future = self.post_processor.submit_chain(
+                    file_path,
+                    self._preprocessor_steps(preprocessors),
+                    name=os.path.basename(file_path),
+                    keep_input=False
+                )
+                
+                def update_path(done):
+                    # 原始文件在处理后已删除，指向处理后的文件
+                    if done.exception() is None:
+                        result['file_path'] = done.result().output
+                        
+                future.add_done_callback(update_path)
+                result['postprocess'] = future
+            elif preprocessors:
+                result['file_path'] = self._apply_preprocessors(
+                    file_path,
+                    preprocessors
+                )
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Failed to download story {story_id}: {e}")
             if isinstance(e, (LoginRequiredError, ContentExpiredError, RateLimitError)):
@@ -259,6 +285,23 @@ class InstagramExtractor:
             logger.error(f"Failed to apply preprocessors: {e}")
             raise ExtractError(f"Failed to apply preprocessors: {e}")
     
+    def _preprocessor_steps(self, preprocessors: List[str]) -> List[tuple]:
+        """将预处理器名称转换为可在工作进程中执行的处理步骤。"""
+        functions = {
+            'remove_metadata': (
+                postprocess.clean_metadata,
+                (self.metadata_cleaner.output_dir, tuple(self.metadata_cleaner.keep_fields))
+            ),
+            'compress_1080p': (postprocess.compress_to_1080p, (self.video_processor.output_dir,))
+        }
+        steps = []
+        for preprocessor in preprocessors:
+            if preprocessor not in functions:
+                logger.warning(f"Unknown preprocessor: {preprocessor}")
+                continue
+            steps.append(functions[preprocessor])
+        return steps
+        
     def clean_metadata(self, file_path: str) -> str:
         """清理元数据。"""
         return self.metadata_cleaner.clean(file_path)
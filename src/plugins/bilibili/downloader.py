@@ -7,13 +7,11 @@ import os
 import time
 import json
 import logging
-import tempfile
 import threading
 import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable, List, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
 
 from src.core.downloader import BaseDownloader
 from src.core.exceptions import (
@@ -22,7 +20,10 @@ from src.core.exceptions import (
     DownloadCanceled
 )
 from src.core.config import DownloaderConfig
-from src.core.speed_limiter import SpeedLimiter
+from src.core.mirror_fetcher import MirrorRangeFetcher
+from src.core.remux import StreamRemuxer
+from src.core.segment_fetcher import SegmentFetcher
+from src.core.concurrency import concurrency_controller
 from .extractor import BilibiliExtractor
 from .danmaku import download_danmaku
 
@@ -39,7 +40,6 @@ class BilibiliDownloader(BaseDownloader):
         config: DownloaderConfig, 下载器配置
         extractor: BilibiliExtractor, 视频信息提取器
         ffmpeg_path: str, FFmpeg可执行文件路径
-        speed_limiter: Optional[SpeedLimiter], 速度限制器
     """
     
     # 清晰度代码映射
@@ -66,13 +66,14 @@ class BilibiliDownloader(BaseDownloader):
             sessdata: B站登录凭证，用于下载高清晰度视频
             ffmpeg_path: FFmpeg可执行文件路径
         """
-        super().__init__(save_dir=str(config.save_dir))
+        super().__init__(
+            platform="bilibili",
+            save_dir=str(config.save_dir),
+            speed_limit=config.speed_limit or None
+        )
         self.config = config
         self.extractor = BilibiliExtractor(sessdata=sessdata)
         self.ffmpeg_path = ffmpeg_path
-        self.speed_limiter = (
-            SpeedLimiter(config.speed_limit) if config.speed_limit > 0 else None
-        )
         self._temp_files = set()
         
     def get_video_info(self, url: str) -> Dict[str, Any]:
@@ -148,36 +149,41 @@ class BilibiliDownloader(BaseDownloader):
                 raise RuntimeError("该视频在当前地区不可用")
                 
             # 获取视频流信息
-            streams = self._get_video_streams(info["bvid"], info["cid"])
+            dash = self._get_dash(info["bvid"], info["cid"])
+            streams = dash.get("video") or []
             if not streams:
                 raise RuntimeError("无法获取视频流信息")
                 
             # 选择最高画质
             stream = self._select_best_quality(streams)
             
-            # 创建临时目录
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # 下载视频分段
-                segment_files = self._download_segments(
+            if stream.get("segments"):
+                # 分段流：边下载边封装
+                success = self._stream_segments(
                     stream["segments"],
-                    Path(temp_dir),
+                    save_path,
+                    progress_callback,
+                    cancel_event
+                )
+            else:
+                # DASH音视频轨道：并发下载后合并
+                success = self._download_dash(
+                    stream,
+                    self._select_best_audio(dash.get("audio") or []),
+                    save_path,
                     progress_callback,
                     cancel_event
                 )
                 
-                if not segment_files:
-                    if cancel_event and cancel_event.is_set():
-                        raise DownloadCanceled("用户取消下载")
-                    raise RuntimeError("视频分段下载失败")
-                    
-                # 合并视频分段
-                if not self._merge_segments(segment_files, save_path):
-                    raise RuntimeError("视频合并失败")
-                    
-                # 下载弹幕
-                danmaku_path = save_path.with_suffix(".xml")
-                if not download_danmaku(info["cid"], danmaku_path):
-                    logger.warning("弹幕下载失败")
+            if not success:
+                if cancel_event and cancel_event.is_set():
+                    raise DownloadCanceled("用户取消下载")
+                raise RuntimeError("视频分段下载失败")
+                
+            # 下载弹幕
+            danmaku_path = save_path.with_suffix(".xml")
+            if not download_danmaku(info["cid"], danmaku_path):
+                logger.warning("弹幕下载失败")
                     
             return True
             
@@ -221,6 +227,18 @@ class BilibiliDownloader(BaseDownloader):
         Returns:
             List[Dict[str, Any]]: 视频流信息列表
         """
+        return self._get_dash(bvid, cid).get("video") or []
+        
+    def _get_dash(self, bvid: str, cid: str) -> Dict[str, Any]:
+        """获取DASH流信息。
+        
+        Args:
+            bvid: BV号
+            cid: 视频CID
+            
+        Returns:
+            Dict[str, Any]: 包含video和audio轨道列表，失败时返回空字典
+        """
         try:
             params = {
                 "bvid": bvid,
@@ -237,11 +255,11 @@ class BilibiliDownloader(BaseDownloader):
             if response["code"] != 0:
                 raise RuntimeError(f"获取视频流失败: {response['message']}")
                 
-            return response["data"]["dash"]["video"]
+            return response["data"]["dash"]
             
         except Exception as e:
             logger.error(f"获取视频流失败: {e}")
-            return []
+            return {}
             
     def _select_best_quality(self, streams: List[Dict[str, Any]]) -> Dict[str, Any]:
         """选择最佳画质。
@@ -259,7 +277,7 @@ class BilibiliDownloader(BaseDownloader):
             raise RuntimeError("无可用视频流")
             
         # 按清晰度排序
-        streams.sort(key=lambda x: x["quality"], reverse=True)
+        streams.sort(key=lambda x: x.get("quality", x.get("id", 0)), reverse=True)
         
         # 选择可用的最高清晰度
         for stream in streams:
@@ -268,6 +286,33 @@ class BilibiliDownloader(BaseDownloader):
                 
         raise RuntimeError("所有视频流均不可用")
         
+    def _select_best_audio(self, streams: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """选择最佳音质。
+        
+        Args:
+            streams: 音频流列表
+            
+        Returns:
+            Optional[Dict[str, Any]]: 选中的音频流，没有音频轨道时返回None
+        """
+        if not streams:
+            return None
+        return max(streams, key=lambda x: (x.get("id", 0), x.get("bandwidth", 0)))
+        
+    @staticmethod
+    def _track_mirrors(track: Dict[str, Any]) -> List[str]:
+        """获取轨道的所有CDN地址。
+        
+        Args:
+            track: 轨道信息
+            
+        Returns:
+            List[str]: base_url在前，其后为backup_url
+        """
+        base_url = track.get("base_url") or track.get("baseUrl")
+        backups = track.get("backup_url") or track.get("backupUrl") or []
+        return [url for url in [base_url, *backups] if url]
+        
     def _check_stream_availability(self, stream: Dict[str, Any]) -> bool:
         """检查视频流是否可用。
         
@@ -278,8 +323,8 @@ class BilibiliDownloader(BaseDownloader):
             bool: 是否可用
         """
         try:
-            response = requests.head(
-                stream["base_url"],
+            response = self.session.head(
+                self._track_mirrors(stream)[0],
                 headers=self.extractor.headers,
                 proxies=self.extractor.proxies,
                 timeout=5
@@ -288,80 +333,94 @@ class BilibiliDownloader(BaseDownloader):
         except:
             return False
             
-    def _download_segments(
+    def _stream_segments(
         self,
         segments: List[Dict[str, Any]],
-        temp_dir: Path,
+        save_path: Path,
         progress_callback: Optional[Callable[[float], None]] = None,
         cancel_event: Optional[threading.Event] = None
-    ) -> List[Path]:
-        """下载视频分段。
+    ) -> bool:
+        """下载视频分段并直接送入FFmpeg封装。
+        
+        分段并发下载、按顺序写入FFmpeg标准输入，一次完成下载和封装，
+        不再落地分段文件和concat列表。
         
         Args:
             segments: 分段信息列表
-            temp_dir: 临时目录
+            save_path: 保存路径
             progress_callback: 进度回调函数
             cancel_event: 取消事件
             
         Returns:
-            List[Path]: 分段文件路径列表
+            bool: 是否下载成功
             
         Raises:
             DownloadCanceled: 用户取消下载
         """
-        segment_files = []
         total_segments = len(segments)
+        if not total_segments:
+            return False
+            
+        fetcher = SegmentFetcher(
+            self.session,
+            concurrency=self.config.max_concurrent_downloads,
+            max_retries=self.max_retries,
+            timeout=self.config.timeout,
+            headers=self.extractor.headers,
+            proxies=self.extractor.proxies,
+            controller=concurrency_controller
+        )
         
-        with ThreadPoolExecutor(
-            max_workers=self.config.max_concurrent_downloads
-        ) as executor:
-            futures = []
-            
-            for i, segment in enumerate(segments):
-                segment_path = temp_dir / f"segment_{i:03d}.m4s"
-                self._temp_files.add(segment_path)
+        def on_segment(count: int, size: int) -> None:
+            if cancel_event and cancel_event.is_set():
+                fetcher.abort()
+                raise DownloadCanceled("用户取消下载")
                 
-                future = executor.submit(
-                    self._download_segment,
-                    segment["base_url"],
-                    segment_path,
-                    cancel_event
-                )
-                futures.append((future, segment_path, i))
+            # 从全局带宽整形器获取配额
+            self.shaper.consume(size, task_id=self._shaper_key, groups=self._shaper_groups)
+            
+            progress = count / total_segments
+            self.update_progress(progress, f"下载进度: {count}/{total_segments} 个分段")
+            if progress_callback:
+                progress_callback(progress)
                 
-            for future, path, index in futures:
-                try:
-                    if cancel_event and cancel_event.is_set():
-                        raise DownloadCanceled("用户取消下载")
-                        
-                    if future.result():
-                        segment_files.append(path)
-                        progress = (index + 1) / total_segments
-                        self.update_progress(
-                            progress,
-                            f"下载进度: {index + 1}/{total_segments} 个分段"
-                        )
-                    else:
-                        return []
-                except DownloadCanceled:
-                    raise
-                except Exception as e:
-                    logger.error(f"分段下载失败: {e}")
-                    return []
-                    
-        return sorted(segment_files)
-        
-    def _download_segment(
+        remuxer = StreamRemuxer(save_path, self.ffmpeg_path)
+        try:
+            remuxer.start()
+            fetcher.fetch_ordered(
+                [segment["base_url"] for segment in segments],
+                remuxer.write,
+                on_segment
+            )
+            remuxer.finish()
+            return True
+            
+        except DownloadCanceled:
+            remuxer.abort()
+            raise
+        except Exception as e:
+            logger.error(f"分段下载失败: {e}")
+            remuxer.abort()
+            return False
+            
+    def _download_dash(
         self,
-        url: str,
+        video: Dict[str, Any],
+        audio: Optional[Dict[str, Any]],
         save_path: Path,
+        progress_callback: Optional[Callable[[float], None]] = None,
         cancel_event: Optional[threading.Event] = None
     ) -> bool:
-        """下载视频分段。
+        """并发下载DASH音视频轨道并合并。
+        
+        每个轨道按Range分块并发下载，首块同时向base_url和所有backup_url请求，
+        锁定最快的CDN；传输停滞的镜像会被自动切换。
         
         Args:
-            url: 分段URL
+            video: 视频轨道
+            audio: 音频轨道，可选
             save_path: 保存路径
+            progress_callback: 进度回调函数
             cancel_event: 取消事件
             
         Returns:
@@ -370,102 +429,106 @@ class BilibiliDownloader(BaseDownloader):
         Raises:
             DownloadCanceled: 用户取消下载
         """
-        try:
-            response = requests.get(
-                url,
+        abort_event = threading.Event()
+        tracks = [("video", video)] + ([("audio", audio)] if audio else [])
+        fetchers = {}
+        paths = {}
+        for name, track in tracks:
+            paths[name] = save_path.with_name(f"{save_path.stem}.{name}.m4s")
+            self._temp_files.add(paths[name])
+            fetchers[name] = MirrorRangeFetcher(
+                self.session,
+                self._track_mirrors(track),
+                concurrency=self.config.max_concurrent_downloads,
+                stall_timeout=self.config.timeout,
+                max_retries=self.max_retries,
                 headers=self.extractor.headers,
-                proxies=self.extractor.proxies,
-                stream=True,
-                timeout=self.config.timeout
+                proxies=self.extractor.proxies
             )
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get("content-length", 0))
-            downloaded_size = 0
-            
-            with open(save_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=self.config.chunk_size):
-                    if cancel_event and cancel_event.is_set():
-                        raise DownloadCanceled("用户取消下载")
-                        
-                    if self.speed_limiter:
-                        self.speed_limiter.wait_sync(len(chunk))
-                        
-                    f.write(chunk)
-                    downloaded_size += len(chunk)
-                    
-                    if total_size:
-                        progress = downloaded_size / total_size
-                        speed = (
-                            self.speed_limiter.current_speed if self.speed_limiter
-                            else 0
-                        )
-                        self.update_progress(
-                            progress,
-                            f"下载进度: {downloaded_size}/{total_size} bytes"
-                            f" ({speed/1024:.1f} KB/s)"
-                        )
-                        
-            return True
             
+        progress_lock = threading.Lock()
+        downloaded = 0
+        
+        def on_chunk(size: int) -> None:
+            nonlocal downloaded
+            if cancel_event and cancel_event.is_set():
+                abort_event.set()
+                raise DownloadCanceled("用户取消下载")
+                
+            # 从全局带宽整形器获取配额
+            self.shaper.consume(size, task_id=self._shaper_key, groups=self._shaper_groups)
+            with progress_lock:
+                downloaded += size
+                total = sum(fetcher.total_size for fetcher in fetchers.values())
+                progress = downloaded / total if total else 0
+            self.update_progress(progress, f"下载进度: {downloaded}/{total} bytes")
+            if progress_callback:
+                progress_callback(progress)
+                
+        try:
+            with ThreadPoolExecutor(max_workers=len(tracks)) as executor:
+                futures = [
+                    executor.submit(fetchers[name].download, paths[name], on_chunk, abort_event)
+                    for name, _ in tracks
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    # 一个轨道失败时中止另一个轨道
+                    abort_event.set()
+                    raise
         except Exception as e:
-            logger.error(f"下载分段失败: {e}")
-            if save_path.exists():
-                save_path.unlink()
+            if cancel_event and cancel_event.is_set():
+                raise DownloadCanceled("用户取消下载")
+            logger.error(f"轨道下载失败: {e}")
+            return False
+            
+        if not self._mux_tracks(paths["video"], paths.get("audio"), save_path):
             return False
             
-    def _merge_segments(
+        for path in paths.values():
+            path.unlink(missing_ok=True)
+            self._temp_files.discard(path)
+        return True
+        
+    def _mux_tracks(
         self,
-        segment_files: List[Path],
+        video_path: Path,
+        audio_path: Optional[Path],
         output_path: Path
     ) -> bool:
-        """合并视频分段。
+        """合并音视频轨道。
         
         Args:
-            segment_files: 分段文件路径列表
+            video_path: 视频轨道文件
+            audio_path: 音频轨道文件，可选
             output_path: 输出文件路径
             
         Returns:
             bool: 是否合并成功
         """
+        cmd = [self.ffmpeg_path, "-i", str(video_path)]
+        if audio_path:
+            cmd += ["-i", str(audio_path)]
+        cmd += ["-c", "copy", "-y", str(output_path)]
+        
         try:
-            # 准备FFmpeg命令
-            concat_file = output_path.with_suffix(".txt")
-            self._temp_files.add(concat_file)
-            
-            # 写入concat文件
-            with open(concat_file, "w", encoding="utf-8") as f:
-                for file in segment_files:
-                    f.write(f"file '{file.absolute()}'\n")
-                    
-            # 执行合并
-            cmd = [
-                self.ffmpeg_path,
-                "-f", "concat",
-                "-safe", "0",
-                "-i", str(concat_file),
-                "-c", "copy",
-                "-y",
-                str(output_path)
-            ]
-            
             result = subprocess.run(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True
             )
-            
-            if result.returncode != 0:
-                logger.error(f"合并失败: {result.stderr}")
-                return False
-                
-            return True
-            
         except Exception as e:
             logger.error(f"合并失败: {e}")
             return False
             
+        if result.returncode != 0:
+            logger.error(f"合并失败: {result.stderr}")
+            return False
+        return True
+        
     def _make_request(self, url: str, **kwargs) -> Dict[str, Any]:
         """发送API请求。
         
@@ -480,7 +543,7 @@ class BilibiliDownloader(BaseDownloader):
             RuntimeError: 请求失败
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=self.extractor.headers,
                 proxies=self.extractor.proxies,
@@ -19,6 +19,7 @@ class PornhubDownloaderConfig:
         output_template: 输出文件名模板
         merge_output_format: 视频合并输出格式
         cookies_file: Cookies 文件路径
+        segment_concurrency: m3u8片段并发下载数
     """
     
     save_dir: Path
@@ -27,4 +28,5 @@ class PornhubDownloaderConfig:
     max_retries: int = 3
     output_template: str = "%(uploader)s/%(title)s-%(id)s.%(ext)s"
     merge_output_format: str = "mp4"
-    cookies_file: Optional[str] = None 
\ No newline at end of file
+    cookies_file: Optional[str] = None
+    segment_concurrency: int = 8 
\ No newline at end of file
@@ -19,11 +19,14 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs, urlencode
 import asyncio
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from src.core.downloader import BaseDownloader, DownloadTask, DownloadStatus
 from src.core.exceptions import DownloadError
+from src.core.segment_fetcher import SegmentFetcher
+from src.core.concurrency import concurrency_controller
+from src.core.remux import StreamRemuxer
+from src.core.session_registry import session_registry
 from src.utils.cookie_manager import CookieManager
 from .config import PornhubDownloaderConfig
 
@@ -157,12 +160,10 @@ class PornhubDownloader(BaseDownloader):
             allowed_methods=["GET", "POST", "HEAD"]
         )
         
-        # 创建适配器
-        adapter = HTTPAdapter(
-            max_retries=retry,
-            pool_connections=10,
-            pool_maxsize=10,
-            pool_block=False
+        # 创建适配器，连接池需容纳所有并发的分片请求
+        adapter = session_registry.make_adapter(
+            retry,
+            pool_maxsize=max(session_registry.max_per_host, self.config.segment_concurrency)
         )
         
         # 配置适配器
@@ -191,10 +192,11 @@ class PornhubDownloader(BaseDownloader):
 
         专门用于处理m3u8流媒体下载，支持：
         - 自动提取base_uri
+        - 片段并发下载、按序写入
         - 片段重试和恢复
         - 详细的进度显示
         - 自定义HTTP头
-        - 视频格式转换
+        - 边下载边通过FFmpeg封装为mp4(找不到FFmpeg时保存为ts)
 
         Args:
             m3u8_url: m3u8文件URL
@@ -216,19 +218,12 @@ class PornhubDownloader(BaseDownloader):
             uploader_dir = self.save_dir / self._sanitize_filename(uploader)
             uploader_dir.mkdir(parents=True, exist_ok=True)
             
-            # 生成临时ts文件路径
-            temp_ts = uploader_dir / f"{video_id}_temp.ts"
-            
-            # 生成最终mp4文件路径
-            final_filename = f"{self._sanitize_filename(title)}-{video_id}.mp4"
-            output_file = uploader_dir / final_filename
+            # 生成最终文件路径
+            base_name = f"{self._sanitize_filename(title)}-{video_id}"
+            output_file = uploader_dir / f"{base_name}.mp4"
 
             # 下载m3u8文件
-            response = requests.get(
-                m3u8_url,
-                proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None,
-                timeout=self.timeout
-            )
+            response = self.session.get(m3u8_url, timeout=self.timeout)
             response.raise_for_status()
             
             # 从URL中提取base_uri
@@ -240,85 +235,69 @@ class PornhubDownloader(BaseDownloader):
             if not playlist or not playlist.segments:
                 raise DownloadError("无效的m3u8文件")
                 
+            # 收集片段URL（手动处理base_uri）
+            segment_urls = []
+            for segment in playlist.segments:
+                if not isinstance(segment, m3u8.model.Segment) or not segment.uri:
+                    logger.warning(f"跳过无效片段: {segment}")
+                    continue
+                segment_url = segment.uri
+                if not segment_url.startswith(('http://', 'https://')):
+                    segment_url = urljoin(base_uri, segment_url)
+                segment_urls.append(segment_url)
+                
+            if not segment_urls:
+                raise DownloadError("没有可下载的片段")
+                
             # 准备下载
-            total_segments = len(playlist.segments)
-            downloaded = 0
+            total_segments = len(segment_urls)
+            fetcher = SegmentFetcher(
+                self.session,
+                concurrency=self.config.segment_concurrency,
+                max_retries=self.max_retries,
+                timeout=self.timeout,
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                    'Accept': '*/*',
+                    'Accept-Language': 'en-US,en;q=0.5',
+                    'Origin': f"{parsed_url.scheme}://{parsed_url.netloc}",
+                    'Referer': f"{parsed_url.scheme}://{parsed_url.netloc}/"
+                },
+                controller=concurrency_controller
+            )
             
-            # 下载所有片段
-            with open(temp_ts, 'wb') as f:
-                for segment in playlist.segments:
-                    if not isinstance(segment, m3u8.model.Segment):
-                        continue
-                        
-                    # 获取片段URL（手动处理base_uri）
-                    segment_url = segment.uri
-                    if not segment_url.startswith(('http://', 'https://')):
-                        segment_url = urljoin(base_uri, segment_url)
-                    
-                    if not segment_url:
-                        logger.warning(f"跳过无效片段: {segment}")
-                        continue
-                        
-                    # 下载片段
-                    for retry in range(self.max_retries):
-                        try:
-                            segment_response = requests.get(
-                                segment_url,
-                                proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None,
-                                timeout=self.timeout,
-                                headers={
-                                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                                    'Accept': '*/*',
-                                    'Accept-Language': 'en-US,en;q=0.5',
-                                    'Origin': f"{parsed_url.scheme}://{parsed_url.netloc}",
-                                    'Referer': f"{parsed_url.scheme}://{parsed_url.netloc}/"
-                                }
-                            )
-                            segment_response.raise_for_status()
-                            f.write(segment_response.content)
-                            break
-                        except requests.exceptions.RequestException as e:
-                            if retry == self.max_retries - 1:
-                                raise DownloadError(f"下载片段失败: {str(e)}")
-                            logger.warning(f"下载片段失败，重试 {retry + 1}/{self.max_retries}: {str(e)}")
-                            time.sleep(1 * (retry + 1))  # 递增等待时间
-                            
-                    # 更新进度
-                    downloaded += 1
-                    progress = downloaded / total_segments
-                    desc = f"下载进度: {downloaded}/{total_segments} ({progress:.1%})"
-                    
-                    if self.progress_callback:
-                        self.progress_callback(progress, desc)
-                    logger.debug(desc)
-                        
-            if downloaded == 0:
-                raise DownloadError("没有成功下载任何片段")
-                
-            # 转换格式
-            try:
-                import ffmpeg
+            def on_segment(count: int, size: int) -> None:
+                self._apply_speed_limit(size)
                 
                 # 更新进度
+                progress = count / total_segments
+                desc = f"下载进度: {count}/{total_segments} ({progress:.1%})"
                 if self.progress_callback:
-                    self.progress_callback(0.95, "正在转换视频格式...")
-                
-                # 使用ffmpeg转换为mp4
-                stream = ffmpeg.input(str(temp_ts))
-                stream = ffmpeg.output(stream, str(output_file), acodec='copy', vcodec='copy')
-                ffmpeg.run(stream, quiet=True, overwrite_output=True)
+                    self.progress_callback(progress, desc)
+                logger.debug(desc)
                 
-                # 删除临时ts文件
-                temp_ts.unlink()
+            # 启动FFmpeg，片段数据直接送入标准输入封装为mp4
+            try:
+                remuxer = StreamRemuxer(output_file, input_format='mpegts').start()
+            except FileNotFoundError:
+                logger.warning("未找到FFmpeg，将直接保存为ts文件")
+                remuxer = None
                 
-                logger.info(f"下载完成: {output_file}")
-                return str(output_file)
+            # 并发下载所有片段，按顺序写入
+            if remuxer is None:
+                output_file = uploader_dir / f"{base_name}.ts"
+                with open(output_file, 'wb') as f:
+                    fetcher.fetch_ordered(segment_urls, f.write, on_segment)
+            else:
+                try:
+                    fetcher.fetch_ordered(segment_urls, remuxer.write, on_segment)
+                except BaseException:
+                    remuxer.abort()
+                    raise
+                remuxer.finish()
                 
-            except Exception as e:
-                logger.error(f"格式转换失败: {str(e)}")
-                # 如果转换失败，保留ts文件并重命名
-                temp_ts.rename(uploader_dir / f"{self._sanitize_filename(title)}-{video_id}.ts")
-                return str(temp_ts)
+            logger.info(f"下载完成: {output_file}")
+            return str(output_file)
             
         except requests.exceptions.RequestException as e:
             raise DownloadError(f"网络请求失败: {str(e)}")
@@ -2,6 +2,8 @@
 
 提供视频和图片下载功能。
 支持代理和自动重试。
+所有请求共用会话注册表中的长连接会话，并按主机限制连接数。
+下载用户作品时一个协程负责翻页，多个工作协程并发下载，完成一个返回一个。
 """
 
 import time
@@ -11,9 +13,10 @@ import logging
 import asyncio
 import aiohttp
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any, Literal
+from typing import Dict, List, Optional, Union, Any, Literal, AsyncIterator, Awaitable, Callable
 from urllib.parse import urlencode, urlparse
 
+from src.core.session_registry import session_registry
 from .signature import TikTokSignature, SignatureError
 
 logger = logging.getLogger(__name__)
@@ -35,7 +38,13 @@ class TikTokDownloader:
         max_retries: int, 最大重试次数
         retry_delay: float, 重试延迟(秒)
         platform: str, 平台(ios/android)
+        max_connections: int, 连接池总连接数
+        max_connections_per_host: int, 每个主机的最大连接数
+        concurrency: int, 批量下载时的并发数
     """
+
+    # 用户作品列表接口
+    USER_POST_URL = "https://api.tiktok.com/aweme/v1/aweme/post/"
     
     # iOS设备列表
     IOS_DEVICES = [
@@ -78,7 +87,10 @@ class TikTokDownloader:
         timeout: int = 30,
         max_retries: int = 3,
         retry_delay: float = 1.0,
-        platform: Literal["ios", "android"] = "ios"
+        platform: Literal["ios", "android"] = "ios",
+        max_connections: int = 100,
+        max_connections_per_host: int = 8,
+        concurrency: int = 4
     ):
         """初始化下载器。
         
@@ -88,6 +100,9 @@ class TikTokDownloader:
             max_retries: 最大重试次数
             retry_delay: 重试延迟
             platform: 平台(ios/android)
+            max_connections: 连接池总连接数
+            max_connections_per_host: 每个主机的最大连接数
+            concurrency: 批量下载时的并发数
         """
         self.signature = TikTokSignature()
         self.proxy = proxy
@@ -95,6 +110,38 @@ class TikTokDownloader:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.platform = platform
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.concurrency = max(1, concurrency)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """从会话注册表获取当前事件循环上共享的会话。
+        
+        Returns:
+            aiohttp.ClientSession: 会话对象
+        """
+        # 只限制连接和单次读取的时间，大文件下载不受总时长限制
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=self.timeout,
+            sock_read=self.timeout
+        )
+        return await session_registry.get_async(
+            "tiktok",
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            timeout=timeout
+        )
+
+    async def close(self) -> None:
+        """关闭当前事件循环上共享的TikTok会话，释放连接池。"""
+        await session_registry.aclose("tiktok")
+
+    async def __aenter__(self) -> 'TikTokDownloader':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
         
     def _get_user_agent(self) -> str:
         """生成随机User-Agent。
@@ -166,77 +213,121 @@ class TikTokDownloader:
         except Exception as e:
             raise DownloadError(f"获取直连URL失败: {e}")
             
-    async def _request(
+    async def _send(
         self,
         url: str,
+        handler: Callable[[aiohttp.ClientResponse], Awaitable[Any]],
         params: Optional[Dict] = None,
-        headers: Optional[Dict] = None,
-        retry: int = 0
-    ) -> aiohttp.ClientResponse:
-        """发送HTTP请求。
+        headers: Optional[Dict] = None
+    ) -> Any:
+        """发送GET请求并在连接释放前处理响应。
         
         支持自动重试和代理。
         
         Args:
             url: 请求URL
+            handler: 响应处理协程，连接在其返回后归还连接池
             params: URL参数
             headers: 请求头
-            retry: 当前重试次数
             
         Returns:
-            aiohttp.ClientResponse: 响应对象
+            Any: handler的返回值
             
         Raises:
             DownloadError: 请求失败
         """
-        try:
-            # 添加签名
-            if params:
-                try:
-                    signature = self.signature.sign(params)
-                    params["_signature"] = signature
-                except SignatureError as e:
-                    logger.error(f"生成签名失败: {e}")
-                    raise DownloadError(f"生成签名失败: {e}")
-                    
-            # 设置代理
-            if self.proxy:
-                proxy = self.proxy
-            else:
-                proxy = None
-                
-            # 设置请求头
-            if not headers:
-                headers = {
-                    "User-Agent": self._get_user_agent()
-                }
+        # 添加签名
+        if params:
+            try:
+                signature = self.signature.sign(params)
+                params["_signature"] = signature
+            except SignatureError as e:
+                logger.error(f"生成签名失败: {e}")
+                raise DownloadError(f"生成签名失败: {e}")
                 
-            # 发送请求
-            async with aiohttp.ClientSession() as session:
+        # 设置请求头
+        if not headers:
+            headers = {
+                "User-Agent": self._get_user_agent()
+            }
+            
+        retry = 0
+        while True:
+            try:
+                session = await self._get_session()
                 async with session.get(
                     url,
                     params=params,
                     headers=headers,
-                    proxy=proxy,
-                    timeout=self.timeout
+                    proxy=self.proxy
                 ) as response:
                     response.raise_for_status()
-                    return response
+                    return await handler(response)
+                    
+            except asyncio.TimeoutError:
+                logger.warning(f"请求超时: {url}")
+                if retry >= self.max_retries:
+                    raise DownloadError(f"请求超时: {url}")
+                    
+            except aiohttp.ClientError as e:
+                logger.warning(f"请求失败: {e}")
+                if retry >= self.max_retries:
+                    raise DownloadError(f"请求失败: {e}")
                     
-        except asyncio.TimeoutError:
-            logger.warning(f"请求超时: {url}")
-            if retry < self.max_retries:
-                await asyncio.sleep(self.retry_delay * (2 ** retry))
-                return await self._request(url, params, headers, retry + 1)
-            raise DownloadError(f"请求超时: {url}")
-            
-        except aiohttp.ClientError as e:
-            logger.warning(f"请求失败: {e}")
-            if retry < self.max_retries:
-                await asyncio.sleep(self.retry_delay * (2 ** retry))
-                return await self._request(url, params, headers, retry + 1)
-            raise DownloadError(f"请求失败: {e}")
+            await asyncio.sleep(self.retry_delay * (2 ** retry))
+            retry += 1
+            
+    async def _request(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> aiohttp.ClientResponse:
+        """发送HTTP请求。
+        
+        响应体在连接归还连接池之前读入内存，返回后仍可调用json()/text()。
+        
+        Args:
+            url: 请求URL
+            params: URL参数
+            headers: 请求头
+            
+        Returns:
+            aiohttp.ClientResponse: 响应对象
+            
+        Raises:
+            DownloadError: 请求失败
+        """
+        async def read(response: aiohttp.ClientResponse) -> aiohttp.ClientResponse:
+            await response.read()
+            return response
             
+        return await self._send(url, read, params, headers)
+        
+    async def _download_file(self, url: str, save_path: Union[str, Path]) -> Path:
+        """流式下载文件。
+        
+        Args:
+            url: 文件URL
+            save_path: 保存路径
+            
+        Returns:
+            Path: 保存路径
+            
+        Raises:
+            DownloadError: 请求失败
+        """
+        save_path = Path(save_path)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        async def write(response: aiohttp.ClientResponse) -> Path:
+            with open(save_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    f.write(chunk)
+            return save_path
+            
+        return await self._send(url, write)
+        
     async def download_video(
         self,
         video_id: str,
@@ -261,16 +352,7 @@ class TikTokDownloader:
             video_url = await self._get_direct_url(video_id, api_version=api_version)
             
             # 下载视频
-            response = await self._request(video_url)
-            
-            save_path = Path(save_path)
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(save_path, "wb") as f:
-                async for chunk in response.content.iter_chunked(8192):
-                    f.write(chunk)
-                    
-            return save_path
+            return await self._download_file(video_url, save_path)
             
         except Exception as e:
             raise DownloadError(f"下载视频失败: {e}")
@@ -311,16 +393,7 @@ class TikTokDownloader:
             image_url = data["aweme_detail"]["image_post_info"]["images"][0]["display_image"]["url_list"][0]
             
             # 下载图片
-            response = await self._request(image_url)
-            
-            save_path = Path(save_path)
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(save_path, "wb") as f:
-                async for chunk in response.content.iter_chunked(8192):
-                    f.write(chunk)
-                    
-            return save_path
+            return await self._download_file(image_url, save_path)
             
         except Exception as e:
             raise DownloadError(f"下载图片失败: {e}")
@@ -381,6 +454,177 @@ class TikTokDownloader:
         except Exception as e:
             raise DownloadError(f"下载失败: {e}")
             
+    async def _iter_user_posts(self, user_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """按游标翻页遍历用户作品。
+        
+        Args:
+            user_id: 用户ID
+            
+        Yields:
+            Dict[str, Any]: 作品信息
+            
+        Raises:
+            DownloadError: 请求失败
+        """
+        max_cursor = 0
+        while True:
+            params = {
+                "user_id": user_id,
+                "count": 20,
+                "max_cursor": max_cursor,
+                "device_id": self.signature.device_id
+            }
+            response = await self._request(self.USER_POST_URL, params)
+            data = await response.json()
+            
+            if "aweme_list" not in data:
+                return
+                
+            for post in data["aweme_list"]:
+                yield post
+                
+            if not data.get("has_more"):
+                return
+                
+            max_cursor = data["max_cursor"]
+            
+    async def _crawl_user_posts(
+        self,
+        user_id: str,
+        save_dir: Union[str, Path],
+        download: Callable[[str, Path, str], Awaitable[Path]],
+        suffix: str,
+        limit: Optional[int] = None,
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        api_version: str = TikTokSignature.API_V2
+    ) -> AsyncIterator[Path]:
+        """并发下载用户作品。
+        
+        一个生产者协程翻页并把作品ID放入有界队列，concurrency个工作协程
+        从队列取出并下载。队列有界，翻页速度不会远超下载速度。
+        
+        Args:
+            user_id: 用户ID
+            save_dir: 保存目录
+            download: 单个作品的下载协程
+            suffix: 文件扩展名
+            limit: 最大下载数量
+            predicate: 作品过滤条件
+            api_version: API版本
+            
+        Yields:
+            Path: 下载完成的文件路径，按完成顺序返回
+            
+        Raises:
+            DownloadError: 翻页失败
+        """
+        save_dir = Path(save_dir)
+        save_dir.mkdir(parents=True, exist_ok=True)
+        
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+        
+        async def produce() -> None:
+            count = 0
+            try:
+                async for post in self._iter_user_posts(user_id):
+                    if limit and count >= limit:
+                        break
+                    if predicate and not predicate(post):
+                        continue
+                    await pending.put(post["aweme_id"])
+                    count += 1
+            except asyncio.CancelledError:
+                raise
+            except BaseException:
+                await self._stop_workers(pending)
+                raise
+            await self._stop_workers(pending)
+                    
+        async def work() -> None:
+            try:
+                while True:
+                    post_id = await pending.get()
+                    if post_id is None:
+                        break
+                    try:
+                        path = await download(post_id, save_dir / f"{post_id}{suffix}", api_version)
+                        await results.put(path)
+                    except DownloadError as e:
+                        logger.error(f"下载作品失败: {post_id} - {e}")
+            finally:
+                await results.put(None)
+                
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        try:
+            finished = 0
+            while finished < len(workers):
+                path = await results.get()
+                if path is None:
+                    finished += 1
+                    continue
+                yield path
+            # 翻页出错时抛出
+            await producer
+        finally:
+            for task in [producer, *workers]:
+                task.cancel()
+            await asyncio.gather(producer, *workers, return_exceptions=True)
+            
+    async def _stop_workers(self, pending: asyncio.Queue) -> None:
+        """向队列放入结束标记，通知所有工作协程退出。"""
+        for _ in range(self.concurrency):
+            await pending.put(None)
+            
+    def iter_user_videos(
+        self,
+        user_id: str,
+        save_dir: Union[str, Path],
+        max_videos: Optional[int] = None,
+        api_version: str = TikTokSignature.API_V2
+    ) -> AsyncIterator[Path]:
+        """并发下载用户视频，完成一个返回一个。
+        
+        Args:
+            user_id: 用户ID
+            save_dir: 保存目录
+            max_videos: 最大下载数量
+            api_version: API版本
+            
+        Returns:
+            AsyncIterator[Path]: 保存路径的异步迭代器
+        """
+        return self._crawl_user_posts(
+            user_id, save_dir, self.download_video, ".mp4",
+            limit=max_videos, api_version=api_version
+        )
+        
+    def iter_user_images(
+        self,
+        user_id: str,
+        save_dir: Union[str, Path],
+        max_images: Optional[int] = None,
+        api_version: str = TikTokSignature.API_V2
+    ) -> AsyncIterator[Path]:
+        """并发下载用户图片，完成一个返回一个。
+        
+        Args:
+            user_id: 用户ID
+            save_dir: 保存目录
+            max_images: 最大下载数量
+            api_version: API版本
+            
+        Returns:
+            AsyncIterator[Path]: 保存路径的异步迭代器
+        """
+        return self._crawl_user_posts(
+            user_id, save_dir, self.download_image, ".jpg",
+            limit=max_images,
+            predicate=lambda post: "image_post_info" in post,
+            api_version=api_version
+        )
+        
     async def download_user_videos(
         self,
         user_id: str,
@@ -397,59 +641,16 @@ class TikTokDownloader:
             api_version: API版本
             
         Returns:
-            List[Path]: 保存路径列表
+            List[Path]: 保存路径列表，按完成顺序排列
             
         Raises:
             DownloadError: 下载失败
         """
         try:
-            save_dir = Path(save_dir)
-            save_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 获取用户视频列表
-            url = f"https://api.tiktok.com/aweme/v1/aweme/post/"
-            params = {
-                "user_id": user_id,
-                "count": 20,
-                "max_cursor": 0,
-                "device_id": self.signature.device_id
-            }
-            
-            video_paths = []
-            video_count = 0
-            
-            while True:
-                response = await self._request(url, params)
-                data = await response.json()
-                
-                if "aweme_list" not in data:
-                    break
-                    
-                for video in data["aweme_list"]:
-                    if max_videos and video_count >= max_videos:
-                        break
-                        
-                    video_id = video["aweme_id"]
-                    save_path = save_dir / f"{video_id}.mp4"
-                    
-                    try:
-                        path = await self.download_video(video_id, save_path, api_version)
-                        video_paths.append(path)
-                        video_count += 1
-                    except DownloadError as e:
-                        logger.error(f"下载视频失败: {e}")
-                        continue
-                        
-                if max_videos and video_count >= max_videos:
-                    break
-                    
-                if not data.get("has_more"):
-                    break
-                    
-                params["max_cursor"] = data["max_cursor"]
-                
-            return video_paths
-            
+            return [
+                path async for path in
+                self.iter_user_videos(user_id, save_dir, max_videos, api_version)
+            ]
         except Exception as e:
             raise DownloadError(f"下载用户视频失败: {e}")
             
@@ -469,61 +670,15 @@ class TikTokDownloader:
             api_version: API版本
             
         Returns:
-            List[Path]: 保存路径列表
+            List[Path]: 保存路径列表，按完成顺序排列
             
         Raises:
             DownloadError: 下载失败
         """
         try:
-            save_dir = Path(save_dir)
-            save_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 获取用户图片列表
-            url = f"https://api.tiktok.com/aweme/v1/aweme/post/"
-            params = {
-                "user_id": user_id,
-                "count": 20,
-                "max_cursor": 0,
-                "device_id": self.signature.device_id
-            }
-            
-            image_paths = []
-            image_count = 0
-            
-            while True:
-                response = await self._request(url, params)
-                data = await response.json()
-                
-                if "aweme_list" not in data:
-                    break
-                    
-                for post in data["aweme_list"]:
-                    if max_images and image_count >= max_images:
-                        break
-                        
-                    if "image_post_info" not in post:
-                        continue
-                        
-                    image_id = post["aweme_id"]
-                    save_path = save_dir / f"{image_id}.jpg"
-                    
-                    try:
-                        path = await self.download_image(image_id, save_path, api_version)
-                        image_paths.append(path)
-                        image_count += 1
-                    except DownloadError as e:
-                        logger.error(f"下载图片失败: {e}")
-                        continue
-                        
-                if max_images and image_count >= max_images:
-                    break
-                    
-                if not data.get("has_more"):
-                    break
-                    
-                params["max_cursor"] = data["max_cursor"]
-                
-            return image_paths
-            
+            return [
+                path async for path in
+                self.iter_user_images(user_id, save_dir, max_images, api_version)
+            ]
         except Exception as e:
-            raise DownloadError(f"下载用户图片失败: {e}") 
\ No newline at end of file
+            raise DownloadError(f"下载用户图片失败: {e}")
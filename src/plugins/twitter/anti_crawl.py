@@ -21,6 +21,7 @@ from fake_useragent import UserAgent
 import undetected_playwright as playwright
 
 from src.core.exceptions import DownloadError
+from src.core.session_registry import session_registry
 
 logger = logging.getLogger(__name__)
 
@@ -268,11 +269,13 @@ class CloudflareBypass:
         """
         try:
             # 发送测试请求
-            response = requests.get(
+            # 单独的会话配置只区分请求头，Cookie容器与同平台的下载器共享：
+            # 待验证的Cookie只随本次请求发送，响应设置的Cookie会写入共享容器
+            session = session_registry.get("twitter", self.proxy, name="cloudflare")
+            response = session.get(
                 "https://twitter.com/home",
                 headers=self.headers,
                 cookies=cookies,
-                proxies={"http": self.proxy, "https": self.proxy} if self.proxy else None,
                 timeout=self.timeout
             )
             
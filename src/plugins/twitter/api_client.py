@@ -11,8 +11,11 @@ from urllib.parse import urljoin
 import json
 import time
 
-from src.core.exceptions import APIError
+from src.core.exceptions import APIError, TwitterRateLimitError
+from src.core.session_registry import session_registry
 from src.utils.cookie_manager import CookieManager
+from .credential_pool import CredentialPool
+from .rate_budget import RateBudgetTracker, endpoint_key
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +23,8 @@ class TwitterAPIClient:
     """Twitter API客户端。
     
     处理Twitter API的调用，支持认证和代理。
-    实现自动重试和错误处理。
+    实现自动重试和错误处理，按响应头中的限额控制每个接口的请求节奏。
+    每次请求从凭据池租用凭据，一个凭据的接口配额用完时换用其他凭据。
     """
     
     BASE_URL = "https://api.twitter.com/2/"
@@ -30,7 +34,10 @@ class TwitterAPIClient:
         cookie_manager: Optional[CookieManager] = None,
         proxy: Optional[str] = None,
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        rate_budget: Optional[RateBudgetTracker] = None,
+        max_rate_wait: float = 5.0,
+        credential_pool: Optional[CredentialPool] = None
     ):
         """初始化API客户端。
 
@@ -39,12 +46,25 @@ class TwitterAPIClient:
             proxy: 代理服务器
             timeout: 超时时间（秒）
             max_retries: 最大重试次数
+            rate_budget: 未指定credential_pool时使用的接口限额跟踪器，默认使用全局跟踪器
+            max_rate_wait: 为接口限额等待的最长时间（秒），超过时抛出TwitterRateLimitError
+            credential_pool: 凭据池，默认不附加凭据，只按接口限速
         """
         self.cookie_manager = cookie_manager
         self.proxy = proxy
         self.timeout = timeout
         self.max_retries = max_retries
-        self.session = self._create_session()
+        self.max_rate_wait = max_rate_wait
+        self.credential_pool = credential_pool or CredentialPool(tracker=rate_budget)
+        # 用户名到ID的缓存，翻页时不再重复消耗用户查询接口的配额
+        self._user_ids: Dict[str, str] = {}
+        # 与下载器共享Twitter的Cookie容器，请求头不同，使用单独的会话配置
+        self.session = session_registry.get(
+            "twitter",
+            proxy,
+            factory=self._create_session,
+            name="api"
+        )
         
     def _create_session(self) -> requests.Session:
         """创建请求会话。
@@ -53,6 +73,9 @@ class TwitterAPIClient:
             requests.Session: 配置好的会话对象
         """
         session = requests.Session()
+        adapter = session_registry.make_adapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         
         # 设置代理
         if self.proxy:
@@ -99,22 +122,51 @@ class TwitterAPIClient:
             Dict: API响应
 
         Raises:
-            APIError: API调用失败
+            APIError: API调用失败，或重试用完时凭据仍被拒绝(401)
+            TwitterRateLimitError: 所有凭据的接口配额用完且重置时间超过max_rate_wait，
+                或重试用完时仍被限流(429)
         """
         url = urljoin(self.BASE_URL, endpoint)
+        key = endpoint_key(url)
+        extra_headers = kwargs.pop("headers", {})
         retries = 0
+        status = None
         
         while retries <= self.max_retries:
+            lease = self.credential_pool.lease(key, max_wait=self.max_rate_wait)
+            if lease.delay > self.max_rate_wait:
+                # 只让出这个接口的请求，不占用线程等待整个窗口
+                raise TwitterRateLimitError(f"接口 {key} 配额已用完", retry_after=lease.delay)
+            if lease.delay > 0:
+                time.sleep(lease.delay)
+                
+            headers = {**lease.headers(), **extra_headers}
             try:
                 response = self.session.request(
                     method=method,
                     url=url,
                     params=params,
                     json=data,
+                    headers=headers,
                     timeout=self.timeout,
                     **kwargs
                 )
+            except requests.exceptions.RequestException as e:
+                self.credential_pool.release(lease)
+                retries += 1
+                if retries > self.max_retries:
+                    raise APIError(f"API请求失败: {str(e)}")
+                time.sleep(2 ** retries)
+                continue
+                
+            self.credential_pool.release(lease, response.headers, response.status_code)
+            status = response.status_code
+            if status in (401, 429):
+                # 下一轮换用其他凭据，都不可用时按重置时间决定等待或让出
+                retries += 1
+                continue
                 
+            try:
                 response.raise_for_status()
                 return response.json()
                 
@@ -126,6 +178,14 @@ class TwitterAPIClient:
                 # 指数退避重试
                 time.sleep(2 ** retries)
                 
+        # 只有401和429会用完重试后走到这里
+        if status == 429:
+            raise TwitterRateLimitError(
+                f"接口 {key} 已限流",
+                retry_after=self.credential_pool.wait_time(key)
+            )
+        raise APIError(f"API认证失败: 接口 {key} 的凭据均被拒绝")
+                
     def download_tweet(self, tweet_id: str) -> Dict[str, Any]:
         """下载单条推文。
 
@@ -137,6 +197,7 @@ class TwitterAPIClient:
 
         Raises:
             APIError: 下载失败
+            TwitterRateLimitError: 推文接口配额用完
         """
         try:
             # 获取推文信息
@@ -181,6 +242,8 @@ class TwitterAPIClient:
                 "media": media
             }
             
+        except TwitterRateLimitError:
+            raise
         except Exception as e:
             raise APIError(f"下载推文失败: {str(e)}")
             
@@ -202,18 +265,21 @@ class TwitterAPIClient:
 
         Raises:
             APIError: 获取失败
+            TwitterRateLimitError: 用户或推文列表接口配额用完
         """
         try:
             # 获取用户ID
-            user = self._request(
-                "GET",
-                "users/by/username/" + username
-            )
-            
-            if not user.get("data"):
-                raise APIError("用户不存在")
+            user_id = self._user_ids.get(username)
+            if user_id is None:
+                user = self._request(
+                    "GET",
+                    "users/by/username/" + username
+                )
                 
-            user_id = user["data"]["id"]
+                if not user.get("data"):
+                    raise APIError("用户不存在")
+                    
+                user_id = self._user_ids[username] = user["data"]["id"]
             
             # 获取推文列表
             params = {
@@ -246,5 +312,7 @@ class TwitterAPIClient:
                 "next_cursor": response.get("meta", {}).get("next_token")
             }
             
+        except TwitterRateLimitError:
+            raise
         except Exception as e:
             raise APIError(f"获取推文列表失败: {str(e)}") 
\ No newline at end of file
@@ -19,6 +19,8 @@ class TwitterDownloaderConfig:
         cookies_file: Cookie文件路径
         output_template: 输出文件名模板
         max_items: 最大下载数量
+        credential_pool_size: 凭据池保持的访客令牌数
+        use_cookie_identities: 是否把CookieManager中已登录的身份加入凭据池
     """
     
     save_dir: Path = Path("downloads/twitter")
@@ -28,6 +30,8 @@ class TwitterDownloaderConfig:
     cookies_file: str = "config/twitter_cookies.txt"
     output_template: str = "%(uploader)s/%(upload_date)s-%(title)s-%(id)s.%(ext)s"
     max_items: Optional[int] = None
+    credential_pool_size: int = 3
+    use_cookie_identities: bool = True
     
     def __post_init__(self):
         """初始化后处理。"""
@@ -44,6 +48,8 @@ class TwitterDownloaderConfig:
             "cookies_file": self.cookies_file,
             "output_template": self.output_template,
             "max_items": self.max_items,
+            "credential_pool_size": self.credential_pool_size,
+            "use_cookie_identities": self.use_cookie_identities,
         }
         
     @classmethod
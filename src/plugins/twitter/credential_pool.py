@@ -0,0 +1,355 @@
+"""Twitter凭据池模块。
+
+Twitter按凭据(访客令牌或登录账号)分别计算每个接口的限额，
+只用一个访客令牌时整个抓取共用一个限额窗口。CredentialPool：
+1. 预先获取多个访客令牌，并可加入CookieManager中的多个登录身份
+2. 每次请求租用一个凭据，优先选择该接口剩余配额最多、正在使用最少的凭据，
+   每个凭据每个接口的配额由RateBudgetTracker分别跟踪
+3. 后台线程在访客令牌过期前换新，失效的令牌移出池并补足数量
+
+池为空时租约不带凭据，按接口键直接限速，与不使用凭据池时的行为一致。
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Callable, Hashable, List, Mapping, Set
+
+from .rate_budget import RateBudgetTracker, rate_budget as default_rate_budget
+
+logger = logging.getLogger(__name__)
+
+# 凭据类型
+GUEST = "guest"
+COOKIE = "cookie"
+
+
+@dataclass
+class Credential:
+    """池中的一个凭据。
+
+    Attributes:
+        id: 凭据标识，同时作为限额跟踪键的前缀
+        kind: 凭据类型，GUEST或COOKIE
+        token: 访客令牌
+        cookies: 登录身份的Cookie
+        expires_at: 过期时间戳，登录身份不过期
+        in_use: 正在使用该凭据的请求数
+        leases: 累计租用次数
+        last_used: 最近一次租用的时间戳
+        valid: 是否仍然有效
+        endpoints: 使用过的接口键
+    """
+
+    id: str
+    kind: str
+    token: Optional[str] = None
+    cookies: Dict[str, str] = field(default_factory=dict)
+    expires_at: float = float('inf')
+    in_use: int = 0
+    leases: int = 0
+    last_used: float = 0.0
+    valid: bool = True
+    endpoints: Set[str] = field(default_factory=set)
+
+    def headers(self) -> Dict[str, str]:
+        """请求需要附加的请求头。
+
+        Returns:
+            Dict[str, str]: 请求头
+        """
+        if self.kind == GUEST:
+            return {"x-guest-token": self.token}
+        headers = {
+            "Cookie": "; ".join(f"{k}={v}" for k, v in self.cookies.items()),
+            "x-twitter-auth-type": "OAuth2Session",
+        }
+        if "ct0" in self.cookies:
+            headers["x-csrf-token"] = self.cookies["ct0"]
+        return headers
+
+
+@dataclass
+class CredentialLease:
+    """一次请求租用的凭据。
+
+    Attributes:
+        credential: 租用的凭据，池为空或不需要认证时为None
+        key: 限额跟踪键
+        delay: 发送前需要等待的秒数
+    """
+
+    credential: Optional[Credential]
+    key: Hashable
+    delay: float
+
+    def headers(self) -> Dict[str, str]:
+        """请求需要附加的请求头。"""
+        return self.credential.headers() if self.credential else {}
+
+
+class CredentialPool:
+    """访客令牌和登录身份的凭据池。
+
+    线程安全。首次租用时获取令牌并启动后台刷新线程。
+
+    Attributes:
+        size: 保持的访客令牌数
+        token_ttl: 访客令牌的有效期(秒)
+        refresh_before: 过期前多久换新(秒)
+        refresh_interval: 后台检查的间隔(秒)
+        tracker: RateBudgetTracker, 按(凭据, 接口)跟踪限额
+    """
+
+    DEFAULT_SIZE = 3
+    DEFAULT_TOKEN_TTL = 3 * 3600.0
+    DEFAULT_REFRESH_BEFORE = 600.0
+    DEFAULT_REFRESH_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        fetch_guest_token: Optional[Callable[[], str]] = None,
+        size: int = DEFAULT_SIZE,
+        identities: Optional[Mapping[str, Dict[str, str]]] = None,
+        tracker: Optional[RateBudgetTracker] = None,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        refresh_before: float = DEFAULT_REFRESH_BEFORE,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.time
+    ):
+        """初始化凭据池。
+
+        Args:
+            fetch_guest_token: 获取新访客令牌的函数，None表示不使用访客令牌
+            size: 保持的访客令牌数
+            identities: 登录身份名到Cookie的映射
+            tracker: 限额跟踪器，默认使用全局跟踪器
+            token_ttl: 访客令牌的有效期(秒)
+            refresh_before: 过期前多久换新(秒)
+            refresh_interval: 后台检查的间隔(秒)
+            clock: 时钟函数，测试时可替换
+        """
+        self.size = size if fetch_guest_token else 0
+        self.token_ttl = token_ttl
+        self.refresh_before = refresh_before
+        self.refresh_interval = refresh_interval
+        self.tracker = tracker or default_rate_budget
+        self._fetch_guest_token = fetch_guest_token
+        self._clock = clock
+        self._credentials: Dict[str, Credential] = {}
+        self._guest_seq = 0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._started = False
+        self._closed = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        for name, cookies in (identities or {}).items():
+            credential_id = f"{COOKIE}:{name}"
+            self._credentials[credential_id] = Credential(
+                id=credential_id, kind=COOKIE, cookies=dict(cookies)
+            )
+
+    def start(self) -> None:
+        """获取初始令牌并启动后台刷新线程，重复调用无副作用。"""
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            if self._fetch_guest_token is not None:
+                self.refresh()
+                self._thread = threading.Thread(
+                    target=self._refresh_loop, name="twitter-credential-refresh", daemon=True
+                )
+                self._thread.start()
+            self._started = True
+
+    def _refresh_loop(self) -> None:
+        """后台定期换新即将过期和失效的令牌。"""
+        while not self._closed.is_set():
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
+            if self._closed.is_set():
+                break
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"刷新访客令牌失败: {e}")
+
+    def refresh(self) -> int:
+        """移除过期和失效的访客令牌，并补足即将过期的令牌。
+
+        Returns:
+            int: 新获取的令牌数
+        """
+        if self._fetch_guest_token is None:
+            return 0
+        now = self._clock()
+        with self._lock:
+            for credential in list(self._credentials.values()):
+                if (
+                    credential.kind == GUEST
+                    and credential.in_use == 0
+                    and (not credential.valid or credential.expires_at <= now)
+                ):
+                    self._drop(credential)
+            fresh = sum(
+                1 for c in self._credentials.values()
+                if c.kind == GUEST and c.valid and c.expires_at - now > self.refresh_before
+            )
+        needed = self.size - fresh
+
+        fetched = 0
+        for _ in range(max(0, needed)):
+            # 在锁外请求，获取令牌时其他请求可以继续租用现有凭据
+            try:
+                token = self._fetch_guest_token()
+            except Exception as e:
+                logger.warning(f"获取访客令牌失败: {e}")
+                break
+            with self._lock:
+                self._guest_seq += 1
+                credential_id = f"{GUEST}:{self._guest_seq}"
+                self._credentials[credential_id] = Credential(
+                    id=credential_id,
+                    kind=GUEST,
+                    token=token,
+                    expires_at=self._clock() + self.token_ttl
+                )
+            fetched += 1
+        if fetched:
+            logger.debug(f"获取了 {fetched} 个访客令牌")
+        return fetched
+
+    def _drop(self, credential: Credential) -> None:
+        """移除凭据及其限额记录(调用方持有锁)。"""
+        del self._credentials[credential.id]
+        for endpoint in credential.endpoints:
+            self.tracker.discard((credential.id, endpoint))
+
+    def _usable(self, now: float) -> List[Credential]:
+        """可以租用的凭据(调用方持有锁)。"""
+        valid = [c for c in self._credentials.values() if c.valid]
+        # 已过期的令牌只在没有其他凭据时使用
+        return [c for c in valid if c.expires_at > now] or valid
+
+    def lease(
+        self,
+        endpoint: str,
+        max_wait: Optional[float] = None,
+        authenticate: bool = True
+    ) -> CredentialLease:
+        """为一次请求租用凭据并预约该凭据在接口上的配额。
+
+        delay超过max_wait时没有占用凭据和配额，调用方不需要release。
+
+        Args:
+            endpoint: 接口键
+            max_wait: 调用方愿意等待的最长时间
+            authenticate: 是否需要凭据，媒体等不需要认证的请求只按接口限速
+
+        Returns:
+            CredentialLease: 租约，池为空或不需要认证时credential为None
+        """
+        if authenticate:
+            self.start()
+        now = self._clock()
+        with self._lock:
+            candidates = self._usable(now) if authenticate else []
+            if not candidates:
+                return CredentialLease(None, endpoint, self.tracker.reserve(endpoint, max_wait))
+
+            best = min(
+                candidates,
+                key=lambda c: (
+                    self.tracker.wait_time((c.id, endpoint)), c.in_use, c.last_used
+                )
+            )
+            key = (best.id, endpoint)
+            delay = self.tracker.reserve(key, max_wait)
+            if max_wait is None or delay <= max_wait:
+                best.in_use += 1
+                best.leases += 1
+                best.last_used = now
+                best.endpoints.add(endpoint)
+            return CredentialLease(best, key, delay)
+
+    def release(
+        self,
+        lease: CredentialLease,
+        headers: Optional[Mapping[str, str]] = None,
+        status: Optional[int] = None
+    ) -> None:
+        """归还租约并用响应更新凭据的限额。
+
+        Args:
+            lease: lease返回的租约
+            headers: 响应头，请求没有收到响应时为None
+            status: HTTP状态码，401表示凭据已失效
+        """
+        if headers is None and status is None:
+            self.tracker.cancel(lease.key)
+        else:
+            self.tracker.update(lease.key, headers or {}, status)
+
+        credential = lease.credential
+        if credential is None:
+            return
+        with self._lock:
+            credential.in_use = max(0, credential.in_use - 1)
+            if status == 401 and credential.valid:
+                credential.valid = False
+                logger.warning(f"凭据 {credential.id} 已失效")
+        if status == 401 and credential.kind == GUEST:
+            self._wakeup.set()
+
+    def wait_time(self, endpoint: str) -> float:
+        """接口在所有凭据中最短的等待时间。
+
+        Args:
+            endpoint: 接口键
+
+        Returns:
+            float: 需要等待的秒数
+        """
+        with self._lock:
+            candidates = self._usable(self._clock())
+            if not candidates:
+                return self.tracker.wait_time(endpoint)
+            return min(self.tracker.wait_time((c.id, endpoint)) for c in candidates)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取每个凭据的状态。
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 凭据标识到类型、在用数、租用次数、剩余有效期和各接口剩余配额的映射
+        """
+        now = self._clock()
+        budgets = self.tracker.get_stats()
+        with self._lock:
+            return {
+                credential.id: {
+                    'kind': credential.kind,
+                    'valid': credential.valid,
+                    'in_use': credential.in_use,
+                    'leases': credential.leases,
+                    'expires_in': credential.expires_at - now,
+                    'remaining': {
+                        endpoint: budgets[(credential.id, endpoint)]['remaining']
+                        for endpoint in credential.endpoints
+                        if (credential.id, endpoint) in budgets
+                    },
+                }
+                for credential in self._credentials.values()
+            }
+
+    def close(self) -> None:
+        """停止后台刷新线程，重复调用无副作用。"""
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
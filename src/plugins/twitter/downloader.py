@@ -16,18 +16,19 @@ from tqdm import tqdm
 import re
 import requests
 from urllib.parse import urlparse
-import hashlib
 import random
 from bs4 import BeautifulSoup
-from ratelimit import limits, sleep_and_retry
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from src.core.downloader import BaseDownloader
-from src.core.exceptions import DownloadError, APIError, RateLimitException
+from src.core.exceptions import DownloadError, APIError, TwitterRateLimitError
+from src.core.hashing import StreamingHasher, hash_file
+from src.core.session_registry import session_registry
 from src.utils.cookie_manager import CookieManager
 from .config import TwitterDownloaderConfig
 from .api_client import TwitterAPIClient
+from .credential_pool import CredentialPool
+from .rate_budget import endpoint_key
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +62,10 @@ class TwitterDownloader(BaseDownloader):
     # API端点
     API_BASE = "https://api.twitter.com/2"
     GUEST_TOKEN_URL = "https://api.twitter.com/1.1/guest/activate.json"
+    API_HOSTS = ("api.twitter.com", "api.x.com")
+
+    # 为接口限额等待的最长时间（秒），超过时让出请求
+    MAX_RATE_WAIT = 5.0
 
     def __init__(
         self,
@@ -86,22 +91,36 @@ class TwitterDownloader(BaseDownloader):
             config=config
         )
         
+        # 访客令牌和登录身份的凭据池，首次调用API时才获取令牌
+        self.credential_pool = CredentialPool(
+            fetch_guest_token=self._fetch_guest_token,
+            size=getattr(config, 'credential_pool_size', CredentialPool.DEFAULT_SIZE),
+            identities=(
+                self._cookie_identities()
+                if getattr(config, 'use_cookie_identities', True) else None
+            )
+        )
+        
         # 初始化API客户端
         self.api_client = TwitterAPIClient(
             cookie_manager=cookie_manager,
             proxy=config.proxy,
             timeout=config.timeout,
-            max_retries=config.max_retries
+            max_retries=config.max_retries,
+            credential_pool=self.credential_pool
         )
         
         # 设置yt-dlp
         self._setup_yt_dlp()
         
-        # 初始化会话
-        self.session = self._create_session()
-        
         # 初始化去重缓存
         self._dedup_cache: Set[Tuple[str, str]] = set()
+        
+        # 下载时流式计算的媒体摘要，键为媒体URL
+        self._media_digests: Dict[str, Dict[str, Any]] = {}
+        
+        # 因限流中断的推文列表游标，键为用户名，下次下载该主页时从此处继续
+        self.timeline_cursors: Dict[str, str] = {}
 
     def _setup_yt_dlp(self):
         """设置yt-dlp下载器。"""
@@ -257,6 +276,20 @@ class TwitterDownloader(BaseDownloader):
             return match.group(1)
         raise DownloadError("无法从URL中提取推文ID")
 
+    def _extract_username(self, url: str) -> str:
+        """从主页URL中提取用户名。
+
+        Args:
+            url: 用户主页URL
+
+        Returns:
+            str: 用户名
+        """
+        match = re.search(r'(?:twitter|x)\.com/(?!i/)([A-Za-z0-9_]+)', url)
+        if match:
+            return match.group(1)
+        raise DownloadError("无法从URL中提取用户名")
+
     def _get_tweet_api_url(self, tweet_id: str) -> str:
         """获取推文API URL。
 
@@ -298,10 +331,9 @@ class TwitterDownloader(BaseDownloader):
                 url = f'https://{url}'
 
             # 发送请求
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=headers,
-                proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None,
                 timeout=30
             )
             response.raise_for_status()
@@ -375,10 +407,9 @@ class TwitterDownloader(BaseDownloader):
                 'Connection': 'keep-alive'
             }
             
-            response = requests.get(
+            response = self.session.get(
                 url,
                 headers=headers,
-                proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None,
                 timeout=30,
                 stream=True
             )
@@ -387,22 +418,31 @@ class TwitterDownloader(BaseDownloader):
             # 确保目录存在
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
             
-            # 保存图片
+            # 保存图片，同时计算摘要供去重使用
+            hasher = StreamingHasher()
             with open(save_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     if chunk:
                         f.write(chunk)
+                        hasher.update(chunk)
+                        
+            digest = hasher.result()
+            self._media_digests[url] = digest
+            self._record_digest(Path(save_path), digest)
             return True
             
         except Exception as e:
             logger.error(f"下载图片失败: {str(e)}")
             return False
 
-    def _get_guest_token(self) -> str:
-        """获取Twitter访客令牌。
+    def _fetch_guest_token(self) -> str:
+        """获取一个新的Twitter访客令牌，由凭据池调用。
 
         Returns:
             str: 访客令牌
+
+        Raises:
+            DownloadError: 获取失败
         """
         try:
             response = self.session.post(self.GUEST_TOKEN_URL)
@@ -412,6 +452,20 @@ class TwitterDownloader(BaseDownloader):
             logger.error(f"获取访客令牌失败: {e}")
             raise DownloadError("获取访客令牌失败") from e
 
+    def _cookie_identities(self) -> Dict[str, Dict[str, str]]:
+        """CookieManager中已登录的Twitter身份。
+
+        Returns:
+            Dict[str, Dict[str, str]]: 身份名到Cookie的映射
+        """
+        if not self.cookie_manager:
+            return {}
+        return {
+            name: cookies
+            for name, cookies in self.cookie_manager.get_identities("twitter").items()
+            if cookies.get("auth_token") and cookies.get("ct0")
+        }
+
     def _extract_tweet_result(self, data: Dict) -> Optional[Dict]:
         """从GraphQL响应中提取推文数据。
 
@@ -456,10 +510,12 @@ class TwitterDownloader(BaseDownloader):
             'Cache-Control': 'no-cache'
         }
 
-    @sleep_and_retry
-    @limits(calls=50, period=900)  # 15分钟50次请求
     def _call_api(self, url: str) -> requests.Response:
-        """调用Twitter API，带限流处理。
+        """调用Twitter API，按接口限额控制节奏。
+        
+        API请求从凭据池租用凭据，每个响应的x-rate-limit头都会更新该凭据在接口上的限额。
+        所有凭据的配额都用完时只让出这个接口的请求，不在当前线程等待整个窗口，
+        其他接口和媒体请求不受影响。
         
         Args:
             url: API URL
@@ -468,20 +524,37 @@ class TwitterDownloader(BaseDownloader):
             requests.Response: API响应
             
         Raises:
-            RateLimitException: 触发限流时抛出
+            TwitterRateLimitError: 接口配额用完或触发限流时抛出，retry_after为窗口重置的等待秒数
         """
-        response = self.session.get(
-            url,
-            headers=self._random_headers(),
-            proxies=self._get_proxies(),
-            timeout=self.config.timeout
+        key = endpoint_key(url)
+        lease = self.credential_pool.lease(
+            key,
+            max_wait=self.MAX_RATE_WAIT,
+            authenticate=urlparse(url).hostname in self.API_HOSTS
         )
-        
+        if lease.delay > self.MAX_RATE_WAIT:
+            raise TwitterRateLimitError(f"接口 {key} 配额已用完", retry_after=lease.delay)
+        if lease.delay > 0:
+            time.sleep(lease.delay)
+            
+        headers = self._random_headers()
+        headers.update(lease.headers())
+        try:
+            response = self.session.get(
+                url,
+                headers=headers,
+                proxies=self._get_proxies(),
+                timeout=self.config.timeout
+            )
+        except requests.RequestException:
+            self.credential_pool.release(lease)
+            raise
+            
+        self.credential_pool.release(lease, response.headers, response.status_code)
         if response.status_code == 429:
-            reset_time = int(response.headers.get('x-rate-limit-reset', 300))
-            logger.warning(f"触发Twitter API限流，将在{reset_time}秒后重试")
-            time.sleep(reset_time + 5)  # 缓冲5秒
-            raise RateLimitException("触发Twitter API限流")
+            raise TwitterRateLimitError(
+                "触发Twitter API限流", retry_after=self.credential_pool.wait_time(key)
+            )
             
         return response
 
@@ -497,12 +570,8 @@ class TwitterDownloader(BaseDownloader):
         Returns:
             str: 文件的MD5哈希值
         """
-        md5 = hashlib.md5()
-        with open(path, 'rb') as f:
-            # 每次读取8KB
-            for chunk in iter(lambda: f.read(8192), b''):
-                md5.update(chunk)
-        return md5.hexdigest()
+        digest = self.file_digests.get(str(path)) or hash_file(path)
+        return digest['md5']
 
     def _download_media(self, url: str, tweet_id: str = "") -> bytes:
         """下载媒体文件。
@@ -523,29 +592,66 @@ class TwitterDownloader(BaseDownloader):
             response.raise_for_status()
             return response.content
             
-        except RateLimitException:
-            # 重试逻辑由装饰器处理
+        except TwitterRateLimitError:
+            # 由调用方按retry_after推迟该接口的请求
             raise
             
         except Exception as e:
             logger.error(f"下载媒体失败: {str(e)}")
             raise DownloadError(f"下载媒体失败: {str(e)}")
 
-    def _calculate_media_hash(self, content: bytes) -> str:
-        """计算媒体文件哈希值。
+    def _media_hash(self, item: Dict[str, Any]) -> str:
+        """获取媒体项的MD5哈希值。
+        
+        依次使用媒体项自带的哈希、下载时流式计算的摘要和本地文件，
+        都不可用时才流式请求媒体计算哈希，不会把整个文件读入内存。
         
         Args:
-            content: 媒体内容
+            item: 媒体项
             
         Returns:
             str: MD5哈希值
+            
+        Raises:
+            DownloadError: 下载失败时抛出
         """
-        return hashlib.md5(content).hexdigest()
+        media_hash = item.get('media_hash') or item.get('md5')
+        if media_hash:
+            return media_hash
+            
+        digest = self._media_digests.get(item.get('url', ''))
+        if digest:
+            return digest['md5']
+            
+        path = item.get('path')
+        if path and os.path.exists(path):
+            return self._safe_hash_file(path)
+            
+        try:
+            response = self.session.get(
+                item['url'],
+                headers=self._random_headers(),
+                proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None,
+                timeout=self.config.timeout,
+                stream=True
+            )
+            response.raise_for_status()
+            hasher = StreamingHasher()
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if chunk:
+                    hasher.update(chunk)
+        except Exception as e:
+            raise DownloadError(f"下载媒体失败: {str(e)}")
+            
+        digest = hasher.result()
+        self._media_digests[item['url']] = digest
+        return digest['md5']
 
     def _remove_dupes(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """复合去重逻辑。
         
-        基于推文ID和媒体文件哈希的组合去重。
+        基于推文ID和媒体文件哈希的组合去重，已保存到本地的媒体
+        还会查询保存目录的去重索引，与媒体库中已有的文件比较。
         
         Args:
             items: 媒体项列表
@@ -557,21 +663,24 @@ class TwitterDownloader(BaseDownloader):
         seen_keys = set()
         
         for item in items:
-            # 获取媒体内容
+            # 获取媒体哈希
             try:
-                content = self._download_media(item['url'], item.get('tweet_id', ''))
-                media_hash = self._calculate_media_hash(content)
+                media_hash = self._media_hash(item)
             except Exception as e:
                 logger.error(f"计算媒体哈希失败: {str(e)}")
                 continue
                 
             # 构建去重键
             dedup_key = (item.get('tweet_id', ''), media_hash)
+            local_path = item.get('path') if item.get('path') and os.path.exists(item['path']) else None
+            in_library = bool(local_path) and self.dedup_index.lookup(media_hash, exclude=local_path) is not None
             
             # 检查是否重复
-            if dedup_key not in seen_keys and dedup_key not in self._dedup_cache:
+            if dedup_key not in seen_keys and dedup_key not in self._dedup_cache and not in_library:
                 seen_keys.add(dedup_key)
                 self._dedup_cache.add(dedup_key)
+                if local_path:
+                    self.dedup_index.add(local_path, media_hash)
                 
                 # 添加哈希信息
                 item['media_hash'] = media_hash
@@ -585,6 +694,7 @@ class TwitterDownloader(BaseDownloader):
                 if 'path' in item and os.path.exists(item['path']):
                     try:
                         os.remove(item['path'])
+                        self.dedup_index.remove(item['path'])
                         logger.info(f"删除重复文件: {item['path']}")
                     except Exception as e:
                         logger.warning(f"删除重复文件失败: {item['path']} - {str(e)}")
@@ -606,6 +716,7 @@ class TwitterDownloader(BaseDownloader):
             Dict[str, Any]: 下载结果
 
         Raises:
+            TwitterRateLimitError: 推文列表接口限流，配额重置后重新下载会从中断处继续
             DownloadError: 下载失败
         """
         if not self._validate_url(url):
@@ -624,6 +735,8 @@ class TwitterDownloader(BaseDownloader):
                 return self._download_list(url)
             else:
                 return self._download_profile(url)
+        except TwitterRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"下载失败: {str(e)}")
             raise DownloadError(f"下载失败: {str(e)}")
@@ -645,27 +758,30 @@ class TwitterDownloader(BaseDownloader):
             # 优先尝试API下载
             logger.info("尝试使用API下载...")
             return self.api_client.download_tweet(tweet_id)
-        except APIError as e:
+        except (APIError, TwitterRateLimitError) as e:
             logger.info(f"API下载失败({str(e)})，降级到浏览器模拟...")
             return self._browser_download_tweet(url)
 
     def _download_profile(self, profile_url: str) -> Dict[str, Any]:
         """下载用户主页内容。
 
-        使用分页方式获取推文列表。
+        使用分页方式获取推文列表，上次因限流中断时从记录的游标继续。
 
         Args:
             profile_url: 用户主页URL
 
         Returns:
             Dict[str, Any]: 下载结果
+
+        Raises:
+            TwitterRateLimitError: 推文列表接口限流，已获取页面中的推文已下载
         """
         username = self._extract_username(profile_url)
         results = []
         
         try:
             # 优先尝试API
-            for page in self._api_get_tweets(username):
+            for page in self._api_get_tweets(username, self.timeline_cursors.pop(username, None)):
                 results.extend(self._process_tweet_page(page))
                 if self.config.max_items and len(results) >= self.config.max_items:
                     break
@@ -703,16 +819,26 @@ class TwitterDownloader(BaseDownloader):
                 logger.warning(f"下载失败: {tweet['url']} - {str(e)}")
         return results
 
-    def _api_get_tweets(self, username: str) -> Generator[List[Dict], None, None]:
+    def _api_get_tweets(
+        self,
+        username: str,
+        cursor: Optional[str] = None
+    ) -> Generator[List[Dict], None, None]:
         """使用API获取推文列表。
 
+        列表接口限流时不在线程中等待：把游标记录到timeline_cursors后立即抛出，
+        由调度方在配额重置后重新排队，下次下载该主页时从此处继续。
+
         Args:
             username: 用户名
+            cursor: 开始翻页的游标，None表示从最新的推文开始
 
         Yields:
             List[Dict]: 一页推文
+
+        Raises:
+            TwitterRateLimitError: 列表接口限流，retry_after为配额重置前的秒数
         """
-        cursor = None
         while True:
             try:
                 page = self.api_client.get_user_tweets(
@@ -731,6 +857,14 @@ class TwitterDownloader(BaseDownloader):
                 # 简化的日志输出
                 logger.info(f"已获取{len(page['tweets'])}条推文")
                 
+            except TwitterRateLimitError as e:
+                if cursor:
+                    self.timeline_cursors[username] = cursor
+                wait = e.retry_after if e.retry_after is not None else self.MAX_RATE_WAIT
+                logger.warning(f"推文列表接口已限流，保留游标，{wait:.0f}秒后可重新排队: {username}")
+                raise TwitterRateLimitError(
+                    f"推文列表接口已限流: {username}", retry_after=wait
+                ) from e
             except APIError as e:
                 logger.error(f"API获取失败: {str(e)}")
                 break
@@ -783,6 +917,11 @@ class TwitterDownloader(BaseDownloader):
             
         return url
 
+    def close(self):
+        """停止凭据池的后台刷新并关闭下载器。"""
+        self.credential_pool.close()
+        super().close()
+
     def _create_session(self) -> requests.Session:
         """创建HTTP会话。
         
@@ -798,17 +937,13 @@ class TwitterDownloader(BaseDownloader):
         retry = Retry(
             total=5,
             backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504, 429],
+            # 429由接口限额跟踪处理，不在适配器内重试
+            status_forcelist=[500, 502, 503, 504],
             allowed_methods=["GET", "POST", "HEAD"]
         )
         
         # 创建适配器
-        adapter = HTTPAdapter(
-            max_retries=retry,
-            pool_connections=10,
-            pool_maxsize=10,
-            pool_block=False
-        )
+        adapter = session_registry.make_adapter(retry)
         
         # 配置适配器
         session.mount("http://", adapter)
@@ -832,13 +967,6 @@ class TwitterDownloader(BaseDownloader):
         
         return session
 
-    def _update_guest_token(self):
-        """更新访客令牌。"""
-        guest_token = self._get_guest_token()
-        self.session.headers.update({
-            "x-guest-token": guest_token
-        })
-
 class TwitterDownloaderRouter:
     """Twitter下载器路由。
     
@@ -0,0 +1,232 @@
+"""Twitter接口限额跟踪模块。
+
+Twitter的每个接口有独立的限额窗口，每个响应都带有：
+- ``x-rate-limit-limit``: 窗口内的请求上限
+- ``x-rate-limit-remaining``: 窗口内剩余的请求数
+- ``x-rate-limit-reset``: 窗口重置的时间戳(秒)
+
+RateBudgetTracker按接口记录这些值：
+1. 每次请求前预约一个配额，本地扣减，多个线程并发时不会超发
+2. 剩余配额低于一定比例时，把剩余请求均匀分布到窗口结束前，而不是用完后再被429
+3. 配额用完或等待时间过长时只返回需要等待的秒数，由调用方让出该接口的任务，
+   其他接口的请求照常进行，不会有线程为一个接口空等整个窗口
+"""
+
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+from typing import Optional, Dict, Any, Callable, Hashable, Mapping
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_key(url: str) -> str:
+    """把请求地址归并为接口键。
+
+    去掉主机和查询参数，版本号之后的数字ID替换为 ``:id``，``username`` 后的用户名替换为 ``:username``，
+    例如 ``https://api.twitter.com/2/users/123/tweets?max_results=20`` 归并为 ``2/users/:id/tweets``。
+
+    Args:
+        url: 完整URL或相对路径
+
+    Returns:
+        str: 接口键
+    """
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    for i, part in enumerate(parts):
+        if i > 0 and part.isdigit():
+            parts[i] = ":id"
+        elif i > 0 and parts[i - 1] == "username":
+            parts[i] = ":username"
+    return "/".join(parts)
+
+
+class _Budget:
+    """单个接口的限额状态。"""
+
+    def __init__(self, limit: int, remaining: int, reset: float, window: float):
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+        self.window = window
+        self.next_slot = 0.0
+        self.throttled = 0
+
+
+class RateBudgetTracker:
+    """按接口跟踪响应头中的限额并控制请求节奏。
+
+    线程安全，锁只在计算预约时持有，等待由调用方在锁外进行。
+    没有收到过限额头的接口不做限制。
+
+    Attributes:
+        pace_below: float, 剩余配额低于上限的该比例时开始匀速放行
+        default_penalty: float, 429响应没有重置时间时的等待秒数
+        window: float, 限额窗口的长度(秒)，窗口重置后没有新的响应头时按此推算下一次重置
+    """
+
+    DEFAULT_PACE_BELOW = 0.5
+    DEFAULT_PENALTY = 60.0
+    DEFAULT_WINDOW = 900.0
+
+    def __init__(
+        self,
+        pace_below: float = DEFAULT_PACE_BELOW,
+        default_penalty: float = DEFAULT_PENALTY,
+        window: float = DEFAULT_WINDOW,
+        clock: Callable[[], float] = time.time
+    ):
+        """初始化跟踪器。
+
+        Args:
+            pace_below: 剩余配额低于上限的该比例时开始匀速放行，0表示只在用完时等待
+            default_penalty: 429响应没有重置时间时的等待秒数
+            window: 限额窗口的长度(秒)，Twitter的接口窗口为15分钟
+            clock: 返回时间戳的时钟函数，需要与x-rate-limit-reset可比较
+        """
+        self.pace_below = pace_below
+        self.default_penalty = default_penalty
+        self.window = window
+        self._clock = clock
+        self._budgets: Dict[Hashable, _Budget] = {}
+        self._lock = threading.Lock()
+
+    def _current(self, key: Hashable, now: float) -> Optional[_Budget]:
+        """获取接口的限额，窗口已重置时恢复到上限并推算下一次重置时间(调用方持有锁)。"""
+        budget = self._budgets.get(key)
+        if budget is not None and now >= budget.reset:
+            budget.remaining = budget.limit
+            budget.next_slot = 0.0
+            budget.reset += ((now - budget.reset) // budget.window + 1) * budget.window
+        return budget
+
+    def reserve(self, key: Hashable, max_wait: Optional[float] = None) -> float:
+        """为一次请求预约配额。
+
+        Args:
+            key: 接口键，可以是endpoint_key的结果或包含凭据标识的元组
+            max_wait: 调用方愿意等待的最长时间，超过时不占用配额
+
+        Returns:
+            float: 需要等待的秒数，0表示可以立即发送
+        """
+        now = self._clock()
+        with self._lock:
+            budget = self._current(key, now)
+            if budget is None:
+                return 0.0
+            if budget.remaining <= 0:
+                return max(0.0, budget.reset - now)
+
+            delay = 0.0
+            interval = 0.0
+            if budget.remaining < budget.limit * self.pace_below:
+                # 剩余请求均匀分布到窗口结束前
+                interval = max(0.0, budget.reset - now) / budget.remaining
+                delay = max(0.0, budget.next_slot - now)
+            if max_wait is not None and delay > max_wait:
+                return delay
+            budget.remaining -= 1
+            budget.next_slot = max(now, budget.next_slot) + interval
+            return delay
+
+    def cancel(self, key: Hashable) -> None:
+        """请求没有发出或没有收到响应时归还预约的配额。
+
+        Args:
+            key: 接口键
+        """
+        with self._lock:
+            budget = self._budgets.get(key)
+            if budget is not None:
+                budget.remaining = min(budget.limit, budget.remaining + 1)
+
+    def update(self, key: Hashable, headers: Mapping[str, str], status: Optional[int] = None) -> None:
+        """用响应头更新接口的限额。
+
+        Args:
+            key: 接口键
+            headers: 响应头
+            status: HTTP状态码，429表示配额已用完
+        """
+        try:
+            limit = int(headers.get("x-rate-limit-limit"))
+            remaining = int(headers.get("x-rate-limit-remaining"))
+            reset = float(headers.get("x-rate-limit-reset"))
+        except (TypeError, ValueError):
+            limit = remaining = reset = None
+
+        now = self._clock()
+        with self._lock:
+            budget = self._current(key, now)
+            if limit is not None:
+                if budget is None:
+                    budget = self._budgets[key] = _Budget(limit, remaining, reset, self.window)
+                else:
+                    if reset == budget.reset:
+                        # 同一窗口内并发请求的响应可能乱序，取较小的剩余数
+                        remaining = min(remaining, budget.remaining)
+                    budget.limit = limit
+                    budget.remaining = remaining
+                    budget.reset = reset
+            if status == 429:
+                if budget is None:
+                    # 没有收到过限额头，按默认惩罚时间作为窗口逐次试探
+                    budget = self._budgets[key] = _Budget(1, 0, now + self.default_penalty, self.default_penalty)
+                budget.remaining = 0
+                if budget.reset <= now:
+                    budget.reset = now + self.default_penalty
+                budget.throttled += 1
+                logger.warning(f"接口 {key} 已限流，{budget.reset - now:.0f}秒后重置")
+
+    def discard(self, key: Hashable) -> None:
+        """删除接口的限额记录。
+
+        Args:
+            key: 接口键
+        """
+        with self._lock:
+            self._budgets.pop(key, None)
+
+    def wait_time(self, key: Hashable) -> float:
+        """接口下一次请求需要等待的时间，不占用配额。
+
+        Args:
+            key: 接口键
+
+        Returns:
+            float: 需要等待的秒数
+        """
+        now = self._clock()
+        with self._lock:
+            budget = self._current(key, now)
+            if budget is None:
+                return 0.0
+            if budget.remaining <= 0:
+                return max(0.0, budget.reset - now)
+            if budget.remaining < budget.limit * self.pace_below:
+                return max(0.0, budget.next_slot - now)
+            return 0.0
+
+    def get_stats(self) -> Dict[Hashable, Dict[str, Any]]:
+        """获取各接口的限额状态。
+
+        Returns:
+            Dict[Hashable, Dict[str, Any]]: 接口键到上限、剩余数、重置等待时间和限流次数的映射
+        """
+        now = self._clock()
+        with self._lock:
+            return {
+                key: {
+                    'limit': budget.limit,
+                    'remaining': budget.remaining,
+                    'reset_in': max(0.0, budget.reset - now),
+                    'throttled': budget.throttled,
+                }
+                for key, budget in self._budgets.items()
+            }
+
+
+# 全局限额跟踪器，同一进程内的API客户端和下载器共享各接口的限额
+rate_budget = RateBudgetTracker()
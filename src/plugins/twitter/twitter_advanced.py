@@ -15,6 +15,7 @@ from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
 import requests
 
 from src.utils.cookie_manager import CookieManager
+from src.core.session_registry import session_registry
 from .config import TwitterDownloaderConfig
 
 logger = logging.getLogger(__name__)
@@ -92,6 +93,14 @@ class TwitterAdvancedDownloader:
             
         return context
         
+    def _session(self) -> requests.Session:
+        """获取共享的HTTP会话。
+        
+        Returns:
+            requests.Session: 会话对象
+        """
+        return session_registry.get("twitter", self.config.proxy, name="advanced")
+        
     def _load_downloaded_ids(self) -> Set[str]:
         """加载已下载的推文ID。
         
@@ -244,11 +253,10 @@ class TwitterAdvancedDownloader:
         }
         
         try:
-            response = requests.get(
+            response = self._session().get(
                 api_url,
                 params=params,
                 headers=headers,
-                proxies={'http': self.config.proxy, 'https': self.config.proxy} if self.config.proxy else None,
                 timeout=30
             )
             response.raise_for_status()
@@ -388,9 +396,8 @@ class TwitterAdvancedDownloader:
             save_path = save_dir / filename
             
             # 下载文件
-            response = requests.get(
+            response = self._session().get(
                 url,
-                proxies={'http': self.config.proxy, 'https': self.config.proxy} if self.config.proxy else None,
                 timeout=30,
                 stream=True
             )
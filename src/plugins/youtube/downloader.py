@@ -311,11 +311,10 @@ class YouTubeDownloader(BaseDownloader):
             
             # 访问会员专属页面
             test_url = "https://www.youtube.com/account"
-            response = requests.get(
+            response = self.session.get(
                 test_url,
                 headers=headers,
                 cookies=cookies,
-                proxies={'http': self.proxy, 'https': self.proxy} if self.proxy else None,
                 timeout=self.timeout
             )
             response.raise_for_status()
@@ -5,10 +5,17 @@ import cv2
 import numpy as np
 import ffmpeg
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+from ..core import postprocess
+from ..core.session_registry import session_registry
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +38,11 @@ class TikTokWatermarkRemover:
         'min_logo_size': 20,  # 最小Logo尺寸
         'max_logo_size': 150,  # 最大Logo尺寸
         'sample_frames': 10,  # 采样帧数
+        'fast_mode': True,  # 快速检测：只解码少量关键帧并缩小后计算
+        'keyframes': 8,  # 快速检测的采样帧数
+        'detect_width': 360,  # 快速检测时缩放到的宽度
+        'static_diff_threshold': 8,  # 静态像素的平均帧差上限
+        'edge_threshold': 20,  # 水印边缘的梯度下限
     }
     
     # 常见水印位置
@@ -60,10 +72,18 @@ class TikTokWatermarkRemover:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.max_workers = max_workers
         
+        # 同一账号同一分辨率的水印位置相同，检测结果按(账号, 宽, 高)缓存
+        self._region_cache: Dict[Tuple[str, int, int], List[WatermarkRegion]] = {}
+        self._cache_lock = threading.Lock()
+        
         if detection_params:
             self.DETECTION_PARAMS.update(detection_params)
             
-    def detect_watermark(self, video_path: str) -> List[WatermarkRegion]:
+    def detect_watermark(
+        self,
+        video_path: str,
+        account: Optional[str] = None
+    ) -> List[WatermarkRegion]:
         """检测视频中的水印区域。
         
         使用多种检测方法：
@@ -72,8 +92,11 @@ class TikTokWatermarkRemover:
         3. 文字检测识别用户名
         4. 常见位置启发式检查
         
+        指定账号时，同一账号同一分辨率的视频直接复用缓存的检测结果。
+        
         Args:
             video_path: 视频文件路径
+            account: 视频来源账号
             
         Returns:
             List[WatermarkRegion]: 检测到的水印区域列表
@@ -87,6 +110,14 @@ class TikTokWatermarkRemover:
             height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             
+            cache_key = (account, width, height) if account else None
+            if cache_key:
+                with self._cache_lock:
+                    cached = self._region_cache.get(cache_key)
+                if cached is not None:
+                    logger.debug(f"使用缓存的水印区域: {account} {width}x{height}")
+                    return list(cached)
+            
             # 1. 帧差法检测静态区域
             static_regions = self._detect_static_regions(
                 cap,
@@ -112,6 +143,10 @@ class TikTokWatermarkRemover:
                 if self._validate_region(region, width, height)
             ]
             
+            if cache_key:
+                with self._cache_lock:
+                    self._region_cache[cache_key] = list(regions)
+                    
         finally:
             cap.release()
             
@@ -125,6 +160,9 @@ class TikTokWatermarkRemover:
         total_frames: int
     ) -> List[WatermarkRegion]:
         """使用帧差法检测静态水印区域。"""
+        if self.DETECTION_PARAMS.get('fast_mode'):
+            return self._detect_static_regions_fast(cap, width, height, total_frames)
+            
         regions = []
         prev_frame = None
         diff_acc = np.zeros((height, width), dtype=np.float32)
@@ -183,6 +221,122 @@ class TikTokWatermarkRemover:
                     
         return regions
         
+    def _sample_frames(
+        self,
+        cap: cv2.VideoCapture,
+        width: int,
+        height: int,
+        total_frames: int
+    ) -> Tuple[np.ndarray, float]:
+        """均匀跳转到若干帧，解码为缩小的灰度图。
+        
+        Args:
+            cap: 视频对象
+            width: 视频宽度
+            height: 视频高度
+            total_frames: 总帧数
+            
+        Returns:
+            Tuple[np.ndarray, float]: 形状为(帧数, 高, 宽)的帧数组和缩放比例
+        """
+        scale = min(1.0, self.DETECTION_PARAMS['detect_width'] / width) if width else 1.0
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        positions = np.unique(np.linspace(
+            0,
+            max(total_frames - 1, 0),
+            num=self.DETECTION_PARAMS['keyframes'],
+            dtype=np.int64
+        ))
+        
+        frames = []
+        for pos in positions:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(pos))
+            ret, frame = cap.read()
+            if not ret:
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if gray.shape[::-1] != size:
+                gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+            frames.append(gray)
+            
+        if not frames:
+            return np.empty((0, size[1], size[0]), dtype=np.uint8), scale
+        return np.stack(frames), scale
+        
+    @staticmethod
+    def _static_pixel_mask(
+        frames: np.ndarray,
+        diff_threshold: float,
+        edge_threshold: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """计算静态像素掩码。
+        
+        在整个帧数组上一次性计算相邻帧差的均值，帧差小且中值帧上有明显边缘的
+        像素视为水印像素。
+        
+        Args:
+            frames: 形状为(帧数, 高, 宽)的灰度帧数组
+            diff_threshold: 平均帧差上限
+            edge_threshold: 梯度下限
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 布尔掩码和平均帧差
+        """
+        stack = frames.astype(np.int16)
+        mean_diff = np.abs(np.diff(stack, axis=0)).mean(axis=0, dtype=np.float32)
+        
+        # 纯色背景也不变化，要求像素处在所有帧都存在的边缘上
+        median = np.median(stack, axis=0)
+        grad_y, grad_x = np.gradient(median)
+        edges = np.hypot(grad_x, grad_y) > edge_threshold
+        
+        return (mean_diff < diff_threshold) & edges, mean_diff
+        
+    def _detect_static_regions_fast(
+        self,
+        cap: cv2.VideoCapture,
+        width: int,
+        height: int,
+        total_frames: int
+    ) -> List[WatermarkRegion]:
+        """在少量缩小的关键帧上检测静态水印区域。"""
+        frames, scale = self._sample_frames(cap, width, height, total_frames)
+        if len(frames) < 2:
+            return []
+            
+        mask, mean_diff = self._static_pixel_mask(
+            frames,
+            self.DETECTION_PARAMS['static_diff_threshold'],
+            self.DETECTION_PARAMS['edge_threshold']
+        )
+        
+        # 膨胀后把水印的笔画连成一块
+        mask = cv2.dilate(
+            mask.astype(np.uint8) * 255,
+            np.ones((3, 3), dtype=np.uint8),
+            iterations=2
+        )
+        contours, _ = cv2.findContours(
+            mask,
+            cv2.RETR_EXTERNAL,
+            cv2.CHAIN_APPROX_SIMPLE
+        )
+        
+        regions = []
+        min_size = self.DETECTION_PARAMS['min_logo_size']
+        max_size = self.DETECTION_PARAMS['max_logo_size']
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            # 还原到原始分辨率
+            rx, ry = int(x / scale), int(y / scale)
+            rw = min(int(round(w / scale)), width - rx)
+            rh = min(int(round(h / scale)), height - ry)
+            if min_size <= rw <= max_size and min_size <= rh <= max_size:
+                confidence = 1.0 - float(mean_diff[y:y+h, x:x+w].mean()) / 255
+                regions.append(WatermarkRegion(rx, ry, rw, rh, confidence))
+                
+        return regions
+        
     def _check_common_regions(
         self,
         width: int,
@@ -295,19 +449,21 @@ class TikTokWatermarkRemover:
     def remove_watermark(
         self,
         video_path: str,
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        account: Optional[str] = None
     ) -> str:
         """移除视频水印。
         
         Args:
             video_path: 输入视频路径
             output_path: 输出视频路径（可选）
+            account: 视频来源账号（可选），用于复用水印检测结果
             
         Returns:
             str: 处理后的视频路径
         """
         # 1. 检测水印区域
-        regions = self.detect_watermark(video_path)
+        regions = self.detect_watermark(video_path, account)
         
         if not regions:
             logger.warning(f"未检测到水印: {video_path}")
@@ -359,13 +515,15 @@ class TikTokWatermarkRemover:
     def batch_remove_watermark(
         self,
         video_paths: List[str],
-        output_dir: Optional[str] = None
+        output_dir: Optional[str] = None,
+        accounts: Optional[List[Optional[str]]] = None
     ) -> List[str]:
         """批量移除视频水印。
         
         Args:
             video_paths: 输入视频路径列表
             output_dir: 输出目录（可选）
+            accounts: 每个视频的来源账号（可选）
             
         Returns:
             List[str]: 处理后的视频路径列表
@@ -375,13 +533,20 @@ class TikTokWatermarkRemover:
             self.output_dir.mkdir(parents=True, exist_ok=True)
             
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            results = list(executor.map(self.remove_watermark, video_paths))
+            results = list(executor.map(
+                self.remove_watermark,
+                video_paths,
+                [None] * len(video_paths),
+                accounts or [None] * len(video_paths)
+            ))
             
         return results
 
 class TikTokDownloader:
     """TikTok视频下载器。"""
     
+    CHUNK_SIZE = 1024 * 1024
+    
     def __init__(
         self,
         output_dir: str,
@@ -397,6 +562,7 @@ class TikTokDownloader:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
         
         if remove_watermark:
             self.watermark_remover = TikTokWatermarkRemover(
@@ -406,6 +572,38 @@ class TikTokDownloader:
         else:
             self.watermark_remover = None
             
+    def _fetch(self, url: str) -> Optional[str]:
+        """下载视频文件，不做后处理。
+        
+        先写入 ``.part`` 临时文件，完成后再改名，文件名取自URL路径。
+        
+        Args:
+            url: 视频文件的直链
+            
+        Returns:
+            Optional[str]: 下载的视频路径，失败时为None
+        """
+        name = os.path.basename(urlparse(url).path) or "video"
+        if not os.path.splitext(name)[1]:
+            name += ".mp4"
+        video_path = self.output_dir / name
+        part_path = video_path.with_name(video_path.name + ".part")
+        
+        session = session_registry.get("tiktok", name="processor")
+        try:
+            with session.get(url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                with open(part_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        f.write(chunk)
+            os.replace(part_path, video_path)
+        except (requests.RequestException, OSError) as e:
+            part_path.unlink(missing_ok=True)
+            logger.error(f"下载视频失败: {url} - {e}")
+            return None
+            
+        return str(video_path)
+        
     def download(self, url: str) -> Optional[str]:
         """下载单个视频。
         
@@ -415,30 +613,57 @@ class TikTokDownloader:
         Returns:
             Optional[str]: 下载的视频路径
         """
-        # TODO: 实现视频下载逻辑
-        video_path = None
+        video_path = self._fetch(url)
         
         if video_path and self.watermark_remover:
             return self.watermark_remover.remove_watermark(video_path)
             
         return video_path
         
-    def batch_download(self, urls: List[str]) -> List[Optional[str]]:
+    def batch_download(
+        self,
+        urls: List[str],
+        accounts: Optional[List[Optional[str]]] = None
+    ) -> List[Optional[str]]:
         """批量下载视频。
         
+        每个视频下载完成后立即交给后处理进程池去水印，下载线程继续下载下一个，
+        下载和去水印同时进行。
+        
         Args:
             urls: 视频URL列表
+            accounts: 每个视频的来源账号（可选），用于复用水印检测结果
             
         Returns:
-            List[Optional[str]]: 下载的视频路径列表
+            List[Optional[str]]: 下载的视频路径列表，顺序与urls一致
         """
+        results: List[Optional[str]] = [None] * len(urls)
+        post_jobs = {}
+        processor = postprocess.get_post_processor() if self.watermark_remover else None
+        
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            results = list(executor.map(self.download, urls))
-            
-        if self.watermark_remover:
-            # 过滤出成功下载的视频
-            valid_paths = [p for p in results if p]
-            if valid_paths:
-                results = self.watermark_remover.batch_remove_watermark(valid_paths)
+            futures = {executor.submit(self._fetch, url): i for i, url in enumerate(urls)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.error(f"下载失败: {urls[i]} - {e}")
+                    continue
+                if results[i] and processor:
+                    post_jobs[i] = processor.submit(
+                        postprocess.remove_watermark,
+                        results[i],
+                        str(self.watermark_remover.output_dir),
+                        accounts[i] if accounts else None,
+                        priority=i,
+                        name=os.path.basename(results[i])
+                    )
+                    
+        for i, job in post_jobs.items():
+            try:
+                results[i] = job.result().output
+            except Exception as e:
+                logger.error(f"去水印失败: {results[i]} - {e}")
                 
         return results 
\ No newline at end of file
@@ -5,12 +5,13 @@
 
 import os
 import asyncio
-import hashlib
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from concurrent.futures import ThreadPoolExecutor
 import logging
 
+from ..core.hashing import hash_file
+from ..core.dedup_index import get_dedup_index
 from ..models.videos import Video
 from ..schemas.video import VideoInfo
 from .scanner import VideoScanner
@@ -27,6 +28,7 @@ class VideoDownloader:
         download_dir: 下载目录
         max_workers: 最大工作线程数
         executor: 线程池执行器
+        dedup_index: 下载目录的去重索引
     """
     
     def __init__(
@@ -48,6 +50,7 @@ class VideoDownloader:
         
         # 确保下载目录存在
         os.makedirs(download_dir, exist_ok=True)
+        self.dedup_index = get_dedup_index(download_dir)
         
     async def start_auto_download(
         self,
@@ -110,16 +113,19 @@ class VideoDownloader:
             downloader = api.get_downloader(video.url)
             await downloader.download(file_path)
             
-            # 计算文件信息
-            file_info = await self._get_file_info(file_path)
+            # 计算文件信息，优先使用下载时按路径记录的流式摘要
+            digest = getattr(downloader, 'file_digests', {}).get(str(file_path))
+            file_info = await self._get_file_info(file_path, digest)
             
             # 检查文件MD5是否重复
-            if self._is_duplicate_file(file_info["md5"]):
+            if self._is_duplicate_file(file_info["md5"], file_path):
                 # 删除重复文件
                 os.remove(file_path)
                 self.scanner.update_video_status(video.id, "duplicate")
                 return False
                 
+            self.dedup_index.add(file_path, file_info["md5"])
+            
             # 更新状态为完成
             self.scanner.update_video_status(
                 video.id,
@@ -153,11 +159,16 @@ class VideoDownloader:
         
         return os.path.join(platform_dir, filename)
         
-    async def _get_file_info(self, file_path: str) -> Dict[str, Any]:
+    async def _get_file_info(
+        self,
+        file_path: str,
+        digest: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """获取文件信息。
         
         Args:
             file_path: 文件路径
+            digest: 下载时已计算的摘要，可选
             
         Returns:
             Dict[str, Any]: 文件信息
@@ -167,41 +178,52 @@ class VideoDownloader:
         return await loop.run_in_executor(
             self.executor,
             self._calculate_file_info,
-            file_path
+            file_path,
+            digest
         )
         
-    def _calculate_file_info(self, file_path: str) -> Dict[str, Any]:
+    def _calculate_file_info(
+        self,
+        file_path: str,
+        digest: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """计算文件信息。
         
         Args:
             file_path: 文件路径
+            digest: 下载时已计算的摘要，提供时不再读取文件
             
         Returns:
             Dict[str, Any]: 文件信息
         """
-        file_size = os.path.getsize(file_path) / (1024 * 1024)  # 转换为MB
+        size_bytes = os.path.getsize(file_path)
+        file_size = size_bytes / (1024 * 1024)  # 转换为MB
         
-        # 计算MD5
-        md5 = hashlib.md5()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                md5.update(chunk)
+        # 没有可用的流式摘要时才分块读取文件计算MD5
+        if not digest or not digest.get('md5') or digest.get('size', size_bytes) != size_bytes:
+            digest = hash_file(file_path)
                 
         return {
             'path': file_path,
             'size': file_size,
-            'md5': md5.hexdigest()
+            'md5': digest['md5']
         }
         
-    def _is_duplicate_file(self, file_md5: str) -> bool:
+    def _is_duplicate_file(self, file_md5: str, file_path: Optional[str] = None) -> bool:
         """检查文件是否重复。
         
+        优先查询去重索引，索引中没有时再查询历史记录。
+        
         Args:
             file_md5: 文件MD5
+            file_path: 文件自身路径，查询索引时排除
             
         Returns:
             bool: 是否重复
         """
+        if self.dedup_index.lookup(file_md5, exclude=file_path):
+            return True
+            
         try:
             with Session(self.scanner.engine) as session:
                 return session.query(Video).filter_by(
@@ -1,22 +1,23 @@
 """速率限制服务。
 
 提供各平台API请求的速率限制功能。
-支持Twitter、B站等平台的自定义限制规则。
+支持Twitter、B站等平台的自定义限制规则，可以按 (平台, 接口) 分别限速。
+限速基于GCRA，每次请求只做一次原子的预约计算，等待在锁外进行。
 """
 
-import time
 import logging
-from typing import Dict, Tuple, List, Optional
-from threading import Lock
-from collections import deque
+from typing import Dict, Tuple, Optional, Union
+
+from .gcra import GCRALimiter, MemoryStateStore, SQLiteStateStore
+from .limiter import RateLimiter, RateLimitExceededError
 
 logger = logging.getLogger(__name__)
 
 class PlatformRateLimiter:
     """平台速率限制器。
     
-    基于滑动窗口算法实现请求速率限制。
-    支持多平台不同限制规则。
+    基于GCRA算法实现请求速率限制，时间窗口内允许突发到最大请求数，之后匀速放行。
+    支持多平台不同限制规则，接口未单独配置时使用所属平台的规则但独立计数。
     线程安全。
     
     Attributes:
@@ -32,52 +33,40 @@ class PlatformRateLimiter:
         "youtube": (10000, 86400)  # 10000次/天
     }
     
-    def __init__(self):
-        """初始化速率限制器。"""
-        # 请求记录: {platform: deque[(timestamp, count)]}
-        self._requests: Dict[str, deque] = {}
-        # 平台锁: {platform: Lock}
-        self._locks: Dict[str, Lock] = {}
-        
-    def _get_platform_lock(self, platform: str) -> Lock:
-        """获取平台锁。
+    def __init__(
+        self,
+        rules: Optional[Dict[Union[str, Tuple[str, str]], Tuple[int, int]]] = None,
+        store: Optional[Union[MemoryStateStore, SQLiteStateStore]] = None
+    ):
+        """初始化速率限制器。
         
         Args:
-            platform: 平台名称
-            
-        Returns:
-            Lock: 平台对应的线程锁
+            rules: 额外的规则，键为平台名或 (平台, 接口)
+            store: 限速状态存储，传入SQLiteStateStore时多个进程共享限额
         """
-        if platform not in self._locks:
-            self._locks[platform] = Lock()
-        return self._locks[platform]
+        self._limiter = GCRALimiter({**self.RULES, **(rules or {})}, store=store)
         
-    def _init_platform(self, platform: str) -> None:
-        """初始化平台记录。
+    @staticmethod
+    def _key(platform: str, endpoint: Optional[str]) -> Union[str, Tuple[str, str]]:
+        """限速键。"""
+        return (platform, endpoint) if endpoint else platform
         
-        Args:
-            platform: 平台名称
-        """
-        if platform not in self._requests:
-            self._requests[platform] = deque()
-            
-    def _clean_old_requests(self, platform: str, window: int) -> None:
-        """清理过期请求记录。
+    def _check_rule(self, platform: str, endpoint: Optional[str] = None) -> None:
+        """检查平台或接口的规则是否存在。
         
-        Args:
-            platform: 平台名称
-            window: 时间窗口(秒)
+        Raises:
+            ValueError: 平台规则未定义
         """
-        now = time.time()
-        while (self._requests[platform] and 
-               now - self._requests[platform][0][0] > window):
-            self._requests[platform].popleft()
+        rules = self._limiter.rules
+        if platform not in rules and (platform, endpoint) not in rules:
+            raise ValueError(f"未定义平台 {platform} 的限制规则")
             
-    def check(self, platform: str) -> bool:
-        """检查是否允许请求。
+    def check(self, platform: str, endpoint: Optional[str] = None) -> bool:
+        """检查是否允许请求，允许时占用一次配额。
         
         Args:
             platform: 平台名称
+            endpoint: 接口名称，None表示按平台整体计数
             
         Returns:
             bool: 是否允许请求
@@ -85,46 +74,18 @@ class PlatformRateLimiter:
         Raises:
             ValueError: 平台规则未定义
         """
-        # 获取平台规则
-        if platform not in self.RULES:
-            raise ValueError(f"未定义平台 {platform} 的限制规则")
-            
-        max_requests, window = self.RULES[platform]
-        
-        # 获取平台锁
-        with self._get_platform_lock(platform):
-            # 初始化平台记录
-            self._init_platform(platform)
-            
-            # 清理过期记录
-            self._clean_old_requests(platform, window)
-            
-            # 计算当前请求数
-            current_requests = sum(count for _, count in self._requests[platform])
-            
-            # 检查是否超限
-            if current_requests >= max_requests:
-                logger.warning(
-                    f"平台 {platform} 请求超限: "
-                    f"{current_requests}/{max_requests} 次/{window}秒"
-                )
-                return False
-                
-            # 记录新请求
-            now = time.time()
-            self._requests[platform].append((now, 1))
-            
-            logger.debug(
-                f"平台 {platform} 当前请求: "
-                f"{current_requests + 1}/{max_requests} 次/{window}秒"
-            )
-            return True
-            
-    def wait(self, platform: str) -> float:
-        """计算需要等待的时间。
+        self._check_rule(platform, endpoint)
+        if not self._limiter.try_acquire(self._key(platform, endpoint)):
+            logger.warning(f"平台 {platform} 请求超限: {endpoint or '全部接口'}")
+            return False
+        return True
+            
+    def wait(self, platform: str, endpoint: Optional[str] = None) -> float:
+        """计算需要等待的时间，不占用配额。
         
         Args:
             platform: 平台名称
+            endpoint: 接口名称
             
         Returns:
             float: 需要等待的秒数
@@ -132,48 +93,48 @@ class PlatformRateLimiter:
         Raises:
             ValueError: 平台规则未定义
         """
-        # 获取平台规则
-        if platform not in self.RULES:
-            raise ValueError(f"未定义平台 {platform} 的限制规则")
-            
-        max_requests, window = self.RULES[platform]
+        self._check_rule(platform, endpoint)
+        return self._limiter.peek(self._key(platform, endpoint))
+        
+    def acquire(self, platform: str, endpoint: Optional[str] = None) -> float:
+        """预约一次请求并等待到预约时间。
         
-        # 获取平台锁
-        with self._get_platform_lock(platform):
-            # 初始化平台记录
-            self._init_platform(platform)
+        Args:
+            platform: 平台名称
+            endpoint: 接口名称
             
-            # 清理过期记录
-            self._clean_old_requests(platform, window)
+        Returns:
+            float: 实际等待的秒数
             
-            # 如果没有请求记录，无需等待
-            if not self._requests[platform]:
-                return 0
-                
-            # 计算最早请求的时间
-            earliest_time = self._requests[platform][0][0]
-            now = time.time()
+        Raises:
+            ValueError: 平台规则未定义
+        """
+        self._check_rule(platform, endpoint)
+        return self._limiter.acquire(self._key(platform, endpoint))
+        
+    async def acquire_async(self, platform: str, endpoint: Optional[str] = None) -> float:
+        """异步预约一次请求，等待时不阻塞事件循环。
+        
+        Args:
+            platform: 平台名称
+            endpoint: 接口名称
             
-            # 计算需要等待的时间
-            wait_time = max(0, window - (now - earliest_time))
+        Returns:
+            float: 实际等待的秒数
             
-            return wait_time
+        Raises:
+            ValueError: 平台规则未定义
+        """
+        self._check_rule(platform, endpoint)
+        return await self._limiter.acquire_async(self._key(platform, endpoint))
             
     def reset(self, platform: Optional[str] = None) -> None:
         """重置请求记录。
         
         Args:
-            platform: 平台名称，如果为None则重置所有平台
+            platform: 平台名称，同时重置该平台的所有接口；如果为None则重置所有平台
         """
-        if platform:
-            # 重置指定平台
-            with self._get_platform_lock(platform):
-                if platform in self._requests:
-                    self._requests[platform].clear()
-        else:
-            # 重置所有平台
-            for p in list(self._requests.keys()):
-                self.reset(p)
+        self._limiter.reset(platform)
                 
 # 创建全局实例
 rate_limiter = PlatformRateLimiter()
@@ -0,0 +1,276 @@
+"""GCRA速率限制模块。
+
+GCRA(通用信元速率算法)只为每个键保存一个"理论到达时间"(TAT)：
+1. 每次请求在锁内读出TAT，算出允许发送的时间并把TAT推进一个发射间隔，
+   整个预约是一次原子的读-改-写，不需要扫描请求记录
+2. 调用方拿到需要等待的秒数后在锁外sleep，其他线程可以同时预约后续时间
+3. 异步路径使用asyncio.sleep，不阻塞事件循环
+
+状态可以保存在SQLiteStateStore中，多个进程共享同一个限额。
+"""
+
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Tuple, Callable, Hashable, Union
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryStateStore:
+    """进程内的TAT存储。"""
+
+    def __init__(self):
+        """初始化存储。"""
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def update(self, key: str, fn: Callable[[Optional[float]], Tuple[Optional[float], float]]) -> float:
+        """原子地读出并更新TAT。
+
+        Args:
+            key: 限速键
+            fn: 接收当前TAT(不存在时为None)，返回(新TAT或None表示不修改, 结果)
+
+        Returns:
+            float: fn返回的结果
+        """
+        with self._lock:
+            new_tat, result = fn(self._tats.get(key))
+            if new_tat is not None:
+                self._tats[key] = new_tat
+            return result
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """清除TAT。
+
+        Args:
+            key: 限速键，同时清除以 ``key/`` 开头的子键；None表示清除全部
+        """
+        with self._lock:
+            if key is None:
+                self._tats.clear()
+            else:
+                for k in [k for k in self._tats if k == key or k.startswith(key + "/")]:
+                    del self._tats[k]
+
+
+class SQLiteStateStore:
+    """跨进程共享的TAT存储。
+
+    每次预约在一个 ``BEGIN IMMEDIATE`` 事务中完成，数据库写锁保证多进程间的原子性。
+    时间使用 ``time.time``，各进程的时钟可以比较。
+    """
+
+    def __init__(self, db_path: Union[str, Path], timeout: float = 5.0):
+        """初始化存储。
+
+        Args:
+            db_path: 数据库路径
+            timeout: 等待其他进程释放写锁的最长时间(秒)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS gcra (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+            )
+
+    def update(self, key: str, fn: Callable[[Optional[float]], Tuple[Optional[float], float]]) -> float:
+        """原子地读出并更新TAT。
+
+        Args:
+            key: 限速键
+            fn: 接收当前TAT(不存在时为None)，返回(新TAT或None表示不修改, 结果)
+
+        Returns:
+            float: fn返回的结果
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tat FROM gcra WHERE key = ?", (key,)).fetchone()
+                new_tat, result = fn(row[0] if row else None)
+                if new_tat is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO gcra (key, tat) VALUES (?, ?)", (key, new_tat)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """清除TAT。
+
+        Args:
+            key: 限速键，同时清除以 ``key/`` 开头的子键；None表示清除全部
+        """
+        with self._lock:
+            if key is None:
+                self._conn.execute("DELETE FROM gcra")
+            else:
+                self._conn.execute(
+                    "DELETE FROM gcra WHERE key = ? OR substr(key, 1, ?) = ?",
+                    (key, len(key) + 1, key + "/")
+                )
+
+    def close(self) -> None:
+        """关闭数据库。"""
+        with self._lock:
+            self._conn.close()
+
+
+class GCRALimiter:
+    """按键限速的GCRA限制器。
+
+    线程安全，锁只在计算预约时持有。
+
+    Attributes:
+        rules: Dict[Hashable, Tuple[int, float]], 每个键的 (请求数, 时间窗口秒)
+        default_rule: Optional[Tuple[int, float]], 未配置的键使用的规则
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Dict[Hashable, Tuple[int, float]]] = None,
+        default_rule: Optional[Tuple[int, float]] = None,
+        store: Optional[Union[MemoryStateStore, SQLiteStateStore]] = None,
+        clock: Optional[Callable[[], float]] = None
+    ):
+        """初始化限制器。
+
+        Args:
+            rules: 每个键的 (请求数, 时间窗口秒)，窗口内最多突发该请求数，之后匀速放行
+            default_rule: 未配置的键使用的规则，None表示未配置的键抛出ValueError
+            store: TAT存储，默认为进程内存储；使用SQLite存储时多个进程共享限额
+            clock: 时钟函数，默认进程内用time.monotonic，共享存储时用time.time
+        """
+        self.rules = dict(rules or {})
+        self.default_rule = default_rule
+        self._store = store or MemoryStateStore()
+        if clock is None:
+            clock = time.time if isinstance(self._store, SQLiteStateStore) else time.monotonic
+        self._clock = clock
+
+    def _rule(self, key: Hashable) -> Tuple[int, float]:
+        """获取键的规则。"""
+        rule = self.rules.get(key)
+        if rule is None and isinstance(key, tuple):
+            # (平台, 接口) 未单独配置时使用平台的规则
+            rule = self.rules.get(key[0])
+        if rule is None:
+            rule = self.default_rule
+        if rule is None:
+            raise ValueError(f"未定义 {key} 的限制规则")
+        return rule
+
+    @staticmethod
+    def _store_key(key: Hashable) -> str:
+        """存储使用的字符串键。"""
+        return "/".join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+    def reserve(self, key: Hashable, cost: int = 1, commit_if_delayed: bool = True) -> float:
+        """预约一次请求。
+
+        Args:
+            key: 限速键，例如平台名或 (平台, 接口)
+            cost: 本次请求消耗的配额
+            commit_if_delayed: 需要等待时是否仍然占用预约
+
+        Returns:
+            float: 需要等待的秒数，0表示可以立即发送
+        """
+        count, period = self._rule(key)
+        interval = period / count
+        tolerance = interval * (count - 1)
+        now = self._clock()
+
+        def reserve_fn(tat: Optional[float]) -> Tuple[Optional[float], float]:
+            tat = now if tat is None else max(tat, now)
+            delay = max(0.0, tat - tolerance - now)
+            if delay > 0 and not commit_if_delayed:
+                return None, delay
+            return tat + interval * cost, delay
+
+        return self._store.update(self._store_key(key), reserve_fn)
+
+    def try_acquire(self, key: Hashable, cost: int = 1) -> bool:
+        """不等待地获取一次配额。
+
+        Args:
+            key: 限速键
+            cost: 本次请求消耗的配额
+
+        Returns:
+            bool: 是否获取成功，失败时不占用配额
+        """
+        return self.reserve(key, cost, commit_if_delayed=False) == 0
+
+    def peek(self, key: Hashable) -> float:
+        """计算下一次请求需要等待的时间，不占用配额。
+
+        Args:
+            key: 限速键
+
+        Returns:
+            float: 需要等待的秒数
+        """
+        count, period = self._rule(key)
+        tolerance = period / count * (count - 1)
+        now = self._clock()
+        return self._store.update(
+            self._store_key(key),
+            lambda tat: (None, 0.0 if tat is None else max(0.0, tat - tolerance - now))
+        )
+
+    def acquire(self, key: Hashable, cost: int = 1) -> float:
+        """获取配额，必要时在锁外等待。
+
+        Args:
+            key: 限速键
+            cost: 本次请求消耗的配额
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        delay = self.reserve(key, cost)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, key: Hashable, cost: int = 1) -> float:
+        """获取配额的异步版本，等待时不阻塞事件循环。
+
+        Args:
+            key: 限速键
+            cost: 本次请求消耗的配额
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        delay = self.reserve(key, cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        """清除限速状态。
+
+        Args:
+            key: 限速键，平台名同时清除该平台所有接口；None表示清除全部
+        """
+        self._store.reset(None if key is None else self._store_key(key))
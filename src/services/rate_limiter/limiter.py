@@ -1,7 +1,7 @@
 """速率限制服务模块。
 
 提供通用的速率限制功能，支持：
-- 基于时间窗口的限制
+- 基于GCRA的调用间隔限制
 - 线程安全操作
 - 异步等待
 - 自定义错误处理
@@ -11,8 +11,9 @@ import time
 import asyncio
 import logging
 from threading import Lock
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable
+
+from .gcra import GCRALimiter
 
 logger = logging.getLogger(__name__)
 
@@ -32,29 +33,30 @@ class RateLimiter:
     """通用速率限制器。
     
     支持：
-    - 基于固定时间窗口的限制
-    - 线程安全操作
+    - 基于GCRA的固定调用间隔
+    - 线程安全操作，等待在锁外进行
     - 同步/异步等待
     - 自定义错误处理
     
     Attributes:
         calls_per_minute: int, 每分钟允许的调用次数
         interval: float, 调用间隔（秒）
-        last_call: float, 上次调用时间戳
-        lock: Lock, 线程锁
+        lock: Lock, 保护统计信息的线程锁
         stats: Dict[str, Any], 统计信息
     """
     
     def __init__(
         self,
         calls_per_minute: int,
-        error_on_exceed: bool = False
+        error_on_exceed: bool = False,
+        clock: Optional[Callable[[], float]] = None
     ):
         """初始化速率限制器。
         
         Args:
             calls_per_minute: 每分钟允许的调用次数
             error_on_exceed: 是否在超出限制时抛出异常，默认等待
+            clock: 预约使用的时钟函数，默认time.monotonic，测试时可替换
         """
         if calls_per_minute <= 0:
             raise ValueError("calls_per_minute 必须大于 0")
@@ -63,7 +65,8 @@ class RateLimiter:
         self.interval = 60.0 / calls_per_minute
         self.error_on_exceed = error_on_exceed
         
-        self.last_call = 0.0
+        # 相邻调用至少间隔interval，不允许突发
+        self._gcra = GCRALimiter(default_rule=(1, self.interval), clock=clock)
         self.lock = Lock()
         
         # 统计信息
@@ -74,20 +77,26 @@ class RateLimiter:
             "last_reset": time.time()
         }
         
-    def wait(self) -> None:
-        """等待直到可以进行下一次调用。
+    def _reserve(self) -> float:
+        """原子地预约下一次调用的时间，返回需要等待的秒数。
         
-        如果 error_on_exceed 为 True，超出限制时抛出异常，
-        否则会等待到下一个可用时间窗口。
+        锁只保护预约和统计，等待在锁外进行，多个线程可以同时排队。
         
         Raises:
             RateLimitExceededError: 超出速率限制且 error_on_exceed 为 True
         """
+        wait_time = self._gcra.reserve(
+            "default", commit_if_delayed=not self.error_on_exceed
+        )
+        if wait_time > 0 and self.error_on_exceed:
+            raise RateLimitExceededError(wait_time)
+            
         with self.lock:
             now = time.time()
-            elapsed = now - self.last_call
-            wait_time = max(0, self.interval - elapsed)
-            
+            # 检查是否需要重置统计
+            if now - self.stats["last_reset"] >= 3600:  # 每小时重置
+                self._reset_stats(now)
+                
             # 更新统计信息
             self.stats["total_calls"] += 1
             self.stats["total_wait_time"] += wait_time
@@ -96,52 +105,34 @@ class RateLimiter:
                 wait_time
             )
             
-            # 检查是否需要重置统计
-            if now - self.stats["last_reset"] >= 3600:  # 每小时重置
-                self._reset_stats(now)
-            
-            if wait_time > 0:
-                if self.error_on_exceed:
-                    raise RateLimitExceededError(wait_time)
-                    
-                logger.debug(f"速率限制：等待 {wait_time:.2f} 秒")
-                time.sleep(wait_time)
-                
-            self.last_call = time.time()
+        if wait_time > 0:
+            logger.debug(f"速率限制：等待 {wait_time:.2f} 秒")
+        return wait_time
+        
+    def wait(self) -> None:
+        """等待直到可以进行下一次调用。
+        
+        如果 error_on_exceed 为 True，超出限制时抛出异常，
+        否则会等待到预约的调用时间。
+        
+        Raises:
+            RateLimitExceededError: 超出速率限制且 error_on_exceed 为 True
+        """
+        wait_time = self._reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
             
     async def async_wait(self) -> None:
         """异步等待直到可以进行下一次调用。
         
-        异步版本的 wait() 方法，用于协程环境。
+        异步版本的 wait() 方法，用于协程环境，等待时不阻塞事件循环。
         
         Raises:
             RateLimitExceededError: 超出速率限制且 error_on_exceed 为 True
         """
-        with self.lock:
-            now = time.time()
-            elapsed = now - self.last_call
-            wait_time = max(0, self.interval - elapsed)
-            
-            # 更新统计信息
-            self.stats["total_calls"] += 1
-            self.stats["total_wait_time"] += wait_time
-            self.stats["max_wait_time"] = max(
-                self.stats["max_wait_time"],
-                wait_time
-            )
-            
-            # 检查是否需要重置统计
-            if now - self.stats["last_reset"] >= 3600:
-                self._reset_stats(now)
-            
-            if wait_time > 0:
-                if self.error_on_exceed:
-                    raise RateLimitExceededError(wait_time)
-                    
-                logger.debug(f"速率限制：等待 {wait_time:.2f} 秒")
-                await asyncio.sleep(wait_time)
-                
-            self.last_call = time.time()
+        wait_time = self._reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
             
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息。
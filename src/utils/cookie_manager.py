@@ -98,6 +98,32 @@ class CookieManager:
         
         return cookies
         
+    def get_identities(self, platform: str) -> Dict[str, Dict[str, str]]:
+        """获取平台的所有Cookie身份。
+        
+        ``{platform}.json`` 之外，``{platform}@{name}.json`` 保存同一平台的其他账号，
+        每个身份都与通用Cookie合并。
+        
+        Args:
+            platform: 平台标识
+            
+        Returns:
+            Dict[str, Dict[str, str]]: 身份名(文件名去掉扩展名)到Cookie的映射
+        """
+        identities = {}
+        cookies = self.get_cookies(platform)
+        if cookies:
+            identities[platform] = cookies
+            
+        universal = self._load_json_file(self.cookie_dir / "universal.json")
+        for file_path in sorted(self.cookie_dir.glob(f"{platform}@*.json")):
+            cookies = dict(universal)
+            cookies.update(self._load_json_file(file_path))
+            if cookies:
+                identities[file_path.stem] = cookies
+                
+        return identities
+        
     def save_cookies(
         self,
         platform: str,
@@ -0,0 +1,178 @@
+"""异步传输引擎测试模块。
+
+测试单个事件循环上的并发下载、取消时清理临时文件以及摘要计算。
+"""
+
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.core.async_transfer import AsyncTransferEngine
+from src.core.exceptions import DownloadCanceled
+from src.core.resume import part_path_for
+
+PAYLOAD = bytes(range(256)) * 1024
+
+
+@asynccontextmanager
+async def serve():
+    """启动返回固定内容的测试服务器，返回文件地址。"""
+    async def handler(request):
+        return web.Response(body=PAYLOAD)
+
+    app = web.Application()
+    app.router.add_get("/file", handler)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield str(server.make_url("/file"))
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_downloads(tmp_path):
+    """测试同一事件循环上并发下载多个文件。"""
+    engine = AsyncTransferEngine(chunk_size=8192, buffer_size=32768, io_workers=2)
+    try:
+        async with serve() as url, aiohttp.ClientSession() as session:
+            digests = await asyncio.gather(*[
+                engine.download(session, url, tmp_path / f"{i}.bin")
+                for i in range(20)
+            ])
+    finally:
+        engine.shutdown()
+
+    for i, digest in enumerate(digests):
+        assert (tmp_path / f"{i}.bin").read_bytes() == PAYLOAD
+        assert digest["size"] == len(PAYLOAD)
+        assert digest["md5"] == hashlib.md5(PAYLOAD).hexdigest()
+    assert not list(tmp_path.glob("*.part"))
+
+
+@pytest.mark.asyncio
+async def test_progress_and_throttle(tmp_path):
+    """测试进度回调和限速回调。"""
+    engine = AsyncTransferEngine(chunk_size=65536)
+    progress = []
+    throttled = []
+    try:
+        async with serve() as url, aiohttp.ClientSession() as session:
+            await engine.download(
+                session,
+                url,
+                tmp_path / "a.bin",
+                on_progress=lambda done, total: progress.append((done, total)),
+                throttle=lambda size: throttled.append(size) or 0
+            )
+    finally:
+        engine.shutdown()
+
+    assert progress[-1] == (len(PAYLOAD), len(PAYLOAD))
+    assert sum(throttled) == len(PAYLOAD)
+
+
+@pytest.mark.asyncio
+async def test_cancel_removes_part_file(tmp_path):
+    """测试取消下载后删除临时文件。"""
+    engine = AsyncTransferEngine(chunk_size=8192)
+    save_path = tmp_path / "a.bin"
+    try:
+        async with serve() as url, aiohttp.ClientSession() as session:
+            with pytest.raises(DownloadCanceled):
+                await engine.download(
+                    session,
+                    url,
+                    save_path,
+                    is_canceled=lambda: True
+                )
+    finally:
+        engine.shutdown()
+
+    assert not save_path.exists()
+    assert not part_path_for(save_path).exists()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_tasks_keep_own_progress(tmp_path):
+    """测试同一下载器上的并发任务各自报告进度，不修改下载器的回调。"""
+    from src.core.downloader import BaseDownloader, DownloadScheduler, DownloadStatus
+
+    def callback(progress, status):
+        pass
+
+    downloader = BaseDownloader(platform="test", save_dir=tmp_path, progress_callback=callback)
+    scheduler = DownloadScheduler(max_concurrency=5)
+    try:
+        async with serve() as url:
+            task_ids = [
+                await scheduler.add_task(downloader, f"{url}?n={i}", tmp_path / f"{i}.bin")
+                for i in range(5)
+            ]
+            while any(
+                scheduler.tasks[t].status in (DownloadStatus.PENDING, DownloadStatus.DOWNLOADING)
+                for t in task_ids
+            ):
+                await asyncio.sleep(0.01)
+    finally:
+        scheduler.thread_pool.shutdown()
+
+    assert downloader.progress_callback is callback
+    for task_id in task_ids:
+        task = scheduler.tasks[task_id]
+        assert task.status == DownloadStatus.COMPLETED
+        assert task.progress == 1.0
+        assert len(task.chunk_metrics) == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_resumes_part_file(tmp_path):
+    """测试调度器遇到可续传的临时文件时交给同步路径，只请求缺失的字节。"""
+    from src.core.downloader import BaseDownloader, DownloadScheduler, DownloadStatus
+    from src.core.resume import ResumeManifest, manifest_path_for
+
+    requested = []
+
+    async def handler(request):
+        headers = {"Accept-Ranges": "bytes", "ETag": '"v1"'}
+        requested.append(request.headers.get("Range"))
+        byte_range = request.headers.get("Range")
+        if byte_range and request.headers.get("If-Range") == '"v1"':
+            start, _, end = byte_range.split("=")[1].partition("-")
+            end = int(end) if end else len(PAYLOAD) - 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(PAYLOAD)}"
+            return web.Response(status=206, body=PAYLOAD[int(start):end + 1], headers=headers)
+        return web.Response(body=PAYLOAD, headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/file", handler)
+    server = TestServer(app)
+    await server.start_server()
+    url = str(server.make_url("/file"))
+
+    half = len(PAYLOAD) // 2
+    save_path = tmp_path / "a.bin"
+    part_path_for(save_path).write_bytes(PAYLOAD[:half])
+    ResumeManifest(
+        manifest_path_for(save_path), url, len(PAYLOAD), etag='"v1"', completed=[[0, half - 1]]
+    ).save()
+
+    downloader = BaseDownloader(platform="test", save_dir=tmp_path)
+    scheduler = DownloadScheduler(max_concurrency=1)
+    try:
+        task_id = await scheduler.add_task(downloader, url, save_path)
+        while scheduler.tasks[task_id].status in (DownloadStatus.PENDING, DownloadStatus.DOWNLOADING):
+            await asyncio.sleep(0.01)
+    finally:
+        scheduler.thread_pool.shutdown()
+        await server.close()
+
+    assert scheduler.tasks[task_id].status == DownloadStatus.COMPLETED
+    assert save_path.read_bytes() == PAYLOAD
+    assert not manifest_path_for(save_path).exists()
+    assert all(r is not None and not r.startswith("bytes=0-") for r in requested)
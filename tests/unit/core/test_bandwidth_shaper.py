@@ -0,0 +1,61 @@
+"""带宽整形器测试模块。
+
+测试全局、分组和任务三级限速的组合效果。
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.core.speed_limiter import BandwidthShaper
+
+
+def test_unlimited_returns_immediately():
+    """测试未配置限速时不等待。"""
+    shaper = BandwidthShaper()
+    assert shaper.reserve(10 * 1024 * 1024, task_id="a", groups=("youtube",)) == 0.0
+
+
+def test_global_limit_shared_by_tasks():
+    """测试全局限速由所有任务共享。"""
+    shaper = BandwidthShaper(global_limit=1000, burst=0)
+    shaper.reserve(500, task_id="a")
+    delay = shaper.reserve(500, task_id="b")
+    assert delay == pytest.approx(0.5, abs=0.05)
+
+
+def test_task_limit_does_not_block_other_tasks():
+    """测试任务级上限只影响该任务，空闲带宽可被其他任务使用。"""
+    shaper = BandwidthShaper(burst=0)
+    shaper.set_task_limit("slow", 100)
+    shaper.reserve(100, task_id="slow")
+
+    assert shaper.reserve(100, task_id="slow") == pytest.approx(1.0, abs=0.05)
+    assert shaper.reserve(100, task_id="fast") == 0.0
+
+
+def test_group_limit_and_runtime_change():
+    """测试分组限速及运行时修改。"""
+    shaper = BandwidthShaper(burst=0)
+    shaper.set_group_limit("twitter", 1000)
+    shaper.reserve(1000, groups=("twitter",))
+    assert shaper.reserve(10, groups=("bilibili",)) == 0.0
+    assert shaper.reserve(10, groups=("twitter",)) > 0.9
+
+    shaper.set_group_limit("twitter", None)
+    assert shaper.reserve(10, groups=("twitter",)) == 0.0
+    assert shaper.get_limits()['groups'] == {}
+
+
+def test_consume_async():
+    """测试异步等待。"""
+    shaper = BandwidthShaper(global_limit=10000, burst=0)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(3):
+            await shaper.consume_async(1000)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.19
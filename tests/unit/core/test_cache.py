@@ -0,0 +1,66 @@
+"""缓存系统测试模块。
+
+测试磁盘缓存的持久化、过期、容量淘汰以及两级缓存的命中统计。
+"""
+
+import threading
+import time
+
+from src.core.cache import DiskCache, SmartCache
+
+
+def test_disk_cache_survives_reopen(tmp_path):
+    """测试重新打开后缓存依然有效。"""
+    DiskCache(tmp_path).put("https://example.com/api", {"title": "video"})
+
+    reopened = DiskCache(tmp_path)
+    assert reopened.get("https://example.com/api") == {"title": "video"}
+    assert "https://example.com/api" in reopened
+    assert {p.name for p in tmp_path.iterdir()} <= {"cache.db", "cache.db-wal", "cache.db-shm"}
+
+
+def test_disk_cache_expiry_does_not_deadlock(tmp_path):
+    """测试读取过期条目时删除并返回None。"""
+    cache = DiskCache(tmp_path)
+    cache.put("key", "value", ttl=0)
+    time.sleep(0.01)
+
+    result = []
+    reader = threading.Thread(target=lambda: result.append(cache.get("key")))
+    reader.start()
+    reader.join(5)
+
+    assert not reader.is_alive()
+    assert result == [None]
+    assert cache.size == 0
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    """测试超过容量上限时淘汰最久未访问的条目。"""
+    cache = DiskCache(tmp_path, max_bytes=3000)
+    cache.ACCESS_RESOLUTION = 0
+    cache.put("a", b"x" * 1000)
+    cache.put("b", b"x" * 1000)
+    cache.get("a")
+    cache.put("c", b"x" * 1000)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.size <= 3000
+
+
+def test_smart_cache_hit_rate(tmp_path):
+    """测试两级缓存的命中统计。"""
+    SmartCache(cache_dir=str(tmp_path)).put("key", {"id": 1}, ttl=60)
+
+    cache = SmartCache(cache_dir=str(tmp_path))
+    assert cache.get("key") == {"id": 1}
+    assert cache.get("key") == {"id": 1}
+    assert cache.get("missing") is None
+
+    stats = cache.get_stats()
+    assert stats['disk_hits'] == 1
+    assert stats['memory_hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == 2 / 3
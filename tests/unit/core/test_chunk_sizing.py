@@ -0,0 +1,88 @@
+"""自适应块大小测试模块。
+
+测试按带宽增大块大小、延迟升高和内存紧张时缩小，以及按控制器大小读取响应。
+"""
+
+import io
+
+import requests
+from requests.packages.urllib3.response import HTTPResponse
+
+from src.core.chunk_sizing import AdaptiveChunkSizer
+from src.core.downloader import BaseDownloader
+
+
+class FakeClock:
+    """可手动推进的时钟。"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _feed(sizer, clock, bandwidth, seconds, reads_per_second=100):
+    """按固定带宽模拟读取。"""
+    for _ in range(int(seconds * reads_per_second)):
+        clock.now += 1 / reads_per_second
+        sizer.observe(int(bandwidth / reads_per_second), 0.001)
+
+
+def test_grows_with_bandwidth():
+    """测试带宽升高时逐步增大块和缓冲区，每次最多翻倍。"""
+    clock = FakeClock()
+    sizer = AdaptiveChunkSizer(8192, 65536, memory_pressure=lambda: False, clock=clock)
+
+    _feed(sizer, clock, 100 * 1024 * 1024, 5)
+
+    assert sizer.chunk_size == 1024 * 1024
+    assert sizer.buffer_size == 16 * 1024 * 1024
+    sizes = [d['chunk_size'] for d in sizer.decisions]
+    assert all(b <= a * 2 for a, b in zip([8192] + sizes, sizes))
+
+
+def test_shrinks_on_slow_read_and_low_bandwidth():
+    """测试单次读取过慢时立即减半，带宽下降后缩小。"""
+    clock = FakeClock()
+    sizer = AdaptiveChunkSizer(256 * 1024, memory_pressure=lambda: False, clock=clock)
+
+    sizer.observe(1024, 2.0)
+    assert sizer.chunk_size == 128 * 1024
+    assert sizer.decisions[-1]['reason'] == 'latency'
+
+    _feed(sizer, clock, 200 * 1024, 3)
+    assert sizer.chunk_size == AdaptiveChunkSizer.MIN_CHUNK_SIZE
+    assert sizer.buffer_size == AdaptiveChunkSizer.MIN_BUFFER_SIZE
+
+
+def test_memory_pressure_shrinks_buffer():
+    """测试内存紧张时缩小缓冲区。"""
+    clock = FakeClock()
+    sizer = AdaptiveChunkSizer(65536, 4 * 1024 * 1024, memory_pressure=lambda: True, clock=clock)
+
+    _feed(sizer, clock, 100 * 1024 * 1024, 0.3)
+
+    assert sizer.buffer_size == 2 * 1024 * 1024
+    metrics = sizer.get_metrics()
+    assert metrics['decisions'][-1]['reason'] == 'memory'
+    assert metrics['adjustments'] == 1
+
+
+def test_iter_chunks_reads_with_current_size(tmp_path):
+    """测试从底层连接按控制器的当前大小读取。"""
+    data = b"x" * 100_000
+    response = requests.Response()
+    response.raw = HTTPResponse(body=io.BytesIO(data), preload_content=False)
+    downloader = BaseDownloader("test", tmp_path)
+    sizer = AdaptiveChunkSizer(8192, memory_pressure=lambda: False)
+
+    chunks = []
+    for chunk in downloader._iter_chunks(response, sizer):
+        chunks.append(len(chunk))
+        sizer.chunk_size = 16384
+
+    assert sum(chunks) == len(data)
+    assert chunks[0] == 8192
+    assert chunks[1] == 16384
+    assert sizer.get_metrics()['reads'] == len(chunks)
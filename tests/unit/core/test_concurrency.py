@@ -0,0 +1,99 @@
+"""自适应并发控制测试模块。
+
+测试吞吐提高时加性增加并发，限流、超时、错误率和延迟升高时乘性减小。
+"""
+
+import threading
+
+from src.core.concurrency import AIMDController
+
+
+class FakeClock:
+    """可手动推进的时钟。"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _window(controller, clock, key, goodput, inflight=None, status=200, latency=0.1):
+    """模拟一个统计窗口：并发用满，传输指定吞吐后结束。"""
+    inflight = inflight or controller.limit(key)
+    for _ in range(inflight):
+        controller.begin(key)
+    controller.add_bytes(key, int(goodput * controller.interval))
+    for _ in range(inflight):
+        controller.end(key, status, latency)
+    clock.now += controller.interval
+    return controller.limit(key)
+
+
+def test_additive_increase_while_goodput_improves():
+    """测试并发用满且吞吐提高时每个窗口加1，吞吐不再提高时保持。"""
+    clock = FakeClock()
+    controller = AIMDController(initial_limit=2, max_limit=5, clock=clock)
+
+    assert _window(controller, clock, "a", 100) == 3
+    assert _window(controller, clock, "a", 200) == 4
+    assert _window(controller, clock, "a", 200) == 4
+    assert _window(controller, clock, "a", 400) == 5
+    assert _window(controller, clock, "a", 800) == 5
+    assert controller.get_stats()["a"]["increases"] == 3
+
+
+def test_not_increased_when_not_saturated():
+    """测试并发没有用满时不增加上限。"""
+    clock = FakeClock()
+    controller = AIMDController(initial_limit=4, clock=clock)
+
+    assert _window(controller, clock, "a", 100, inflight=1) == 4
+
+
+def test_throttle_halves_once_per_window():
+    """测试429和超时时立即减半，同一窗口内只减一次。"""
+    clock = FakeClock()
+    controller = AIMDController(initial_limit=8, clock=clock)
+
+    controller.begin("a")
+    controller.end("a", 429, 0.1)
+    controller.begin("a")
+    controller.end("a", None, 0)
+    assert controller.limit("a") == 4
+
+    clock.now += controller.interval
+    controller.begin("a")
+    controller.end("a", None, 0)
+    assert controller.limit("a") == 2
+    assert controller.get_stats()["a"]["decreases"] == 2
+
+
+def test_error_rate_and_latency_decrease():
+    """测试5xx比例过高或延迟远高于基线时减小上限。"""
+    clock = FakeClock()
+    controller = AIMDController(initial_limit=8, max_limit=8, clock=clock)
+
+    assert _window(controller, clock, "a", 100, status=500) == 4
+
+    _window(controller, clock, "b", 100, latency=0.1)
+    assert _window(controller, clock, "b", 100, latency=1.0) == 4
+
+
+def test_acquire_blocks_until_release():
+    """测试并发用满时acquire等待其他请求释放，取消时返回False。"""
+    controller = AIMDController(initial_limit=1, interval=60)
+    assert controller.acquire("a")
+
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: controller.acquire("a") and acquired.set())
+    thread.start()
+    assert not acquired.wait(0.2)
+    controller.release("a")
+    assert acquired.wait(1)
+    thread.join()
+
+    cancel = threading.Event()
+    cancel.set()
+    assert not controller.acquire("a", cancel=cancel)
+    assert controller.get_stats()["a"]["inflight"] == 1
@@ -0,0 +1,91 @@
+"""去重索引测试模块。
+
+测试逐级过滤、增量更新和按哈希查找。
+"""
+
+import os
+
+import pytest
+
+from src.core import dedup_index as dedup_module
+from src.core.dedup_index import DedupIndex, SAMPLE_SIZE
+from src.core.downloader import BaseDownloader
+from src.utils.cookie_manager import CookieManager
+
+
+@pytest.fixture
+def index(tmp_path):
+    """创建临时索引。"""
+    instance = DedupIndex(tmp_path / "index.db", max_workers=2)
+    yield instance
+    instance.close()
+
+
+def _write(path, data, mtime=None):
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_full_hash_only_on_sample_collision(index, tmp_path, monkeypatch):
+    """测试只有大小和采样哈希都相同时才计算完整哈希。"""
+    head = b"a" * SAMPLE_SIZE
+    tail = b"z" * SAMPLE_SIZE
+    original = _write(tmp_path / "a.mp4", head + b"1" * 100 + tail, mtime=1000)
+    copy = _write(tmp_path / "b.mp4", head + b"1" * 100 + tail, mtime=2000)
+    middle_differs = _write(tmp_path / "c.mp4", head + b"2" * 100 + tail)
+    other_size = _write(tmp_path / "d.mp4", b"x" * 10)
+    _write(tmp_path / "e.mp4", b"y" * 10)
+
+    hashed = []
+    real_hash_file = dedup_module.hash_file
+    monkeypatch.setattr(
+        dedup_module, "hash_file",
+        lambda path, **kwargs: hashed.append(path) or real_hash_file(path, **kwargs)
+    )
+
+    paths = index.scan(tmp_path)
+    assert len(paths) == 5
+    assert index.find_duplicates(paths) == [[original, copy]]
+    assert sorted(hashed) == sorted([original, copy, middle_differs])
+    assert other_size not in hashed
+
+    # 未变化的文件不再重新计算
+    hashed.clear()
+    index.scan(tmp_path)
+    assert index.find_duplicates() == [[original, copy]]
+    assert hashed == []
+
+
+def test_scan_drops_removed_files(index, tmp_path):
+    """测试扫描时移除已删除文件的索引项。"""
+    path = _write(tmp_path / "a.jpg", b"data")
+    index.add(path, "hash")
+    assert index.lookup("hash") == path
+
+    os.remove(path)
+    index.scan(tmp_path)
+    assert index.lookup("hash") is None
+
+
+def test_remove_duplicates_in_dir(tmp_path):
+    """测试目录去重保留最早的文件。"""
+    downloader = BaseDownloader(
+        platform="test",
+        save_dir=tmp_path,
+        cookie_manager=CookieManager(tmp_path / "config"),
+    )
+    library = tmp_path / "library"
+    (library / "sub").mkdir(parents=True)
+    _write(library / "a.mp4", b"same", mtime=1000)
+    _write(library / "sub" / "b.mp4", b"same", mtime=2000)
+    _write(library / "c.mp4", b"diff")
+
+    result = downloader.remove_duplicates_in_dir(library)
+    downloader.close()
+
+    assert result['original_count'] == 3
+    assert result['removed_count'] == 1
+    assert (library / "a.mp4").exists()
+    assert not (library / "sub" / "b.mp4").exists()
@@ -0,0 +1,209 @@
+"""下载调度器测试模块。
+
+测试 core.download_scheduler 的事件驱动分派和统计推送。
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+
+from src.core.download_scheduler import DownloadScheduler, DownloadTask
+
+
+class FakeResponse:
+    """模拟流式响应。"""
+
+    status_code = 200
+
+    def __init__(self, content: bytes, gate: threading.Event):
+        self.headers = {"content-length": str(len(content))}
+        self._content = content
+        self._gate = gate
+
+    def iter_content(self, chunk_size=8192):
+        self._gate.wait(5)
+        yield self._content
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """创建使用模拟请求的调度器。"""
+    instance = DownloadScheduler(max_concurrent=2)
+    instance.gate = threading.Event()
+    monkeypatch.setattr(
+        instance,
+        "_make_request",
+        lambda url, **kwargs: FakeResponse(b"data", instance.gate)
+    )
+    yield instance
+    instance.gate.set()
+    instance.stop()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_dispatch_fills_free_slots(scheduler, tmp_path):
+    """测试添加任务时立即填满空闲槽位，完成后立即补位。"""
+    for i in range(5):
+        scheduler.add_task(DownloadTask(id=str(i), url=f"https://example.com/{i}", save_path=tmp_path / f"{i}.bin"))
+
+    assert scheduler.get_stats()['active_tasks'] == 2
+    assert scheduler.get_stats()['queued_tasks'] == 3
+
+    scheduler.gate.set()
+    assert _wait_for(lambda: scheduler.get_stats()['completed_tasks'] == 5)
+    assert (tmp_path / "4.bin").read_bytes() == b"data"
+
+
+def test_stats_pushed_on_change(scheduler, tmp_path):
+    """测试统计信息在状态变化时推送。"""
+    received = []
+    scheduler.stats_updated.connect(received.append, Qt.DirectConnection)
+
+    scheduler.add_task(DownloadTask(id="a", url="https://example.com/a", save_path=tmp_path / "a.bin"))
+    assert received and received[-1]['active_tasks'] == 1
+
+    scheduler.gate.set()
+    assert _wait_for(lambda: received[-1]['active_tasks'] == 0)
+
+
+def test_queued_tasks_restored_after_restart(monkeypatch, tmp_path):
+    """测试停止时未完成的任务持久化，重启后恢复并完成。"""
+    gate = threading.Event()
+    monkeypatch.setattr(
+        DownloadScheduler,
+        "_make_request",
+        lambda self, url, **kwargs: FakeResponse(b"data", gate)
+    )
+    queue_path = tmp_path / "queue.db"
+    first = DownloadScheduler(max_concurrent=1, queue_path=queue_path)
+    first.pause_all()
+    for i in range(3):
+        first.add_task(DownloadTask(id=str(i), url=f"https://example.com/{i}", save_path=tmp_path / f"{i}.bin"))
+    first.stop()
+
+    gate.set()
+    second = DownloadScheduler(max_concurrent=2, queue_path=queue_path)
+    try:
+        assert second.get_stats()['total_tasks'] == 3
+        assert _wait_for(lambda: second.get_stats()['completed_tasks'] == 3)
+        assert (tmp_path / "2.bin").read_bytes() == b"data"
+    finally:
+        second.stop()
+
+
+def test_host_limits_and_fairness(monkeypatch, tmp_path):
+    """测试单个主机的并发上限，以及其他主机的任务不会被大量排队任务饿死。"""
+    gate = threading.Event()
+    monkeypatch.setattr(
+        DownloadScheduler,
+        "_make_request",
+        lambda self, url, **kwargs: FakeResponse(b"data", gate)
+    )
+    scheduler = DownloadScheduler(max_concurrent=3, host_limits={"twimg.com": 1})
+    try:
+        for i in range(10):
+            scheduler.add_task(DownloadTask(id=f"t{i}", url=f"https://video.twimg.com/{i}", save_path=tmp_path / f"t{i}.bin"))
+        scheduler.add_task(DownloadTask(id="y", url="https://youtube.com/y", save_path=tmp_path / "y.bin"))
+
+        hosts = scheduler.get_host_stats()
+        assert hosts["twimg.com"] == {'queued': 9, 'active': 1, 'limit': 1}
+        assert hosts["youtube.com"]['active'] == 1
+        assert scheduler.get_stats()['active_tasks'] == 2
+
+        gate.set()
+        assert _wait_for(lambda: scheduler.get_stats()['completed_tasks'] == 11)
+        assert scheduler.get_host_stats() == {}
+    finally:
+        scheduler.stop()
+
+
+def test_pause_and_resume_task(scheduler, tmp_path):
+    """测试暂停的任务停下后不占用槽位，恢复后重新排队并完成。"""
+    scheduler.add_task(DownloadTask(id="a", url="https://example.com/a", save_path=tmp_path / "a.bin"))
+    scheduler.pause_task("a")
+    scheduler.gate.set()
+    assert _wait_for(lambda: scheduler.get_stats()['active_tasks'] == 0)
+    assert scheduler.get_stats()['completed_tasks'] == 0
+
+    scheduler.resume_task("a")
+    assert _wait_for(lambda: scheduler.get_stats()['completed_tasks'] == 1)
+    assert (tmp_path / "a.bin").read_bytes() == b"data"
+    scheduler.resume_task("missing")
+
+
+def test_paused_tasks_restored_after_restart(monkeypatch, tmp_path):
+    """测试暂停的任务重启后保持暂停，恢复后完成。"""
+    gate = threading.Event()
+    monkeypatch.setattr(
+        DownloadScheduler,
+        "_make_request",
+        lambda self, url, **kwargs: FakeResponse(b"data", gate)
+    )
+    queue_path = tmp_path / "queue.db"
+    first = DownloadScheduler(max_concurrent=1, queue_path=queue_path)
+    first.add_task(DownloadTask(id="b", url="https://example.com/b", save_path=tmp_path / "b.bin"))
+    first.add_task(DownloadTask(id="a", url="https://example.com/a", save_path=tmp_path / "a.bin"))
+    first.pause_task("a")
+    gate.set()
+    assert _wait_for(lambda: first.get_stats()['completed_tasks'] == 1)
+    assert _wait_for(lambda: first.get_stats()['active_tasks'] == 0)
+    assert first.get_task("a").status == "paused"
+    first.stop()
+
+    second = DownloadScheduler(max_concurrent=1, queue_path=queue_path)
+    try:
+        assert second.get_stats()['total_tasks'] == 1
+        assert second.get_task("a").status == "paused"
+        assert second.get_stats()['active_tasks'] == 0
+        second.resume_all()
+        assert _wait_for(lambda: second.get_stats()['completed_tasks'] == 1)
+        assert (tmp_path / "a.bin").read_bytes() == b"data"
+    finally:
+        second.stop()
+
+
+def test_cached_response_content_usable(monkeypatch, tmp_path):
+    """测试缓存的是响应内容而不是响应对象，命中时可以直接读取内容，包括重启后从磁盘读取。"""
+    import requests
+
+    from src.core import download_scheduler as scheduler_module
+
+    class FakeSession:
+        calls = 0
+
+        def request(self, method, url, **kwargs):
+            FakeSession.calls += 1
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json"
+            response._content = b'{"id": 1}'
+            return response
+
+    monkeypatch.setattr(scheduler_module.session_registry, "get", lambda *args, **kwargs: FakeSession())
+    first = DownloadScheduler(max_concurrent=1, cache_dir=tmp_path / "cache")
+    second = DownloadScheduler(max_concurrent=1, cache_dir=tmp_path / "cache")
+    try:
+        live = first._make_request("https://example.com/api")
+        assert live.json() == {"id": 1}
+        assert first._make_request("https://example.com/api") is not live
+        cached = second._make_request("https://example.com/api")
+        assert FakeSession.calls == 1
+        assert cached.status_code == 200
+        assert cached.headers["content-type"] == "application/json"
+        assert cached.json() == {"id": 1}
+    finally:
+        first.stop()
+        second.stop()
@@ -4,17 +4,27 @@
 """
 
 import pytest
+import requests
 import responses
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from src.core.downloader import BaseDownloader, DownloadError
+from src.core.session_registry import session_registry
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    """每个测试使用新的共享会话。"""
+    session_registry.close("test")
+    yield
+    session_registry.close("test")
 
 @pytest.fixture
-def downloader():
+def downloader(tmp_path):
     """创建下载器实例。"""
     return BaseDownloader(
-        save_dir="downloads",
+        platform="test",
+        save_dir=tmp_path,
         proxy="http://127.0.0.1:7890",
         timeout=5,
         max_retries=2
@@ -24,12 +34,14 @@ def downloader():
 def mock_session():
     """模拟requests.Session。"""
     with patch("requests.Session") as mock:
+        mock.return_value.proxies = {}
+        mock.return_value.cookies = {}
         yield mock
 
 def test_init_with_proxy(mock_session):
     """测试使用代理初始化。"""
     proxy = "http://127.0.0.1:7890"
-    downloader = BaseDownloader(save_dir="downloads", proxy=proxy)
+    downloader = BaseDownloader(platform="test", save_dir="downloads", proxy=proxy)
     
     # 验证代理配置
     session = mock_session.return_value
@@ -40,7 +52,7 @@ def test_init_with_proxy(mock_session):
 
 def test_init_without_proxy(mock_session):
     """测试不使用代理初始化。"""
-    downloader = BaseDownloader(save_dir="downloads")
+    downloader = BaseDownloader(platform="test", save_dir="downloads")
     
     # 验证代理配置
     session = mock_session.return_value
@@ -116,7 +128,7 @@ def test_download_timeout(downloader, tmp_path):
     )
     
     # 验证异常
-    with pytest.raises(DownloadError, match="下载超时"):
+    with pytest.raises(DownloadError, match="请求超时"):
         downloader.download(url, save_path)
         
     # 验证文件未创建
@@ -137,7 +149,7 @@ def test_download_error(downloader, tmp_path):
     )
     
     # 验证异常
-    with pytest.raises(DownloadError, match="下载失败"):
+    with pytest.raises(DownloadError, match="资源不存在"):
         downloader.download(url, save_path)
         
     # 验证文件未创建
@@ -145,9 +157,9 @@ def test_download_error(downloader, tmp_path):
 
 def test_close(mock_session):
     """测试关闭下载器。"""
-    downloader = BaseDownloader(save_dir="downloads")
+    downloader = BaseDownloader(platform="test", save_dir="downloads")
     downloader.close()
     
-    # 验证会话关闭
+    # 共享会话由注册表关闭
     session = mock_session.return_value
-    session.close.assert_called_once() 
\ No newline at end of file
+    session.close.assert_not_called()
\ No newline at end of file
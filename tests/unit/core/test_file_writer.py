@@ -0,0 +1,77 @@
+"""定位写盘测试模块。
+
+测试缓冲区池复用、预分配、按偏移并发写入和顺序写缓冲区。
+"""
+
+import threading
+
+from src.core.file_writer import BufferPool, PositionalWriter, StagingBuffer
+
+
+def test_buffer_pool_reuses_size_class():
+    """测试归还的缓冲区按档位复用，超过缓存上限时丢弃。"""
+    pool = BufferPool(max_cached_bytes=256 * 1024)
+
+    first = pool.acquire(100 * 1024)
+    assert len(first) == 128 * 1024
+    pool.release(first)
+    assert pool.acquire(120 * 1024) is first
+
+    big = pool.acquire(1024 * 1024)
+    pool.release(big)
+    assert pool.get_stats() == {'cached_bytes': 0, 'allocated': 2, 'reused': 1}
+
+
+def test_preallocate_keeps_existing_data(tmp_path):
+    """测试预分配到指定大小且不覆盖已有内容。"""
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc")
+
+    with PositionalWriter(path) as writer:
+        writer.preallocate(1024)
+
+    data = path.read_bytes()
+    assert len(data) == 1024
+    assert data[:3] == b"abc"
+
+
+def test_concurrent_writes_at_offsets(tmp_path):
+    """测试多个线程共用一个文件按偏移写入。"""
+    path = tmp_path / "data.bin"
+    parts = [bytes([i]) * 10000 for i in range(8)]
+
+    with PositionalWriter(path, truncate=True) as writer:
+        writer.preallocate(80000)
+        threads = [
+            threading.Thread(target=writer.write_at, args=(i * 10000, part))
+            for i, part in enumerate(parts)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert path.read_bytes() == b"".join(parts)
+
+
+def test_staging_buffer_writes_in_order(tmp_path):
+    """测试顺序写缓冲区按到达顺序写盘，超大数据直接写入并回调。"""
+    path = tmp_path / "data.bin"
+    pool = BufferPool()
+    flushed = []
+    chunks = [b"a" * 40000, b"b" * 40000, b"c" * 200000, b"d" * 10]
+
+    with PositionalWriter(path, truncate=True) as writer:
+        staging = StagingBuffer(
+            writer, 5, 64 * 1024, pool=pool, on_flush=lambda data: flushed.append(len(data))
+        )
+        for chunk in chunks:
+            staging.append(chunk)
+        staging.flush(resize=256 * 1024)
+        assert staging.capacity == 256 * 1024
+        staging.close()
+
+    assert path.read_bytes() == b"\0" * 5 + b"".join(chunks)
+    assert sum(flushed) == sum(len(c) for c in chunks)
+    assert staging.position == 5 + sum(len(c) for c in chunks)
+    assert pool.get_stats()['cached_bytes'] == (64 + 256) * 1024
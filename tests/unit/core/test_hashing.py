@@ -0,0 +1,69 @@
+"""流式哈希测试模块。
+
+测试下载过程中计算的摘要与文件内容一致，且去重不再重新读取文件。
+"""
+
+import hashlib
+
+import pytest
+import responses
+
+from src.core import downloader as downloader_module
+from src.core.downloader import BaseDownloader
+from src.core.hashing import StreamingHasher, hash_file
+from src.utils.cookie_manager import CookieManager
+
+URL = "https://example.com/video.mp4"
+CONTENT = bytes(range(256)) * 64
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    """创建禁用分段的下载器。"""
+    instance = BaseDownloader(
+        platform="test",
+        save_dir=tmp_path,
+        cookie_manager=CookieManager(tmp_path / "config"),
+        max_segments=1,
+    )
+    yield instance
+    instance.close()
+
+
+def test_streaming_hasher_matches_file(tmp_path):
+    """测试流式摘要与整文件摘要一致。"""
+    path = tmp_path / "data.bin"
+    path.write_bytes(CONTENT)
+
+    hasher = StreamingHasher()
+    hasher.update_from_file(path, 100)
+    hasher.update(CONTENT[100:])
+
+    assert hasher.result() == hash_file(path, chunk_size=1000)
+    assert hasher.md5 == hashlib.md5(CONTENT).hexdigest()
+    assert hasher.size == len(CONTENT)
+
+
+@responses.activate
+def test_download_records_digest(downloader, tmp_path, monkeypatch):
+    """测试顺序下载时边写边算摘要，去重直接复用。"""
+    responses.add(responses.GET, URL, body=CONTENT, headers={"Content-Length": str(len(CONTENT))})
+    save_path = tmp_path / "video.mp4"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("不应重新读取文件")
+
+    monkeypatch.setattr(downloader_module, "hash_file", fail)
+    assert downloader.download(URL, save_path)
+
+    digest = downloader.file_digests[str(save_path)]
+    assert digest["md5"] == hashlib.md5(CONTENT).hexdigest()
+
+    copy_path = tmp_path / "copy.mp4"
+    copy_path.write_bytes(CONTENT)
+    result = downloader._remove_duplicates([
+        {"path": str(save_path)},
+        {"path": str(copy_path), "md5": digest["md5"]},
+    ])
+    assert result == [{"path": str(save_path)}]
+    assert not copy_path.exists()
@@ -0,0 +1,60 @@
+"""主机公平队列测试模块。
+
+测试同优先级内按主机轮询、权重、并发上限跳过和域名后缀分组。
+"""
+
+from src.core.host_queue import FairHostQueue, host_key
+
+
+def _drain(queue, can_start=lambda key: True):
+    items = []
+    while True:
+        entry = queue.pop(can_start)
+        if entry is None:
+            return items
+        items.append(entry[0])
+
+
+def test_round_robin_across_hosts():
+    """测试大量同一主机的任务不会让其他主机的任务一直排队。"""
+    queue = FairHostQueue()
+    for i in range(5):
+        queue.put(f"t{i}", 5, "twitter.com")
+    queue.put("y0", 5, "youtube.com")
+    queue.put("y1", 5, "youtube.com")
+    queue.put("urgent", 1, "twitter.com")
+
+    assert _drain(queue) == ["urgent", "t0", "y0", "t1", "y1", "t2", "t3", "t4"]
+    assert queue.empty()
+
+
+def test_weights():
+    """测试权重为2的主机每轮取两个任务。"""
+    queue = FairHostQueue(weights={"a": 2})
+    for i in range(4):
+        queue.put(f"a{i}", 5, "a")
+        queue.put(f"b{i}", 5, "b")
+
+    assert _drain(queue)[:6] == ["a0", "a1", "b0", "a2", "a3", "b1"]
+
+
+def test_capped_host_skipped_and_lower_priority_used():
+    """测试达到上限的主机被跳过，空闲槽位由低优先级的其他主机任务使用。"""
+    queue = FairHostQueue()
+    queue.put("a0", 1, "a")
+    queue.put("a1", 1, "a")
+    queue.put("b0", 5, "b")
+
+    assert queue.pop(lambda key: key != "a") == ("b0", "b")
+    assert queue.pop(lambda key: key != "a") is None
+    assert queue.depth_by_key() == {"a": 2}
+    assert queue.qsize() == 2
+
+
+def test_host_key_groups_by_suffix():
+    """测试按配置的最长域名后缀分组。"""
+    groups = ["twimg.com", "video.twimg.com"]
+    assert host_key("https://pbs.twimg.com/a.jpg", groups) == "twimg.com"
+    assert host_key("https://video.twimg.com/a.mp4", groups) == "video.twimg.com"
+    assert host_key("https://nottwimg.com/a", groups) == "nottwimg.com"
+    assert host_key("https://Example.com/a") == "example.com"
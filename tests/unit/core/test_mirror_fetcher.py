@@ -0,0 +1,97 @@
+"""多镜像分块下载测试模块。
+
+测试首块竞速选出最快镜像以及镜像停滞时自动切换。
+"""
+
+import re
+import threading
+import time
+
+import pytest
+import requests
+
+from src.core.exceptions import DownloadError
+from src.core.mirror_fetcher import MirrorRangeFetcher
+
+CONTENT = bytes(range(256)) * 40  # 10240字节
+
+
+class FakeResponse:
+    """模拟Range响应。"""
+
+    status_code = 206
+
+    def __init__(self, start, end, stall=False):
+        self.headers = {"Content-Range": f"bytes {start}-{end}/{len(CONTENT)}"}
+        self._data = CONTENT[start:end + 1]
+        self._stall = stall
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1024):
+        yield self._data[:10]
+        if self._stall:
+            raise requests.exceptions.ReadTimeout("stalled")
+        yield self._data[10:]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeSession:
+    """按镜像模拟不同行为的会话。"""
+
+    def __init__(self, delays=None, stall_after_first=()):
+        self.delays = delays or {}
+        self.stall_after_first = set(stall_after_first)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, **kwargs):
+        start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", headers["Range"]).groups())
+        end = min(end, len(CONTENT) - 1)
+        with self.lock:
+            self.calls.append((url, start))
+        time.sleep(self.delays.get(url, 0))
+        return FakeResponse(start, end, stall=url in self.stall_after_first and start > 0)
+
+
+def test_race_locks_onto_fastest_mirror(tmp_path):
+    """测试首块竞速后其余块使用最快的镜像。"""
+    session = FakeSession(delays={"slow": 0.2})
+    fetcher = MirrorRangeFetcher(session, ["slow", "fast"], chunk_size=1024, concurrency=3)
+    path = tmp_path / "video.m4s"
+    sizes = []
+
+    assert fetcher.download(path, sizes.append) == len(CONTENT)
+
+    assert path.read_bytes() == CONTENT
+    assert sum(sizes) == len(CONTENT)
+    assert fetcher.mirrors[0] == "fast"
+    assert {url for url, start in session.calls if start > 0} == {"fast"}
+
+
+def test_stalled_mirror_fails_over(tmp_path):
+    """测试镜像传输中途停滞时切换到备用镜像。"""
+    session = FakeSession(delays={"backup": 0.05}, stall_after_first={"primary"})
+    fetcher = MirrorRangeFetcher(session, ["primary", "backup"], chunk_size=1024, concurrency=2)
+    path = tmp_path / "video.m4s"
+
+    fetcher.download(path)
+
+    assert path.read_bytes() == CONTENT
+    assert fetcher.mirrors[0] == "backup"
+
+
+def test_abort(tmp_path):
+    """测试取消下载。"""
+    abort_event = threading.Event()
+    abort_event.set()
+    fetcher = MirrorRangeFetcher(FakeSession(), ["a"], chunk_size=1024)
+
+    with pytest.raises(DownloadError):
+        fetcher.download(tmp_path / "video.m4s", abort_event=abort_event)
@@ -0,0 +1,107 @@
+"""后处理阶段测试模块。
+
+测试进程池执行、优先级顺序、多步处理链以及任务计时。
+"""
+
+import os
+import time
+import threading
+
+import pytest
+
+from src.core.postprocess import PostProcessor
+
+
+def _pid(value):
+    """返回工作进程ID。"""
+    return value, os.getpid()
+
+
+def _sleep(seconds):
+    """模拟耗时处理。"""
+    time.sleep(seconds)
+    return seconds
+
+
+def _fail():
+    raise ValueError("编码失败")
+
+
+def _append(path, suffix):
+    """模拟生成新文件的处理步骤。"""
+    output = path + suffix
+    with open(output, "w") as f:
+        f.write(open(path).read() + suffix)
+    return output
+
+
+def test_runs_in_worker_process():
+    """测试任务在独立进程中执行并记录耗时。"""
+    processor = PostProcessor(max_workers=2)
+    try:
+        result = processor.submit(_pid, "video.mp4", name="remux").result(timeout=30)
+    finally:
+        processor.shutdown()
+
+    assert result.output[0] == "video.mp4"
+    assert result.output[1] != os.getpid()
+    assert result.name == "remux"
+    assert result.run_time >= 0
+    assert processor.get_stats()["completed"] == 1
+
+
+def test_priority_order():
+    """测试工作者空闲后先执行优先级高的任务。"""
+    processor = PostProcessor(max_workers=1)
+    order = []
+    lock = threading.Lock()
+
+    def record(future):
+        with lock:
+            order.append(future.result().name)
+
+    try:
+        processor.submit(_sleep, 0.3, name="busy").add_done_callback(record)
+        time.sleep(0.1)
+        futures = [
+            processor.submit(_sleep, 0, priority=5, name="low"),
+            processor.submit(_sleep, 0, priority=1, name="high"),
+            processor.submit(_sleep, 0, priority=5, name="low2"),
+        ]
+        for future in futures:
+            future.add_done_callback(record)
+        for future in futures:
+            future.result(timeout=30)
+    finally:
+        processor.shutdown()
+
+    assert order == ["busy", "high", "low", "low2"]
+    assert processor.results[1].wait_time > 0.1
+
+
+def test_failure_propagates():
+    """测试任务失败时Future抛出异常并计入统计。"""
+    processor = PostProcessor(max_workers=1)
+    try:
+        with pytest.raises(ValueError, match="编码失败"):
+            processor.submit(_fail).result(timeout=30)
+    finally:
+        processor.shutdown()
+
+    assert processor.get_stats()["failed"] == 1
+
+
+def test_chain_removes_intermediate_files(tmp_path):
+    """测试多步处理只保留最终文件。"""
+    source = tmp_path / "a"
+    source.write_text("a")
+    processor = PostProcessor(max_workers=1)
+    try:
+        result = processor.submit_chain(
+            str(source), [(_append, ("b",)), (_append, ("c",))]
+        ).result(timeout=30)
+    finally:
+        processor.shutdown()
+
+    assert open(result.output).read() == "abc"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "abc"]
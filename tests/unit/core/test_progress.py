@@ -0,0 +1,68 @@
+"""进度上报测试模块。
+
+测试按时间和进度步长采样、完成时必定通知以及速度平滑。
+"""
+
+from src.core.progress import ProgressReporter
+
+
+class FakeClock:
+    """可手动推进的时钟。"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_samples_by_interval():
+    """测试同一采样间隔内的报告被合并。"""
+    clock = FakeClock()
+    events = []
+    reporter = ProgressReporter(lambda *e: events.append(e), interval=0.125, clock=clock)
+
+    for i in range(1, 101):
+        clock.now = i / 64
+        reporter.update(i * 1000, 1_000_000)
+
+    # 第一次报告之后每8次报告采样一次
+    assert len(events) == 13
+    assert events[-1][0] == 97_000
+    assert events[-1][2] == 64_000
+
+
+def test_samples_by_step_and_finish():
+    """测试按进度步长采样，完成时一定通知。"""
+    clock = FakeClock()
+    events = []
+    reporter = ProgressReporter(
+        lambda *e: events.append(e), interval=60, step=0.25, clock=clock
+    )
+
+    for downloaded in range(0, 1001, 10):
+        clock.now += 0.001
+        reporter.update(downloaded, 1000)
+
+    assert [e[0] for e in events] == [0, 250, 500, 750, 1000]
+
+
+def test_speed_smoothing_and_reset():
+    """测试速度按指数加权平均平滑，重置后重新估计。"""
+    clock = FakeClock()
+    reporter = ProgressReporter(lambda *e: None, interval=1, smoothing=0.5, clock=clock)
+
+    reporter.update(0, 0)
+    clock.now = 1
+    reporter.update(100, 0)
+    clock.now = 2
+    reporter.update(400, 0)
+    assert reporter.speed == 200
+
+    reporter.reset()
+    assert reporter.speed == 0
+    # 续传时已有的字节不计入速度
+    reporter.update(5000, 0)
+    clock.now = 3
+    reporter.update(5010, 0)
+    assert reporter.speed == 10
@@ -0,0 +1,59 @@
+"""流式封装测试模块。
+
+使用模拟的FFmpeg脚本测试数据通过标准输入写出以及失败时的清理。
+"""
+
+import stat
+import sys
+
+import pytest
+
+from src.core.exceptions import DownloadError
+from src.core.remux import StreamRemuxer
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="需要sh")
+
+
+def _fake_ffmpeg(tmp_path, body):
+    """生成模拟FFmpeg脚本，最后一个参数为输出文件。"""
+    script = tmp_path / "ffmpeg"
+    script.write_text("#!/bin/sh\nfor a; do out=$a; done\n" + body)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+def test_stream_into_ffmpeg(tmp_path):
+    """测试写入的数据按顺序到达FFmpeg。"""
+    ffmpeg = _fake_ffmpeg(tmp_path, 'cat > "$out"\n')
+    output = tmp_path / "out" / "video.mp4"
+
+    with StreamRemuxer(output, ffmpeg, input_format="mpegts") as remuxer:
+        for i in range(100):
+            remuxer.write(b"%d;" % i)
+
+    assert output.read_bytes() == b"".join(b"%d;" % i for i in range(100))
+
+
+def test_ffmpeg_failure_removes_output(tmp_path):
+    """测试FFmpeg失败时抛出异常并删除输出文件。"""
+    ffmpeg = _fake_ffmpeg(tmp_path, 'cat > "$out"\necho "invalid data" >&2\nexit 1\n')
+    output = tmp_path / "video.mp4"
+
+    with pytest.raises(DownloadError, match="invalid data"):
+        with StreamRemuxer(output, ffmpeg) as remuxer:
+            remuxer.write(b"data")
+
+    assert not output.exists()
+
+
+def test_abort_on_error(tmp_path):
+    """测试下载出错时终止FFmpeg。"""
+    ffmpeg = _fake_ffmpeg(tmp_path, 'cat > "$out"\n')
+    output = tmp_path / "video.mp4"
+
+    with pytest.raises(RuntimeError):
+        with StreamRemuxer(output, ffmpeg) as remuxer:
+            remuxer.write(b"partial")
+            raise RuntimeError("segment failed")
+
+    assert not output.exists()
@@ -0,0 +1,111 @@
+"""断点续传测试模块。
+
+测试续传清单的范围计算以及中断后只请求缺失字节。
+"""
+
+import re
+
+import pytest
+import responses
+
+from src.core.downloader import BaseDownloader
+from src.core.resume import ResumeManifest, part_path_for, manifest_path_for
+from src.utils.cookie_manager import CookieManager
+
+URL = "https://example.com/video.mp4"
+CONTENT = bytes(range(256)) * 64  # 16384字节
+ETAG = '"abc123"'
+
+
+def _range_callback(request):
+    """按Range/If-Range返回内容。"""
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    base_headers = {"Accept-Ranges": "bytes", "ETag": ETAG}
+    if not range_header or (if_range and if_range != ETAG):
+        return (200, dict(base_headers, **{"Content-Length": str(len(CONTENT))}), CONTENT)
+    start, end = re.match(r"bytes=(\d+)-(\d*)", range_header).groups()
+    start = int(start)
+    end = int(end) if end else len(CONTENT) - 1
+    headers = dict(base_headers, **{
+        "Content-Range": f"bytes {start}-{end}/{len(CONTENT)}",
+        "Content-Length": str(end - start + 1),
+    })
+    return (206, headers, CONTENT[start:end + 1])
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    """创建禁用分段的下载器。"""
+    instance = BaseDownloader(
+        platform="test",
+        save_dir=tmp_path,
+        cookie_manager=CookieManager(tmp_path / "config"),
+        max_segments=1,
+    )
+    yield instance
+    instance.close()
+
+
+def test_manifest_missing_ranges(tmp_path):
+    """测试已完成范围合并与缺失范围计算。"""
+    manifest = ResumeManifest(tmp_path / "m.json", URL, 100)
+    manifest.mark_completed(0, 9)
+    manifest.mark_completed(10, 19)
+    manifest.mark_completed(50, 59)
+
+    assert manifest.completed == [[0, 19], [50, 59]]
+    assert manifest.missing_ranges() == [(20, 49), (60, 99)]
+    assert manifest.completed_size == 30
+
+
+def test_manifest_roundtrip(tmp_path):
+    """测试清单保存和加载。"""
+    path = tmp_path / "m.json"
+    manifest = ResumeManifest(path, URL, 100, etag=ETAG)
+    manifest.mark_completed(0, 49)
+    manifest.save()
+
+    loaded = ResumeManifest.load(path)
+    assert loaded.url == URL
+    assert loaded.validator == ETAG
+    assert loaded.missing_ranges() == [(50, 99)]
+
+
+@responses.activate
+def test_resume_requests_only_missing_bytes(downloader, tmp_path):
+    """测试续传时只请求缺失的字节。"""
+    responses.add_callback(responses.GET, URL, callback=_range_callback)
+    save_path = tmp_path / "video.mp4"
+    half = len(CONTENT) // 2
+
+    part_path_for(save_path).write_bytes(CONTENT[:half])
+    manifest = ResumeManifest(manifest_path_for(save_path), URL, len(CONTENT), etag=ETAG)
+    manifest.mark_completed(0, half - 1)
+    manifest.save()
+
+    assert downloader.download(URL, save_path)
+
+    assert save_path.read_bytes() == CONTENT
+    assert not part_path_for(save_path).exists()
+    assert not manifest_path_for(save_path).exists()
+    fetched = [c for c in responses.calls if c.request.headers.get("Range") == f"bytes={half}-{len(CONTENT) - 1}"]
+    assert len(fetched) == 1
+    assert fetched[0].request.headers["If-Range"] == ETAG
+
+
+@responses.activate
+def test_resume_restarts_when_file_changed(downloader, tmp_path):
+    """测试远程文件变化时重新下载。"""
+    responses.add_callback(responses.GET, URL, callback=_range_callback)
+    save_path = tmp_path / "video.mp4"
+
+    part_path_for(save_path).write_bytes(b"x" * 100)
+    manifest = ResumeManifest(manifest_path_for(save_path), URL, len(CONTENT), etag='"stale"')
+    manifest.mark_completed(0, 99)
+    manifest.save()
+
+    assert downloader.download(URL, save_path)
+
+    assert save_path.read_bytes() == CONTENT
+    assert len(responses.calls) == 1
@@ -0,0 +1,131 @@
+"""分片并发下载测试模块。
+
+测试乱序完成的分片按顺序写出、失败重试以及在途分片数量受限，
+并发控制器限制同时进行的请求数。
+"""
+
+import random
+import threading
+import time
+
+import pytest
+import requests
+
+from src.core.concurrency import AIMDController
+from src.core.exceptions import DownloadError
+from src.core.segment_fetcher import SegmentFetcher
+
+
+class FakeResponse:
+    """模拟分片响应。"""
+
+    status_code = 200
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """随机延迟返回分片，记录并发数。"""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+            fail = self.failures.get(url, 0) > 0
+            if fail:
+                self.failures[url] -= 1
+        try:
+            time.sleep(random.uniform(0, 0.01))
+            if fail:
+                raise requests.exceptions.ConnectionError("reset")
+            return FakeResponse(url.encode() + b";")
+        finally:
+            with self.lock:
+                self.current -= 1
+
+
+def test_segments_written_in_order():
+    """测试分片按播放顺序写出。"""
+    session = FakeSession()
+    fetcher = SegmentFetcher(session, concurrency=4)
+    urls = [f"seg{i}" for i in range(50)]
+    output = bytearray()
+    progress = []
+
+    count = fetcher.fetch_ordered(urls, output.extend, lambda n, size: progress.append(n))
+
+    assert count == 50
+    assert bytes(output) == b"".join(u.encode() + b";" for u in urls)
+    assert progress == list(range(1, 51))
+    assert 1 < session.peak <= 4
+
+
+def test_segment_retry(monkeypatch):
+    """测试单个分片失败后重试。"""
+    session = FakeSession(failures={"seg3": 1})
+    fetcher = SegmentFetcher(session, concurrency=2, max_retries=2)
+    monkeypatch.setattr(fetcher._abort, "wait", lambda timeout: False)
+    output = bytearray()
+
+    fetcher.fetch_ordered([f"seg{i}" for i in range(5)], output.extend)
+
+    assert output.count(b";") == 5
+
+
+def test_failure_raises_after_retries(monkeypatch):
+    """测试重试次数用尽后抛出异常。"""
+    fetcher = SegmentFetcher(FakeSession(failures={"seg1": 5}), concurrency=2, max_retries=2)
+    monkeypatch.setattr(fetcher._abort, "wait", lambda timeout: False)
+
+    with pytest.raises(DownloadError):
+        fetcher.fetch_ordered([f"seg{i}" for i in range(4)], lambda data: None)
+
+
+def test_controller_limits_concurrency():
+    """测试使用并发控制器时同时进行的请求数不超过控制器给出的上限。"""
+    session = FakeSession()
+    controller = AIMDController(initial_limit=2, max_limit=8, interval=60)
+    fetcher = SegmentFetcher(session, concurrency=2, controller=controller)
+    urls = [f"https://cdn.example.com/seg{i}" for i in range(30)]
+    output = bytearray()
+
+    fetcher.fetch_ordered(urls, output.extend)
+
+    assert output.count(b";") == 30
+    assert session.peak <= 2
+    stats = controller.get_stats()["cdn.example.com"]
+    assert stats["limit"] == 2
+    assert stats["inflight"] == 0
+
+
+def test_shared_controller_limits_fetchers_together():
+    """测试多个下载器共享控制器时同一主机的总并发不超过上限。"""
+    session = FakeSession()
+    controller = AIMDController(initial_limit=2, max_limit=8, interval=60)
+    outputs = [bytearray(), bytearray()]
+
+    def run(output):
+        fetcher = SegmentFetcher(session, concurrency=2, controller=controller)
+        fetcher.fetch_ordered(
+            [f"https://cdn.example.com/seg{i}" for i in range(20)], output.extend
+        )
+
+    threads = [threading.Thread(target=run, args=(output,)) for output in outputs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(output.count(b";") == 20 for output in outputs)
+    assert session.peak <= 2
+    assert controller.get_stats()["cdn.example.com"]["inflight"] == 0
@@ -0,0 +1,98 @@
+"""分段下载测试模块。
+
+测试基于Range请求的多连接分段下载及回退逻辑。
+"""
+
+import re
+
+import pytest
+import responses
+
+from src.core.downloader import BaseDownloader
+from src.utils.cookie_manager import CookieManager
+
+URL = "https://example.com/large.bin"
+CONTENT = bytes(range(256)) * 400  # 102400字节
+
+
+def _range_callback(request):
+    """根据Range头返回对应的字节范围。"""
+    range_header = request.headers.get("Range")
+    if not range_header:
+        return (200, {"Accept-Ranges": "bytes", "Content-Length": str(len(CONTENT))}, CONTENT)
+    start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", range_header).groups())
+    headers = {
+        "Content-Range": f"bytes {start}-{end}/{len(CONTENT)}",
+        "Content-Length": str(end - start + 1),
+    }
+    return (206, headers, CONTENT[start:end + 1])
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    """创建小分段阈值的下载器。"""
+    instance = BaseDownloader(
+        platform="test",
+        save_dir=tmp_path,
+        cookie_manager=CookieManager(tmp_path / "config"),
+        max_segments=4,
+    )
+    instance.MIN_SEGMENT_SIZE = 16 * 1024
+    yield instance
+    instance.close()
+
+
+def test_split_ranges_covers_file():
+    """测试字节范围切分无重叠且覆盖整个文件。"""
+    ranges = BaseDownloader._split_ranges(10, 3)
+    assert ranges == [(0, 2), (3, 5), (6, 9)]
+
+
+@responses.activate
+def test_segmented_download(downloader, tmp_path):
+    """测试支持Range时按分段并发下载。"""
+    responses.add_callback(responses.GET, URL, callback=_range_callback)
+    save_path = tmp_path / "large.bin"
+
+    assert downloader.download(URL, save_path)
+
+    assert save_path.read_bytes() == CONTENT
+    range_requests = [c for c in responses.calls if "Range" in c.request.headers]
+    assert len(range_requests) == 4
+
+
+@responses.activate
+def test_fallback_without_accept_ranges(downloader, tmp_path):
+    """测试服务器不支持Range时回退到单连接下载。"""
+    responses.add(
+        responses.GET,
+        URL,
+        body=CONTENT,
+        status=200,
+        headers={"Content-Length": str(len(CONTENT))},
+    )
+    save_path = tmp_path / "large.bin"
+
+    assert downloader.download(URL, save_path)
+
+    assert save_path.read_bytes() == CONTENT
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_segmented_download_skips_rehash(downloader, tmp_path, monkeypatch):
+    """测试分段下载完成后不重新读取整个文件计算摘要，只登记到去重索引。"""
+    from src.core import downloader as downloader_module
+
+    def fail(*args, **kwargs):
+        raise AssertionError("不应重新读取文件")
+
+    monkeypatch.setattr(downloader_module, "hash_file", fail)
+    responses.add_callback(responses.GET, URL, callback=_range_callback)
+    save_path = tmp_path / "large.bin"
+
+    assert downloader.download(URL, save_path)
+
+    assert save_path.read_bytes() == CONTENT
+    assert str(save_path) not in downloader.file_digests
+    assert downloader.dedup_index.find_duplicates([save_path]) == []
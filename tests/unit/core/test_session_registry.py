@@ -0,0 +1,76 @@
+"""HTTP会话注册表测试模块。
+
+测试会话按平台和代理复用、Cookie容器共享以及连接池上限。
+"""
+
+import asyncio
+
+import pytest
+import requests
+
+from src.core.session_registry import SessionRegistry
+
+
+def test_session_reused_per_platform_and_proxy():
+    """测试同一平台和代理复用会话，工厂只调用一次。"""
+    registry = SessionRegistry()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return requests.Session()
+
+    first = registry.get("bilibili", factory=factory)
+    second = registry.get("bilibili", factory=factory)
+    proxied = registry.get("bilibili", "http://127.0.0.1:7890", factory=factory)
+
+    assert first is second
+    assert proxied is not first
+    assert proxied.proxies["https"] == "http://127.0.0.1:7890"
+    assert len(calls) == 2
+
+
+def test_cookie_jar_shared_across_sessions():
+    """测试同一平台的会话共享Cookie，不同平台互不影响。"""
+    registry = SessionRegistry()
+
+    download = registry.get("twitter", cookies={"auth_token": "abc"})
+    api = registry.get("twitter", name="api")
+    other = registry.get("youtube")
+
+    assert api is not download
+    assert api.cookies is download.cookies
+    assert api.cookies.get("auth_token") == "abc"
+    assert other.cookies.get("auth_token") is None
+
+
+def test_adapter_limits_connections_per_host():
+    """测试适配器按主机限制连接数。"""
+    registry = SessionRegistry(max_per_host=4)
+    adapter = registry.get("tumblr").get_adapter("https://example.com")
+
+    assert adapter._pool_maxsize == 4
+    assert adapter._pool_block is True
+
+
+def test_close():
+    """测试关闭后重新创建会话。"""
+    registry = SessionRegistry()
+    session = registry.get("xvideos")
+
+    registry.close("xvideos")
+
+    assert registry.get("xvideos") is not session
+
+
+@pytest.mark.asyncio
+async def test_async_session_per_loop():
+    """测试异步会话在同一事件循环内复用。"""
+    registry = SessionRegistry(max_per_host=3)
+    session = await registry.get_async("tiktok")
+
+    assert await registry.get_async("tiktok") is session
+    assert session.connector.limit_per_host == 3
+
+    await registry.aclose("tiktok")
+    assert session.closed
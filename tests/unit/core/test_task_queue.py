@@ -0,0 +1,113 @@
+"""持久化任务队列测试模块。
+
+测试批量提交、心跳合并、租约收回和重启后按进度恢复。
+"""
+
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from src.core.task_queue import DurableTaskQueue
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "queue.db"
+
+
+def test_batched_put_survives_reopen(db_path):
+    """测试攒满批次后提交，重新打开后按优先级和入队顺序恢复。"""
+    queue = DurableTaskQueue(db_path, batch_size=3, commit_interval=60)
+    queue.put("a", {"url": "a"}, priority=5)
+    queue.put("b", {"url": "b"}, priority=1)
+    assert DurableTaskQueue(db_path, commit_interval=60).recover() == []
+
+    queue.put("c", {"url": "c"}, priority=5)
+    queue.close()
+
+    reopened = DurableTaskQueue(db_path)
+    assert [t.id for t in reopened.recover()] == ["b", "a", "c"]
+    reopened.close()
+
+
+def test_interrupted_lease_requeued_with_progress(db_path):
+    """测试持有者进程退出后租约立即收回，任务带着最后一次心跳的进度重新排队。"""
+    dead = subprocess.Popen([sys.executable, "-c", ""])
+    dead.wait()
+    queue = DurableTaskQueue(db_path, owner=f"{socket.gethostname()}:{dead.pid}")
+    queue.put("a", {"url": "a"})
+    queue.lease("a")
+    queue.heartbeat("a", {"downloaded_size": 10})
+    queue.heartbeat("a", {"downloaded_size": 20})
+    queue.flush()
+    assert queue.get_stats() == {"leased": 1}
+    queue.close()
+
+    restarted = DurableTaskQueue(db_path)
+    tasks = restarted.recover()
+    assert [t.id for t in tasks] == ["a"]
+    assert tasks[0].progress == {"downloaded_size": 20}
+    assert tasks[0].attempts == 1
+    restarted.close()
+
+
+def test_same_pid_previous_run_reclaimed(db_path):
+    """测试进程号与本进程相同的上一次运行(例如容器中的1号进程)持有的租约被收回，本进程的租约保留。"""
+    stale = DurableTaskQueue(db_path, owner=f"{socket.gethostname()}:{os.getpid()}:previous")
+    stale.put("a", {})
+    stale.lease("a")
+    stale.close()
+
+    queue = DurableTaskQueue(db_path)
+    queue.put("b", {})
+    queue.lease("b")
+    assert [t.id for t in queue.recover()] == ["a"]
+    assert queue.get_stats() == {"queued": 1, "leased": 1}
+    queue.close()
+
+
+def test_live_local_owner_not_reclaimed(db_path):
+    """测试同一主机上仍在运行的其他进程持有的租约不被收回。"""
+    alive = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        other = DurableTaskQueue(db_path, owner=f"{socket.gethostname()}:{alive.pid}:other")
+        other.put("a", {})
+        other.lease("a")
+        other.close()
+        assert DurableTaskQueue(db_path).recover() == []
+    finally:
+        alive.kill()
+        alive.wait()
+
+
+def test_remote_lease_reclaimed_after_expiry(db_path):
+    """测试其他主机持有的租约只在过期后收回。"""
+    queue = DurableTaskQueue(db_path, owner="otherhost:1")
+    queue.put("a", {})
+    queue.lease("a")
+    queue.close()
+    assert DurableTaskQueue(db_path).recover() == []
+
+    queue = DurableTaskQueue(db_path, owner="otherhost:1", lease_time=-1)
+    queue.lease("a")
+    queue.close()
+    assert [t.id for t in DurableTaskQueue(db_path).recover()] == ["a"]
+
+
+def test_release_complete_and_fail(db_path):
+    """测试暂停的任务默认不恢复，完成的任务删除，失败的任务保留错误。"""
+    queue = DurableTaskQueue(db_path)
+    for task_id in ("a", "b", "c"):
+        queue.put(task_id, {})
+        queue.lease(task_id)
+    queue.release("a", {"downloaded_size": 5}, paused=True)
+    queue.complete("b")
+    queue.fail("c", "boom")
+
+    assert queue.get_stats() == {"paused": 1, "failed": 1}
+    assert queue.recover() == []
+    assert [(t.id, t.state) for t in queue.recover(include_paused=True)] == [("a", "paused")]
+    queue.close()
@@ -0,0 +1,102 @@
+"""水印快速检测测试模块。
+
+测试静态像素掩码的批量计算以及按账号和分辨率缓存检测结果，
+以及批量下载前的视频文件下载。
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("ffmpeg")
+
+from src.processors.tiktok_downloader import (
+    TikTokDownloader,
+    TikTokWatermarkRemover,
+    WatermarkRegion,
+)
+
+
+def _frames_with_logo():
+    """生成随机噪声帧，固定位置叠加一个静态Logo。"""
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 255, (8, 64, 96), dtype=np.uint8)
+    frames[:, 10:20, 70:90] = 0
+    frames[:, 12:18, 72:88] = 255
+    return frames
+
+
+def test_static_pixel_mask():
+    """测试只有静态Logo的像素被选中。"""
+    mask, mean_diff = TikTokWatermarkRemover._static_pixel_mask(
+        _frames_with_logo(), diff_threshold=8, edge_threshold=20
+    )
+
+    ys, xs = np.nonzero(mask)
+    assert (ys.min(), ys.max(), xs.min(), xs.max()) == (10, 19, 70, 89)
+    assert mean_diff[10:20, 70:90].max() == 0
+
+
+def test_regions_cached_per_account(tmp_path, monkeypatch):
+    """测试同一账号同一分辨率只检测一次。"""
+    remover = TikTokWatermarkRemover(str(tmp_path))
+    calls = []
+
+    def fake_detect(cap, width, height, total_frames):
+        calls.append((width, height))
+        return [WatermarkRegion(10, 10, 40, 40, 0.9)]
+
+    class FakeCapture:
+        def __init__(self, path):
+            pass
+
+        def get(self, prop):
+            return {3: 720, 4: 1280, 7: 300}.get(prop, 0)
+
+        def release(self):
+            pass
+
+    monkeypatch.setattr("cv2.VideoCapture", FakeCapture)
+    monkeypatch.setattr(remover, "_detect_static_regions", fake_detect)
+    monkeypatch.setattr(remover, "_check_common_regions", lambda w, h: [])
+
+    first = remover.detect_watermark("a.mp4", account="user1")
+    second = remover.detect_watermark("b.mp4", account="user1")
+    remover.detect_watermark("c.mp4", account="user2")
+
+    assert first == second
+    assert len(calls) == 2
+
+
+class _FakeResponse:
+    """模拟流式响应。"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+
+def test_fetch_writes_video(tmp_path, monkeypatch):
+    """测试下载的视频按URL文件名保存，不留下临时文件。"""
+    session = type("Session", (), {"get": lambda self, url, **kwargs: _FakeResponse(b"video")})()
+    monkeypatch.setattr(
+        "src.processors.tiktok_downloader.session_registry.get",
+        lambda platform, name="default": session
+    )
+    downloader = TikTokDownloader(str(tmp_path), remove_watermark=False)
+
+    assert downloader.batch_download(["https://v.example.com/a/123.mp4?x=1"]) == [str(tmp_path / "123.mp4")]
+    assert (tmp_path / "123.mp4").read_bytes() == b"video"
+    assert not (tmp_path / "123.mp4.part").exists()
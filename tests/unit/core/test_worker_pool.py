@@ -0,0 +1,109 @@
+"""下载工作线程池测试模块。
+
+测试 core.scheduler.DownloadScheduler 的并发执行、动态调整和停止功能。
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.core.scheduler import DownloadScheduler
+from src.core.task import DownloadTask, TaskStatus
+
+
+@pytest.fixture
+def running(monkeypatch):
+    """将任务执行替换为可观察并发数的假下载。"""
+    state = {"current": 0, "peak": 0, "release": threading.Event()}
+    lock = threading.Lock()
+
+    def fake_start(task):
+        with lock:
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+        state["release"].wait(5)
+        with lock:
+            state["current"] -= 1
+        task.status = TaskStatus.COMPLETED
+
+    monkeypatch.setattr(DownloadTask, "start", fake_start)
+    return state
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_runs_tasks_concurrently(running):
+    """测试按最大并发数并行执行任务。"""
+    scheduler = DownloadScheduler({'download.max_concurrent': 3})
+    for i in range(6):
+        scheduler.add_task(f"https://youtube.com/watch?v={i}", f"/tmp/{i}.mp4")
+
+    assert _wait_for(lambda: scheduler.get_stats()['busy_workers'] == 3)
+    stats = scheduler.get_stats()
+    assert stats['queue_depth'] == 3
+    assert stats['utilization'] == 1.0
+
+    running["release"].set()
+    assert scheduler.drain(timeout=5)
+    assert running["peak"] == 3
+    assert scheduler.get_stats()['completed_tasks'] == 6
+    scheduler.stop()
+
+
+def test_resize_workers(running):
+    """测试运行时调整并发数。"""
+    scheduler = DownloadScheduler({'download.max_concurrent': 1})
+    scheduler.set_config({'max_concurrent': 4})
+    assert _wait_for(lambda: scheduler.get_stats()['workers'] == 4)
+
+    scheduler.set_config({'max_concurrent': 2})
+    assert _wait_for(lambda: scheduler.get_stats()['workers'] == 2)
+    scheduler.stop()
+
+
+def test_stop_cancels_pending(running):
+    """测试停止时取消尚未开始的任务。"""
+    scheduler = DownloadScheduler({'download.max_concurrent': 1})
+    for i in range(3):
+        scheduler.add_task(f"https://youtube.com/watch?v={i}", f"/tmp/{i}.mp4")
+    assert _wait_for(lambda: scheduler.get_stats()['busy_workers'] == 1)
+
+    running["release"].set()
+    scheduler.stop(timeout=5)
+
+    stats = scheduler.get_stats()
+    assert stats['workers'] == 0
+    assert stats['completed_tasks'] + stats['failed_tasks'] == 3
+    with pytest.raises(RuntimeError):
+        scheduler.add_task("https://youtube.com/watch?v=x", "/tmp/x.mp4")
+
+
+def test_speed_limit_units_and_global_shaper(monkeypatch):
+    """测试速度限制统一按KB/s换算，未配置或未变化时不修改全局限速。"""
+    from src.core import scheduler as scheduler_module
+
+    calls = []
+    monkeypatch.setattr(scheduler_module.bandwidth_shaper, "set_global_limit", calls.append)
+
+    scheduler = DownloadScheduler({})
+    assert calls == []
+
+    scheduler.set_config({'speed_limit': 100})
+    scheduler.set_config({'speed_limit': 100})
+    assert calls == [100 * 1024]
+    assert scheduler.speed_limit == 100 * 1024
+
+    configured = DownloadScheduler({'download.speed_limit': 50})
+    assert calls[-1] == 50 * 1024
+    assert configured.speed_limit == 50 * 1024
+
+    scheduler.stop()
+    configured.stop()
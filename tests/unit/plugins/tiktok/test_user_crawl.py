@@ -0,0 +1,112 @@
+"""TikTok用户作品并发下载测试模块。
+
+测试翻页与下载并行、结果按完成顺序返回以及共享会话复用。
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.plugins.tiktok.downloader import TikTokDownloader, DownloadError
+
+
+class FakeResponse:
+    """模拟已读取的列表响应。"""
+
+    def __init__(self, data):
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+
+def _make_pages(total, page_size=3):
+    """生成分页数据，游标为下一页的起始序号。"""
+    pages = {}
+    for cursor in range(0, total, page_size):
+        ids = range(cursor, min(cursor + page_size, total))
+        pages[cursor] = {
+            "aweme_list": [{"aweme_id": str(i)} for i in ids],
+            "has_more": cursor + page_size < total,
+            "max_cursor": cursor + page_size,
+        }
+    return pages
+
+
+@pytest.fixture
+def downloader(monkeypatch):
+    """创建使用模拟列表接口的下载器。"""
+    d = TikTokDownloader(concurrency=3)
+    pages = _make_pages(10)
+    d.cursors = []
+
+    async def fake_request(url, params=None, headers=None):
+        d.cursors.append(params["max_cursor"])
+        return FakeResponse(pages[params["max_cursor"]])
+
+    monkeypatch.setattr(d, "_request", fake_request)
+    return d
+
+
+@pytest.mark.asyncio
+async def test_concurrent_user_crawl(downloader, tmp_path):
+    """测试多个视频并发下载且结果按完成顺序返回。"""
+    state = {"current": 0, "peak": 0}
+
+    async def fake_download(video_id, save_path, api_version=None):
+        state["current"] += 1
+        state["peak"] = max(state["peak"], state["current"])
+        # 序号小的作品下载更慢
+        await asyncio.sleep(0.01 * (10 - int(video_id) % 4))
+        state["current"] -= 1
+        Path(save_path).write_bytes(b"video")
+        return Path(save_path)
+
+    downloader.download_video = fake_download
+
+    paths = [p async for p in downloader.iter_user_videos("42", tmp_path)]
+
+    assert sorted(p.name for p in paths) == sorted(f"{i}.mp4" for i in range(10))
+    assert [p.name for p in paths] != [f"{i}.mp4" for i in range(10)]
+    assert state["peak"] == 3
+    assert downloader.cursors == [0, 3, 6, 9]
+
+
+@pytest.mark.asyncio
+async def test_max_videos_and_failures(downloader, tmp_path):
+    """测试数量限制以及单个作品失败不影响其他作品。"""
+    async def fake_download(video_id, save_path, api_version=None):
+        if video_id == "1":
+            raise DownloadError("失败")
+        return Path(save_path)
+
+    downloader.download_video = fake_download
+
+    paths = await downloader.download_user_videos("42", tmp_path, max_videos=4)
+
+    assert sorted(p.name for p in paths) == ["0.mp4", "2.mp4", "3.mp4"]
+    assert downloader.cursors == [0, 3]
+
+
+@pytest.mark.asyncio
+async def test_pagination_error_raises(downloader, tmp_path, monkeypatch):
+    """测试翻页失败时抛出异常。"""
+    async def broken_request(url, params=None, headers=None):
+        raise DownloadError("请求失败")
+
+    monkeypatch.setattr(downloader, "_request", broken_request)
+
+    with pytest.raises(DownloadError, match="请求失败"):
+        await downloader.download_user_videos("42", tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_session_reused():
+    """测试所有请求共用一个连接池。"""
+    async with TikTokDownloader(max_connections_per_host=5) as d:
+        session = await d._get_session()
+        assert await d._get_session() is session
+        assert session.connector.limit_per_host == 5
+
+    assert session.closed
@@ -0,0 +1,59 @@
+"""Twitter API客户端测试模块。
+
+测试凭据持续被拒绝或持续限流时抛出对应的异常，而不是返回None。
+"""
+
+import pytest
+
+from src.core.exceptions import APIError, TwitterRateLimitError
+from src.plugins.twitter.api_client import TwitterAPIClient
+from src.plugins.twitter.credential_pool import CredentialPool
+from src.plugins.twitter.rate_budget import RateBudgetTracker
+
+
+class FakeResponse:
+    """只有状态码的响应。"""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeSession:
+    """总是返回同一个状态码。"""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.calls = 0
+
+    def request(self, **kwargs):
+        self.calls += 1
+        return FakeResponse(self.status_code)
+
+
+def _client(status_code):
+    client = TwitterAPIClient(
+        max_retries=2,
+        credential_pool=CredentialPool(tracker=RateBudgetTracker())
+    )
+    client.session = FakeSession(status_code)
+    return client
+
+
+def test_repeated_401_raises_api_error():
+    """测试重试用完时仍然401抛出APIError。"""
+    client = _client(401)
+    with pytest.raises(APIError):
+        client._request("GET", "users/by/username/bob")
+    assert client.session.calls == 3
+
+
+def test_repeated_429_raises_rate_limit_error():
+    """测试重试用完时仍然429抛出带重置时间的TwitterRateLimitError。"""
+    client = _client(429)
+    client.max_rate_wait = float("inf")
+    client.credential_pool.tracker.default_penalty = 0.01
+    with pytest.raises(TwitterRateLimitError) as info:
+        client._request("GET", "users/by/username/bob")
+    assert client.session.calls == 3
+    assert info.value.retry_after is not None
@@ -0,0 +1,118 @@
+"""Twitter凭据池测试模块。
+
+测试预取令牌、按剩余配额轮换凭据、令牌过期换新和失效移除。
+"""
+
+import itertools
+
+import pytest
+
+from src.plugins.twitter.credential_pool import CredentialPool
+from src.plugins.twitter.rate_budget import RateBudgetTracker
+
+
+class FakeClock:
+    """可手动推进的时钟。"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def exhausted(reset):
+    return {
+        "x-rate-limit-limit": "50",
+        "x-rate-limit-remaining": "0",
+        "x-rate-limit-reset": str(reset),
+    }
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def pool(clock):
+    counter = itertools.count(1)
+    pool = CredentialPool(
+        fetch_guest_token=lambda: f"token{next(counter)}",
+        size=2,
+        tracker=RateBudgetTracker(clock=clock),
+        token_ttl=100,
+        refresh_before=10,
+        refresh_interval=3600,
+        clock=clock
+    )
+    yield pool
+    pool.close()
+
+
+def test_prefetch_and_spread_leases(pool):
+    """测试首次租用时预取令牌，并发请求分散到不同凭据。"""
+    first = pool.lease("timeline")
+    second = pool.lease("timeline")
+
+    assert len(pool.get_stats()) == 2
+    assert first.credential.id != second.credential.id
+    assert {first.headers()["x-guest-token"], second.headers()["x-guest-token"]} == {"token1", "token2"}
+
+
+def test_exhausted_credential_skipped(pool, clock):
+    """测试一个凭据的接口配额用完后换用其他凭据，全部用完时返回重置等待时间。"""
+    lease = pool.lease("timeline")
+    pool.release(lease, exhausted(clock.now + 900), 200)
+
+    other = pool.lease("timeline")
+    assert other.credential.id != lease.credential.id
+    assert other.delay == 0
+    pool.release(other, exhausted(clock.now + 300), 429)
+
+    parked = pool.lease("timeline", max_wait=5)
+    assert parked.delay == pytest.approx(300)
+    assert pool.wait_time("timeline") == pytest.approx(300)
+    # 其他接口不受影响
+    assert pool.lease("tweets", max_wait=5).delay == 0
+
+
+def test_expiring_tokens_refreshed(pool, clock):
+    """测试即将过期的令牌提前换新，过期后空闲的令牌移出池。"""
+    pool.start()
+    clock.now += 95
+    assert pool.refresh() == 2
+    assert len(pool.get_stats()) == 4
+
+    clock.now += 10
+    pool.refresh()
+    stats = pool.get_stats()
+    assert len(stats) == 2
+    assert all(s['expires_in'] > 0 for s in stats.values())
+
+
+def test_invalid_token_replaced(pool):
+    """测试401使令牌失效，刷新时移除并补足。"""
+    lease = pool.lease("timeline")
+    pool.release(lease, {}, 401)
+
+    assert pool.refresh() == 1
+    stats = pool.get_stats()
+    assert lease.credential.id not in stats
+    assert len(stats) == 2
+
+
+def test_cookie_identities_and_anonymous_lease(clock):
+    """测试登录身份附加Cookie和CSRF头，不需要认证的请求不占用凭据。"""
+    pool = CredentialPool(
+        identities={"twitter": {"auth_token": "a", "ct0": "csrf"}},
+        tracker=RateBudgetTracker(clock=clock),
+        clock=clock
+    )
+    lease = pool.lease("timeline")
+    assert lease.headers()["x-csrf-token"] == "csrf"
+    assert "auth_token=a" in lease.headers()["Cookie"]
+
+    media = pool.lease("media/abc.jpg", authenticate=False)
+    assert media.credential is None
+    assert media.headers() == {}
@@ -0,0 +1,106 @@
+"""Twitter接口限额跟踪测试模块。
+
+测试按响应头记录限额、接近用完时匀速放行和按接口独立限流。
+"""
+
+import pytest
+
+from src.plugins.twitter.rate_budget import RateBudgetTracker, endpoint_key
+
+
+class FakeClock:
+    """可手动推进的时钟。"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def headers(limit, remaining, reset):
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(reset),
+    }
+
+
+def test_endpoint_key():
+    """测试ID和用户名归并到同一接口。"""
+    assert endpoint_key("https://api.twitter.com/2/users/123/tweets?max_results=20") == "2/users/:id/tweets"
+    assert endpoint_key("https://api.twitter.com/2/users/by/username/jack") == "2/users/by/username/:username"
+    assert endpoint_key("https://api.twitter.com/2/tweets/1") == endpoint_key("https://api.twitter.com/2/tweets/2")
+
+
+def test_unknown_endpoint_not_limited():
+    """测试没有收到限额头的接口不做限制。"""
+    tracker = RateBudgetTracker(clock=FakeClock())
+    assert tracker.reserve("media") == 0
+    tracker.update("media", {}, 200)
+    assert tracker.reserve("media") == 0
+
+
+def test_paces_before_exhaustion():
+    """测试剩余配额过半前直接放行，之后在窗口内均匀分布。"""
+    clock = FakeClock()
+    tracker = RateBudgetTracker(pace_below=0.5, clock=clock)
+    tracker.update("timeline", headers(10, 6, 1100))
+
+    assert tracker.reserve("timeline") == 0  # 剩余6，不限速
+    assert tracker.reserve("timeline") == 0  # 剩余5，不限速
+    assert tracker.reserve("timeline") == 0  # 剩余4，开始限速，本次立即发送
+    # 剩余4个请求分布在剩余的100秒内，下一次排在25秒后
+    assert tracker.reserve("timeline") == pytest.approx(25.0)
+
+
+def test_exhausted_endpoint_parked_without_consuming():
+    """测试配额用完的接口返回到重置的等待时间，超过max_wait时不占用配额。"""
+    clock = FakeClock()
+    tracker = RateBudgetTracker(pace_below=0, clock=clock)
+    tracker.update("timeline", headers(50, 1, 1900))
+
+    assert tracker.reserve("timeline", max_wait=5) == 0
+    assert tracker.reserve("timeline", max_wait=5) == pytest.approx(900)
+    # 其他接口不受影响
+    assert tracker.reserve("tweets", max_wait=5) == 0
+
+    clock.now = 1900
+    assert tracker.reserve("timeline", max_wait=5) == 0
+    assert tracker.get_stats()["timeline"]["remaining"] == 49
+
+
+def test_refill_advances_reset_without_new_headers():
+    """测试窗口重置后只恢复一次配额，下一次重置时间按窗口长度推算。"""
+    clock = FakeClock()
+    tracker = RateBudgetTracker(pace_below=0, window=900, clock=clock)
+    tracker.update("timeline", headers(2, 0, 1100))
+
+    clock.now = 1100
+    assert tracker.reserve("timeline") == 0
+    assert tracker.reserve("timeline") == 0
+    # 没有收到新的响应头，配额用完后等到推算的下一次重置
+    assert tracker.reserve("timeline") == pytest.approx(900)
+    assert tracker.get_stats()["timeline"]["remaining"] == 0
+
+
+def test_429_parks_endpoint():
+    """测试429响应使接口暂停到重置时间，没有重置时间时使用默认惩罚。"""
+    clock = FakeClock()
+    tracker = RateBudgetTracker(default_penalty=60, clock=clock)
+
+    tracker.update("search", {}, 429)
+    assert tracker.wait_time("search") == pytest.approx(60)
+    assert tracker.get_stats()["search"]["throttled"] == 1
+
+
+def test_out_of_order_responses_keep_lower_remaining():
+    """测试同一窗口内乱序到达的响应不会抬高剩余数，失败的请求归还配额。"""
+    tracker = RateBudgetTracker(clock=FakeClock())
+    tracker.update("tweets", headers(100, 40, 1900))
+    tracker.update("tweets", headers(100, 42, 1900))
+    assert tracker.get_stats()["tweets"]["remaining"] == 40
+
+    tracker.reserve("tweets")
+    tracker.cancel("tweets")
+    assert tracker.get_stats()["tweets"]["remaining"] == 40
@@ -0,0 +1,88 @@
+"""GCRA速率限制测试模块。
+
+测试突发后匀速放行、按接口独立计数、等待不阻塞其他线程以及跨进程共享状态。
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.services.rate_limiter import PlatformRateLimiter
+from src.services.rate_limiter.gcra import GCRALimiter, SQLiteStateStore
+
+
+class FakeClock:
+    """可手动推进的时钟。"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_paced():
+    """测试窗口内允许突发到最大请求数，之后按发射间隔预约。"""
+    clock = FakeClock()
+    limiter = GCRALimiter({"api": (4, 2.0)}, clock=clock)
+
+    assert [limiter.reserve("api") for _ in range(4)] == [0, 0, 0, 0]
+    assert limiter.reserve("api") == pytest.approx(0.5)
+    assert limiter.reserve("api") == pytest.approx(1.0)
+
+    clock.now += 10
+    assert limiter.peek("api") == 0
+
+
+def test_try_acquire_does_not_consume_when_limited():
+    """测试被拒绝的请求不占用配额。"""
+    clock = FakeClock()
+    limiter = GCRALimiter({"api": (1, 1.0)}, clock=clock)
+
+    assert limiter.try_acquire("api")
+    assert not limiter.try_acquire("api")
+    assert not limiter.try_acquire("api")
+    clock.now += 1.0
+    assert limiter.try_acquire("api")
+
+
+def test_endpoints_limited_independently():
+    """测试同一平台的不同接口独立计数，按平台重置时一并清除。"""
+    limiter = PlatformRateLimiter(rules={("twitter", "search"): (1, 60)})
+
+    assert limiter.check("twitter", "search")
+    assert not limiter.check("twitter", "search")
+    assert limiter.check("twitter", "timeline")
+    assert limiter.wait("twitter", "search") > 0
+
+    limiter.reset("twitter")
+    assert limiter.wait("twitter", "search") == 0
+    with pytest.raises(ValueError):
+        limiter.check("unknown")
+
+
+def test_waiters_do_not_serialize():
+    """测试等待在锁外进行，多个线程的等待时间重叠。"""
+    limiter = GCRALimiter({"api": (1, 0.2)})
+    limiter.reserve("api")
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire, args=("api",)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 三个请求分别预约0.2/0.4/0.6秒后，总耗时约为最长的一个
+    assert time.monotonic() - started < 0.9
+
+
+def test_sqlite_store_shared(tmp_path):
+    """测试两个使用同一数据库的限制器共享配额。"""
+    first = GCRALimiter({"api": (2, 60)}, store=SQLiteStateStore(tmp_path / "rate.db"))
+    second = GCRALimiter({"api": (2, 60)}, store=SQLiteStateStore(tmp_path / "rate.db"))
+
+    assert first.try_acquire("api")
+    assert second.try_acquire("api")
+    assert not first.try_acquire("api")
@@ -6,6 +6,15 @@ import asyncio
 from unittest.mock import patch, MagicMock
 from src.services.rate_limiter import RateLimiter, RateLimitExceededError
 
+class FakeClock:
+    """可手动设置的时钟。"""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+        
+    def __call__(self):
+        return self.now
+
 @pytest.fixture
 def limiter():
     """创建测试用速率限制器。"""
@@ -28,40 +37,37 @@ def test_init_validation():
     with pytest.raises(ValueError):
         RateLimiter(calls_per_minute=-1)
 
-@patch('time.time')
-def test_wait_no_delay(mock_time):
+def test_wait_no_delay():
     """测试无需等待的情况。"""
-    mock_time.return_value = 1000.0
-    limiter = RateLimiter(calls_per_minute=60)
+    limiter = RateLimiter(calls_per_minute=60, clock=FakeClock())
     
     # 第一次调用无需等待
     limiter.wait()
     assert limiter.stats["total_wait_time"] == 0
     assert limiter.stats["total_calls"] == 1
 
-@patch('time.time')
 @patch('time.sleep')
-def test_wait_with_delay(mock_sleep, mock_time):
+def test_wait_with_delay(mock_sleep):
     """测试需要等待的情况。"""
-    mock_time.side_effect = [1000.0, 1000.2, 1000.2]  # 初始化，检查时间，更新时间
-    limiter = RateLimiter(calls_per_minute=60)  # 每秒一次
+    clock = FakeClock()
+    limiter = RateLimiter(calls_per_minute=60, clock=clock)  # 每秒一次
     
     limiter.wait()  # 第一次调用
-    mock_time.side_effect = [1000.2, 1000.2, 1000.2]  # 0.2秒后再次调用
+    clock.now = 1000.2  # 0.2秒后再次调用
     limiter.wait()  # 第二次调用
     
     # 验证等待时间
-    mock_sleep.assert_called_once_with(0.8)  # 应该等待0.8秒
+    mock_sleep.assert_called_once_with(pytest.approx(0.8))  # 应该等待0.8秒
     assert limiter.stats["total_calls"] == 2
-    assert limiter.stats["total_wait_time"] == 0.8
+    assert limiter.stats["total_wait_time"] == pytest.approx(0.8)
 
-@patch('time.time')
-def test_error_on_exceed(mock_time):
+def test_error_on_exceed():
     """测试超出限制时抛出异常。"""
-    mock_time.side_effect = [1000.0, 1000.2, 1000.2]
-    limiter = RateLimiter(calls_per_minute=60, error_on_exceed=True)
+    clock = FakeClock()
+    limiter = RateLimiter(calls_per_minute=60, error_on_exceed=True, clock=clock)
     
     limiter.wait()  # 第一次调用
+    clock.now = 1000.2
     
     # 第二次调用应该抛出异常
     with pytest.raises(RateLimitExceededError) as exc_info:
@@ -70,19 +76,18 @@ def test_error_on_exceed(mock_time):
     assert exc_info.value.wait_time == pytest.approx(0.8, rel=1e-2)
 
 @pytest.mark.asyncio
-@patch('time.time')
 @patch('asyncio.sleep')
-async def test_async_wait(mock_sleep, mock_time):
+async def test_async_wait(mock_sleep):
     """测试异步等待。"""
-    mock_time.side_effect = [1000.0, 1000.2, 1000.2]
-    limiter = RateLimiter(calls_per_minute=60)
+    clock = FakeClock()
+    limiter = RateLimiter(calls_per_minute=60, clock=clock)
     
     await limiter.async_wait()  # 第一次调用
-    mock_time.side_effect = [1000.2, 1000.2, 1000.2]
+    clock.now = 1000.2
     await limiter.async_wait()  # 第二次调用
     
     # 验证异步等待
-    mock_sleep.assert_called_once_with(0.8)
+    mock_sleep.assert_called_once_with(pytest.approx(0.8))
     assert limiter.stats["total_calls"] == 2
 
 def test_context_manager():
@@ -106,32 +111,33 @@ async def test_async_context_manager():
     async with limiter:
         assert limiter.stats["total_calls"] == 2
 
-@patch('time.time')
-def test_stats_collection(mock_time):
+@patch('time.sleep')
+def test_stats_collection(mock_sleep):
     """测试统计信息收集。"""
-    mock_time.return_value = 1000.0
-    limiter = RateLimiter(calls_per_minute=60)
+    clock = FakeClock()
+    limiter = RateLimiter(calls_per_minute=60, clock=clock)
     
     # 第一次调用
     limiter.wait()
     
     # 0.8秒后第二次调用
-    mock_time.side_effect = [1000.8, 1000.8, 1000.8]
+    clock.now = 1000.8
     limiter.wait()
     
     # 检查统计信息
     stats = limiter.get_stats()
     assert stats["total_calls"] == 2
-    assert stats["total_wait_time"] == 0.2
-    assert stats["max_wait_time"] == 0.2
-    assert stats["avg_wait_time"] == 0.1
+    assert stats["total_wait_time"] == pytest.approx(0.2)
+    assert stats["max_wait_time"] == pytest.approx(0.2)
+    assert stats["avg_wait_time"] == pytest.approx(0.1)
     assert stats["calls_per_minute"] == 60
 
+@patch('time.sleep')
 @patch('time.time')
-def test_stats_reset(mock_time):
+def test_stats_reset(mock_time, mock_sleep):
     """测试统计信息重置。"""
     mock_time.return_value = 1000.0
-    limiter = RateLimiter(calls_per_minute=60)
+    limiter = RateLimiter(calls_per_minute=60, clock=mock_time)
     
     # 进行一些调用
     limiter.wait()
@@ -207,14 +213,13 @@ def test_error_message():
     error = RateLimitExceededError(1.5)
     assert "需要等待 1.50 秒" in str(error)
 
-@patch('time.time')
-def test_zero_wait_time(mock_time):
+def test_zero_wait_time():
     """测试无需等待的边界情况。"""
-    mock_time.return_value = 1000.0
-    limiter = RateLimiter(calls_per_minute=60)
+    clock = FakeClock()
+    limiter = RateLimiter(calls_per_minute=60, clock=clock)
     
     limiter.wait()
-    mock_time.return_value = 1002.0  # 2秒后，远超等待时间
+    clock.now = 1002.0  # 2秒后，远超等待时间
     limiter.wait()
     
     assert limiter.stats["total_wait_time"] == 0